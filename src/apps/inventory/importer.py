@@ -0,0 +1,338 @@
+"""
+Persistence of parser output into the inventory.
+
+``import_parsed_data`` writes the structured output of a parser to the
+``Device``, ``Interface``, ``VRF``, ``ACL``, ``RouteTable`` and
+``InventoryItem`` tables in one transaction per device. Rows are upserted
+with ``bulk_create(update_conflicts=True)`` on each model's
+``unique_together`` key, so a device with tens of thousands of interfaces
+is written with a handful of statements instead of a ``save()`` per row.
+
+Re-collected configurations usually differ in a handful of lines, so the
+import is incremental: every row carries a hash of its values, and only
+rows whose hash changed are written. Unchanged rows cost one read and no
+writes, which keeps write volume, WAL growth and index churn proportional
+to what actually changed.
+"""
+
+import hashlib
+import ipaddress
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from apps.parsers.models import DeviceFile
+from apps.parsers.parsers.results import to_primitive
+from .models import ACL, VRF, Device, Interface, InventoryItem, InventoryItemType, RouteTable
+
+# Rows per INSERT statement
+BATCH_SIZE = 1000
+
+# List sections of the parser output stored as generic inventory items
+OTHER_SECTIONS = (
+	'network_objects', 'nat_rules', 'vlans', 'policies', 'address_objects',
+	'service_objects', 'security_policies', 'switch_ports', 'routing_instances',
+)
+
+# Maximum length of the name columns
+MAX_NAME_LENGTH = 255
+
+
+def _to_int(value: Any) -> Optional[int]:
+	"""Return the value as an integer, or None if it is not one."""
+	try:
+		return int(value)
+	except (TypeError, ValueError):
+		return None
+
+
+def _split_address(address: str, mask: str = "") -> Tuple[Optional[str], str]:
+	"""
+	Split an interface address into a valid IP address and a subnet mask.
+
+	Args:
+		address (str): ``10.0.0.1``, ``10.0.0.1/24`` or ``10.0.0.1 255.255.255.0``.
+		mask (str): The subnet mask, if the parser reports it separately.
+
+	Returns:
+		Tuple[Optional[str], str]: The IP address (None if invalid) and the mask.
+	"""
+	address = (address or "").strip()
+	if ' ' in address:
+		address, mask = address.split(None, 1)
+	if '/' in address:
+		try:
+			interface = ipaddress.ip_interface(address)
+		except ValueError:
+			return None, mask
+		address = str(interface.ip)
+		mask = str(interface.netmask) if interface.version == 4 else str(interface.network.prefixlen)
+	try:
+		return str(ipaddress.ip_address(address)), mask[:15]
+	except ValueError:
+		return None, mask[:15]
+
+
+def _item_name(item: Dict[str, Any], index: int) -> str:
+	"""Return an identifying name for an item of a parser output list."""
+	for key in ('name', 'id', 'prefix', 'network'):
+		if item.get(key) not in (None, ''):
+			return str(item[key])
+	return str(index)
+
+
+def _item_scope(item: Dict[str, Any]) -> str:
+	"""
+	Return the scope that qualifies the name of an item of a parser output list.
+
+	FortiGate policy IDs and object names restart in every VDOM, and JunOS
+	security policy names are only unique per zone pair, so the name alone
+	does not identify those items.
+	"""
+	if item.get('vdom'):
+		return f"{item['vdom']}:"
+	if item.get('from_zone') or item.get('to_zone'):
+		return f"{item.get('from_zone') or ''}>{item.get('to_zone') or ''}:"
+	return ""
+
+
+def vrfs(parsed_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+	"""Return the VRFs of the parser output; JunOS reports them as routing instances."""
+	if 'vrfs' in parsed_data:
+		return parsed_data['vrfs'] or []
+	return [
+		instance for instance in parsed_data.get('routing_instances') or []
+		if instance.get('type') in ('vrf', 'virtual-router')
+	]
+
+
+def interface_rows(parsed_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+	"""Return ``Interface`` field values for the interfaces in the parser output."""
+	rows = []
+	for interface in parsed_data.get('interfaces') or []:
+		address = interface.get('ip_address') or interface.get('ip') or ""
+		mask = interface.get('subnet_mask') or interface.get('netmask') or ""
+		if not address:
+			# JunOS reports addresses per logical unit
+			for unit in interface.get('units') or []:
+				addresses = ((unit.get('family') or {}).get('inet') or {}).get('addresses') or []
+				if addresses:
+					address = addresses[0]
+					break
+
+		ip_address, subnet_mask = _split_address(address, mask)
+		enabled = interface.get('enabled', True)
+		rows.append({
+			'name': str(interface.get('name', ''))[:MAX_NAME_LENGTH],
+			'description': str(interface.get('description') or '')[:255],
+			'ip_address': ip_address,
+			'subnet_mask': subnet_mask,
+			'mac_address': str(interface.get('mac_address') or '')[:17],
+			'is_up': enabled,
+			'is_enabled': enabled,
+			'speed': _to_int(interface.get('speed')),
+			'mtu': _to_int(interface.get('mtu')),
+		})
+	return rows
+
+
+def vrf_rows(parsed_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+	"""Return ``VRF`` field values for the VRFs (or VRF routing instances) in the parser output."""
+	return [
+		{
+			'name': str(vrf.get('name', ''))[:MAX_NAME_LENGTH],
+			'description': str(vrf.get('description') or '')[:255],
+			'route_distinguisher': str(vrf.get('rd') or vrf.get('route_distinguisher') or '')[:100],
+		}
+		for vrf in vrfs(parsed_data)
+	]
+
+
+def acl_rows(parsed_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+	"""Return ``ACL`` field values for the access lists in the parser output."""
+	types = {choice for choice, _ in ACL.TYPE_CHOICES}
+	return [
+		{
+			'name': str(acl.get('name', ''))[:MAX_NAME_LENGTH],
+			'type': acl.get('type') if acl.get('type') in types else 'other',
+			'rules': acl.get('rules') or [],
+		}
+		for acl in parsed_data.get('acls') or []
+	]
+
+
+def inventory_item_rows(parsed_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+	"""Return ``InventoryItem`` field values for every component in the parser output."""
+	rows = []
+
+	def add(item_type: str, name: str, data: Dict[str, Any]):
+		rows.append({
+			'item_type': item_type,
+			'name': name[:MAX_NAME_LENGTH],
+			'description': str(data.get('description') or ''),
+			'data': to_primitive(data),
+		})
+
+	for index, interface in enumerate(parsed_data.get('interfaces') or []):
+		add(InventoryItemType.INTERFACE, _item_name(interface, index), interface)
+	for index, acl in enumerate(parsed_data.get('acls') or []):
+		add(InventoryItemType.ACL, _item_name(acl, index), acl)
+	for index, vrf in enumerate(vrfs(parsed_data)):
+		add(InventoryItemType.VRF, _item_name(vrf, index), vrf)
+	for route in static_routes(parsed_data):
+		destination = route.get('prefix') or f"{route.get('network', '')}/{route.get('mask', '')}"
+		add(InventoryItemType.ROUTE, f"{destination} via {route.get('next_hop', '')}", route)
+	for index, tunnel in enumerate(((parsed_data.get('vpn') or {}).get('ipsec')) or []):
+		add(InventoryItemType.IPSEC_TUNNEL, f"{_item_scope(tunnel)}{_item_name(tunnel, index)}", tunnel)
+	for section in OTHER_SECTIONS:
+		for index, item in enumerate(parsed_data.get(section) or []):
+			add(InventoryItemType.OTHER, f"{section}:{_item_scope(item)}{_item_name(item, index)}", item)
+	return rows
+
+
+def static_routes(parsed_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+	"""Return the static routes of the global routing table."""
+	return (parsed_data.get('routing') or {}).get('static_routes') or []
+
+
+def device_fields(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+	"""Return the ``Device`` summary fields for the parser output."""
+	routing = parsed_data.get('routing') or {}
+	acl_rules = sum(len(acl.get('rules') or []) for acl in parsed_data.get('acls') or [])
+	policies = len(parsed_data.get('policies') or []) + len(parsed_data.get('security_policies') or [])
+	return {
+		'interface_count': len(parsed_data.get('interfaces') or []),
+		'route_count': len(static_routes(parsed_data)),
+		'acl_count': acl_rules + policies,
+		'ipsec_tunnel_count': len(((parsed_data.get('vpn') or {}).get('ipsec')) or []),
+		'routing_protocols': {name: to_primitive(value) for name, value in routing.items() if name != 'static_routes'},
+		'last_config_snapshot': timezone.now(),
+	}
+
+
+def row_hash(row: Dict[str, Any]) -> str:
+	"""Return a stable hash of a row's field values."""
+	encoded = json.dumps(row, sort_keys=True, cls=DjangoJSONEncoder, separators=(',', ':'))
+	return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def sync_rows(model, device: Device, rows: List[Dict[str, Any]], key_fields: List[str]) -> Dict[str, int]:
+	"""
+	Bring the stored rows of one device in line with the parser output.
+
+	Every row is hashed and compared with the ``row_hash`` stored with it.
+	Only new and changed rows are written, with a single bulk upsert; rows
+	that are no longer in the configuration are deactivated when the model
+	has an ``is_active`` field and deleted otherwise. Unchanged rows are not
+	touched at all.
+
+	Args:
+		model: The inventory model; it must have a ``row_hash`` field.
+		device (Device): The device the rows belong to.
+		rows (List[Dict[str, Any]]): Field values of every row; all rows have
+			the same fields. Rows with the same key keep the last value.
+		key_fields (List[str]): The unique key fields besides ``device``.
+
+	Returns:
+		Dict[str, int]: Number of rows ``inserted``, ``updated``, ``unchanged`` and ``removed``.
+	"""
+	deactivate = any(field.name == 'is_active' for field in model._meta.fields)
+	state_fields = ['pk', 'row_hash'] + (['is_active'] if deactivate else [])
+	stored = {
+		tuple(values[:len(key_fields)]): values[len(key_fields):]
+		for values in model.objects.filter(device=device).values_list(*key_fields, *state_fields).iterator()
+	}
+
+	wanted = {}
+	for row in rows:
+		wanted[tuple(row[field] for field in key_fields)] = row
+
+	changes = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+	objects = []
+	for key, row in wanted.items():
+		digest = row_hash(row)
+		current = stored.get(key)
+		if current is not None and current[1] == digest and (not deactivate or current[2]):
+			changes['unchanged'] += 1
+			continue
+
+		changes['inserted' if current is None else 'updated'] += 1
+		values = dict(row, row_hash=digest)
+		if deactivate:
+			values['is_active'] = True
+		objects.append(model(device=device, **values))
+
+	if objects:
+		model.objects.bulk_create(
+			objects,
+			batch_size=BATCH_SIZE,
+			update_conflicts=True,
+			unique_fields=['device'] + key_fields,
+			update_fields=[field for field in values if field not in key_fields] + ['updated_at']
+		)
+
+	removed = [
+		current[0] for key, current in stored.items()
+		if key not in wanted and (not deactivate or current[2])
+	]
+	for offset in range(0, len(removed), BATCH_SIZE):
+		chunk = model.objects.filter(pk__in=removed[offset:offset + BATCH_SIZE])
+		if deactivate:
+			chunk.update(is_active=False, updated_at=timezone.now())
+		else:
+			chunk.delete()
+	changes['removed'] = len(removed)
+	return changes
+
+
+def import_parsed_data(device_file: DeviceFile, parsed_data: Dict[str, Any]) -> Tuple[Device, Dict[str, Dict[str, int]]]:
+	"""
+	Save the parser output of a device file to the inventory.
+
+	The device is identified by its project and hostname (the device file's
+	name if the parser found no hostname). Everything is written in one
+	transaction. Only the interfaces, VRFs, ACLs and inventory items that
+	changed since the previous import are written; interfaces, VRFs and ACLs
+	that are no longer configured are deleted and inventory items are
+	deactivated. ``last_seen`` of every active inventory item is set in a
+	single statement.
+
+	Args:
+		device_file (DeviceFile): The parsed device file.
+		parsed_data (Dict[str, Any]): The complete parser output.
+
+	Returns:
+		Tuple[Device, Dict[str, Dict[str, int]]]: The created or updated device,
+		and the changes made per model name (see ``sync_rows``).
+	"""
+	name = (parsed_data.get('hostname') or device_file.name)[:MAX_NAME_LENGTH]
+	defaults = device_fields(parsed_data)
+	defaults['device_type'] = device_file.device_type
+	if parsed_data.get('version'):
+		defaults['firmware_version'] = str(parsed_data['version'])[:100]
+
+	with transaction.atomic():
+		device, _ = Device.objects.update_or_create(project=device_file.project, name=name, defaults=defaults)
+
+		changes = {
+			'Interface': sync_rows(Interface, device, interface_rows(parsed_data), ['name']),
+			'VRF': sync_rows(VRF, device, vrf_rows(parsed_data), ['name']),
+			'ACL': sync_rows(ACL, device, acl_rows(parsed_data), ['name']),
+			'InventoryItem': sync_rows(InventoryItem, device, inventory_item_rows(parsed_data), ['item_type', 'name']),
+		}
+		InventoryItem.objects.filter(device=device, is_active=True).update(last_seen=defaults['last_config_snapshot'])
+
+		# The global routing table has no VRF, and NULLs never conflict on the
+		# unique key, so it is updated in place rather than upserted
+		routes = {'static_routes': to_primitive(static_routes(parsed_data))}
+		route_table = RouteTable.objects.filter(device=device, vrf=None).first()
+		if route_table is None:
+			RouteTable.objects.create(device=device, vrf=None, routes=routes)
+		elif route_table.routes != routes:
+			route_table.routes = routes
+			route_table.save(update_fields=['routes', 'updated_at'])
+
+	return device, changes
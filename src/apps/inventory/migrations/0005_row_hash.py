@@ -0,0 +1,33 @@
+# Generated by Django 4.2.11 on 2026-10-17 01:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_rename_inventory_d_device__82f1fb_idx_inventory_d_device__4b4a89_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='acl',
+            name='row_hash',
+            field=models.CharField(blank=True, help_text='Hash of the parsed values, used to skip unchanged rows on re-import', max_length=64, verbose_name='Row Hash'),
+        ),
+        migrations.AddField(
+            model_name='interface',
+            name='row_hash',
+            field=models.CharField(blank=True, help_text='Hash of the parsed values, used to skip unchanged rows on re-import', max_length=64, verbose_name='Row Hash'),
+        ),
+        migrations.AddField(
+            model_name='inventoryitem',
+            name='row_hash',
+            field=models.CharField(blank=True, help_text='Hash of the parsed values, used to skip unchanged rows on re-import', max_length=64, verbose_name='Row Hash'),
+        ),
+        migrations.AddField(
+            model_name='vrf',
+            name='row_hash',
+            field=models.CharField(blank=True, help_text='Hash of the parsed values, used to skip unchanged rows on re-import', max_length=64, verbose_name='Row Hash'),
+        ),
+    ]
@@ -186,6 +186,12 @@ class Interface(models.Model):
 		blank=True,
 		null=True
 	)
+	row_hash = models.CharField(
+		_("Row Hash"),
+		max_length=64,
+		blank=True,
+		help_text=_("Hash of the parsed values, used to skip unchanged rows on re-import")
+	)
 	created_at = models.DateTimeField(
 		_("Created At"),
 		auto_now_add=True
@@ -235,6 +241,12 @@ class VRF(models.Model):
 		max_length=100,
 		blank=True
 	)
+	row_hash = models.CharField(
+		_("Row Hash"),
+		max_length=64,
+		blank=True,
+		help_text=_("Hash of the parsed values, used to skip unchanged rows on re-import")
+	)
 	created_at = models.DateTimeField(
 		_("Created At"),
 		auto_now_add=True
@@ -290,6 +302,12 @@ class ACL(models.Model):
 		_("Rules"),
 		default=dict
 	)
+	row_hash = models.CharField(
+		_("Row Hash"),
+		max_length=64,
+		blank=True,
+		help_text=_("Hash of the parsed values, used to skip unchanged rows on re-import")
+	)
 	created_at = models.DateTimeField(
 		_("Created At"),
 		auto_now_add=True
@@ -431,6 +449,12 @@ class InventoryItem(models.Model):
 		blank=True,
 		help_text=_('When this item was last observed in device configuration')
 	)
+	row_hash = models.CharField(
+		_('Row Hash'),
+		max_length=64,
+		blank=True,
+		help_text=_('Hash of the parsed values, used to skip unchanged rows on re-import')
+	)
 	
 	# Standard fields
 	created_at = models.DateTimeField(
@@ -0,0 +1,135 @@
+import tempfile
+import time
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from apps.projects.models import Project
+from apps.clients.models import Client
+from apps.parsers.models import DeviceFile, DeviceType
+from ..importer import import_parsed_data
+from ..models import ACL, VRF, Device, Interface, InventoryItem, InventoryItemType, RouteTable
+
+
+class ImportParsedDataTest(TestCase):
+	"""Tests for saving parser output to the inventory."""
+
+	def setUp(self):
+		"""Set up test data in a temporary media root."""
+		media_root = tempfile.TemporaryDirectory()
+		self.addCleanup(media_root.cleanup)
+		settings_override = override_settings(MEDIA_ROOT=media_root.name)
+		settings_override.enable()
+		self.addCleanup(settings_override.disable)
+
+		client = Client.objects.create(name='Test Company')
+		self.project = Project.objects.create(name='Test Project', client=client)
+		device_type = DeviceType.objects.create(name='Cisco IOS', slug='cisco-ios')
+		self.device_file = DeviceFile.objects.create(
+			name='r1-backup',
+			project=self.project,
+			device_type=device_type,
+			file=SimpleUploadedFile('r1.cfg', b'hostname R1\n')
+		)
+		self.parsed_data = {
+			'device_type': 'cisco_ios',
+			'hostname': 'R1',
+			'interfaces': [
+				{'name': 'Gi0/0', 'description': 'Uplink', 'ip_address': '10.0.0.1', 'subnet_mask': '255.255.255.0', 'enabled': True},
+				{'name': 'Gi0/1', 'description': '', 'ip_address': 'dhcp', 'subnet_mask': '', 'enabled': False},
+			],
+			'acls': [{'name': 'OUTSIDE', 'type': 'extended', 'rules': ['permit tcp any any eq 443']}],
+			'vrfs': [{'name': 'MGMT', 'rd': '65000:1', 'route_targets': [], 'interfaces': []}],
+			'routing': {
+				'static_routes': [{'network': '0.0.0.0', 'mask': '0.0.0.0', 'next_hop': '10.0.0.254'}],
+				'ospf': {'enabled': False},
+			},
+		}
+
+	def test_import(self):
+		"""Test that every section of the parser output is saved."""
+		device, changes = import_parsed_data(self.device_file, self.parsed_data)
+
+		self.assertEqual(device.name, 'R1')
+		self.assertEqual(changes['Interface']['inserted'], 2)
+		self.assertEqual(device.interface_count, 2)
+		self.assertEqual(device.acl_count, 1)
+		self.assertEqual(device.route_count, 1)
+		self.assertEqual(device.routing_protocols, {'ospf': {'enabled': False}})
+
+		uplink = Interface.objects.get(device=device, name='Gi0/0')
+		self.assertEqual(uplink.ip_address, '10.0.0.1')
+		self.assertIsNone(Interface.objects.get(device=device, name='Gi0/1').ip_address)
+		self.assertEqual(VRF.objects.get(device=device).route_distinguisher, '65000:1')
+		self.assertEqual(ACL.objects.get(device=device).rules, ['permit tcp any any eq 443'])
+		self.assertEqual(len(RouteTable.objects.get(device=device, vrf=None).routes['static_routes']), 1)
+		self.assertEqual(InventoryItem.objects.filter(device=device).count(), 5)
+		self.assertTrue(InventoryItem.objects.filter(
+			device=device, item_type=InventoryItemType.ROUTE, name='0.0.0.0/0.0.0.0 via 10.0.0.254'
+		).exists())
+
+	def test_reimport_writes_only_changed_rows(self):
+		"""Test that a re-import writes changed rows only and retires ones no longer configured."""
+		device, _ = import_parsed_data(self.device_file, self.parsed_data)
+		uplink = Interface.objects.get(device=device, name='Gi0/0')
+		unchanged = Interface.objects.get(device=device, name='Gi0/1')
+		first_seen = InventoryItem.objects.get(device=device, name='Gi0/1').last_seen
+
+		self.parsed_data['interfaces'][0] = dict(self.parsed_data['interfaces'][0], description='New uplink')
+		self.parsed_data['acls'] = []
+		device, changes = import_parsed_data(self.device_file, self.parsed_data)
+
+		self.assertEqual(changes['Interface'], {'inserted': 0, 'updated': 1, 'unchanged': 1, 'removed': 0})
+		self.assertEqual(changes['ACL']['removed'], 1)
+		self.assertEqual(Device.objects.count(), 1)
+		self.assertEqual(Interface.objects.get(pk=uplink.pk).description, 'New uplink')
+		self.assertEqual(Interface.objects.get(pk=unchanged.pk).updated_at, unchanged.updated_at)
+		self.assertFalse(ACL.objects.filter(device=device).exists())
+		self.assertFalse(InventoryItem.objects.get(device=device, item_type=InventoryItemType.ACL).is_active)
+		self.assertGreater(InventoryItem.objects.get(device=device, name='Gi0/1').last_seen, first_seen)
+		self.assertEqual(RouteTable.objects.filter(device=device).count(), 1)
+
+	def test_removed_item_is_reactivated(self):
+		"""Test that an inventory item that reappears is reactivated."""
+		import_parsed_data(self.device_file, dict(self.parsed_data, acls=[]))
+		import_parsed_data(self.device_file, self.parsed_data)
+		import_parsed_data(self.device_file, dict(self.parsed_data, acls=[]))
+		device, changes = import_parsed_data(self.device_file, self.parsed_data)
+
+		self.assertEqual(changes['InventoryItem']['updated'], 1)
+		self.assertTrue(InventoryItem.objects.get(device=device, item_type=InventoryItemType.ACL).is_active)
+
+	def test_items_with_the_same_name_in_different_scopes(self):
+		"""Test that policies named alike in different VDOMs or zone pairs are all kept."""
+		self.parsed_data['policies'] = [
+			{'id': '1', 'vdom': 'root', 'action': 'accept'},
+			{'id': '1', 'vdom': 'customer-a', 'action': 'deny'},
+		]
+		self.parsed_data['security_policies'] = [
+			{'name': 'allow-web', 'from_zone': 'trust', 'to_zone': 'untrust'},
+			{'name': 'allow-web', 'from_zone': 'dmz', 'to_zone': 'untrust'},
+		]
+		device, _ = import_parsed_data(self.device_file, self.parsed_data)
+
+		names = set(InventoryItem.objects.filter(device=device, item_type=InventoryItemType.OTHER).values_list('name', flat=True))
+		self.assertEqual(names, {
+			'policies:root:1',
+			'policies:customer-a:1',
+			'security_policies:trust>untrust:allow-web',
+			'security_policies:dmz>untrust:allow-web',
+		})
+
+	def test_large_device(self):
+		"""Test that a device with 20,000 interfaces loads in bulk."""
+		self.parsed_data['interfaces'] = [
+			{'name': f'Ethernet{number // 48}/{number % 48}', 'description': f'port {number}', 'enabled': True}
+			for number in range(20000)
+		]
+		started = time.monotonic()
+		device, _ = import_parsed_data(self.device_file, self.parsed_data)
+		self.assertLess(time.monotonic() - started, 30)
+
+		# A re-import with one changed interface writes only that row
+		self.parsed_data['interfaces'][0]['description'] = 'changed'
+		_, changes = import_parsed_data(self.device_file, self.parsed_data)
+		self.assertEqual(changes['Interface'], {'inserted': 0, 'updated': 1, 'unchanged': 19999, 'removed': 0})
+		self.assertEqual(Interface.objects.filter(device=device).count(), 20000)
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import DeviceType, DeviceFile
+from django.template.response import TemplateResponse
+from django.urls import path
+from .models import ConfigBlob, DeviceType, DeviceFile, ParseJob, ParseResultCache
+from .profiling import aggregate_profiles, is_profiling_enabled
 
 @admin.register(DeviceType)
 class DeviceTypeAdmin(admin.ModelAdmin):
@@ -23,15 +26,57 @@ class DeviceFileAdmin(admin.ModelAdmin):
 	list_display = ('name', 'project', 'device_type', 'parsed', 'created_at')
 	list_filter = ('parsed', 'device_type', 'project', 'created_at')
 	search_fields = ('name', 'project__name', 'device_type__name')
-	readonly_fields = ('parsed', 'parse_errors', 'created_at', 'updated_at')
+	readonly_fields = ('parsed', 'parse_errors', 'content_hash', 'parse_profile', 'original_filename', 'blob', 'created_at', 'updated_at')
+	change_list_template = 'admin/parsers/devicefile/change_list.html'
 	fieldsets = (
 		(None, {
-			'fields': ('name', 'project', 'device_type', 'file')
+			'fields': ('name', 'project', 'device_type', 'file', 'original_filename', 'blob')
 		}),
 		('Parsing Status', {
-			'fields': ('parsed', 'parse_errors')
+			'fields': ('parsed', 'parse_errors', 'content_hash', 'parse_profile')
 		}),
 		('Additional Information', {
 			'fields': ('notes', 'created_at', 'updated_at')
 		}),
 	)
+	
+	def get_urls(self):
+		return [
+			path('profiling/', self.admin_site.admin_view(self.profiling_view), name='parsers_devicefile_profiling'),
+		] + super().get_urls()
+	
+	def profiling_view(self, request):
+		"""Show the stored parse profiles aggregated per device type, slowest extractors first."""
+		profiles = DeviceFile.objects.filter(parse_profile__isnull=False).values_list('device_type__name', 'parse_profile')
+		context = dict(
+			self.admin_site.each_context(request),
+			opts=self.model._meta,
+			title='Parse profiles by device type',
+			device_types=aggregate_profiles(profiles.iterator()),
+			profiling_enabled=is_profiling_enabled(),
+		)
+		return TemplateResponse(request, 'admin/parsers/devicefile/profiling.html', context)
+
+@admin.register(ParseResultCache)
+class ParseResultCacheAdmin(admin.ModelAdmin):
+	"""Admin interface for ParseResultCache model"""
+	list_display = ('content_hash', 'parser', 'parser_version', 'size', 'hits', 'last_used_at')
+	list_filter = ('parser', 'parser_version')
+	search_fields = ('content_hash',)
+	readonly_fields = ('content_hash', 'parser', 'parser_version', 'result', 'size', 'hits', 'created_at', 'last_used_at')
+
+@admin.register(ParseJob)
+class ParseJobAdmin(admin.ModelAdmin):
+	"""Admin interface for ParseJob model"""
+	list_display = ('device_file', 'status', 'attempts', 'worker', 'duration', 'created_at')
+	list_filter = ('status', 'created_at')
+	search_fields = ('device_file__name', 'worker', 'last_error')
+	readonly_fields = ('attempts', 'worker', 'started_at', 'finished_at', 'duration', 'last_error', 'created_at', 'updated_at')
+
+@admin.register(ConfigBlob)
+class ConfigBlobAdmin(admin.ModelAdmin):
+	"""Admin interface for ConfigBlob model"""
+	list_display = ('content_hash', 'compression', 'size', 'stored_size', 'ref_count', 'created_at')
+	list_filter = ('compression',)
+	search_fields = ('content_hash',)
+	readonly_fields = ('content_hash', 'path', 'compression', 'size', 'stored_size', 'ref_count', 'created_at')
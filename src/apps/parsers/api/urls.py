@@ -1,7 +1,13 @@
-from django.urls import path
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from apps.parsers.views import DeviceFileViewSet, ParseJobViewSet
 
 app_name = 'api_parsers'
 
+router = DefaultRouter()
+router.register(r'jobs', ParseJobViewSet)
+router.register(r'device-files', DeviceFileViewSet)
+
 urlpatterns = [
-	# Will add endpoints as needed
+	path('', include(router.urls)),
 ]
@@ -0,0 +1,203 @@
+"""
+Import of zip and tar.gz archives of device configuration files.
+
+Archives are read member by member straight from the uploaded file: zip
+members are decompressed one at a time through ``ZipFile.open`` and tar.gz
+archives are read as a forward-only stream, so nothing is unpacked to disk
+and at most one member is held in memory. Members are turned into
+``DeviceFile`` rows with ``bulk_create`` in batches, and a parse job is
+queued for every new row in the same transaction, so parse workers start on
+the first batch while the rest of the archive is still being read.
+"""
+
+import os
+import tarfile
+import zipfile
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from django.conf import settings
+from django.db import transaction
+from django.template.defaultfilters import filesizeformat
+
+from .bulk import get_device_type
+from .models import DeviceFile, DeviceType, ParseJob
+from .parsers.factory import ParserFactory
+
+# File name endings of the supported archive formats
+ARCHIVE_EXTENSIONS = ('.zip', '.tar.gz', '.tgz')
+
+# Directories added by archivers that never contain configurations
+IGNORED_DIRECTORIES = ('__MACOSX',)
+
+
+class ArchiveError(ValueError):
+	"""Raised when an uploaded archive cannot be read."""
+
+
+def open_archive(fileobj, name: str) -> Union[zipfile.ZipFile, tarfile.TarFile]:
+	"""
+	Open an archive for reading.
+
+	Args:
+		fileobj: The archive file object; zip archives must be seekable.
+		name (str): The archive's file name, used to pick the format.
+
+	Returns:
+		Union[zipfile.ZipFile, tarfile.TarFile]: The open archive. tar.gz
+		archives are opened in streaming mode.
+
+	Raises:
+		ArchiveError: If the format is not supported or the archive is corrupt.
+	"""
+	lowered = name.lower()
+	try:
+		if lowered.endswith('.zip'):
+			return zipfile.ZipFile(fileobj)
+		if lowered.endswith(('.tar.gz', '.tgz')):
+			return tarfile.open(fileobj=fileobj, mode='r|gz')
+	except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as e:
+		raise ArchiveError(f"Cannot read the archive: {str(e)}")
+	raise ArchiveError(f"Unsupported archive format: {name}")
+
+
+def iter_archive_members(
+	archive: Union[zipfile.ZipFile, tarfile.TarFile],
+	extensions: Sequence[str],
+	max_member_size: int,
+	max_members: Optional[int] = None
+) -> Iterator[Tuple[str, Optional[bytes], str]]:
+	"""
+	Read the configuration files of an archive one at a time.
+
+	Args:
+		archive (Union[zipfile.ZipFile, tarfile.TarFile]): An archive returned by ``open_archive``.
+		extensions (Sequence[str]): Accepted file extensions without the dot.
+		max_member_size (int): Members larger than this many bytes are skipped.
+		max_members (Optional[int]): Stop after this many accepted members.
+
+	Yields:
+		Tuple[str, Optional[bytes], str]: ``(member name, content, reason)``; the
+		content is None and the reason says why when a member is skipped.
+		Directories, hidden files and links are passed over silently.
+	"""
+	if isinstance(archive, zipfile.ZipFile):
+		entries = ((info.filename, info) for info in archive.infolist() if not info.is_dir())
+	else:
+		entries = ((member.name, member) for member in archive if member.isfile())
+
+	accepted = 0
+	try:
+		for name, entry in entries:
+			parts = [part for part in name.split('/') if part not in ('', '.')]
+			name = '/'.join(parts)
+			if any(part.startswith('.') or part in IGNORED_DIRECTORIES for part in parts):
+				continue
+
+			if os.path.splitext(parts[-1])[1][1:].lower() not in extensions:
+				yield name, None, "unsupported file type"
+				continue
+
+			if max_members is not None and accepted >= max_members:
+				yield name, None, f"archive holds more than {max_members} configuration files"
+				return
+
+			# Read one byte past the limit rather than trusting the sizes in the headers
+			if isinstance(archive, zipfile.ZipFile):
+				with archive.open(entry) as member_file:
+					content = member_file.read(max_member_size + 1)
+			else:
+				content = archive.extractfile(entry).read(max_member_size + 1)
+			if len(content) > max_member_size:
+				yield name, None, f"larger than {filesizeformat(max_member_size)}"
+				continue
+
+			accepted += 1
+			yield name, content, ""
+	except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError, zlib.error) as e:
+		raise ArchiveError(f"Cannot read the archive: {str(e)}")
+
+
+def member_device_name(member_name: str) -> str:
+	"""Return a device name for an archive member: its path without the extension."""
+	return os.path.splitext(member_name)[0][:255]
+
+
+def import_archive(
+	project,
+	fileobj,
+	archive_name: str,
+	extensions: Sequence[str],
+	max_member_size: int,
+	device_type: Optional[DeviceType] = None,
+	notes: str = "",
+	batch_size: int = 200
+) -> Dict[str, Any]:
+	"""
+	Create device files for the members of an archive and queue them for parsing.
+
+	Args:
+		project (Project): The project to add the device files to.
+		fileobj: The archive file object.
+		archive_name (str): The archive's file name.
+		extensions (Sequence[str]): Accepted member file extensions without the dot.
+		max_member_size (int): Maximum member size in bytes.
+		device_type (Optional[DeviceType]): Device type of every member, or None
+			to detect the device type of each member from its content.
+		notes (str): Notes stored on every device file.
+		batch_size (int): Device files created per transaction.
+
+	Returns:
+		Dict[str, Any]: ``created`` (number of device files created and queued)
+		and ``skipped`` (``(member name, reason)`` pairs).
+
+	Raises:
+		ArchiveError: If the archive cannot be read. Batches created before the
+			error are kept.
+	"""
+	max_members = getattr(settings, 'ARCHIVE_MAX_MEMBERS', None)
+	device_types: Dict[type, DeviceType] = {}
+	created = 0
+	skipped: List[Tuple[str, str]] = []
+	batch: List[DeviceFile] = []
+
+	def flush():
+		with transaction.atomic():
+			for device_file in batch:
+				device_file.acquire_blob()
+			device_files = DeviceFile.objects.bulk_create(batch)
+			ParseJob.enqueue_many(device_files)
+		return len(device_files)
+
+	archive = open_archive(fileobj, archive_name)
+	try:
+		for name, content, reason in iter_archive_members(archive, extensions, max_member_size, max_members):
+			if content is None:
+				skipped.append((name, reason))
+				continue
+
+			member_type = device_type
+			if member_type is None:
+				ranked = ParserFactory.detect(content)
+				if not ranked:
+					skipped.append((name, "device type not detected"))
+					continue
+				parser_class = ranked[0][0]
+				if parser_class not in device_types:
+					device_types[parser_class] = get_device_type(parser_class)[0]
+				member_type = device_types[parser_class]
+
+			device_file = DeviceFile(project=project, device_type=member_type, name=member_device_name(name), notes=notes)
+			device_file.set_content(os.path.basename(name), content)
+			batch.append(device_file)
+
+			if len(batch) >= batch_size:
+				created += flush()
+				batch = []
+
+		if batch:
+			created += flush()
+	finally:
+		archive.close()
+
+	return {'created': created, 'skipped': skipped}
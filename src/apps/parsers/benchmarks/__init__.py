@@ -0,0 +1,8 @@
+"""
+Parser benchmarks.
+
+``generators`` builds synthetic configurations for every supported vendor at
+a configurable scale and ``runner`` times the parsers against them, records
+peak memory and compares the results to a stored baseline. Run them with the
+``benchmark_parsers`` management command.
+"""
@@ -0,0 +1,400 @@
+"""
+Synthetic configuration generators for the parser benchmarks.
+
+Every generator takes the same scale keywords and returns a configuration in
+the vendor's native format, shaped like a real device export: headers and
+global settings, then the interface, object, ACL and routing sections in the
+order the device writes them. Output is deterministic, so two runs of the
+benchmark parse byte-identical input.
+
+Scale keywords (a vendor ignores the ones it has no equivalent for):
+	interfaces: Physical and logical interfaces.
+	acl_lines: ACL, firewall filter or address object entries.
+	vrfs: VRFs, routing instances or IPsec tunnels.
+	policies: Firewall policies, NAT rules or network objects.
+	vlans: VLANs.
+"""
+
+from typing import Callable, Dict, List
+
+# Named scales for the benchmark command
+SCALES: Dict[str, Dict[str, int]] = {
+	'small': {'interfaces': 48, 'acl_lines': 200, 'vrfs': 10, 'policies': 100, 'vlans': 50},
+	'medium': {'interfaces': 500, 'acl_lines': 2000, 'vrfs': 100, 'policies': 1000, 'vlans': 500},
+	'large': {'interfaces': 5000, 'acl_lines': 20000, 'vrfs': 1000, 'policies': 10000, 'vlans': 4000},
+}
+
+# Entries per ACL, filter or address group
+ENTRIES_PER_LIST = 50
+
+SERVICES = (('tcp', 22), ('tcp', 443), ('tcp', 8443), ('udp', 53), ('udp', 123), ('tcp', 3389))
+
+
+def _octets(number: int) -> str:
+	"""Return the middle two octets of a unique /24 for a number."""
+	return f"{number // 256 % 256}.{number % 256}"
+
+
+def cisco_ios(interfaces: int = 48, acl_lines: int = 200, vrfs: int = 10, policies: int = 0, vlans: int = 0) -> str:
+	"""Generate a Cisco IOS PE router configuration."""
+	lines: List[str] = [
+		"Building configuration...",
+		"",
+		"Current configuration : 0 bytes",
+		"!",
+		"version 15.2",
+		"service timestamps debug datetime msec",
+		"service timestamps log datetime msec",
+		"service password-encryption",
+		"!",
+		"hostname BENCH-IOS-1",
+		"!",
+		"boot system flash bootflash:c7600-advipservicesk9-mz.152-4.S7.bin",
+		"!",
+	]
+	for vrf in range(vrfs):
+		lines += [
+			f"ip vrf CUST_{vrf}",
+			f" rd 65000:{vrf}",
+			f" route-target export 65000:{vrf}",
+			f" route-target import 65000:{vrf}",
+			"!",
+		]
+	for number in range(interfaces):
+		lines.append(f"interface GigabitEthernet{number // 48}/{number % 48}")
+		lines.append(f" description Link to access switch {number}")
+		if vrfs and number % 4:
+			lines.append(f" ip vrf forwarding CUST_{number % vrfs}")
+		lines.append(f" ip address 10.{_octets(number)}.1 255.255.255.0")
+		lines.append(" ip ospf cost 10")
+		lines.append(" shutdown" if number % 7 == 6 else " no shutdown")
+		lines.append("!")
+	for number in range(acl_lines):
+		if number % ENTRIES_PER_LIST == 0:
+			if number:
+				lines.append("!")
+			lines.append(f"ip access-list extended ACL_{number // ENTRIES_PER_LIST}")
+		protocol, port = SERVICES[number % len(SERVICES)]
+		action = 'deny' if number % 10 == 9 else 'permit'
+		lines.append(f" {action} {protocol} 10.{_octets(number)}.0 0.0.0.255 any eq {port}")
+	lines += [
+		"!",
+		"router ospf 1",
+		" router-id 192.0.2.1",
+		" log-adjacency-changes",
+	]
+	lines += [f" network 10.{_octets(number)}.0 0.0.0.255 area 0" for number in range(0, interfaces, 4)]
+	lines += [
+		"!",
+		"router bgp 65000",
+		" bgp router-id 192.0.2.1",
+		" bgp log-neighbor-changes",
+	]
+	lines += [f" neighbor 192.0.2.{number % 250 + 2} remote-as {65001 + number}" for number in range(max(1, vrfs // 4))]
+	lines.append("!")
+	lines += [f"ip route 172.{16 + number // 256 % 16}.{number % 256}.0 255.255.255.0 192.0.2.254" for number in range(interfaces // 4)]
+	lines += ["!", "line vty 0 4", " transport input ssh", "!", "end"]
+	return "\n".join(lines) + "\n"
+
+
+def cisco_asa(interfaces: int = 8, acl_lines: int = 200, vrfs: int = 0, policies: int = 100, vlans: int = 0) -> str:
+	"""Generate a Cisco ASA firewall configuration."""
+	lines: List[str] = [
+		": Saved",
+		":",
+		"ASA Version 9.8(4)",
+		"!",
+		"hostname BENCH-ASA-1",
+		"domain-name example.net",
+		"!",
+	]
+	for number in range(interfaces):
+		lines += [
+			f"interface GigabitEthernet0/{number}",
+			f" nameif {'outside' if number == 0 else f'inside_{number}'}",
+			f" security-level {0 if number == 0 else 100 - number % 50}",
+			f" ip address 10.{_octets(number)}.1 255.255.255.0",
+			"!",
+		]
+	for number in range(policies):
+		lines.append(f"object network OBJ_{number}")
+		if number % 3:
+			lines.append(f" subnet 172.{16 + number // 256 % 16}.{number % 256}.0 255.255.255.0")
+		else:
+			lines.append(f" host 192.168.{_octets(number)}")
+		lines.append(f" description Server group {number}")
+		lines.append("!")
+	for number in range(acl_lines):
+		protocol, port = SERVICES[number % len(SERVICES)]
+		target = f"object OBJ_{number % policies}" if policies else "any"
+		lines.append(f"access-list OUTSIDE_IN extended permit {protocol} any {target} eq {port}")
+	lines.append("access-group OUTSIDE_IN in interface outside")
+	for number in range(max(1, policies // 2)):
+		lines.append(f"nat (inside_{number % max(1, interfaces - 1) + 1},outside) source static OBJ_{number} OBJ_{number}")
+	lines += [
+		"class-map inspection_default",
+		" match default-inspection-traffic",
+		"policy-map global_policy",
+		" class inspection_default",
+		"  inspect dns",
+		": end",
+	]
+	return "\n".join(lines) + "\n"
+
+
+def cisco_nexus(interfaces: int = 48, acl_lines: int = 200, vrfs: int = 10, policies: int = 0, vlans: int = 50) -> str:
+	"""Generate a Cisco Nexus data center switch configuration."""
+	lines: List[str] = [
+		"!Command: show running-config",
+		"!Running configuration last done at: Mon Jan  1 00:00:00 2024",
+		"!",
+		"version 9.3(8) Bios:version 05.45",
+		"hostname BENCH-NX-1",
+		"vdc BENCH-NX-1 id 1",
+		"  limit-resource vlan minimum 16 maximum 4094",
+		"",
+		"feature bgp",
+		"feature interface-vlan",
+		"feature lacp",
+		"feature vpc",
+		"",
+	]
+	for number in range(acl_lines):
+		if number % ENTRIES_PER_LIST == 0:
+			lines.append(f"ip access-list ACL_{number // ENTRIES_PER_LIST}")
+		protocol, port = SERVICES[number % len(SERVICES)]
+		lines.append(f"  {(number % ENTRIES_PER_LIST + 1) * 10} permit {protocol} 10.{_octets(number)}.0/24 any eq {port}")
+	for number in range(vlans):
+		lines += [f"vlan {number + 2}", f"  name VLAN_{number + 2}"]
+		if number % 20 == 19:
+			lines.append("  state suspend")
+	lines.append("!")
+	for vrf in range(vrfs):
+		lines += [f"vrf context CUST_{vrf}", f"  rd 65000:{vrf}", "  address-family ipv4 unicast"]
+	lines += [
+		"vpc domain 10",
+		"  peer-switch",
+		"  role priority 100",
+		"  peer-keepalive destination 192.0.2.2 source 192.0.2.1",
+		"  peer-gateway",
+		"!",
+	]
+	port_channels = max(1, interfaces // 8)
+	for number in range(port_channels):
+		lines += [
+			f"interface port-channel{number + 1}",
+			"  switchport mode trunk",
+			f"  vpc {number + 1}",
+		]
+	for number in range(interfaces):
+		lines += [
+			f"interface Ethernet{number // 48 + 1}/{number % 48 + 1}",
+			f"  description Server {number}",
+			"  switchport mode trunk",
+			f"  channel-group {number % port_channels + 1} mode active",
+			"  no shutdown",
+		]
+	lines.append("!")
+	return "\n".join(lines) + "\n"
+
+
+def _fortios_entries(section: str, entries: List[List[str]], names: List[str]) -> List[str]:
+	"""Render a FortiOS ``config`` table with ``edit``/``next`` entries."""
+	lines = [f"config {section}"]
+	for name, settings in zip(names, entries):
+		lines.append(f"    edit {name}")
+		lines += [f"        set {setting}" for setting in settings]
+		lines.append("    next")
+	lines.append("end")
+	return lines
+
+
+def fortigate(interfaces: int = 16, acl_lines: int = 200, vrfs: int = 10, policies: int = 100, vlans: int = 0) -> str:
+	"""Generate a FortiGate firewall configuration; ACL lines become address objects and VRFs IPsec tunnels."""
+	lines: List[str] = [
+		"#config-version=FGT60F-7.2.5-FW-build1517-230606:opmode=0:vdom=0:user=admin",
+		"#conf_file_ver=1",
+		"#buildno=1517",
+		"#global_vdom=1",
+		"config system global",
+		"    set alias \"FortiGate-60F\"",
+		"    set hostname \"BENCH-FGT-1\"",
+		"    set timezone 04",
+		"end",
+	]
+	lines += _fortios_entries('system interface', [
+		[
+			"vdom \"root\"",
+			f"ip 10.{_octets(number)}.1 255.255.255.0",
+			"allowaccess ping https ssh",
+			"type physical",
+			f"description \"Segment {number}\"",
+		] + (["status down"] if number % 7 == 6 else [])
+		for number in range(interfaces)
+	], [f"\"port{number + 1}\"" for number in range(interfaces)])
+	lines += _fortios_entries('firewall address', [
+		[f"subnet 172.{16 + number // 256 % 16}.{number % 256}.0 255.255.255.0", f"comment \"Network {number}\""]
+		for number in range(acl_lines)
+	], [f"\"NET_{number}\"" for number in range(acl_lines)])
+	services = max(1, policies // 10)
+	lines += _fortios_entries('firewall service custom', [
+		["protocol TCP/UDP/SCTP", f"tcp-portrange {8000 + number}-{8010 + number}"]
+		for number in range(services)
+	], [f"\"SVC_{number}\"" for number in range(services)])
+	ports = max(1, interfaces)
+	addresses = max(1, acl_lines)
+	lines += _fortios_entries('firewall policy', [
+		[
+			f"name \"policy-{number + 1}\"",
+			f"srcintf \"port{number % ports + 1}\"",
+			f"dstintf \"port{(number + 1) % ports + 1}\"",
+			f"srcaddr \"NET_{number % addresses}\"",
+			f"dstaddr \"NET_{(number * 7) % addresses}\" \"NET_{(number * 13) % addresses}\"",
+			"action accept",
+			"schedule \"always\"",
+			f"service \"HTTPS\" \"SVC_{number % services}\"",
+		] + (["nat enable"] if number % 2 else [])
+		for number in range(policies)
+	], [str(number + 1) for number in range(policies)])
+	lines += _fortios_entries('vpn ipsec phase1-interface', [
+		[
+			"interface \"port1\"",
+			"peertype any",
+			"proposal aes256-sha256",
+			"dhgrp 14",
+			f"remote-gw 203.0.113.{number % 250 + 1}",
+			"psksecret ENC xxxxxxxx",
+		]
+		for number in range(vrfs)
+	], [f"\"TUNNEL_{number}\"" for number in range(vrfs)])
+	lines += _fortios_entries('vpn ipsec phase2-interface', [
+		[
+			f"phase1name \"TUNNEL_{number}\"",
+			"proposal aes256-sha256",
+			f"src-subnet 10.{_octets(number)}.0 255.255.255.0",
+			f"dst-subnet 192.168.{number % 256}.0 255.255.255.0",
+		]
+		for number in range(vrfs)
+	], [f"\"TUNNEL_{number}_P2\"" for number in range(vrfs)])
+	return "\n".join(lines) + "\n"
+
+
+def fortiswitch(interfaces: int = 48, acl_lines: int = 0, vrfs: int = 0, policies: int = 0, vlans: int = 50) -> str:
+	"""Generate a FortiSwitch configuration."""
+	lines: List[str] = [
+		"#config-version=FS1D48-7.2.4-FW-build0456-230316:user=admin",
+		"#conf_file_ver=1",
+		"#buildno=0456",
+		"config system global",
+		"    set hostname \"BENCH-FSW-1\"",
+		"    set switch-mgmt-mode local",
+		"end",
+	]
+	lines += _fortios_entries('switch vlan', [
+		[f"description \"VLAN {number + 2}\""]
+		for number in range(vlans)
+	], [str(number + 2) for number in range(vlans)])
+	lines += _fortios_entries('switch physical-port', [
+		[
+			"speed auto",
+			f"description \"Access port {number + 1}\"",
+		] + (["poe-status enable"] if number % 2 else [])
+		for number in range(interfaces)
+	], [f"\"port{number + 1}\"" for number in range(interfaces)])
+	lines += _fortios_entries('switch interface', [
+		[f"native-vlan {number % max(1, vlans) + 2}", "snmp-index 1"]
+		for number in range(interfaces)
+	], [f"\"port{number + 1}\"" for number in range(interfaces)])
+	return "\n".join(lines) + "\n"
+
+
+def juniper_junos(interfaces: int = 48, acl_lines: int = 200, vrfs: int = 10, policies: int = 100, vlans: int = 0) -> str:
+	"""Generate a Juniper JunOS (SRX) configuration in brace format."""
+	lines: List[str] = [
+		"## Last commit: 2024-01-01 00:00:00 UTC by admin",
+		"version 21.4R3.15;",
+		"system {",
+		"    host-name BENCH-SRX-1;",
+		"    services {",
+		"        ssh;",
+		"    }",
+		"}",
+		"interfaces {",
+	]
+	for number in range(interfaces):
+		lines += [
+			f"    ge-0/{number // 48}/{number % 48} {{",
+			f"        description \"Uplink {number}\";",
+		]
+		if number % 7 == 6:
+			lines.append("        disable;")
+		lines += [
+			"        unit 0 {",
+			"            family inet {",
+			f"                address 10.{_octets(number)}.1/24;",
+			"            }",
+			"        }",
+			"    }",
+		]
+	lines += ["}", "routing-options {", "    autonomous-system 65000;", "    static {"]
+	lines += [f"        route 172.{16 + number // 256 % 16}.{number % 256}.0/24 next-hop 10.0.0.254;" for number in range(interfaces // 4)]
+	lines += ["    }", "}", "protocols {", "    bgp {", "        group IBGP {", "            peer-as 65000;"]
+	lines += [f"            neighbor 192.0.2.{number % 250 + 2};" for number in range(max(1, vrfs // 4))]
+	lines += ["        }", "    }", "    ospf {", "        area 0.0.0.0 {"]
+	lines += [f"            interface ge-0/{number // 48}/{number % 48}.0;" for number in range(0, interfaces, 4)]
+	lines += ["        }", "    }", "}", "firewall {", "    family inet {"]
+	for number in range(acl_lines):
+		if number % ENTRIES_PER_LIST == 0:
+			if number:
+				lines.append("        }")
+			lines.append(f"        filter FILTER_{number // ENTRIES_PER_LIST} {{")
+		protocol, port = SERVICES[number % len(SERVICES)]
+		lines += [
+			f"            term t{number} {{",
+			"                from {",
+			f"                    source-address 10.{_octets(number)}.0/24;",
+			f"                    protocol {protocol};",
+			f"                    destination-port {port};",
+			"                }",
+			f"                then {'discard' if number % 10 == 9 else 'accept'};",
+			"            }",
+		]
+	if acl_lines:
+		lines.append("        }")
+	lines += ["    }", "}", "routing-instances {"]
+	for vrf in range(vrfs):
+		lines += [
+			f"    CUST_{vrf} {{",
+			"        instance-type vrf;",
+			f"        interface ge-0/0/{vrf % 48}.{vrf + 100};",
+			f"        route-distinguisher 65000:{vrf};",
+			f"        vrf-target target:65000:{vrf};",
+			"    }",
+		]
+	lines += ["}", "security {", "    policies {", "        from-zone trust to-zone untrust {"]
+	for number in range(policies):
+		lines += [
+			f"            policy p{number} {{",
+			"                match {",
+			f"                    source-address NET_{number};",
+			"                    destination-address any;",
+			"                    application junos-https;",
+			"                }",
+			"                then {",
+			f"                    {'deny' if number % 10 == 9 else 'permit'};",
+			"                }",
+			"            }",
+		]
+	lines += ["        }", "    }", "}"]
+	return "\n".join(lines) + "\n"
+
+
+# Generator for each device type slug of ``ParserFactory.DEVICE_TYPE_PARSERS``
+GENERATORS: Dict[str, Callable[..., str]] = {
+	'cisco-ios': cisco_ios,
+	'cisco-asa': cisco_asa,
+	'cisco-nexus': cisco_nexus,
+	'fortigate': fortigate,
+	'fortiswitch': fortiswitch,
+	'juniper-junos': juniper_junos,
+}
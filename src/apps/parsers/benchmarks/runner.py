@@ -0,0 +1,251 @@
+"""
+Benchmark runner for the device configuration parsers.
+
+Each benchmark case (one vendor at one scale) runs in a fresh child process,
+so the peak resident set size the operating system reports for the child
+belongs to that case alone and earlier cases cannot warm caches for later
+ones. In the child the configuration is generated, then ``parse()`` is timed
+on a new parser instance ``repeat`` times, with every section of its lazy
+result read, and the best time is kept, and
+finally every ``extract_*`` method is timed the same way on its own against
+the raw text, so a slow extractor shows up even when ``parse()`` hides it
+behind a shared index.
+
+Results are plain dictionaries so they can be written to and compared with a
+JSON baseline; see ``compare``.
+"""
+
+import inspect
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from apps.parsers.parsers.base import Parser
+from apps.parsers.parsers.factory import ParserFactory
+
+from .generators import GENERATORS
+
+try:
+	import resource
+except ImportError:  # pragma: no cover - not available on Windows
+	resource = None
+
+# Baseline shipped with the benchmarks
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Timings and memory growth below these floors are too noisy to compare
+MIN_COMPARED_SECONDS = 0.001
+MIN_COMPARED_BYTES = 1024 * 1024
+
+
+def peak_rss_bytes() -> Optional[int]:
+	"""
+	Return the peak resident set size of the current process.
+
+	Returns:
+		Optional[int]: The peak RSS in bytes, or None where the ``resource``
+		module is not available.
+	"""
+	if resource is None:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# Linux reports kilobytes, macOS bytes
+	return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def get_extractors(parser: Parser) -> List[str]:
+	"""
+	Return the names of the extractors a parser implements.
+
+	Extractors that take arguments besides the configuration, such as data
+	computed by another extractor, are included only if those arguments are
+	optional.
+
+	Args:
+		parser (Parser): The parser.
+
+	Returns:
+		List[str]: The ``extract_*`` method names in alphabetical order.
+	"""
+	names = []
+	for name in dir(parser):
+		method = getattr(parser, name)
+		if not name.startswith('extract_') or not callable(method):
+			continue
+		required = [
+			parameter for parameter in list(inspect.signature(method).parameters.values())[1:]
+			if parameter.default is inspect.Parameter.empty
+			and parameter.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+		]
+		if not required:
+			names.append(name)
+	return names
+
+
+def time_call(function: Callable[[], Any], repeat: int) -> float:
+	"""Return the best wall clock time in seconds of ``repeat`` calls."""
+	best = float('inf')
+	for _ in range(max(1, repeat)):
+		started = time.perf_counter()
+		function()
+		best = min(best, time.perf_counter() - started)
+	return best
+
+
+def run_case(vendor: str, scale: Dict[str, int], repeat: int = 3) -> Dict[str, Any]:
+	"""
+	Benchmark one vendor's parser at one scale in the current process.
+
+	Args:
+		vendor (str): A device type slug with a generator in ``GENERATORS``.
+		scale (Dict[str, int]): Scale keywords for the generator.
+		repeat (int): Times each measurement is repeated; the best is kept.
+
+	Returns:
+		Dict[str, Any]: The case's measurements: the size of the configuration,
+		the ``parse()`` time and throughput, the peak RSS of the process and the
+		part of it the parse added, and the time of each extractor.
+	"""
+	parser_class = ParserFactory.DEVICE_TYPE_PARSERS[vendor]
+	config_text = GENERATORS[vendor](**scale)
+	size = len(config_text.encode('utf-8'))
+	lines = config_text.count('\n')
+
+	rss_before = peak_rss_bytes()
+	# dict() reads every section, so lazily extracted sections are timed too
+	parse_seconds = time_call(lambda: dict(parser_class().parse(config_text)), repeat)
+	rss_after = peak_rss_bytes()
+
+	extractors = {
+		name: time_call(lambda name=name: getattr(parser_class(), name)(config_text), repeat)
+		for name in get_extractors(parser_class())
+	}
+
+	return {
+		'vendor': vendor,
+		'parser': parser_class.__name__,
+		'scale': dict(scale),
+		'bytes': size,
+		'lines': lines,
+		'parse_seconds': parse_seconds,
+		'megabytes_per_second': size / parse_seconds / 1e6 if parse_seconds else None,
+		'lines_per_second': lines / parse_seconds if parse_seconds else None,
+		'peak_rss_bytes': rss_after,
+		'parse_rss_bytes': rss_after - rss_before if rss_after is not None else None,
+		'extractors': extractors,
+	}
+
+
+def run(cases: List[Tuple[str, str, Dict[str, int]]], repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+	"""
+	Run benchmark cases, each in a fresh child process.
+
+	Args:
+		cases (List[Tuple[str, str, Dict[str, int]]]): ``(vendor, scale name,
+			scale keywords)`` for each case.
+		repeat (int): Times each measurement is repeated; the best is kept.
+
+	Returns:
+		Dict[str, Dict[str, Any]]: The results of ``run_case`` keyed by
+		``"<vendor>/<scale name>"``.
+	"""
+	results = {}
+	for vendor, scale_name, scale in cases:
+		# A new process per case keeps ru_maxrss specific to the case
+		with ProcessPoolExecutor(max_workers=1) as executor:
+			results[f"{vendor}/{scale_name}"] = executor.submit(run_case, vendor, scale, repeat).result()
+	return results
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+	"""
+	Load the results stored in a baseline file.
+
+	Args:
+		path (str): The baseline JSON file.
+
+	Returns:
+		Dict[str, Dict[str, Any]]: The stored results keyed like ``run``'s,
+		empty if the file does not exist.
+	"""
+	if not os.path.exists(path):
+		return {}
+	with open(path, encoding='utf-8') as baseline_file:
+		return json.load(baseline_file).get('results', {})
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]]) -> None:
+	"""
+	Store results as a baseline, replacing the cases they cover.
+
+	Cases in an existing baseline that were not run this time are kept.
+
+	Args:
+		path (str): The baseline JSON file.
+		results (Dict[str, Dict[str, Any]]): Results returned by ``run``.
+	"""
+	stored = load_baseline(path)
+	stored.update(results)
+	baseline = {
+		'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+		'python': platform.python_version(),
+		'platform': platform.platform(),
+		'results': dict(sorted(stored.items())),
+	}
+	with open(path, 'w', encoding='utf-8') as baseline_file:
+		json.dump(baseline, baseline_file, indent='\t')
+		baseline_file.write('\n')
+
+
+def compare(
+	results: Dict[str, Dict[str, Any]],
+	baseline: Dict[str, Dict[str, Any]],
+	tolerance: float = 0.25
+) -> List[str]:
+	"""
+	Compare results with a baseline.
+
+	A case regresses when its ``parse()`` time, the time of one of its
+	extractors or the memory its parse added grows by more than the tolerance
+	over the baseline. Measurements that are tiny in both runs are skipped,
+	as are cases the baseline does not have or whose scale differs.
+
+	Args:
+		results (Dict[str, Dict[str, Any]]): Results returned by ``run``.
+		baseline (Dict[str, Dict[str, Any]]): Stored results, see ``load_baseline``.
+		tolerance (float): Allowed growth as a fraction, e.g. 0.25 for 25%.
+
+	Returns:
+		List[str]: A description of each regression; empty if there are none.
+	"""
+	def exceeds(current, previous, floor):
+		if current is None or previous is None or max(current, previous) < floor:
+			return False
+		return current > previous * (1 + tolerance)
+
+	regressions = []
+	for key, result in sorted(results.items()):
+		previous = baseline.get(key)
+		if previous is None or previous.get('scale') != result['scale']:
+			continue
+
+		timings = [('parse()', result['parse_seconds'], previous.get('parse_seconds'))]
+		timings += [
+			(f"{name}()", seconds, previous.get('extractors', {}).get(name))
+			for name, seconds in sorted(result['extractors'].items())
+		]
+		for label, current, before in timings:
+			if exceeds(current, before, MIN_COMPARED_SECONDS):
+				regressions.append(f"{key}: {label} took {current * 1000:.1f} ms, baseline {before * 1000:.1f} ms")
+
+		current, before = result.get('parse_rss_bytes'), previous.get('parse_rss_bytes')
+		if exceeds(current, before, MIN_COMPARED_BYTES):
+			regressions.append(
+				f"{key}: parse() grew peak RSS by {current / 1e6:.1f} MB, baseline {before / 1e6:.1f} MB"
+			)
+	return regressions
@@ -0,0 +1,188 @@
+"""
+Content-addressed storage of uploaded configuration files.
+
+Every distinct file content is stored once, compressed, under a name
+derived from its SHA-256: ``blobs/<h[0:2]>/<h[2:4]>/<h>.<gz|zst>``. The same
+configuration uploaded to several projects, re-uploaded or imported again
+from an archive shares one stored copy; ``ConfigBlob`` rows count the device
+files that refer to each copy so it can be deleted with the last of them.
+
+zstd is used when the optional ``zstandard`` package is installed and
+``DEVICE_FILE_COMPRESSION`` allows it; gzip otherwise. The compression of
+every blob is recorded, so blobs written with either remain readable.
+"""
+
+import gzip
+import hashlib
+import io
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+try:
+	import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+	zstandard = None
+
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_ZSTD = 'zstd'
+
+# File name extension of each compression
+EXTENSIONS = {
+	COMPRESSION_GZIP: 'gz',
+	COMPRESSION_ZSTD: 'zst',
+}
+
+# Directory of the blob store inside the media storage
+BLOB_ROOT = 'blobs'
+
+
+def get_compression() -> str:
+	"""Return the compression for new blobs: the configured one if it is available, else gzip."""
+	compression = getattr(settings, 'DEVICE_FILE_COMPRESSION', COMPRESSION_ZSTD)
+	if compression == COMPRESSION_ZSTD and zstandard is None:
+		return COMPRESSION_GZIP
+	return compression if compression in EXTENSIONS else COMPRESSION_GZIP
+
+
+def compress(content: bytes, compression: str) -> bytes:
+	"""
+	Compress file content.
+
+	Args:
+		content (bytes): The raw content.
+		compression (str): ``'gzip'`` or ``'zstd'``.
+
+	Returns:
+		bytes: The compressed content.
+	"""
+	if compression == COMPRESSION_ZSTD:
+		return zstandard.ZstdCompressor(level=10).compress(content)
+	# A fixed mtime keeps the output, like the blob name, a function of the content
+	return gzip.compress(content, compresslevel=6, mtime=0)
+
+
+def decompress(data: bytes, compression: str) -> bytes:
+	"""
+	Decompress stored blob data.
+
+	Args:
+		data (bytes): The stored data.
+		compression (str): ``'gzip'`` or ``'zstd'``.
+
+	Returns:
+		bytes: The raw content.
+
+	Raises:
+		ValueError: If the data is zstd compressed but ``zstandard`` is not installed.
+	"""
+	if compression == COMPRESSION_ZSTD:
+		if zstandard is None:
+			raise ValueError("The zstandard package is required to read zstd compressed files.")
+		return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+	return gzip.decompress(data)
+
+
+def blob_path(content_hash: str, compression: str) -> str:
+	"""Return the storage name of a blob."""
+	return f"{BLOB_ROOT}/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}.{EXTENSIONS[compression]}"
+
+
+def write_blob(content: bytes) -> Tuple[str, str, str, int]:
+	"""
+	Store file content in the blob store unless it is already there.
+
+	Content that already has a ``ConfigBlob`` is not written again, whatever
+	compression it was stored with, so changing ``DEVICE_FILE_COMPRESSION``
+	or storing from a process without ``zstandard`` never leaves a second
+	copy that no row points to. This does not take a reference to the blob;
+	see ``ConfigBlob.reference``.
+
+	Args:
+		content (bytes): The raw content.
+
+	Returns:
+		Tuple[str, str, str, int]: The SHA-256, storage name, compression and stored size.
+	"""
+	from .models import ConfigBlob
+
+	content_hash = hashlib.sha256(content).hexdigest()
+	existing = ConfigBlob.objects.filter(content_hash=content_hash).values_list(
+		'path', 'compression', 'stored_size'
+	).first()
+	if existing is not None:
+		return (content_hash, *existing)
+
+	compression = get_compression()
+	path = blob_path(content_hash, compression)
+	if default_storage.exists(path):
+		return content_hash, path, compression, default_storage.size(path)
+
+	data = compress(content, compression)
+	saved = default_storage.save(path, ContentFile(data))
+	if saved != path:
+		# Another process stored the same blob in the meantime
+		default_storage.delete(saved)
+	return content_hash, path, compression, len(data)
+
+
+@contextmanager
+def open_text(path: str, compression: Optional[str] = None) -> Iterator[TextIO]:
+	"""
+	Open a stored file as text, decompressing it as it is read.
+
+	Args:
+		path (str): Storage name of the file.
+		compression (Optional[str]): ``'gzip'``, ``'zstd'`` or None for a file
+			stored uncompressed.
+
+	Yields:
+		TextIO: The decoded content; undecodable bytes are replaced. Iterating
+		over it yields the lines one at a time.
+
+	Raises:
+		ValueError: If the file is zstd compressed but ``zstandard`` is not installed.
+	"""
+	with default_storage.open(path, 'rb') as stored_file:
+		if compression == COMPRESSION_ZSTD:
+			if zstandard is None:
+				raise ValueError("The zstandard package is required to read zstd compressed files.")
+			stream = zstandard.ZstdDecompressor().stream_reader(stored_file)
+		elif compression == COMPRESSION_GZIP:
+			stream = gzip.GzipFile(fileobj=stored_file, mode='rb')
+		else:
+			stream = stored_file.file
+		with io.TextIOWrapper(stream, encoding='utf-8', errors='replace') as text:
+			yield text
+
+
+def read_blob(path: str, compression: str) -> bytes:
+	"""Return the raw content of a stored blob."""
+	with default_storage.open(path, 'rb') as blob_file:
+		return decompress(blob_file.read(), compression)
+
+
+def store_file(name: str) -> Dict[str, Any]:
+	"""
+	Copy an uncompressed file from the media storage into the blob store.
+
+	Args:
+		name (str): Storage name of the file.
+
+	Returns:
+		Dict[str, Any]: ``content_hash``, ``path``, ``compression``, ``size`` and
+		``stored_size``, the arguments of ``ConfigBlob.reference``.
+	"""
+	with default_storage.open(name, 'rb') as stored_file:
+		content = stored_file.read()
+	content_hash, path, compression, stored_size = write_blob(content)
+	return {
+		'content_hash': content_hash,
+		'path': path,
+		'compression': compression,
+		'size': len(content),
+		'stored_size': stored_size,
+	}
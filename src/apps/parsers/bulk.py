@@ -0,0 +1,132 @@
+"""
+Bulk parsing of device configuration backups.
+
+Used by the ``bulk_parse`` management command. ``parse_path`` runs in the
+worker processes of a process pool: it memory-maps one file, detects the
+vendor with ``ParserFactory`` on the mapped bytes and parses it within the
+parse budget, so large captures are not read and decoded up front. Only plain
+data crosses the process boundary; all database writes happen in the
+parent, in batches.
+"""
+
+import os
+import statistics
+import time
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from .cache import compute_content_hash
+from .models import DeviceType
+from .parsers.base import Parser
+from .parsers.budget import ParseBudget, ParseBudgetExceeded
+from .parsers.buffers import map_file
+from .parsers.factory import ParserFactory
+
+
+def iter_config_paths(paths: Iterable[str], extensions: Optional[List[str]] = None) -> Iterator[str]:
+	"""
+	Expand files and directories into the configuration files to parse.
+
+	Args:
+		paths (Iterable[str]): Files and directories; directories are walked recursively.
+		extensions (Optional[List[str]]): Only yield files with one of these
+			extensions (e.g. ``['.cfg', '.txt']``), or None for all files.
+
+	Yields:
+		str: Paths of regular files, directories in sorted order. Hidden files
+		and directories are skipped.
+	"""
+	for path in paths:
+		if os.path.isfile(path):
+			yield path
+			continue
+
+		for root, dirs, files in os.walk(path):
+			dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+			for name in sorted(files):
+				if name.startswith('.'):
+					continue
+				if extensions and os.path.splitext(name)[1].lower() not in extensions:
+					continue
+				yield os.path.join(root, name)
+
+
+def get_device_type(parser_class: Type[Parser]) -> Tuple[DeviceType, bool]:
+	"""
+	Return the device type a parser class handles, creating it if needed.
+
+	Args:
+		parser_class (Type[Parser]): The parser class.
+
+	Returns:
+		Tuple[DeviceType, bool]: The device type and whether it was created.
+	"""
+	name = parser_class.__name__
+	if name.endswith('Parser'):
+		name = name[:-len('Parser')]
+	return DeviceType.objects.get_or_create(
+		slug=ParserFactory.get_device_type_slug(parser_class),
+		defaults={'name': name}
+	)
+
+
+def parse_path(path: str, time_limit: Optional[float] = None, memory_limit: Optional[int] = None) -> Dict[str, Any]:
+	"""
+	Detect the vendor of a configuration file and parse it.
+
+	Args:
+		path (str): The configuration file.
+		time_limit (Optional[float]): Parse time limit in seconds, None for no limit.
+		memory_limit (Optional[int]): Parse memory limit in bytes, None for no limit.
+
+	Returns:
+		Dict[str, Any]: ``path``, ``content_hash``, ``parser`` (class name, None
+		if no parser matched), ``result`` (None if the parse failed outright),
+		``error`` (empty on success) and ``duration`` (seconds spent detecting
+		and parsing).
+	"""
+	outcome = {'path': path, 'content_hash': '', 'parser': None, 'result': None, 'error': '', 'duration': 0.0}
+	started = time.perf_counter()
+	try:
+		with map_file(path) as buffer:
+			outcome['content_hash'] = compute_content_hash(buffer)
+			parser = ParserFactory.get_parser(buffer)
+		if parser is None:
+			outcome['error'] = "No parser detected for the configuration"
+			return outcome
+		outcome['parser'] = type(parser).__name__
+
+		try:
+			outcome['result'] = ParseBudget(time_limit, memory_limit).parse_buffer(parser, partial(map_file, path))
+		except ParseBudgetExceeded as e:
+			outcome['result'] = e.partial_results
+			outcome['error'] = f"Parse budget exceeded in {e.extractor}: {str(e)}"
+	except ValueError as e:
+		outcome['error'] = f"Parsing error: {str(e)}"
+	except Exception as e:
+		outcome['error'] = f"Unexpected error: {str(e)}"
+	finally:
+		outcome['duration'] = time.perf_counter() - started
+	return outcome
+
+
+def summarize_latencies(durations: List[float]) -> Dict[str, float]:
+	"""
+	Summarize parse latencies.
+
+	Args:
+		durations (List[float]): Seconds per file.
+
+	Returns:
+		Dict[str, float]: ``count``, ``mean``, ``p50``, ``p95`` and ``max`` in seconds.
+	"""
+	ordered = sorted(durations)
+	if not ordered:
+		return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+	return {
+		'count': len(ordered),
+		'mean': statistics.fmean(ordered),
+		'p50': ordered[(len(ordered) - 1) // 2],
+		'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+		'max': ordered[-1],
+	}
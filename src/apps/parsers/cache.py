@@ -0,0 +1,177 @@
+"""
+Content-hash cache for parser output.
+
+See ``ParseResultCache`` for how entries are keyed. The cache is bounded by
+the ``PARSE_CACHE_MAX_BYTES`` setting; when a new entry pushes the total
+size over the limit, the least recently used entries are deleted until the
+cache is back under 90% of the limit, so eviction does not run on every
+store once the cache is full.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import ParseResultCache
+from .parsers.base import Parser
+from .parsers.buffers import Buffer
+from .parsers.results import to_primitive
+
+# Fraction of the size limit the cache is trimmed down to when it overflows
+EVICTION_LOW_WATERMARK = 0.9
+
+
+def compute_content_hash(content: Buffer) -> str:
+	"""Return the SHA-256 hex digest of the configuration file content."""
+	return hashlib.sha256(content).hexdigest()
+
+
+def get_cache_limit() -> int:
+	"""Return the configured cache size limit in bytes; 0 disables the cache."""
+	return getattr(settings, 'PARSE_CACHE_MAX_BYTES', 0)
+
+
+def get_cached_result(content_hash: str, parser: Parser) -> Optional[Dict[str, Any]]:
+	"""
+	Return the cached output of a parser for the given content.
+
+	Args:
+		content_hash (str): SHA-256 of the configuration file content.
+		parser (Parser): The parser that would parse the content.
+
+	Returns:
+		Optional[Dict[str, Any]]: The cached parser output, or None on a cache miss.
+	"""
+	if not get_cache_limit():
+		return None
+
+	entry = ParseResultCache.objects.filter(
+		content_hash=content_hash,
+		parser=type(parser).__name__,
+		parser_version=parser.PARSER_VERSION
+	).only('pk', 'result').first()
+	if entry is None:
+		return None
+
+	ParseResultCache.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=timezone.now())
+	return entry.result
+
+
+def store_result(content_hash: str, parser: Parser, result: Dict[str, Any]) -> None:
+	"""
+	Store parser output in the cache and evict old entries if it is full.
+
+	Args:
+		content_hash (str): SHA-256 of the configuration file content.
+		parser (Parser): The parser that produced the output.
+		result (Dict[str, Any]): The parser output.
+	"""
+	limit = get_cache_limit()
+	if not limit:
+		return
+
+	result = to_primitive(result)
+	size = len(json.dumps(result, cls=DjangoJSONEncoder).encode('utf-8'))
+	if size > limit:
+		return
+
+	ParseResultCache.objects.update_or_create(
+		content_hash=content_hash,
+		parser=type(parser).__name__,
+		parser_version=parser.PARSER_VERSION,
+		defaults={'result': result, 'size': size, 'last_used_at': timezone.now()}
+	)
+	evict(limit)
+
+
+def store_results(entries: Iterable[Tuple[str, Parser, Dict[str, Any]]]) -> int:
+	"""
+	Store the output of many parses at once, evicting old entries only once.
+
+	Entries that are already cached are left alone.
+
+	Args:
+		entries (Iterable[Tuple[str, Parser, Dict[str, Any]]]): ``(content hash,
+			parser, parser output)`` triples.
+
+	Returns:
+		int: The number of entries written.
+	"""
+	limit = get_cache_limit()
+	if not limit:
+		return 0
+
+	now = timezone.now()
+	rows = {}
+	for content_hash, parser, result in entries:
+		result = to_primitive(result)
+		size = len(json.dumps(result, cls=DjangoJSONEncoder).encode('utf-8'))
+		if size > limit:
+			continue
+		key = (content_hash, type(parser).__name__, parser.PARSER_VERSION)
+		rows[key] = ParseResultCache(
+			content_hash=content_hash,
+			parser=key[1],
+			parser_version=key[2],
+			result=result,
+			size=size,
+			last_used_at=now
+		)
+
+	ParseResultCache.objects.bulk_create(rows.values(), ignore_conflicts=True)
+	evict(limit)
+	return len(rows)
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+	"""
+	Delete the least recently used entries while the cache is over its limit.
+
+	Args:
+		max_bytes (Optional[int]): The size limit; defaults to ``PARSE_CACHE_MAX_BYTES``.
+
+	Returns:
+		int: The number of entries deleted.
+	"""
+	if max_bytes is None:
+		max_bytes = get_cache_limit()
+
+	total = ParseResultCache.objects.aggregate(total=Sum('size'))['total'] or 0
+	if total <= max_bytes:
+		return 0
+
+	excess = total - int(max_bytes * EVICTION_LOW_WATERMARK)
+	evicted = []
+	for pk, size in ParseResultCache.objects.order_by('last_used_at').values_list('pk', 'size').iterator():
+		evicted.append(pk)
+		excess -= size
+		if excess <= 0:
+			break
+
+	deleted, _ = ParseResultCache.objects.filter(pk__in=evicted).delete()
+	return deleted
+
+
+def invalidate(parser_class: Optional[type] = None) -> int:
+	"""
+	Delete cached output, either of one parser class or of all parsers.
+
+	Entries of older parser versions are never served, so this is only
+	needed to reclaim space early.
+
+	Args:
+		parser_class (Optional[type]): The parser class whose entries to delete.
+
+	Returns:
+		int: The number of entries deleted.
+	"""
+	entries = ParseResultCache.objects.all()
+	if parser_class is not None:
+		entries = entries.filter(parser=parser_class.__name__)
+	deleted, _ = entries.delete()
+	return deleted
@@ -0,0 +1,52 @@
+"""
+Structural diffs between versions of a device configuration.
+
+``diff_device_files`` compares two uploads block by block with the blocks
+the device type's parser splits them into; see
+``apps.parsers.parsers.stanza_diff``. Uploads with the same content hash
+are reported as identical without reading either file.
+"""
+
+from typing import Any, Dict
+
+from .models import DeviceFile
+from .parsers.factory import ParserFactory
+from .parsers.stanza_diff import CHANGE_KINDS, diff_blocks, split_column_blocks, summarize
+
+
+def diff_device_files(previous: DeviceFile, current: DeviceFile) -> Dict[str, Any]:
+	"""
+	Compare two versions of a device configuration.
+
+	Args:
+		previous (DeviceFile): The older version.
+		current (DeviceFile): The newer version; its device type selects how
+			both files are split into blocks.
+
+	Returns:
+		Dict[str, Any]: The primary keys of both files, whether they are
+		``identical``, the number of changed blocks of every kind in
+		``summary``, the counts per changed section in ``sections`` and the
+		changes themselves in ``changes`` (see ``BlockChange.to_dict``).
+	"""
+	result = {
+		'previous': previous.pk,
+		'current': current.pk,
+		'identical': True,
+		'summary': dict.fromkeys(CHANGE_KINDS, 0),
+		'sections': [],
+		'changes': [],
+	}
+	if previous.content_hash and previous.content_hash == current.content_hash:
+		return result
+
+	parser = ParserFactory.get_parser_for_device_type(current.device_type.slug)
+	split = parser.split_blocks if parser is not None else split_column_blocks
+	changes = diff_blocks(split(previous.read_text()), split(current.read_text()))
+
+	result['identical'] = not changes
+	for change in changes:
+		result['summary'][change.kind] += 1
+	result['sections'] = summarize(changes)
+	result['changes'] = [change.to_dict() for change in changes]
+	return result
@@ -1,6 +1,13 @@
 from django import forms
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
-from .models import DeviceFile
+from .archives import ARCHIVE_EXTENSIONS, ArchiveError, open_archive
+from .models import DeviceFile, DeviceType
+from apps.projects.models import Project
+
+# Extensions and size limit of uploaded configuration files, also applied to archive members
+CONFIG_FILE_EXTENSIONS = ['txt', 'conf', 'cfg']
+MAX_CONFIG_FILE_SIZE = 10 * 1024 * 1024
 
 class DeviceFileForm(forms.ModelForm):
 	"""Form for creating and updating DeviceFile instances."""
@@ -37,12 +44,50 @@ class DeviceFileForm(forms.ModelForm):
 		file = self.cleaned_data.get('file')
 		if file:
 			# Check file size (max 10MB)
-			if file.size > 10 * 1024 * 1024:
+			if file.size > MAX_CONFIG_FILE_SIZE:
 				raise forms.ValidationError(_('File size cannot exceed 10MB.'))
 			
 			# Check file extension
 			ext = file.name.split('.')[-1].lower()
-			if ext not in ['txt', 'conf', 'cfg']:
+			if ext not in CONFIG_FILE_EXTENSIONS:
 				raise forms.ValidationError(_('Only .txt, .conf, and .cfg files are allowed.'))
 		
-		return file 
\ No newline at end of file
+		return file 
+
+
+class DeviceFileArchiveForm(forms.Form):
+	"""Form for uploading a zip or tar.gz archive of device configuration files."""
+	project = forms.ModelChoiceField(queryset=Project.objects.all(), label=_('Project'))
+	device_type = forms.ModelChoiceField(
+		queryset=DeviceType.objects.all(),
+		required=False,
+		label=_('Device Type'),
+		empty_label=_('Detect from each file'),
+		help_text=_('Leave empty to detect the device type of every file from its content.')
+	)
+	archive = forms.FileField(
+		label=_('Archive'),
+		help_text=_('A .zip, .tar.gz or .tgz archive of .txt, .conf and .cfg configuration files.')
+	)
+	notes = forms.CharField(label=_('Notes'), required=False, widget=forms.Textarea(attrs={'rows': 4}))
+	
+	def clean_archive(self):
+		"""Validate the uploaded archive."""
+		archive = self.cleaned_data.get('archive')
+		if archive:
+			max_size = getattr(settings, 'ARCHIVE_UPLOAD_MAX_BYTES', 0)
+			if max_size and archive.size > max_size:
+				raise forms.ValidationError(
+					_('Archive size cannot exceed %(size)dMB.') % {'size': max_size // (1024 * 1024)}
+				)
+			
+			if not archive.name.lower().endswith(ARCHIVE_EXTENSIONS):
+				raise forms.ValidationError(_('Only .zip, .tar.gz and .tgz archives are allowed.'))
+			
+			try:
+				open_archive(archive, archive.name).close()
+			except ArchiveError as e:
+				raise forms.ValidationError(str(e))
+			archive.seek(0)
+		
+		return archive
@@ -0,0 +1,139 @@
+"""
+Background parse job queue.
+
+Jobs live in the ``ParseJob`` table. Workers (see the ``parse_worker``
+management command) claim the oldest due job with ``SELECT ... FOR UPDATE
+SKIP LOCKED``: a row locked by one worker's claiming transaction is simply
+skipped by the others, so workers never block on each other or run the same
+job twice, and parse throughput grows with the number of worker processes.
+
+A configuration the parser rejects is final and fails the job right away.
+Unexpected errors, such as storage being unavailable, are retried with an
+exponentially growing delay until the job has used its ``max_attempts``.
+"""
+
+import os
+import socket
+import time
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ParseJob
+
+
+def default_worker_id() -> str:
+	"""Return an identifier for the current worker process, ``<host>:<pid>``."""
+	return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+	"""
+	Return how long to wait before retrying a job.
+
+	Args:
+		attempts (int): Number of attempts made so far.
+
+	Returns:
+		timedelta: ``PARSE_JOB_RETRY_DELAY`` seconds, doubled for every further attempt.
+	"""
+	base = getattr(settings, 'PARSE_JOB_RETRY_DELAY', 30)
+	return timedelta(seconds=base * 2 ** max(attempts - 1, 0))
+
+
+def claim_job(worker: str) -> Optional[ParseJob]:
+	"""
+	Claim the oldest pending job that is due.
+
+	Args:
+		worker (str): Identifier of the claiming worker.
+
+	Returns:
+		Optional[ParseJob]: The claimed job, now running, or None if no job is due.
+	"""
+	now = timezone.now()
+	with transaction.atomic():
+		job = (
+			ParseJob.objects
+			.select_for_update(skip_locked=True)
+			.filter(status=ParseJob.STATUS_PENDING, run_after__lte=now)
+			.order_by('run_after', 'pk')
+			.first()
+		)
+		if job is None:
+			return None
+
+		job.status = ParseJob.STATUS_RUNNING
+		job.attempts += 1
+		job.worker = worker
+		job.started_at = now
+		job.finished_at = None
+		job.duration = None
+		job.save(update_fields=['status', 'attempts', 'worker', 'started_at', 'finished_at', 'duration', 'updated_at'])
+	return job
+
+
+def run_job(job: ParseJob) -> ParseJob:
+	"""
+	Parse the job's device file and record the outcome on the job.
+
+	Args:
+		job (ParseJob): A job returned by ``claim_job``.
+
+	Returns:
+		ParseJob: The job, succeeded, failed or rescheduled as pending.
+	"""
+	started = time.monotonic()
+	try:
+		if job.device_file.parse_file(raise_unexpected=True):
+			job.status = ParseJob.STATUS_SUCCEEDED
+			job.last_error = ""
+		else:
+			job.status = ParseJob.STATUS_FAILED
+			job.last_error = job.device_file.parse_errors
+	except Exception as e:
+		job.last_error = f"{type(e).__name__}: {str(e)}"
+		if job.attempts < job.max_attempts:
+			job.status = ParseJob.STATUS_PENDING
+			job.run_after = timezone.now() + get_retry_delay(job.attempts)
+		else:
+			job.status = ParseJob.STATUS_FAILED
+
+	job.finished_at = timezone.now()
+	job.duration = time.monotonic() - started
+	job.save(update_fields=['status', 'last_error', 'run_after', 'finished_at', 'duration', 'updated_at'])
+	return job
+
+
+def requeue_stale_jobs(stale_after: Optional[float] = None) -> int:
+	"""
+	Return jobs left running by a worker that died to the queue.
+
+	Jobs that have no attempts left are marked failed instead.
+
+	Args:
+		stale_after (Optional[float]): Seconds after which a running job is
+			considered abandoned; defaults to ``PARSE_JOB_STALE_AFTER``.
+
+	Returns:
+		int: The number of jobs requeued or failed.
+	"""
+	if stale_after is None:
+		stale_after = getattr(settings, 'PARSE_JOB_STALE_AFTER', 600)
+	now = timezone.now()
+	stale = ParseJob.objects.filter(
+		status=ParseJob.STATUS_RUNNING,
+		started_at__lt=now - timedelta(seconds=stale_after)
+	)
+	error = "Worker stopped before the job finished"
+	requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+		status=ParseJob.STATUS_PENDING, run_after=now, last_error=error, updated_at=now
+	)
+	failed = stale.update(
+		status=ParseJob.STATUS_FAILED, finished_at=now, last_error=error, updated_at=now
+	)
+	return requeued + failed
@@ -0,0 +1,90 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.template.defaultfilters import filesizeformat
+
+from apps.parsers.benchmarks.generators import GENERATORS, SCALES
+from apps.parsers.benchmarks.runner import DEFAULT_BASELINE, compare, load_baseline, run, save_baseline
+
+
+class Command(BaseCommand):
+	"""
+	Benchmark the parsers against synthetic configurations.
+
+	Each vendor's generator builds a configuration at the chosen scale, which
+	is parsed in a fresh process; ``parse()`` and every extractor are timed
+	and the peak RSS recorded. The results are compared with the stored
+	baseline and the command fails if any measurement regressed by more than
+	the tolerance, so it can gate changes to the parsers.
+	"""
+	help = 'Benchmark the configuration parsers and compare the results with a baseline'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--vendor', action='append', dest='vendors', choices=sorted(GENERATORS), help='Benchmark only this device type (repeatable)')
+		parser.add_argument('--scale', action='append', dest='scales', choices=list(SCALES), help='Named scale to run (repeatable, default: small and medium)')
+		parser.add_argument('--interfaces', type=int, help='Override the number of interfaces')
+		parser.add_argument('--acl-lines', type=int, help='Override the number of ACL lines')
+		parser.add_argument('--vrfs', type=int, help='Override the number of VRFs')
+		parser.add_argument('--policies', type=int, help='Override the number of policies')
+		parser.add_argument('--vlans', type=int, help='Override the number of VLANs')
+		parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the best is kept')
+		parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file to compare with')
+		parser.add_argument('--save-baseline', action='store_true', help='Store the results in the baseline instead of comparing')
+		parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown as a fraction (default: 0.25)')
+		parser.add_argument('--json', action='store_true', help='Write the results as JSON')
+
+	def handle(self, *args, **options):
+		overrides = {
+			key: options[key] for key in ('interfaces', 'acl_lines', 'vrfs', 'policies', 'vlans')
+			if options[key] is not None
+		}
+		if any(value < 0 for value in overrides.values()):
+			raise CommandError("Scale overrides must not be negative")
+
+		cases = []
+		for scale_name in options['scales'] or ['small', 'medium']:
+			scale = dict(SCALES[scale_name], **overrides)
+			if overrides:
+				scale_name = f"{scale_name}+custom"
+			cases += [(vendor, scale_name, scale) for vendor in options['vendors'] or sorted(GENERATORS)]
+
+		# Forked benchmark processes must not share the parent's database connections
+		connections.close_all()
+		results = run(cases, repeat=options['repeat'])
+
+		if options['json']:
+			self.stdout.write(json.dumps(results, indent='\t'))
+		else:
+			for key, result in results.items():
+				self.write_result(key, result)
+
+		if options['save_baseline']:
+			save_baseline(options['baseline'], results)
+			self.stdout.write(self.style.SUCCESS(f"Saved {len(results)} result(s) to {options['baseline']}"))
+			return
+
+		baseline = load_baseline(options['baseline'])
+		if not baseline:
+			self.stdout.write(self.style.WARNING(f"No baseline at {options['baseline']}; run with --save-baseline to create one"))
+			return
+
+		regressions = compare(results, baseline, options['tolerance'])
+		if regressions:
+			for regression in regressions:
+				self.stderr.write(regression)
+			raise CommandError(f"{len(regressions)} measurement(s) regressed by more than {options['tolerance']:.0%}")
+		compared = sum(1 for key in results if key in baseline)
+		self.stdout.write(self.style.SUCCESS(f"No regressions in {compared} case(s) compared with the baseline"))
+
+	def write_result(self, key, result):
+		"""Write the measurements of one case."""
+		peak = result['peak_rss_bytes']
+		self.stdout.write(
+			f"{key}: {filesizeformat(result['bytes'])}, {result['lines']} lines, "
+			f"parse() {result['parse_seconds'] * 1000:.1f} ms "
+			f"({result['megabytes_per_second'] or 0:.1f} MB/s, {result['lines_per_second'] or 0:,.0f} lines/s), "
+			f"peak RSS {filesizeformat(peak) if peak is not None else 'n/a'}"
+		)
+		for name, seconds in sorted(result['extractors'].items(), key=lambda item: -item[1]):
+			self.stdout.write(f"    {name}() {seconds * 1000:.1f} ms")
@@ -0,0 +1,163 @@
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections, transaction
+
+from apps.inventory.importer import import_parsed_data
+from apps.parsers.bulk import get_device_type, iter_config_paths, parse_path, summarize_latencies
+from apps.parsers.cache import store_results
+from apps.parsers.models import DeviceFile
+from apps.parsers.parsers.factory import ParserFactory
+from apps.projects.models import Project
+
+
+class Command(BaseCommand):
+	"""
+	Detect, parse and import a large number of device configuration backups.
+
+	Files are parsed across a process pool; the device files, their results
+	and the inventory are written to the project in batched transactions by
+	this process.
+	"""
+	help = 'Parse a directory or list of device configuration files into a project'
+
+	def add_arguments(self, parser):
+		parser.add_argument('project', type=int, help='ID of the project to add the device files to')
+		parser.add_argument('paths', nargs='+', help='Configuration files or directories (walked recursively)')
+		parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Parser processes (default: number of CPUs)')
+		parser.add_argument('--batch-size', type=int, default=200, help='Device files written per transaction')
+		parser.add_argument('--extension', action='append', dest='extensions', help='Only parse files with this extension (repeatable)')
+		parser.add_argument('--time-limit', type=float, default=None, help='Seconds per parse (default: PARSE_TIME_LIMIT, 0 for no limit)')
+
+	def handle(self, *args, **options):
+		try:
+			self.project = Project.objects.get(pk=options['project'])
+		except Project.DoesNotExist:
+			raise CommandError(f"Project {options['project']} does not exist")
+
+		extensions = [
+			extension.lower() if extension.startswith('.') else f".{extension.lower()}"
+			for extension in options['extensions'] or []
+		]
+		paths = list(iter_config_paths(options['paths'], extensions))
+		if not paths:
+			raise CommandError("No configuration files found")
+
+		time_limit = options['time_limit']
+		if time_limit is None:
+			time_limit = getattr(settings, 'PARSE_TIME_LIMIT', None)
+		parse = partial(
+			parse_path,
+			time_limit=time_limit or None,
+			memory_limit=getattr(settings, 'PARSE_MEMORY_LIMIT', None)
+		)
+
+		workers = max(1, min(options['workers'], len(paths)))
+		batch_size = max(1, options['batch_size'])
+		self.device_types = {}
+		self.latencies = defaultdict(list)
+		self.counts = defaultdict(int)
+
+		self.stdout.write(f"Parsing {len(paths)} file(s) with {workers} worker(s)")
+		started = time.perf_counter()
+		batch = []
+		done = 0
+
+		if workers == 1:
+			outcomes = map(parse, paths)
+		else:
+			# Forked workers must not share the parent's database connections
+			connections.close_all()
+			executor = ProcessPoolExecutor(max_workers=workers)
+			outcomes = (future.result() for future in as_completed([executor.submit(parse, path) for path in paths]))
+
+		try:
+			for outcome in outcomes:
+				batch.append(outcome)
+				done += 1
+				if len(batch) >= batch_size:
+					self.write_batch(batch)
+					batch = []
+					elapsed = time.perf_counter() - started
+					self.stdout.write(f"{done}/{len(paths)} files, {done / elapsed:.1f} files/sec")
+			if batch:
+				self.write_batch(batch)
+		finally:
+			if workers > 1:
+				executor.shutdown(cancel_futures=True)
+
+		self.report(len(paths), time.perf_counter() - started)
+
+	def get_device_type(self, parser_name):
+		"""Return the DeviceType for a parser class name, creating it if needed."""
+		if parser_name not in self.device_types:
+			parser_class = next(
+				parser_class for parser_class in ParserFactory._get_parser_classes()
+				if parser_class.__name__ == parser_name
+			)
+			device_type, created = get_device_type(parser_class)
+			if created:
+				self.stdout.write(f"Created device type {device_type.name} ({device_type.slug})")
+			self.device_types[parser_name] = (device_type, parser_class)
+		return self.device_types[parser_name]
+
+	def write_batch(self, batch):
+		"""Create the device files of a batch of parse outcomes and import their results in one transaction."""
+		close_old_connections()
+		device_files = []
+		cache_entries = []
+		imports = []
+		for outcome in batch:
+			if outcome['parser'] is None:
+				self.counts['undetected'] += 1
+				self.stderr.write(f"Skipped {outcome['path']}: {outcome['error']}")
+				continue
+
+			device_type, parser_class = self.get_device_type(outcome['parser'])
+			self.latencies[outcome['parser']].append(outcome['duration'])
+			self.counts['parsed' if not outcome['error'] else 'failed'] += 1
+
+			device_file = DeviceFile(
+				project=self.project,
+				device_type=device_type,
+				name=os.path.splitext(os.path.basename(outcome['path']))[0],
+				parsed=not outcome['error'],
+				parse_errors=outcome['error'],
+			)
+			with open(outcome['path'], 'rb') as config_file:
+				device_file.set_content(os.path.basename(outcome['path']), config_file.read())
+			device_files.append(device_file)
+
+			# Full results are cached so that later parses of the files are served from the cache
+			if not outcome['error']:
+				cache_entries.append((outcome['content_hash'], parser_class(), outcome['result']))
+				imports.append((device_file, outcome['result']))
+
+		with transaction.atomic():
+			for device_file in device_files:
+				device_file.acquire_blob()
+			DeviceFile.objects.bulk_create(device_files)
+			store_results(cache_entries)
+			# Partial results of failed parses are not imported, as in DeviceFile.parse_file
+			for device_file, result in imports:
+				import_parsed_data(device_file, result)
+
+	def report(self, total, elapsed):
+		"""Write throughput and per-vendor latency statistics."""
+		self.stdout.write(self.style.SUCCESS(
+			f"Processed {total} file(s) in {elapsed:.1f}s ({total / elapsed:.1f} files/sec): "
+			f"{self.counts['parsed']} parsed, {self.counts['failed']} with errors, "
+			f"{self.counts['undetected']} undetected"
+		))
+		self.stdout.write(f"{'Parser':<24}{'Files':>8}{'Mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'Max ms':>10}")
+		for parser_name, durations in sorted(self.latencies.items()):
+			stats = summarize_latencies(durations)
+			self.stdout.write(
+				f"{parser_name:<24}{stats['count']:>8}{stats['mean'] * 1000:>10.1f}"
+				f"{stats['p50'] * 1000:>10.1f}{stats['p95'] * 1000:>10.1f}{stats['max'] * 1000:>10.1f}"
+			)
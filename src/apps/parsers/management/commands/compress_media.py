@@ -0,0 +1,124 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections, transaction
+from django.template.defaultfilters import filesizeformat
+
+from apps.parsers.blobs import store_file
+from apps.parsers.models import ConfigBlob, DeviceFile
+
+
+def compress_task(task):
+	"""
+	Copy one device file into the blob store; run in a worker process.
+
+	Args:
+		task (tuple): The device file's pk and storage name.
+
+	Returns:
+		tuple: The task, the stored blob's values (see ``store_file``) and an
+		error message, which is empty on success.
+	"""
+	pk, name = task
+	try:
+		return task, store_file(name), ""
+	except (OSError, ValueError) as e:
+		return task, None, str(e)
+
+
+class Command(BaseCommand):
+	"""
+	Compress device files that were stored before compression was introduced.
+
+	Device files without a blob are copied into the compressed blob store and
+	their original files deleted. Files are compressed across a process pool;
+	database updates are made by this process in batched transactions. The
+	command can be interrupted and run again: device files that already have
+	a blob are skipped. Report files are compressed by ``compress_reports``.
+	"""
+	help = 'Compress uncompressed device files in parallel'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Compression processes (default: number of CPUs)')
+		parser.add_argument('--batch-size', type=int, default=200, help='Device files updated per transaction')
+
+	def handle(self, *args, **options):
+		tasks = list(DeviceFile.objects.filter(blob__isnull=True).exclude(file='').values_list('pk', 'file'))
+		if not tasks:
+			self.stdout.write("No files to compress")
+			return
+
+		workers = max(1, min(options['workers'], len(tasks)))
+		batch_size = max(1, options['batch_size'])
+		self.counts = {'compressed': 0, 'skipped': 0, 'failed': 0}
+		self.original_bytes = 0
+		self.stored_bytes = 0
+
+		self.stdout.write(f"Compressing {len(tasks)} file(s) with {workers} worker(s)")
+		started = time.perf_counter()
+		batch = []
+
+		if workers == 1:
+			outcomes = map(compress_task, tasks)
+		else:
+			# Forked workers must not share the parent's database connections
+			connections.close_all()
+			executor = ProcessPoolExecutor(max_workers=workers)
+			outcomes = (future.result() for future in as_completed([executor.submit(compress_task, task) for task in tasks]))
+
+		try:
+			for task, result, error in outcomes:
+				if error:
+					self.counts['failed'] += 1
+					self.stderr.write(f"Failed to compress {task[1]}: {error}")
+				else:
+					batch.append((task[0], task[1], result))
+					if len(batch) >= batch_size:
+						self.write_batch(batch)
+						batch = []
+			if batch:
+				self.write_batch(batch)
+		finally:
+			if workers > 1:
+				executor.shutdown(cancel_futures=True)
+
+		elapsed = time.perf_counter() - started
+		saved = self.original_bytes - self.stored_bytes
+		self.stdout.write(self.style.SUCCESS(
+			f"Compressed {self.counts['compressed']} file(s) in {elapsed:.1f}s, "
+			f"{self.counts['skipped']} skipped, {self.counts['failed']} failed: "
+			f"{filesizeformat(self.original_bytes)} stored in {filesizeformat(self.stored_bytes)} "
+			f"({filesizeformat(saved)} saved)"
+		))
+
+	def record(self, sizes):
+		"""Count a compressed file; ``sizes`` is None for a device file that was skipped."""
+		if sizes is None:
+			self.counts['skipped'] += 1
+			return
+		self.counts['compressed'] += 1
+		self.original_bytes += sizes[0]
+		self.stored_bytes += sizes[1]
+
+	def write_batch(self, batch):
+		"""Point a batch of device files at their blobs and delete their original files."""
+		close_old_connections()
+		with transaction.atomic():
+			for pk, name, stored in batch:
+				blob = ConfigBlob.reference(**stored)
+				updated = DeviceFile.objects.filter(pk=pk, blob__isnull=True, file=name).update(
+					blob=blob,
+					file=blob.path,
+					content_hash=blob.content_hash,
+					original_filename=os.path.basename(name)[:255]
+				)
+				if not updated:
+					# The device file was deleted or given a new file meanwhile
+					ConfigBlob.release(blob.pk)
+					self.record(None)
+					continue
+
+				self.record((stored['size'], stored['stored_size']))
+				transaction.on_commit(lambda name=name: DeviceFile._meta.get_field('file').storage.delete(name))
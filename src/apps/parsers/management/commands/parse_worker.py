@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.parsers.jobs import claim_job, default_worker_id, requeue_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+	"""
+	Run a parse worker that processes queued parse jobs.
+
+	Start as many workers as needed; they coordinate through the database.
+	Every worker also returns jobs abandoned by a worker that died to the
+	queue, on startup and then every ``--requeue-interval`` seconds.
+	"""
+	help = 'Process queued device file parse jobs'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--once', action='store_true', help='Exit once no job is due instead of polling')
+		parser.add_argument('--sleep', type=float, default=2.0, help='Seconds to wait between polls of an empty queue')
+		parser.add_argument('--max-jobs', type=int, default=0, help='Exit after this many jobs (0 for no limit)')
+		parser.add_argument(
+			'--requeue-interval', type=float, default=60.0,
+			help='Seconds between checks for abandoned jobs to requeue'
+		)
+		parser.add_argument('--worker-id', default='', help='Identifier recorded on claimed jobs (default <host>:<pid>)')
+
+	def handle(self, *args, **options):
+		worker = options['worker_id'] or default_worker_id()
+		processed = 0
+		next_requeue = time.monotonic()
+
+		self.stdout.write(f"Parse worker {worker} started")
+		try:
+			while not options['max_jobs'] or processed < options['max_jobs']:
+				close_old_connections()
+				if time.monotonic() >= next_requeue:
+					requeued = requeue_stale_jobs()
+					if requeued:
+						self.stdout.write(f"Requeued {requeued} abandoned job(s)")
+					next_requeue = time.monotonic() + options['requeue_interval']
+
+				job = claim_job(worker)
+				if job is None:
+					if options['once']:
+						break
+					time.sleep(options['sleep'])
+					continue
+
+				run_job(job)
+				processed += 1
+				message = f"Job {job.pk} ({job.device_file.name}): {job.status} in {job.duration:.2f}s"
+				if job.last_error:
+					message += f" - {job.last_error}"
+				style = self.style.SUCCESS if job.status == job.STATUS_SUCCEEDED else self.style.WARNING
+				self.stdout.write(style(message))
+		except KeyboardInterrupt:
+			pass
+
+		self.stdout.write(f"Parse worker {worker} stopped after {processed} job(s)")
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.11 on 2026-10-17 01:17
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parsers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devicefile',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='Content Hash'),
+        ),
+        migrations.CreateModel(
+            name='ParseResultCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, verbose_name='Content Hash')),
+                ('parser', models.CharField(max_length=100, verbose_name='Parser')),
+                ('parser_version', models.CharField(max_length=20, verbose_name='Parser Version')),
+                ('result', models.JSONField(verbose_name='Parsed Result')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='Size (bytes)')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='Hits')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Last Used At')),
+            ],
+            options={
+                'verbose_name': 'Parse Result Cache Entry',
+                'verbose_name_plural': 'Parse Result Cache',
+                'ordering': ['-last_used_at'],
+                'indexes': [models.Index(fields=['last_used_at'], name='parsers_par_last_us_446722_idx')],
+                'unique_together': {('content_hash', 'parser', 'parser_version')},
+            },
+        ),
+    ]
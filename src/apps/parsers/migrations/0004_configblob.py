@@ -0,0 +1,42 @@
+# Generated by Django 4.2.11 on 2026-10-17 01:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parsers', '0003_parsejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConfigBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True, verbose_name='Content Hash')),
+                ('path', models.CharField(max_length=255, verbose_name='Path')),
+                ('compression', models.CharField(max_length=10, verbose_name='Compression')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='Size (bytes)')),
+                ('stored_size', models.PositiveBigIntegerField(default=0, verbose_name='Stored Size (bytes)')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Reference Count')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+            ],
+            options={
+                'verbose_name': 'Configuration Blob',
+                'verbose_name_plural': 'Configuration Blobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='devicefile',
+            name='original_filename',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Original Filename'),
+        ),
+        migrations.AddField(
+            model_name='devicefile',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='device_files', to='parsers.configblob', verbose_name='Blob'),
+        ),
+    ]
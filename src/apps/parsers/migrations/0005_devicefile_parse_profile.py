@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-17 01:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parsers', '0004_configblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devicefile',
+            name='parse_profile',
+            field=models.JSONField(blank=True, null=True, verbose_name='Parse Profile'),
+        ),
+    ]
@@ -1,8 +1,14 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from apps.projects.models import Project
 import os
+import time
 import uuid
+from functools import partial
 
 def device_file_path(instance, filename):
 	"""
@@ -44,6 +50,89 @@ class DeviceType(models.Model):
 	def __str__(self):
 		return self.name
 
+class ConfigBlob(models.Model):
+	"""
+	A stored configuration file content, shared by all device files with that content.
+	
+	Attributes:
+		content_hash (str): SHA-256 of the raw content; also names the stored file.
+		path (str): Storage name of the compressed content.
+		compression (str): The compression of the stored content, gzip or zstd.
+		size (int): Size of the raw content in bytes.
+		stored_size (int): Size of the compressed content in bytes.
+		ref_count (int): Number of device files referring to the blob.
+		created_at (datetime): When the blob was first stored.
+	"""
+	content_hash = models.CharField(_("Content Hash"), max_length=64, unique=True)
+	path = models.CharField(_("Path"), max_length=255)
+	compression = models.CharField(_("Compression"), max_length=10)
+	size = models.PositiveBigIntegerField(_("Size (bytes)"), default=0)
+	stored_size = models.PositiveBigIntegerField(_("Stored Size (bytes)"), default=0)
+	ref_count = models.PositiveIntegerField(_("Reference Count"), default=0)
+	created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+	
+	class Meta:
+		verbose_name = _("Configuration Blob")
+		verbose_name_plural = _("Configuration Blobs")
+		ordering = ["-created_at"]
+	
+	def __str__(self):
+		return f"{self.content_hash[:12]} ({self.ref_count} refs)"
+	
+	@classmethod
+	def reference(cls, content_hash, path, compression, size, stored_size):
+		"""
+		Take a reference to content that has been written to the blob store.
+		
+		Args:
+			content_hash (str): SHA-256 of the raw content.
+			path (str): Storage name of the blob.
+			compression (str): The compression of the blob.
+			size (int): Size of the raw content in bytes.
+			stored_size (int): Size of the blob in bytes.
+		
+		Returns:
+			ConfigBlob: The blob, with its reference count incremented.
+		"""
+		while True:
+			blob, created = cls.objects.get_or_create(
+				content_hash=content_hash,
+				defaults={
+					'path': path,
+					'compression': compression,
+					'size': size,
+					'stored_size': stored_size,
+					'ref_count': 1,
+				}
+			)
+			if created:
+				return blob
+			# The blob may have been released and deleted since it was looked up
+			if cls.objects.filter(pk=blob.pk).update(ref_count=models.F('ref_count') + 1):
+				blob.ref_count += 1
+				return blob
+	
+	@classmethod
+	def release(cls, blob_id):
+		"""
+		Drop a reference to a blob, deleting it with its stored file when none are left.
+		
+		Args:
+			blob_id (int): The blob's primary key.
+		"""
+		from django.core.files.storage import default_storage
+		
+		cls.objects.filter(pk=blob_id, ref_count__gt=0).update(ref_count=models.F('ref_count') - 1)
+		blob = cls.objects.filter(pk=blob_id, ref_count=0).first()
+		if blob is not None and cls.objects.filter(pk=blob_id, ref_count=0).delete()[0]:
+			# Keep the file if the deletion is rolled back
+			transaction.on_commit(lambda: default_storage.delete(blob.path))
+	
+	def read(self):
+		"""Return the raw content of the blob."""
+		from .blobs import read_blob
+		return read_blob(self.path, self.compression)
+
 class DeviceFile(models.Model):
 	"""
 	Represents an uploaded device configuration file.
@@ -51,10 +140,17 @@ class DeviceFile(models.Model):
 	Attributes:
 		project (Project): The project this device file belongs to.
 		device_type (DeviceType): The type of device this configuration is for.
-		file (FileField): The uploaded configuration file.
+		file (FileField): The uploaded configuration file. Files are kept in the
+			content-addressed blob store, so the field points to compressed data;
+			use ``read_content()`` to read it.
+		blob (ConfigBlob): The stored content of the file.
+		original_filename (str): The name of the file as uploaded.
 		name (str): A friendly name for the device configuration.
 		parsed (bool): Whether the file has been successfully parsed.
 		parse_errors (str): Any errors encountered during parsing.
+		content_hash (str): SHA-256 of the file content, set when the file is parsed.
+		parse_profile (dict): Per-extractor statistics of the last profiled parse,
+			see ``apps.parsers.profiling``.
 		created_at (datetime): The datetime when the file was uploaded.
 		updated_at (datetime): The datetime when the file was last updated.
 	"""
@@ -71,13 +167,28 @@ class DeviceFile(models.Model):
 		verbose_name=_("Device Type")
 	)
 	file = models.FileField(_("Configuration File"), upload_to=device_file_path)
+	blob = models.ForeignKey(
+		ConfigBlob,
+		on_delete=models.PROTECT,
+		null=True,
+		blank=True,
+		related_name="device_files",
+		verbose_name=_("Blob")
+	)
+	original_filename = models.CharField(_("Original Filename"), max_length=255, blank=True)
 	name = models.CharField(_("Device Name"), max_length=255)
 	parsed = models.BooleanField(_("Parsed"), default=False)
 	parse_errors = models.TextField(_("Parse Errors"), blank=True)
+	content_hash = models.CharField(_("Content Hash"), max_length=64, blank=True, db_index=True)
+	parse_profile = models.JSONField(_("Parse Profile"), null=True, blank=True)
 	notes = models.TextField(_("Notes"), blank=True)
 	created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
 	updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
 	
+	# Blob arguments of content stored by set_content() that the file does not
+	# hold a reference to yet (see acquire_blob)
+	_stored_content = None
+	
 	class Meta:
 		verbose_name = _("Device File")
 		verbose_name_plural = _("Device Files")
@@ -88,17 +199,142 @@ class DeviceFile(models.Model):
 	
 	def filename(self):
 		"""Return the filename of the uploaded file"""
-		return os.path.basename(self.file.name)
+		return self.original_filename or os.path.basename(self.file.name)
+	
+	def save(self, *args, **kwargs):
+		"""Move a newly assigned upload into the blob store before saving."""
+		previous_blob_id = None
+		if self.file and not self.file._committed:
+			previous_blob_id = self.blob_id
+			self.file.seek(0)
+			self.set_content(os.path.basename(self.file.name), self.file.read())
+		
+		if self._stored_content is None:
+			super().save(*args, **kwargs)
+			return
+		
+		with transaction.atomic():
+			self.acquire_blob()
+			super().save(*args, **kwargs)
+			if previous_blob_id:
+				# The replaced file's reference; the new content took its own
+				ConfigBlob.release(previous_blob_id)
+	
+	def set_content(self, filename, content):
+		"""
+		Point the file at the stored copy of the given content, storing it if needed.
+		
+		Unlike ``save()``, this does not touch the database, so it can be used
+		on instances that are created with ``bulk_create``. The reference to
+		the blob is taken by ``acquire_blob()``, which ``save()`` calls; callers
+		of ``bulk_create`` call it in the same transaction.
+		
+		Args:
+			filename (str): The name of the file as uploaded.
+			content (bytes): The raw file content.
+		"""
+		from .blobs import write_blob
+		
+		content_hash, path, compression, stored_size = write_blob(content)
+		self._stored_content = {
+			'content_hash': content_hash,
+			'path': path,
+			'compression': compression,
+			'size': len(content),
+			'stored_size': stored_size,
+		}
+		self.content_hash = content_hash
+		self.original_filename = filename[:255]
+		self.file.name = path
+		self.file._committed = True
+	
+	def acquire_blob(self):
+		"""
+		Take the reference to the content stored by ``set_content()``.
+		
+		Call it in the transaction that saves the row, so that the reference
+		is rolled back if the row is not saved. Does nothing when there is no
+		new content.
+		"""
+		if self._stored_content is None:
+			return
+		self.blob = ConfigBlob.reference(**self._stored_content)
+		self.file.name = self.blob.path
+		self._stored_content = None
+	
+	def read_content(self):
+		"""Return the raw content of the configuration file."""
+		if self.blob_id:
+			return self.blob.read()
+		
+		# Files uploaded before the blob store was introduced
+		self.file.open('rb')
+		try:
+			return self.file.read()
+		finally:
+			self.file.close()
+	
+	def read_text(self):
+		"""Return the content of the configuration file as text."""
+		return self.read_content().decode('utf-8', errors='replace')
+	
+	def line_source(self):
+		"""
+		Return a callable that opens the configuration file as decoded lines.
+		
+		The callable holds only the storage name and compression of the file,
+		so it can be passed to a parsing process.
+		
+		Returns:
+			Callable: Opens the file as a context manager yielding a text stream.
+		"""
+		from .blobs import open_text
+		
+		if self.blob_id:
+			return partial(open_text, self.blob.path, self.blob.compression)
+		return partial(open_text, self.file.name)
+	
+	def previous_version(self, parsed_only=True):
+		"""
+		Return the most recent earlier upload of the same device.
+		
+		Uploads are versions of the same device when they share the project,
+		device type and device name.
+		
+		Args:
+			parsed_only (bool): Only consider uploads that parsed successfully.
+		
+		Returns:
+			Optional[DeviceFile]: The previous version, or None if there is none.
+		"""
+		versions = DeviceFile.objects.filter(
+			project_id=self.project_id,
+			device_type_id=self.device_type_id,
+			name=self.name,
+			pk__lt=self.pk
+		)
+		if parsed_only:
+			versions = versions.filter(parsed=True)
+		return versions.exclude(content_hash='').order_by('-pk').first()
 	
-	def parse_file(self):
+	def parse_file(self, raise_unexpected=False):
 		"""
 		Parse the configuration file and save results to the inventory.
 		
+		When ``PARSE_INCREMENTAL`` is enabled and the result of the device's
+		previous version is still in the parse result cache, only the parts of
+		the configuration that changed since that version are parsed again
+		(see ``Parser.reparse``).
+		
+		Args:
+			raise_unexpected (bool): Re-raise unexpected errors after recording
+				them, so that a caller such as the parse worker can retry.
+		
 		Returns:
 			bool: True if parsing was successful, False otherwise.
 			
 		Raises:
-			Exception: Any unexpected exceptions that occur during parsing.
+			Exception: Unexpected errors, when ``raise_unexpected`` is set.
 		"""
 		# Reset parsing status and errors
 		self.parsed = False
@@ -107,6 +343,9 @@ class DeviceFile(models.Model):
 		try:
 			# Get appropriate parser using factory based on device type
 			from .parsers.factory import ParserFactory
+			from .parsers.budget import ParseBudget, ParseBudgetExceeded
+			from .cache import compute_content_hash, get_cached_result, store_result
+			from .profiling import export_profile, is_profiling_enabled
 			
 			parser = ParserFactory.get_parser_for_device_type(self.device_type.slug)
 			if not parser:
@@ -114,21 +353,69 @@ class DeviceFile(models.Model):
 				self.save(update_fields=['parsed', 'parse_errors'])
 				return False
 			
-			# Read the configuration file
-			self.file.seek(0)  # Ensure we're at the start of the file
-			config_text = self.file.read().decode('utf-8', errors='replace')
+			# Blobs are named by their content hash, so the file is only read to parse it
+			if self.blob_id:
+				self.content_hash = self.blob.content_hash
+				size = self.blob.size
+			else:
+				content = self.read_content()
+				self.content_hash = compute_content_hash(content)
+				size = len(content)
+			update_fields = ['parsed', 'parse_errors', 'content_hash']
 			
-			# Parse the configuration
-			parsed_data = parser.parse(config_text)
+			# Identical content parsed by the same parser version is served from the cache
+			parsed_data = get_cached_result(self.content_hash, parser)
+			if parsed_data is None:
+				if is_profiling_enabled():
+					parser.enable_profiling()
+				
+				# Parse the configuration within the configured time and memory budget
+				budget = ParseBudget(
+					time_limit=getattr(settings, 'PARSE_TIME_LIMIT', None),
+					memory_limit=getattr(settings, 'PARSE_MEMORY_LIMIT', None)
+				)
+				started = time.perf_counter()
+				previous, previous_result = None, None
+				if parser.INCREMENTAL_SECTIONS and getattr(settings, 'PARSE_INCREMENTAL', False):
+					previous = self.previous_version()
+					if previous is not None:
+						previous_result = get_cached_result(previous.content_hash, parser)
+				try:
+					if previous_result is not None:
+						# Re-parse only what changed since the previous version
+						parsed_data = budget.reparse(parser, self.read_text(), previous.read_text(), previous_result)
+					elif parser.STREAMING:
+						# Stream the file to the parser rather than decoding it whole
+						parsed_data = budget.parse_lines(parser, self.line_source())
+					else:
+						parsed_data = budget.parse(parser, self.read_text())
+					store_result(self.content_hash, parser, parsed_data)
+				except ParseBudgetExceeded as e:
+					self.parse_errors = f"Parse budget exceeded in {e.extractor}: {str(e)}"
+				
+				if parser.profile is not None:
+					self.parse_profile = {
+						'parser': type(parser).__name__,
+						'bytes': size,
+						'seconds': time.perf_counter() - started,
+						'complete': not self.parse_errors,
+						'incremental': previous_result is not None,
+						'extractors': parser.profile,
+					}
+					update_fields.append('parse_profile')
 			
-			# TODO: Save parsed data to the inventory
-			# This will involve creating records in various inventory models
-			# based on the structured data returned by the parser
+			# Only complete results are saved to the inventory; the importer would
+			# take the sections that did not finish for deleted configuration
+			if not self.parse_errors:
+				from apps.inventory.importer import import_parsed_data
+				import_parsed_data(self, parsed_data)
 			
 			# Update status
-			self.parsed = True
-			self.save(update_fields=['parsed', 'parse_errors'])
-			return True
+			self.parsed = not self.parse_errors
+			self.save(update_fields=update_fields)
+			if 'parse_profile' in update_fields:
+				export_profile(self, self.parse_profile)
+			return self.parsed
 			
 		except ValueError as e:
 			# Handle parsing errors
@@ -139,4 +426,152 @@ class DeviceFile(models.Model):
 			# Handle unexpected errors
 			self.parse_errors = f"Unexpected error: {str(e)}"
 			self.save(update_fields=['parsed', 'parse_errors'])
+			if raise_unexpected:
+				raise
 			return False
+
+
+@receiver(post_delete, sender=DeviceFile)
+def release_device_file_blob(sender, instance, **kwargs):
+	"""Release the stored content of a deleted device file, including cascaded deletes."""
+	if instance.blob_id:
+		ConfigBlob.release(instance.blob_id)
+
+
+class ParseResultCache(models.Model):
+	"""
+	Parser output cached by configuration content.
+	
+	Entries are keyed by the SHA-256 of the file content together with the
+	parser class and its ``PARSER_VERSION``, so re-uploading an identical
+	configuration skips parsing and bumping a parser's version invalidates
+	only that parser's entries. The least recently used entries are evicted
+	once the cache grows past ``PARSE_CACHE_MAX_BYTES``.
+	
+	Attributes:
+		content_hash (str): SHA-256 of the configuration file content.
+		parser (str): The parser class name.
+		parser_version (str): The parser's ``PARSER_VERSION`` when the entry was stored.
+		result (dict): The parser output.
+		size (int): Size of the serialized parser output in bytes.
+		hits (int): How often the entry was served from the cache.
+		created_at (datetime): When the entry was stored.
+		last_used_at (datetime): When the entry was last stored or served.
+	"""
+	content_hash = models.CharField(_("Content Hash"), max_length=64)
+	parser = models.CharField(_("Parser"), max_length=100)
+	parser_version = models.CharField(_("Parser Version"), max_length=20)
+	result = models.JSONField(_("Parsed Result"))
+	size = models.PositiveIntegerField(_("Size (bytes)"), default=0)
+	hits = models.PositiveIntegerField(_("Hits"), default=0)
+	created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+	last_used_at = models.DateTimeField(_("Last Used At"), default=timezone.now)
+	
+	class Meta:
+		verbose_name = _("Parse Result Cache Entry")
+		verbose_name_plural = _("Parse Result Cache")
+		ordering = ["-last_used_at"]
+		unique_together = ["content_hash", "parser", "parser_version"]
+		indexes = [
+			models.Index(fields=["last_used_at"]),
+		]
+	
+	def __str__(self):
+		return f"{self.parser} v{self.parser_version} {self.content_hash[:12]}"
+
+
+class ParseJob(models.Model):
+	"""
+	A queued request to parse a device file.
+	
+	Uploads enqueue a job instead of parsing inside the web request; the
+	``parse_worker`` management command claims pending jobs with
+	``SELECT ... FOR UPDATE SKIP LOCKED`` so any number of workers can drain
+	the queue without claiming the same job twice. A job that fails is
+	rescheduled with a growing delay until it has used ``max_attempts``.
+	
+	Attributes:
+		device_file (DeviceFile): The device file to parse.
+		status (str): One of pending, running, succeeded or failed.
+		attempts (int): Number of times a worker has started the job.
+		max_attempts (int): Number of attempts before the job is marked failed.
+		run_after (datetime): The job is not claimed before this time.
+		worker (str): Identifier of the worker that last claimed the job.
+		started_at (datetime): When the last attempt started.
+		finished_at (datetime): When the last attempt finished.
+		duration (float): Seconds the last attempt took.
+		last_error (str): The error of the last failed attempt.
+		created_at (datetime): When the job was enqueued.
+		updated_at (datetime): When the job was last updated.
+	"""
+	STATUS_PENDING = 'pending'
+	STATUS_RUNNING = 'running'
+	STATUS_SUCCEEDED = 'succeeded'
+	STATUS_FAILED = 'failed'
+	STATUS_CHOICES = [
+		(STATUS_PENDING, _('Pending')),
+		(STATUS_RUNNING, _('Running')),
+		(STATUS_SUCCEEDED, _('Succeeded')),
+		(STATUS_FAILED, _('Failed')),
+	]
+	
+	device_file = models.ForeignKey(
+		DeviceFile,
+		on_delete=models.CASCADE,
+		related_name="parse_jobs",
+		verbose_name=_("Device File")
+	)
+	status = models.CharField(_("Status"), max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+	attempts = models.PositiveIntegerField(_("Attempts"), default=0)
+	max_attempts = models.PositiveIntegerField(_("Max Attempts"), default=3)
+	run_after = models.DateTimeField(_("Run After"), default=timezone.now)
+	worker = models.CharField(_("Worker"), max_length=255, blank=True)
+	started_at = models.DateTimeField(_("Started At"), null=True, blank=True)
+	finished_at = models.DateTimeField(_("Finished At"), null=True, blank=True)
+	duration = models.FloatField(_("Duration (seconds)"), null=True, blank=True)
+	last_error = models.TextField(_("Last Error"), blank=True)
+	created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+	updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
+	
+	class Meta:
+		verbose_name = _("Parse Job")
+		verbose_name_plural = _("Parse Jobs")
+		ordering = ["-created_at"]
+		indexes = [
+			models.Index(fields=["status", "run_after"]),
+		]
+	
+	def __str__(self):
+		return f"Parse {self.device_file_id} ({self.status})"
+	
+	@classmethod
+	def enqueue(cls, device_file, max_attempts=None):
+		"""
+		Queue a device file for parsing.
+		
+		Args:
+			device_file (DeviceFile): The device file to parse.
+			max_attempts (int): Number of attempts; defaults to ``PARSE_JOB_MAX_ATTEMPTS``.
+		
+		Returns:
+			ParseJob: The new job.
+		"""
+		if max_attempts is None:
+			max_attempts = getattr(settings, 'PARSE_JOB_MAX_ATTEMPTS', 3)
+		return cls.objects.create(device_file=device_file, max_attempts=max_attempts)
+	
+	@classmethod
+	def enqueue_many(cls, device_files):
+		"""
+		Queue several device files for parsing with a single insert.
+		
+		Args:
+			device_files (list): The saved device files to parse.
+		
+		Returns:
+			list: The new jobs.
+		"""
+		max_attempts = getattr(settings, 'PARSE_JOB_MAX_ATTEMPTS', 3)
+		return cls.objects.bulk_create([
+			cls(device_file=device_file, max_attempts=max_attempts) for device_file in device_files
+		])
@@ -4,8 +4,16 @@ Base parser module defining the abstract Parser interface.
 All device-specific parsers must implement this interface.
 """
 
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from functools import wraps
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Tuple, Union
+from . import incremental
+from .buffers import Buffer, iter_lines
+from .detection import get_signature_set
+from .incremental import ConfigDiff, Stanza
+from .patterns import REGISTRY, CompiledPattern, PatternSpec
+from .stanza_diff import split_column_blocks
 
 
 class Parser(ABC):
@@ -14,8 +22,50 @@ class Parser(ABC):
 	
 	All device-specific parsers must inherit from this class and implement
 	the required methods.
+	
+	Attributes:
+		DETECTION_SIGNATURES (Tuple[Tuple[str, float], ...]): ``(regex, weight)``
+			pairs that identify configurations handled by the parser. Patterns are
+			matched with ``re.MULTILINE`` and must not define named groups; strong,
+			vendor specific markers get a high weight and generic ones a low weight.
+		PATTERNS (Dict[str, PatternSpec]): Regular expressions used by the
+			extractors, as pattern strings or ``(pattern, flags)`` pairs by name.
+			They are registered in the shared pattern registry when the class is
+			created and are available as compiled patterns in ``patterns``.
+		PARSER_VERSION (str): Version of the parser's output. Cached parse results
+			are keyed by it, so bump it whenever a change alters the output.
+		STREAMING (bool): Whether ``parse_lines`` consumes its lines incrementally.
+			Large files are only streamed to parsers that set it; others get the
+			whole text.
+		INCREMENTAL_SECTIONS (Dict[str, Tuple[str, ...]]): The result sections
+			that ``reparse`` can extract on their own, mapped to the stanza
+			sections (see ``split_stanzas``) their extractor reads. Empty for
+			parsers that do not support incremental parsing.
+		INCREMENTAL_DEPENDENCIES (Dict[str, Tuple[str, ...]]): Result sections
+			whose extractor also reads other, earlier result sections.
+		INCREMENTAL_ENTRIES (FrozenSet[str]): Result sections that hold one entry
+			per stanza, in stanza order, so they can be merged entry by entry.
+		OPTION_SETTINGS (Dict[str, str]): Constructor arguments that
+			``ParserFactory`` fills in from Django settings, mapped to the setting.
+		profile (Optional[Dict[str, Dict[str, Any]]]): Per-extractor statistics
+			once ``enable_profiling`` was called on the instance, otherwise None.
 	"""
 	
+	PARSER_VERSION = "1"
+	STREAMING = False
+	DETECTION_SIGNATURES: Tuple[Tuple[str, float], ...] = ()
+	PATTERNS: Dict[str, PatternSpec] = {}
+	INCREMENTAL_SECTIONS: Dict[str, Tuple[str, ...]] = {}
+	INCREMENTAL_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {}
+	INCREMENTAL_ENTRIES: FrozenSet[str] = frozenset()
+	OPTION_SETTINGS: Dict[str, str] = {}
+	patterns: Dict[str, CompiledPattern] = {}
+	profile: Optional[Dict[str, Dict[str, Any]]] = None
+	
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		cls.patterns = REGISTRY.register_all(cls.__name__, cls.PATTERNS)
+	
 	@abstractmethod
 	def parse(self, config_text: str) -> Dict[str, Any]:
 		"""
@@ -28,12 +78,146 @@ class Parser(ABC):
 			Dict[str, Any]: A dictionary containing the parsed configuration data.
 			The structure will include sections for hostname, interfaces, routes,
 			VLANs, etc., depending on what's available in the configuration.
+			Parsers may return a ``LazyResult`` that extracts each section when
+			it is first read.
 			
 		Raises:
 			ValueError: If the configuration cannot be parsed or is invalid.
 		"""
 		pass
 	
+	def parse_lines(self, lines: Iterable[str]) -> Dict[str, Any]:
+		"""
+		Parse a configuration given as an iterable of lines, e.g. an open file.
+		
+		Parsers that can build their result in a single pass over the lines
+		override this and set ``STREAMING``, so the whole configuration never
+		has to be held in memory. The default joins the lines and calls ``parse``.
+		
+		Args:
+			lines (Iterable[str]): The configuration lines, with or without line endings.
+			
+		Returns:
+			Dict[str, Any]: A dictionary containing the parsed configuration data.
+			
+		Raises:
+			ValueError: If the configuration cannot be parsed or is invalid.
+		"""
+		return self.parse('\n'.join(line.rstrip('\r\n') for line in lines))
+	
+	def parse_buffer(self, buffer: Buffer) -> Dict[str, Any]:
+		"""
+		Parse a configuration held in a bytes buffer, e.g. a memory-mapped file.
+		
+		Parsers that can scan the bytes directly override this and decode only
+		the parts they keep. The default decodes the buffer a line at a time
+		and passes the lines to ``parse_lines``.
+		
+		Args:
+			buffer (Buffer): The raw configuration bytes.
+			
+		Returns:
+			Dict[str, Any]: A dictionary containing the parsed configuration data.
+			
+		Raises:
+			ValueError: If the configuration cannot be parsed or is invalid.
+		"""
+		return self.parse_lines(iter_lines(buffer))
+	
+	def reparse(self, config_text: str, previous_text: str, previous_result: Dict[str, Any]) -> Dict[str, Any]:
+		"""
+		Parse a new version of a configuration, reusing the result of the previous one.
+		
+		Only the sections whose stanzas changed are extracted again, and list
+		sections such as interfaces or policies only for their changed entries;
+		see ``apps.parsers.parsers.incremental``. Parsers without
+		``INCREMENTAL_SECTIONS`` run a full parse.
+		
+		Args:
+			config_text (str): The new configuration text.
+			previous_text (str): The previous version of the configuration.
+			previous_result (Dict[str, Any]): The complete result of parsing the
+				previous version with the same ``PARSER_VERSION``.
+			
+		Returns:
+			Dict[str, Any]: The same data ``parse(config_text)`` returns.
+			
+		Raises:
+			ValueError: If the configuration cannot be parsed or is invalid.
+		"""
+		return incremental.reparse(self, config_text, previous_text, previous_result)
+	
+	def split_stanzas(self, config_text: str) -> List[Stanza]:
+		"""
+		Split a configuration into the stanzas its extractors read.
+		
+		Stanzas are compared by their text, so two versions of an unchanged
+		stanza must split to the same text. The default splits the whole
+		configuration with ``split_blocks``; parsers override it when their
+		extractors read only part of it, or read it in other units.
+		
+		Args:
+			config_text (str): The raw device configuration text.
+			
+		Returns:
+			List[Stanza]: The stanzas in the order the extractors read them.
+		"""
+		return self.split_blocks(config_text)
+	
+	def parse_stanzas(self, stanzas: List[Stanza]) -> Dict[str, Any]:
+		"""
+		Parse a configuration made of the given stanzas only.
+		
+		The default joins the stanzas' text and calls ``parse``. Parsers
+		override it to skip device type detection, which the stanzas alone may
+		not pass, and to return a lazy result, so only the sections that are
+		read are extracted.
+		
+		Args:
+			stanzas (List[Stanza]): Stanzas returned by ``split_stanzas``.
+			
+		Returns:
+			Dict[str, Any]: The parsed data of the stanzas.
+			
+		Raises:
+			ValueError: If the joined stanzas cannot be parsed.
+		"""
+		return self.parse('\n'.join(stanza.text for stanza in stanzas))
+	
+	def reparse_section(self, name: str, diff: ConfigDiff, previous: Any, result: Dict[str, Any]) -> Any:
+		"""
+		Extract a result section whose stanzas changed (see ``incremental.reparse_section``).
+		
+		Parsers override this for sections that need more than the stanzas of
+		their own sections, e.g. FortiGate VDOMs.
+		
+		Args:
+			name (str): The result section.
+			diff (ConfigDiff): The stanzas of the previous and the new version.
+			previous (Any): The section in the previous result.
+			result (Dict[str, Any]): The new result, for the sections this one reads.
+			
+		Returns:
+			Any: The section of the new configuration.
+		"""
+		return incremental.reparse_section(self, name, diff, previous, result)
+	
+	def split_blocks(self, config_text: str) -> List[Stanza]:
+		"""
+		Split a configuration into blocks for structural diffs (see ``stanza_diff``).
+		
+		Unlike ``split_stanzas``, the blocks cover the whole configuration, not
+		only what the extractors read. The default splits IOS style top-level
+		stanzas; parsers of other formats override it.
+		
+		Args:
+			config_text (str): The raw device configuration text.
+			
+		Returns:
+			List[Stanza]: The blocks in configuration order.
+		"""
+		return split_column_blocks(config_text)
+	
 	@abstractmethod
 	def detect_device_type(self, config_text: str) -> bool:
 		"""
@@ -47,6 +231,55 @@ class Parser(ABC):
 		"""
 		pass
 	
+	def detection_score(self, config_text: Union[str, Buffer]) -> float:
+		"""
+		Score the configuration against this parser's detection signatures.
+		
+		Args:
+			config_text (Union[str, Buffer]): The raw device configuration text,
+				or its bytes, which are scanned without being decoded.
+			
+		Returns:
+			float: The summed weight of the matching signatures, 0 if none match.
+		"""
+		return get_signature_set((type(self),)).scores(config_text)[0]
+	
+	def enable_profiling(self) -> Dict[str, Dict[str, Any]]:
+		"""
+		Record statistics for every extractor this parser instance runs.
+		
+		The instance's ``extract_*`` methods are wrapped so that each call adds
+		to ``profile[name]``: ``calls``, ``seconds`` (wall time, including any
+		extractor it calls in turn) and ``items`` (entries in its result, see
+		``count_items``).
+		Profiling is off by default because of the wrapping overhead.
+		
+		Returns:
+			Dict[str, Dict[str, Any]]: The profile, filled in as extractors run.
+		"""
+		if self.profile is not None:
+			return self.profile
+		self.profile = {}
+		
+		def wrap(name, method):
+			@wraps(method)
+			def extractor(config, *args, **kwargs):
+				started = time.perf_counter()
+				result = method(config, *args, **kwargs)
+				stats = self.profile.setdefault(name, {'calls': 0, 'seconds': 0.0, 'items': 0})
+				stats['calls'] += 1
+				stats['seconds'] += time.perf_counter() - started
+				stats['items'] += count_items(result)
+				return result
+			return extractor
+		
+		for name in dir(self):
+			if name.startswith('extract_'):
+				method = getattr(self, name)
+				if callable(method):
+					setattr(self, name, wrap(name, method))
+		return self.profile
+	
 	def extract_hostname(self, config_text: str) -> str:
 		"""
 		Extract the hostname from the configuration.
@@ -109,4 +342,26 @@ class Parser(ABC):
 			Dict[str, Any]: A dictionary containing routing information,
 			including routing protocols, static routes, etc.
 		"""
-		return {} 
\ No newline at end of file
+		return {} 
+
+
+def count_items(value: Any) -> int:
+	"""
+	Count the entries in an extractor result for profiling.
+	
+	Lists count their elements and dictionaries the items of their values,
+	so ``{'static_routes': [...], 'ospf': {'areas': [...]}}`` counts routes
+	and OSPF areas alike. Scalars such as a hostname or a ``False`` flag are
+	not items.
+	
+	Args:
+		value (Any): The extractor result.
+		
+	Returns:
+		int: The number of items.
+	"""
+	if isinstance(value, (list, tuple)):
+		return len(value)
+	if isinstance(value, dict):
+		return sum(count_items(item) for item in value.values())
+	return 0
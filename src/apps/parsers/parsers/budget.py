@@ -0,0 +1,352 @@
+"""
+Time and memory budget for a single parse.
+
+Python's regular expression engine can only be interrupted by a signal
+while it is matching, not from another thread, so a pattern that backtracks
+catastrophically on a malformed or truncated upload would keep the calling
+worker busy indefinitely. A
+``ParseBudget`` runs the parser in a child process instead, enforces a wall
+clock deadline (and, where supported, an address space limit) and stops the
+child when it overruns. The child reports the name of every ``extract_*``
+call as it starts and finishes, so the parent knows which extractor overran.
+Extractor results stay in the child, which only sends the finished result.
+When the deadline passes, the parent signals the child, which interrupts
+the running extractor and sends the results of the extractors that did
+complete; a child that runs out of memory does the same. A child that does
+not respond within ``STOP_GRACE_PERIOD``, e.g. because it is stuck in C code
+that does not check for signals, is killed and its results are lost. When
+profiling is enabled on the parser, the child also sends its extractor
+profile after every extractor, so the parent's ``parser.profile`` covers the
+extractors that completed even when the budget ran out.
+
+The child is started with the platform's default start method, which is
+``fork`` on Linux, so no parser state has to be pickled and a parser with
+profiling enabled works. Forking a multithreaded web worker copies only the
+calling thread, so a lock that another thread held, e.g. in a logging
+handler, stays locked in the child. The child only runs the parser and
+writes to its pipe; parsers must not log or touch the database.
+
+Parsers that support streaming can be given a line source instead of the
+text: the child opens the source itself and parses it line by line, so the
+configuration is never held in memory, in the parent or in the child. A
+buffer source, such as a memory-mapped file, is opened in the child too and
+handed to ``Parser.parse_buffer``.
+
+Parsers return lazy results (see ``LazyResult``) whose sections are only
+extracted when read. A budgeted parse resolves every section before it
+returns, so all extractors run within the budget rather than later, in the
+caller, without one.
+"""
+
+import multiprocessing
+import os
+import signal
+import time
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional, Union
+
+from .base import Parser
+from .buffers import Buffer
+from .results import LazyResult
+
+try:
+	import resource
+except ImportError:  # pragma: no cover - not available on Windows
+	resource = None
+
+
+# A zero-argument callable that opens a configuration as a context manager
+# yielding its lines, e.g. ``functools.partial(open, path)``
+LineSource = Callable[[], ContextManager[Iterable[str]]]
+
+# A zero-argument callable that opens a configuration as a context manager
+# yielding its bytes, e.g. ``functools.partial(map_file, path)``
+BufferSource = Callable[[], ContextManager[Buffer]]
+
+# Messages sent from the child process to the parent
+EXTRACTOR_STARTED = 'started'
+EXTRACTOR_FINISHED = 'finished'
+EXTRACTOR_PROFILE = 'profile'
+PARSE_DONE = 'done'
+PARSE_STOPPED = 'stopped'
+PARSE_FAILED = 'failed'
+
+# Signal the parent sends to stop the child; None where signals are not available
+STOP_SIGNAL = getattr(signal, 'SIGUSR1', None)
+
+# Seconds a stopped child has to send its partial results before it is killed
+STOP_GRACE_PERIOD = 2.0
+
+
+class ParseBudgetExceeded(ValueError):
+	"""
+	Raised when a parse runs out of time or memory.
+
+	Attributes:
+		extractor (str): The extractor that was running when the budget ran
+			out, or ``'parse'`` if no extractor was running.
+		partial_results (Dict[str, Any]): Results of the extractors that
+			completed, keyed by extractor name without the ``extract_`` prefix.
+	"""
+
+	def __init__(self, message: str, extractor: str, partial_results: Dict[str, Any]):
+		super().__init__(message)
+		self.extractor = extractor
+		self.partial_results = partial_results
+
+
+class _ParseStopped(BaseException):
+	"""Raised in the child when the parent stops the parse; parsers do not catch it as an Exception."""
+
+
+def _stop(signum, frame) -> None:
+	"""Signal handler that interrupts the running extractor."""
+	raise _ParseStopped()
+
+
+def _send(connection, message: tuple) -> None:
+	"""Send a message to the parent without being stopped halfway through it."""
+	if STOP_SIGNAL is None:
+		connection.send(message)
+		return
+	signal.pthread_sigmask(signal.SIG_BLOCK, {STOP_SIGNAL})
+	try:
+		connection.send(message)
+	finally:
+		signal.pthread_sigmask(signal.SIG_UNBLOCK, {STOP_SIGNAL})
+
+
+def _instrument_extractors(parser: Parser, connection, completed: Dict[str, Any]) -> None:
+	"""Wrap the parser's extract_* methods so that every call is reported to the parent and its result kept."""
+	def wrap(name, method):
+		def extractor(*args, **kwargs):
+			_send(connection, (EXTRACTOR_STARTED, name, None))
+			result = method(*args, **kwargs)
+			completed[name[len('extract_'):]] = result
+			_send(connection, (EXTRACTOR_FINISHED, name, None))
+			if parser.profile is not None:
+				_send(connection, (EXTRACTOR_PROFILE, name, parser.profile))
+			return result
+		return extractor
+
+	for name in dir(parser):
+		if name.startswith('extract_'):
+			method = getattr(parser, name)
+			if callable(method):
+				setattr(parser, name, wrap(name, method))
+
+
+def _run_parser(parser: Parser, method: str, config: Union[str, LineSource, BufferSource], *args: Any) -> Dict[str, Any]:
+	"""Call a parse method of the parser with configuration text or an opened source and resolve the result."""
+	if callable(config):
+		with config() as opened:
+			return _resolve(getattr(parser, method)(opened, *args))
+	return _resolve(getattr(parser, method)(config, *args))
+
+
+def _resolve(result: Dict[str, Any]) -> Dict[str, Any]:
+	"""Extract every section of a lazy result; other results are returned unchanged."""
+	if isinstance(result, LazyResult):
+		result.resolve()
+	return result
+
+
+def _parse_in_child(
+	connection,
+	parser: Parser,
+	method: str,
+	config: Union[str, LineSource, BufferSource],
+	memory_limit: Optional[int],
+	args: tuple = ()
+) -> None:
+	"""Entry point of the child process."""
+	# Results of the extractors that completed, sent only if the parse is stopped
+	completed: Dict[str, Any] = {}
+	try:
+		if STOP_SIGNAL is not None:
+			signal.signal(STOP_SIGNAL, _stop)
+		if memory_limit and resource is not None:
+			resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+		_instrument_extractors(parser, connection, completed)
+		result = _run_parser(parser, method, config, *args)
+		_send(connection, (PARSE_DONE, None, result))
+	except (_ParseStopped, MemoryError):
+		try:
+			_send(connection, (PARSE_STOPPED, None, completed))
+		except Exception:
+			# Out of memory while pickling the results
+			_send(connection, (PARSE_STOPPED, None, {}))
+	except BaseException as e:
+		try:
+			_send(connection, (PARSE_FAILED, None, e))
+		except Exception:
+			# The exception itself could not be pickled
+			_send(connection, (PARSE_FAILED, None, RuntimeError(f"{type(e).__name__}: {e}")))
+	finally:
+		connection.close()
+
+
+class ParseBudget:
+	"""
+	Limits the wall clock time and memory a single parse may use.
+
+	Args:
+		time_limit (Optional[float]): Seconds the parse may take. When None the
+			parser runs in the current process without any limits.
+		memory_limit (Optional[int]): Maximum address space of the parsing
+			process in bytes, or None for no limit. Only enforced where the
+			``resource`` module is available.
+	"""
+
+	def __init__(self, time_limit: Optional[float] = 60.0, memory_limit: Optional[int] = None):
+		self.time_limit = time_limit
+		self.memory_limit = memory_limit
+
+	def parse(self, parser: Parser, config_text: str) -> Dict[str, Any]:
+		"""
+		Parse a configuration within the budget.
+
+		Args:
+			parser (Parser): The parser to run.
+			config_text (str): The raw device configuration text.
+
+		Returns:
+			Dict[str, Any]: The parser's result.
+
+		Raises:
+			ParseBudgetExceeded: If the parse ran out of time or memory.
+			ValueError: If the parser rejected the configuration.
+		"""
+		return self._parse(parser, 'parse', config_text)
+
+	def parse_lines(self, parser: Parser, source: LineSource) -> Dict[str, Any]:
+		"""
+		Parse a configuration line by line within the budget.
+
+		Args:
+			parser (Parser): The parser to run; its ``parse_lines`` is called.
+			source (LineSource): Opens the configuration. It is called in the
+				parsing process, so it must not depend on state, such as database
+				connections, that cannot be shared with a child process.
+
+		Returns:
+			Dict[str, Any]: The parser's result.
+
+		Raises:
+			ParseBudgetExceeded: If the parse ran out of time or memory.
+			ValueError: If the parser rejected the configuration.
+		"""
+		return self._parse(parser, 'parse_lines', source)
+
+	def parse_buffer(self, parser: Parser, source: BufferSource) -> Dict[str, Any]:
+		"""
+		Parse a configuration buffer, e.g. a memory-mapped file, within the budget.
+
+		Args:
+			parser (Parser): The parser to run; its ``parse_buffer`` is called.
+			source (BufferSource): Opens the buffer in the parsing process, so a
+				mapped file is mapped by the process that reads it.
+
+		Returns:
+			Dict[str, Any]: The parser's result.
+
+		Raises:
+			ParseBudgetExceeded: If the parse ran out of time or memory.
+			ValueError: If the parser rejected the configuration.
+		"""
+		return self._parse(parser, 'parse_buffer', source)
+
+	def reparse(self, parser: Parser, config_text: str, previous_text: str,
+			previous_result: Dict[str, Any]) -> Dict[str, Any]:
+		"""
+		Parse a new version of a configuration incrementally within the budget.
+
+		Only the extractors of changed sections run (see ``Parser.reparse``),
+		so when the budget runs out the partial results hold only what those
+		extractors returned.
+
+		Args:
+			parser (Parser): The parser to run; its ``reparse`` is called.
+			config_text (str): The new configuration text.
+			previous_text (str): The previous version of the configuration.
+			previous_result (Dict[str, Any]): The complete result of parsing the
+				previous version.
+
+		Returns:
+			Dict[str, Any]: The parser's result.
+
+		Raises:
+			ParseBudgetExceeded: If the parse ran out of time or memory.
+			ValueError: If the parser rejected the configuration.
+		"""
+		return self._parse(parser, 'reparse', config_text, previous_text, previous_result)
+
+	def _parse(self, parser: Parser, method: str, config: Union[str, LineSource, BufferSource],
+			*args: Any) -> Dict[str, Any]:
+		"""Run a parse method of the parser in a child process and enforce the budget."""
+		if not self.time_limit:
+			return _run_parser(parser, method, config, *args)
+
+		context = multiprocessing.get_context()
+		parent_connection, child_connection = context.Pipe(duplex=False)
+		process = context.Process(
+			target=_parse_in_child,
+			args=(child_connection, parser, method, config, self.memory_limit, args),
+			name=f"parse-{type(parser).__name__}",
+		)
+		process.start()
+		child_connection.close()
+
+		deadline = time.monotonic() + self.time_limit
+		stopping = False
+		running: List[str] = []
+
+		try:
+			while True:
+				remaining = deadline - time.monotonic()
+				if remaining <= 0 or not parent_connection.poll(remaining):
+					if stopping or STOP_SIGNAL is None:
+						raise ParseBudgetExceeded(
+							f"Time limit of {self.time_limit:g}s exceeded",
+							running[-1] if running else 'parse',
+							{},
+						)
+					# Ask the child for the results of the extractors that completed
+					os.kill(process.pid, STOP_SIGNAL)
+					stopping = True
+					deadline = time.monotonic() + STOP_GRACE_PERIOD
+					continue
+
+				try:
+					kind, name, payload = parent_connection.recv()
+				except EOFError:
+					process.join(1)
+					if stopping:
+						message = f"Time limit of {self.time_limit:g}s exceeded"
+					else:
+						message = f"Parser process exited unexpectedly (exit code {process.exitcode})"
+					raise ParseBudgetExceeded(message, running[-1] if running else 'parse', {})
+
+				if kind == EXTRACTOR_STARTED:
+					running.append(name)
+				elif kind == EXTRACTOR_FINISHED:
+					if running:
+						running.pop()
+				elif kind == EXTRACTOR_PROFILE:
+					if parser.profile is not None:
+						parser.profile.update(payload)
+				elif kind == PARSE_DONE:
+					return payload
+				elif kind == PARSE_STOPPED:
+					if stopping:
+						message = f"Time limit of {self.time_limit:g}s exceeded"
+					else:
+						message = f"Memory limit of {self.memory_limit} bytes exceeded"
+					raise ParseBudgetExceeded(message, running[-1] if running else 'parse', payload)
+				else:
+					raise payload
+		finally:
+			parent_connection.close()
+			if process.is_alive():
+				process.terminate()
+			process.join()
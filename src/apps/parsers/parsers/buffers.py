@@ -0,0 +1,85 @@
+"""
+Memory-mapped access to configuration files.
+
+A multi-hundred-megabyte capture read with ``read().decode()`` exists in
+memory twice, as bytes and as text. Mapping the file instead leaves it in
+the page cache: regular expressions run over the mapping directly (see the
+bytes support of the pattern registry), and only the spans a parser keeps
+are decoded.
+"""
+
+import mmap
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+# A bytes-like configuration buffer
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[Buffer]:
+	"""
+	Map a file into memory read-only.
+
+	Args:
+		path (str): The file to map.
+
+	Yields:
+		Buffer: An ``mmap`` of the file, or ``b''`` for an empty file, which
+		cannot be mapped.
+	"""
+	with open(path, 'rb') as config_file:
+		try:
+			mapped = mmap.mmap(config_file.fileno(), 0, access=mmap.ACCESS_READ)
+		except ValueError:
+			# Empty files cannot be mapped
+			yield b''
+			return
+		try:
+			yield mapped
+		finally:
+			mapped.close()
+
+
+def decode(data: bytes) -> str:
+	"""Decode a span of a configuration buffer, replacing undecodable bytes."""
+	return data.decode('utf-8', errors='replace')
+
+
+def iter_lines(buffer: Buffer) -> Iterator[str]:
+	"""
+	Decode the lines of a buffer one at a time.
+
+	Args:
+		buffer (Buffer): The configuration buffer.
+
+	Yields:
+		str: Each line with its line ending.
+	"""
+	size = len(buffer)
+	start = 0
+	while start < size:
+		end = buffer.find(b'\n', start)
+		end = size if end == -1 else end + 1
+		yield decode(buffer[start:end])
+		start = end
+
+
+def count_lines(buffer: Buffer, start: int = 0, end: Optional[int] = None, chunk_size: int = 1024 * 1024) -> int:
+	"""
+	Count the line endings in a span of a buffer without copying it whole.
+
+	Args:
+		buffer (Buffer): The configuration buffer.
+		start (int): Offset of the span.
+		end (Optional[int]): End of the span, the end of the buffer by default.
+		chunk_size (int): Bytes copied out of the buffer at a time.
+
+	Returns:
+		int: The number of ``\\n`` bytes in the span.
+	"""
+	end = len(buffer) if end is None else end
+	count = 0
+	for offset in range(start, end, chunk_size):
+		count += buffer[offset:min(offset + chunk_size, end)].count(b'\n')
+	return count
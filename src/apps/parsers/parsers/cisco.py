@@ -8,13 +8,48 @@ This module contains parser implementations for various Cisco device types:
 """
 
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional, Union
 from .base import Parser
+from .buffers import Buffer
+from .detection import sample_lines
+from .incremental import Stanza
+from .ios_index import IOSBlockIndex
+from .results import (
+	IOSAccessList, IOSBGPNeighbor, IOSInterface, IOSStaticRoute, IOSVrf, LazyResult, NATRule, NetworkObject,
+	NexusVlan, OSPFNetwork, RouteTarget, VPCPortChannel
+)
+from .stanza_diff import split_column_blocks
 
 
 class CiscoIOSParser(Parser):
 	"""Parser for Cisco IOS devices (routers and switches)."""
 	
+	PARSER_VERSION = "1"
+	STREAMING = True
+	
+	DETECTION_SIGNATURES = (
+		(r'^[ \t]*boot system flash', 2.0),
+		(r'^[ \t]*ip classless', 2.0),
+		(r'^[ \t]*version \d+\.\d+', 1.0),
+		(r'^[ \t]*service (?:timestamps|password-encryption|config)\b', 1.0),
+		(r'^interface (?:GigabitEthernet|FastEthernet)\d', 1.0),
+	)
+	
+	# Stanzas are the indexed top-level stanzas, by section name
+	INCREMENTAL_SECTIONS = {
+		"hostname": ('hostname',),
+		"interfaces": ('interface',),
+		"acls": ('ip access-list',),
+		"vrfs": ('ip vrf',),
+		"routing": ('ip route', 'router ospf', 'router bgp'),
+	}
+	INCREMENTAL_DEPENDENCIES = {"vrfs": ("interfaces",)}
+	INCREMENTAL_ENTRIES = frozenset({"interfaces", "acls"})
+	
+	def __init__(self):
+		self._index = None
+		self._index_text = None
+	
 	def parse(self, config_text: str) -> Dict[str, Any]:
 		"""
 		Parse Cisco IOS configuration.
@@ -31,159 +66,231 @@ class CiscoIOSParser(Parser):
 		if not self.detect_device_type(config_text):
 			raise ValueError("Not a valid Cisco IOS configuration.")
 		
-		hostname = self.extract_hostname(config_text)
-		interfaces = self.extract_interfaces(config_text)
-		acls = self.extract_acls(config_text)
-		vrfs = self.extract_vrfs(config_text)
-		routing = self.extract_routing(config_text)
-		
-		return {
-			"device_type": "cisco_ios",
-			"hostname": hostname,
-			"interfaces": interfaces,
-			"acls": acls,
-			"vrfs": vrfs,
-			"routing": routing
-		}
+		return self._parse_config(config_text)
+	
+	def parse_lines(self, lines: Iterable[str]) -> Dict[str, Any]:
+		"""
+		Parse a Cisco IOS configuration from an iterable of lines.
+		
+		The lines are consumed in a single pass and only the stanzas the
+		extractors read are kept, so an open file of any size, such as a
+		``show tech-support`` capture, can be passed directly.
+		
+		Args:
+			lines (Iterable[str]): The configuration lines.
+			
+		Returns:
+			Dict[str, Any]: Structured configuration data.
+			
+		Raises:
+			ValueError: If the configuration is not valid Cisco IOS.
+		"""
+		sample, lines = sample_lines(lines)
+		if not self.detect_device_type(sample):
+			raise ValueError("Not a valid Cisco IOS configuration.")
+		
+		return self._parse_config(IOSBlockIndex(lines, sections_only=True))
+	
+	def parse_buffer(self, buffer: Buffer) -> Dict[str, Any]:
+		"""
+		Parse a Cisco IOS configuration from a bytes buffer, e.g. a memory-mapped file.
+		
+		Detection and indexing scan the bytes directly; only the stanzas of the
+		sections the extractors read are decoded.
+		
+		Args:
+			buffer (Buffer): The raw configuration bytes.
+			
+		Returns:
+			Dict[str, Any]: Structured configuration data.
+			
+		Raises:
+			ValueError: If the configuration is not valid Cisco IOS.
+		"""
+		if not self.detect_device_type(buffer):
+			raise ValueError("Not a valid Cisco IOS configuration.")
+		
+		return self._parse_config(IOSBlockIndex.from_buffer(buffer))
+	
+	def _parse_config(self, config: Union[str, IOSBlockIndex]) -> LazyResult:
+		"""Map every section to its extractor, run against configuration text or a prebuilt index."""
+		result = LazyResult({"device_type": "cisco_ios"}, {
+			"hostname": lambda: self.extract_hostname(config),
+			"interfaces": lambda: self.extract_interfaces(config),
+			"acls": lambda: self.extract_acls(config),
+			"vrfs": lambda: self.extract_vrfs(config, self.build_interface_vrf_map(result["interfaces"])),
+			"routing": lambda: self.extract_routing(config)
+		})
+		return result
+	
+	def split_stanzas(self, config_text: str) -> List[Stanza]:
+		"""Split the configuration into its indexed top-level stanzas, keyed by header."""
+		index = IOSBlockIndex(config_text.splitlines(), sections_only=True)
+		return [
+			Stanza(name, None, block.header, block.text)
+			for name, blocks in index.sections.items()
+			for block in blocks
+		]
+	
+	def parse_stanzas(self, stanzas: List[Stanza]) -> LazyResult:
+		"""Parse a configuration made of the given stanzas only."""
+		return self._parse_config(IOSBlockIndex.from_text('\n'.join(stanza.text for stanza in stanzas)))
+	
+	def split_blocks(self, config_text: str) -> List[Stanza]:
+		"""Split the configuration into its top-level stanzas, in the index's sections where they belong to one."""
+		return split_column_blocks(config_text, IOSBlockIndex.SECTION_PREFIXES)
 	
 	def detect_device_type(self, config_text: str) -> bool:
 		"""Check if the configuration is from a Cisco IOS device."""
-		# Look for typical Cisco IOS indicators
-		ios_indicators = [
-			r'version \d+\.\d+',
-			r'boot system flash',
-			r'service\s+',
-			r'ip classless'
-		]
+		return self.detection_score(config_text) > 0
+	
+	def get_block_index(self, config_text: Union[str, IOSBlockIndex]) -> IOSBlockIndex:
+		"""
+		Return the stanza index for the given configuration text.
 		
-		# Check if at least one indicator is present
-		for indicator in ios_indicators:
-			if re.search(indicator, config_text, re.IGNORECASE):
-				return True
+		The index is built once and reused for as long as the parser is asked
+		about the same configuration text, so calling several extractors in a
+		row only walks the configuration a single time. All extractors also
+		accept an already built index in place of the text.
 		
-		return False
+		Args:
+			config_text (Union[str, IOSBlockIndex]): The raw Cisco IOS configuration
+				text, or an index built with IOSBlockIndex.
+			
+		Returns:
+			IOSBlockIndex: The index of top-level stanzas.
+		"""
+		if isinstance(config_text, IOSBlockIndex):
+			return config_text
+		if self._index is None or self._index_text is not config_text:
+			self._index = IOSBlockIndex.from_text(config_text)
+			self._index_text = config_text
+		return self._index
 	
 	def extract_hostname(self, config_text: str) -> str:
 		"""Extract hostname from Cisco IOS configuration."""
-		hostname_match = re.search(r'^hostname\s+(.+)$', config_text, re.MULTILINE)
-		if hostname_match:
-			return hostname_match.group(1).strip()
+		for block in self.get_block_index(config_text).section('hostname'):
+			return block.header.split(None, 1)[1].strip()
 		return ""
 	
-	def extract_interfaces(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_interfaces(self, config_text: str) -> List[IOSInterface]:
 		"""Extract interface configurations from Cisco IOS."""
 		interfaces = []
 		
-		# Find all interface blocks
-		interface_blocks = re.findall(
-			r'^interface\s+(.+?)$\s+(.+?)(?=^!|^interface|\Z)', 
-			config_text, 
-			re.MULTILINE | re.DOTALL
-		)
-		
-		for interface_name, interface_config in interface_blocks:
-			interface = {
-				"name": interface_name.strip(),
-				"description": "",
-				"ip_address": "",
-				"subnet_mask": "",
-				"enabled": True,
-				"vrf": "",
-				"config": interface_config.strip()
-			}
-			
-			# Extract description
-			desc_match = re.search(r'description\s+(.+?)$', interface_config, re.MULTILINE)
-			if desc_match:
-				interface["description"] = desc_match.group(1).strip()
+		for block in self.get_block_index(config_text).section('interface'):
+			interface = IOSInterface(
+				name=block.header.split(None, 1)[1].strip(),
+				description="",
+				ip_address="",
+				subnet_mask="",
+				enabled=True,
+				vrf="",
+				config=block.body
+			)
 			
-			# Extract IP address
-			ip_match = re.search(r'ip address\s+(\S+)\s+(\S+)', interface_config)
-			if ip_match:
-				interface["ip_address"] = ip_match.group(1)
-				interface["subnet_mask"] = ip_match.group(2)
+			for command in block.commands():
+				if command.startswith('description ') and not interface["description"]:
+					interface["description"] = command[len('description '):].strip()
+				elif command.startswith('ip address ') and not interface["ip_address"]:
+					# Only the primary address is recorded; "ip address dhcp" has no mask
+					tokens = command.split()
+					if len(tokens) >= 4:
+						interface["ip_address"] = tokens[2]
+						interface["subnet_mask"] = tokens[3]
+				elif command == 'shutdown':
+					interface["enabled"] = False
+				elif command.startswith('ip vrf forwarding '):
+					interface["vrf"] = command.split()[3]
 			
-			# Check if shutdown
-			if re.search(r'shutdown', interface_config, re.MULTILINE):
-				interface["enabled"] = False
-			
-			# Extract VRF
-			vrf_match = re.search(r'ip vrf forwarding\s+(\S+)', interface_config)
-			if vrf_match:
-				interface["vrf"] = vrf_match.group(1)
-				
 			interfaces.append(interface)
 		
 		return interfaces
 	
-	def extract_acls(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_acls(self, config_text: str) -> List[IOSAccessList]:
 		"""Extract ACLs from Cisco IOS configuration."""
 		acls = []
 		
-		# Find standard and extended ACLs
-		acl_blocks = re.findall(
-			r'^(ip access-list\s+\S+\s+\S+)$\s+(.+?)(?=^!|\Z)', 
-			config_text, 
-			re.MULTILINE | re.DOTALL
-		)
-		
-		for acl_header, acl_body in acl_blocks:
-			acl_name_match = re.search(r'ip access-list\s+(\S+)\s+(\S+)', acl_header)
-			if acl_name_match:
-				acl_type = acl_name_match.group(1)
-				acl_name = acl_name_match.group(2)
-				
-				rules = []
-				for line in acl_body.strip().split('\n'):
-					if line.strip() and not line.strip().startswith('!'):
-						rules.append(line.strip())
-				
-				acls.append({
-					"name": acl_name,
-					"type": acl_type,
-					"rules": rules
-				})
+		# Find standard and extended named ACLs
+		for block in self.get_block_index(config_text).section('ip access-list'):
+			tokens = block.header.split()
+			if len(tokens) < 4:
+				continue
+			
+			acls.append(IOSAccessList(
+				name=tokens[3],
+				type=tokens[2],
+				rules=list(block.commands())
+			))
 		
 		return acls
 	
-	def extract_vrfs(self, config_text: str) -> List[Dict[str, Any]]:
-		"""Extract VRF configurations from Cisco IOS."""
+	def build_interface_vrf_map(self, interfaces: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+		"""
+		Group interface names by the VRF they are bound to.
+		
+		Args:
+			interfaces (List[Dict[str, Any]]): Interfaces as returned by extract_interfaces.
+			
+		Returns:
+			Dict[str, List[str]]: Interface names keyed by VRF name, in configuration order.
+			Interfaces in the global routing table are not included.
+		"""
+		interface_vrf_map: Dict[str, List[str]] = {}
+		for interface in interfaces:
+			if interface["vrf"]:
+				interface_vrf_map.setdefault(interface["vrf"], []).append(interface["name"])
+		return interface_vrf_map
+	
+	def extract_vrfs(self, config_text: str, interface_vrf_map: Optional[Dict[str, List[str]]] = None) -> List[IOSVrf]:
+		"""
+		Extract VRF configurations from Cisco IOS.
+		
+		Args:
+			config_text (str): The raw Cisco IOS configuration text.
+			interface_vrf_map (Optional[Dict[str, List[str]]]): Interface membership as
+				returned by build_interface_vrf_map. When omitted it is built once from
+				extract_interfaces, so VRF membership never rescans the interfaces per VRF.
+				
+		Returns:
+			List[IOSVrf]: The VRFs with their route targets and member interfaces.
+		"""
 		vrfs = []
+		if interface_vrf_map is None:
+			interface_vrf_map = self.build_interface_vrf_map(self.extract_interfaces(config_text))
 		
-		# Find VRF definitions
-		vrf_blocks = re.findall(
-			r'^ip vrf\s+(\S+)$\s+(.+?)(?=^!|\Z)', 
-			config_text, 
-			re.MULTILINE | re.DOTALL
-		)
-		
-		for vrf_name, vrf_config in vrf_blocks:
-			vrf = {
-				"name": vrf_name.strip(),
-				"rd": "",
-				"route_targets": [],
-				"interfaces": []
-			}
+		for block in self.get_block_index(config_text).section('ip vrf'):
+			tokens = block.header.split()
+			if len(tokens) != 3:
+				continue
 			
-			# Extract route distinguisher
-			rd_match = re.search(r'rd\s+(\S+)', vrf_config)
-			if rd_match:
-				vrf["rd"] = rd_match.group(1)
+			vrf_name = tokens[2]
+			vrf = IOSVrf(
+				name=vrf_name,
+				rd="",
+				route_targets=[],
+				interfaces=[]
+			)
 			
-			# Extract route targets
-			rt_exports = re.findall(r'route-target\s+export\s+(\S+)', vrf_config)
-			rt_imports = re.findall(r'route-target\s+import\s+(\S+)', vrf_config)
+			rt_exports = []
+			rt_imports = []
+			for command in block.commands():
+				parts = command.split()
+				if parts[0] == 'rd' and len(parts) > 1 and not vrf["rd"]:
+					vrf["rd"] = parts[1]
+				elif parts[0] == 'route-target' and len(parts) > 2:
+					if parts[1] == 'export':
+						rt_exports.append(parts[2])
+					elif parts[1] == 'import':
+						rt_imports.append(parts[2])
 			
 			for rt in rt_exports:
-				vrf["route_targets"].append({"type": "export", "value": rt})
+				vrf["route_targets"].append(RouteTarget(type="export", value=rt))
 			
 			for rt in rt_imports:
-				vrf["route_targets"].append({"type": "import", "value": rt})
+				vrf["route_targets"].append(RouteTarget(type="import", value=rt))
 			
-			# Find interfaces in this VRF
-			for interface in self.extract_interfaces(config_text):
-				if interface["vrf"] == vrf_name:
-					vrf["interfaces"].append(interface["name"])
+			# Interfaces bound to this VRF
+			vrf["interfaces"] = list(interface_vrf_map.get(vrf_name, []))
 			
 			vrfs.append(vrf)
 		
@@ -206,64 +313,59 @@ class CiscoIOSParser(Parser):
 				"neighbors": []
 			}
 		}
-		
-		# Extract static routes
-		static_routes = re.findall(r'ip route\s+(\S+)\s+(\S+)\s+(\S+)', config_text)
-		for network, mask, next_hop in static_routes:
-			routing["static_routes"].append({
-				"network": network,
-				"mask": mask,
-				"next_hop": next_hop
-			})
-		
-		# Extract OSPF configuration
-		ospf_match = re.search(
-			r'^router ospf\s+(\d+)$\s+(.+?)(?=^!|\Z)', 
-			config_text, 
-			re.MULTILINE | re.DOTALL
-		)
-		if ospf_match:
-			routing["ospf"]["enabled"] = True
-			routing["ospf"]["process_id"] = ospf_match.group(1)
-			ospf_config = ospf_match.group(2)
+		index = self.get_block_index(config_text)
+		
+		# Extract static routes from the global routing table
+		for block in index.section('ip route'):
+			tokens = block.header.split()
+			if len(tokens) < 5 or tokens[2] == 'vrf':
+				continue
+			routing["static_routes"].append(IOSStaticRoute(
+				network=tokens[2],
+				mask=tokens[3],
+				next_hop=tokens[4]
+			))
+		
+		# Extract OSPF configuration (first process only)
+		for block in index.section('router ospf'):
+			tokens = block.header.split()
+			if len(tokens) < 3 or not tokens[2].isdigit():
+				continue
 			
-			# Extract router-id
-			router_id_match = re.search(r'router-id\s+(\S+)', ospf_config)
-			if router_id_match:
-				routing["ospf"]["router_id"] = router_id_match.group(1)
+			routing["ospf"]["enabled"] = True
+			routing["ospf"]["process_id"] = tokens[2]
 			
-			# Extract networks
-			network_matches = re.findall(r'network\s+(\S+)\s+(\S+)\s+area\s+(\S+)', ospf_config)
-			for network, wildcard, area in network_matches:
-				routing["ospf"]["networks"].append({
-					"network": network,
-					"wildcard": wildcard,
-					"area": area
-				})
+			for command in block.commands():
+				parts = command.split()
+				if parts[0] == 'router-id' and len(parts) > 1 and not routing["ospf"]["router_id"]:
+					routing["ospf"]["router_id"] = parts[1]
+				elif parts[0] == 'network' and len(parts) >= 5 and parts[3] == 'area':
+					routing["ospf"]["networks"].append(OSPFNetwork(
+						network=parts[1],
+						wildcard=parts[2],
+						area=parts[4]
+					))
+			break
 		
 		# Extract BGP configuration
-		bgp_match = re.search(
-			r'^router bgp\s+(\d+)$\s+(.+?)(?=^!|\Z)', 
-			config_text, 
-			re.MULTILINE | re.DOTALL
-		)
-		if bgp_match:
-			routing["bgp"]["enabled"] = True
-			routing["bgp"]["as_number"] = bgp_match.group(1)
-			bgp_config = bgp_match.group(2)
+		for block in index.section('router bgp'):
+			tokens = block.header.split()
+			if len(tokens) < 3 or not tokens[2].isdigit():
+				continue
 			
-			# Extract router-id
-			router_id_match = re.search(r'bgp router-id\s+(\S+)', bgp_config)
-			if router_id_match:
-				routing["bgp"]["router_id"] = router_id_match.group(1)
+			routing["bgp"]["enabled"] = True
+			routing["bgp"]["as_number"] = tokens[2]
 			
-			# Extract neighbors
-			neighbor_matches = re.findall(r'neighbor\s+(\S+)\s+remote-as\s+(\S+)', bgp_config)
-			for neighbor, remote_as in neighbor_matches:
-				routing["bgp"]["neighbors"].append({
-					"ip": neighbor,
-					"remote_as": remote_as
-				})
+			for command in block.commands():
+				parts = command.split()
+				if command.startswith('bgp router-id ') and len(parts) > 2 and not routing["bgp"]["router_id"]:
+					routing["bgp"]["router_id"] = parts[2]
+				elif parts[0] == 'neighbor' and len(parts) >= 4 and parts[2] == 'remote-as':
+					routing["bgp"]["neighbors"].append(IOSBGPNeighbor(
+						ip=parts[1],
+						remote_as=parts[3]
+					))
+			break
 		
 		return routing
 
@@ -271,41 +373,47 @@ class CiscoIOSParser(Parser):
 class CiscoASAParser(Parser):
 	"""Parser for Cisco ASA Firewall devices."""
 	
+	PARSER_VERSION = "1"
+	
+	DETECTION_SIGNATURES = (
+		(r'^ASA Version \d', 5.0),
+		(r'^[ \t]+nameif \S+', 3.0),
+		(r'^[ \t]+security-level \d+', 3.0),
+		(r'^access-list \S+ extended ', 2.0),
+		(r'^nat \([^\s,()]+,[^\s()]+\)', 2.0),
+		(r'^class-map ', 0.5),
+		(r'^policy-map ', 0.5),
+	)
+	
+	PATTERNS = {
+		'hostname': (r'^hostname\s+(.+)$', re.MULTILINE),
+		'network_object': (r'^object network\s+(\S+)$\s+(.+?)(?=^!|\Z)', re.MULTILINE | re.DOTALL),
+		'object_host': r'host\s+(\S+)',
+		'object_subnet': r'subnet\s+(\S+)\s+(\S+)',
+		'object_description': (r'description\s+(.+?)$', re.MULTILINE),
+		'nat_rule': (r'nat\s+\(([^\s,()]+),([^\s()]+)\)\s+(\S+)\s+(.+?)$', re.MULTILINE),
+	}
+	
 	def parse(self, config_text: str) -> Dict[str, Any]:
 		"""Parse Cisco ASA configuration."""
 		if not self.detect_device_type(config_text):
 			raise ValueError("Not a valid Cisco ASA configuration.")
 		
-		hostname = self.extract_hostname(config_text)
-		
-		return {
-			"device_type": "cisco_asa",
-			"hostname": hostname,
-			"interfaces": self.extract_interfaces(config_text),
-			"acls": self.extract_acls(config_text),
-			"network_objects": self.extract_network_objects(config_text),
-			"nat_rules": self.extract_nat_rules(config_text)
-		}
+		return LazyResult({"device_type": "cisco_asa"}, {
+			"hostname": lambda: self.extract_hostname(config_text),
+			"interfaces": lambda: self.extract_interfaces(config_text),
+			"acls": lambda: self.extract_acls(config_text),
+			"network_objects": lambda: self.extract_network_objects(config_text),
+			"nat_rules": lambda: self.extract_nat_rules(config_text)
+		})
 	
 	def detect_device_type(self, config_text: str) -> bool:
 		"""Check if the configuration is from a Cisco ASA device."""
-		asa_indicators = [
-			r'ASA Version',
-			r'access-list.*extended',
-			r'class-map',
-			r'policy-map',
-			r'nat\s+\(\S+,\S+\)'
-		]
-		
-		for indicator in asa_indicators:
-			if re.search(indicator, config_text, re.IGNORECASE):
-				return True
-		
-		return False
+		return self.detection_score(config_text) > 0
 	
 	def extract_hostname(self, config_text: str) -> str:
 		"""Extract hostname from Cisco ASA configuration."""
-		hostname_match = re.search(r'^hostname\s+(.+)$', config_text, re.MULTILINE)
+		hostname_match = self.patterns['hostname'].search(config_text)
 		if hostname_match:
 			return hostname_match.group(1).strip()
 		return ""
@@ -321,29 +429,25 @@ class CiscoASAParser(Parser):
 		# ASA-specific ACL extraction
 		return []
 	
-	def extract_network_objects(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_network_objects(self, config_text: str) -> List[NetworkObject]:
 		"""Extract network objects from ASA configuration."""
 		network_objects = []
 		
 		# Find object network definitions
-		object_blocks = re.findall(
-			r'^object network\s+(\S+)$\s+(.+?)(?=^!|\Z)', 
-			config_text, 
-			re.MULTILINE | re.DOTALL
-		)
+		object_blocks = self.patterns['network_object'].findall(config_text)
 		
 		for object_name, object_config in object_blocks:
-			network_object = {
-				"name": object_name.strip(),
-				"type": "network",
-				"value": "",
-				"description": ""
-			}
+			network_object = NetworkObject(
+				name=object_name.strip(),
+				type="network",
+				value="",
+				description=""
+			)
 			
 			# Extract host or subnet
-			host_match = re.search(r'host\s+(\S+)', object_config)
-			subnet_match = re.search(r'subnet\s+(\S+)\s+(\S+)', object_config)
-			desc_match = re.search(r'description\s+(.+?)$', object_config, re.MULTILINE)
+			host_match = self.patterns['object_host'].search(object_config)
+			subnet_match = self.patterns['object_subnet'].search(object_config)
+			desc_match = self.patterns['object_description'].search(object_config)
 			
 			if host_match:
 				network_object["value"] = f"host {host_match.group(1)}"
@@ -357,24 +461,20 @@ class CiscoASAParser(Parser):
 		
 		return network_objects
 	
-	def extract_nat_rules(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_nat_rules(self, config_text: str) -> List[NATRule]:
 		"""Extract NAT rules from ASA configuration."""
 		nat_rules = []
 		
 		# Find NAT rule definitions
-		nat_matches = re.findall(
-			r'nat\s+\((\S+),(\S+)\)\s+(\S+)\s+(.+?)$', 
-			config_text, 
-			re.MULTILINE
-		)
+		nat_matches = self.patterns['nat_rule'].findall(config_text)
 		
 		for src_interface, dst_interface, nat_type, nat_config in nat_matches:
-			nat_rule = {
-				"source_interface": src_interface,
-				"destination_interface": dst_interface,
-				"type": nat_type,
-				"config": nat_config.strip()
-			}
+			nat_rule = NATRule(
+				source_interface=src_interface,
+				destination_interface=dst_interface,
+				type=nat_type,
+				config=nat_config.strip()
+			)
 			
 			nat_rules.append(nat_rule)
 		
@@ -384,41 +484,49 @@ class CiscoASAParser(Parser):
 class CiscoNexusParser(Parser):
 	"""Parser for Cisco Nexus data center switches."""
 	
+	PARSER_VERSION = "1"
+	
+	DETECTION_SIGNATURES = (
+		(r'^!Command: show running-config', 5.0),
+		(r'^feature \S+', 2.0),
+		(r'^vdc \S+', 2.0),
+		(r'^vpc domain \d+', 2.0),
+		(r'^interface Ethernet\d+/\d+', 1.0),
+		(r'^interface port-channel\d+', 1.0),
+	)
+	
+	PATTERNS = {
+		'hostname': (r'^hostname\s+(.+)$', re.MULTILINE),
+		'vlan': (r'^vlan\s+(\d+)$\s+(.+?)(?=^!|^vlan\s+\d+|\Z)', re.MULTILINE | re.DOTALL),
+		'vlan_name': (r'name\s+(.+?)$', re.MULTILINE),
+		'vlan_state': r'state\s+(\S+)',
+		'vpc_domain': (r'^vpc domain\s+(\d+)$\s+(.+?)(?=^!|\Z)', re.MULTILINE | re.DOTALL),
+		'vpc_peer_keepalive': r'peer-keepalive destination\s+(\S+)',
+		'vpc_peer_gateway': r'peer-gateway',
+		'port_channel': (r'^interface port-channel(\d+)$\s+(.+?)(?=^interface|\Z)', re.MULTILINE | re.DOTALL),
+		'port_channel_vpc': r'vpc\s+(\d+)',
+	}
+	
 	def parse(self, config_text: str) -> Dict[str, Any]:
 		"""Parse Cisco Nexus configuration."""
 		if not self.detect_device_type(config_text):
 			raise ValueError("Not a valid Cisco Nexus configuration.")
 		
-		hostname = self.extract_hostname(config_text)
-		
-		return {
-			"device_type": "cisco_nexus",
-			"hostname": hostname,
-			"interfaces": self.extract_interfaces(config_text),
-			"vlans": self.extract_vlans(config_text),
-			"vpc": self.extract_vpc(config_text),
-			"vdc": self.extract_vdc(config_text)
-		}
+		return LazyResult({"device_type": "cisco_nexus"}, {
+			"hostname": lambda: self.extract_hostname(config_text),
+			"interfaces": lambda: self.extract_interfaces(config_text),
+			"vlans": lambda: self.extract_vlans(config_text),
+			"vpc": lambda: self.extract_vpc(config_text),
+			"vdc": lambda: self.extract_vdc(config_text)
+		})
 	
 	def detect_device_type(self, config_text: str) -> bool:
 		"""Check if the configuration is from a Cisco Nexus device."""
-		nexus_indicators = [
-			r'feature\s+',
-			r'vdc\s+',
-			r'vpc domain',
-			r'interface Ethernet\d+/\d+',
-			r'interface port-channel'
-		]
-		
-		for indicator in nexus_indicators:
-			if re.search(indicator, config_text, re.IGNORECASE):
-				return True
-		
-		return False
+		return self.detection_score(config_text) > 0
 	
 	def extract_hostname(self, config_text: str) -> str:
 		"""Extract hostname from Cisco Nexus configuration."""
-		hostname_match = re.search(r'^hostname\s+(.+)$', config_text, re.MULTILINE)
+		hostname_match = self.patterns['hostname'].search(config_text)
 		if hostname_match:
 			return hostname_match.group(1).strip()
 		return ""
@@ -429,31 +537,27 @@ class CiscoNexusParser(Parser):
 		# Would include different interface types and Nexus-specific parameters
 		return []
 	
-	def extract_vlans(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_vlans(self, config_text: str) -> List[NexusVlan]:
 		"""Extract VLAN information from Nexus configuration."""
 		vlans = []
 		
 		# Find VLAN definitions
-		vlan_blocks = re.findall(
-			r'^vlan\s+(\d+)$\s+(.+?)(?=^!|^vlan\s+\d+|\Z)', 
-			config_text, 
-			re.MULTILINE | re.DOTALL
-		)
+		vlan_blocks = self.patterns['vlan'].findall(config_text)
 		
 		for vlan_id, vlan_config in vlan_blocks:
-			vlan = {
-				"id": vlan_id.strip(),
-				"name": "",
-				"state": "active"
-			}
+			vlan = NexusVlan(
+				id=vlan_id.strip(),
+				name="",
+				state="active"
+			)
 			
 			# Extract VLAN name
-			name_match = re.search(r'name\s+(.+?)$', vlan_config, re.MULTILINE)
+			name_match = self.patterns['vlan_name'].search(vlan_config)
 			if name_match:
 				vlan["name"] = name_match.group(1).strip()
 			
 			# Extract VLAN state
-			state_match = re.search(r'state\s+(\S+)', vlan_config)
+			state_match = self.patterns['vlan_state'].search(vlan_config)
 			if state_match:
 				vlan["state"] = state_match.group(1)
 			
@@ -471,40 +575,32 @@ class CiscoNexusParser(Parser):
 		}
 		
 		# Extract vPC domain
-		vpc_domain_match = re.search(
-			r'^vpc domain\s+(\d+)$\s+(.+?)(?=^!|\Z)', 
-			config_text, 
-			re.MULTILINE | re.DOTALL
-		)
+		vpc_domain_match = self.patterns['vpc_domain'].search(config_text)
 		
 		if vpc_domain_match:
 			vpc["domain_id"] = vpc_domain_match.group(1)
 			vpc_config = vpc_domain_match.group(2)
 			
 			# Extract peer-keepalive
-			keepalive_match = re.search(r'peer-keepalive destination\s+(\S+)', vpc_config)
+			keepalive_match = self.patterns['vpc_peer_keepalive'].search(vpc_config)
 			if keepalive_match:
 				vpc["peer_keepalive"] = keepalive_match.group(1)
 			
 			# Check for peer-gateway
-			if re.search(r'peer-gateway', vpc_config):
+			if self.patterns['vpc_peer_gateway'].search(vpc_config):
 				vpc["peer_gateway"] = True
 		
 		# Find port-channels with vPC configuration
-		po_blocks = re.findall(
-			r'^interface port-channel(\d+)$\s+(.+?)(?=^interface|\Z)', 
-			config_text, 
-			re.MULTILINE | re.DOTALL
-		)
+		po_blocks = self.patterns['port_channel'].findall(config_text)
 		
 		for po_id, po_config in po_blocks:
-			vpc_match = re.search(r'vpc\s+(\d+)', po_config)
+			vpc_match = self.patterns['port_channel_vpc'].search(po_config)
 			if vpc_match:
 				vpc_id = vpc_match.group(1)
-				vpc["port_channels"].append({
-					"port_channel_id": po_id,
-					"vpc_id": vpc_id
-				})
+				vpc["port_channels"].append(VPCPortChannel(
+					port_channel_id=po_id,
+					vpc_id=vpc_id
+				))
 		
 		return vpc
 	
@@ -0,0 +1,127 @@
+"""
+Signature based device type detection.
+
+Every parser class declares weighted regular expressions in its
+``DETECTION_SIGNATURES`` attribute. A ``SignatureSet`` holds the signatures
+of any number of parser classes and searches only a bounded prefix of a
+configuration for each of them. Each signature counts at most once and the
+weights of the matched signatures are added up per parser class.
+"""
+
+import itertools
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Type, Union
+from .buffers import Buffer
+from .patterns import REGISTRY, CompiledPattern
+
+# Number of characters of a configuration that detection looks at
+DETECTION_SAMPLE_SIZE = 256 * 1024
+
+
+class SignatureSet:
+	"""
+	The detection signatures of several parser classes.
+
+	Every distinct signature is searched for on its own, so signatures of
+	different parsers that match the same line are all credited. Joining them
+	into one alternation would report only the first alternative at each
+	position and scan no faster, because ``re`` tries every alternative at
+	every position either way. A search stops at the first match, so the
+	signatures that do match cost little.
+
+	Attributes:
+		parser_classes (Tuple[type, ...]): The parser classes, in priority order.
+		signatures (List[Tuple[CompiledPattern, List[Tuple[int, float]]]]): Every
+			distinct signature, registered in the shared pattern registry as
+			``<parser class>.signature<n>``, with the index of each parser
+			class it belongs to and its weight there.
+	"""
+
+	def __init__(self, parser_classes: Sequence[type]):
+		self.parser_classes = tuple(parser_classes)
+
+		# Pattern -> [(index of the parser class, weight), ...]; a pattern shared
+		# by several parsers is searched for once and credited to all of them
+		owners: Dict[str, Tuple[CompiledPattern, List[Tuple[int, float]]]] = {}
+		for class_index, parser_class in enumerate(self.parser_classes):
+			for number, (pattern, weight) in enumerate(parser_class.DETECTION_SIGNATURES):
+				compiled = REGISTRY.register(f"{parser_class.__name__}.signature{number}", pattern, re.MULTILINE)
+				owners.setdefault(pattern, (compiled, []))[1].append((class_index, weight))
+		self.signatures = list(owners.values())
+
+	def scores(self, config_text: Union[str, Buffer]) -> List[float]:
+		"""
+		Score a configuration against every parser class.
+
+		Args:
+			config_text (Union[str, Buffer]): The raw configuration text, or its
+				bytes, e.g. an ``mmap`` of the file, which are scanned without
+				being decoded; only the first ``DETECTION_SAMPLE_SIZE``
+				characters or bytes are scanned.
+
+		Returns:
+			List[float]: The summed weight of the matched signatures of each
+			parser class, in the order of ``parser_classes``.
+		"""
+		scores = [0.0] * len(self.parser_classes)
+		for pattern, pattern_owners in self.signatures:
+			if pattern.search(config_text, 0, DETECTION_SAMPLE_SIZE):
+				for class_index, weight in pattern_owners:
+					scores[class_index] += weight
+		return scores
+
+	def rank(self, config_text: Union[str, Buffer]) -> List[Tuple[type, float]]:
+		"""
+		Rank the parser classes that match a configuration.
+
+		Args:
+			config_text (Union[str, Buffer]): The raw configuration text or bytes.
+
+		Returns:
+			List[Tuple[type, float]]: ``(parser class, confidence)`` pairs for every
+			class with at least one matching signature, best first. The
+			confidence is the class's share of the total matched weight, between
+			0 and 1. Ties keep the order of ``parser_classes``.
+		"""
+		scores = self.scores(config_text)
+		total = sum(scores)
+		if not total:
+			return []
+
+		ranked = [
+			(parser_class, score / total)
+			for parser_class, score in zip(self.parser_classes, scores)
+			if score
+		]
+		ranked.sort(key=lambda item: -item[1])
+		return ranked
+
+
+@lru_cache(maxsize=None)
+def get_signature_set(parser_classes: Tuple[Type, ...]) -> SignatureSet:
+	"""Return the compiled signature set for the given parser classes, building it once."""
+	return SignatureSet(parser_classes)
+
+
+def sample_lines(lines: Iterable[str]) -> Tuple[str, Iterator[str]]:
+	"""
+	Read the detection sample from the start of a stream of lines.
+
+	Args:
+		lines (Iterable[str]): The configuration lines, e.g. an open file.
+
+	Returns:
+		Tuple[str, Iterator[str]]: The first ``DETECTION_SAMPLE_SIZE`` characters
+		or so as text, and an iterator over all of the lines, including the
+		ones read for the sample.
+	"""
+	lines = iter(lines)
+	head = []
+	size = 0
+	for line in lines:
+		head.append(line.rstrip('\r\n'))
+		size += len(line)
+		if size >= DETECTION_SAMPLE_SIZE:
+			break
+	return '\n'.join(head), itertools.chain(head, lines)
@@ -5,8 +5,13 @@ This module provides a factory class that can automatically select the appropria
 parser based on the content of the configuration file.
 """
 
-from typing import Optional, List, Type
+from typing import Any, Dict, Optional, List, Tuple, Type, Union
+
+from django.conf import settings
+
 from .base import Parser
+from .buffers import Buffer, map_file
+from .detection import get_signature_set
 from .cisco import CiscoIOSParser, CiscoASAParser, CiscoNexusParser
 from .fortinet import FortiGateParser, FortiSwitchParser
 from .juniper import JuniperJunOSParser
@@ -17,29 +22,72 @@ class ParserFactory:
 	Factory class for creating device configuration parsers.
 	
 	This factory determines the appropriate parser to use based on the content
-	of a configuration file.
+	of a configuration file. The detection signatures of all parsers are
+	evaluated together in a single scan over a bounded prefix of the file.
 	"""
 	
+	# Parser class for each device type slug
+	DEVICE_TYPE_PARSERS = {
+		'cisco-ios': CiscoIOSParser,
+		'cisco-asa': CiscoASAParser,
+		'cisco-nexus': CiscoNexusParser,
+		'fortigate': FortiGateParser,
+		'fortiswitch': FortiSwitchParser,
+		'juniper-junos': JuniperJunOSParser
+	}
+	
 	@classmethod
-	def get_parser(cls, config_text: str) -> Optional[Parser]:
+	def get_parser(cls, config_text: Union[str, Buffer]) -> Optional[Parser]:
 		"""
 		Get the appropriate parser for the given configuration text.
 		
 		Args:
-			config_text (str): The device configuration text.
+			config_text (Union[str, Buffer]): The device configuration text, or
+				its bytes, which are scanned without being decoded.
 			
 		Returns:
-			Optional[Parser]: An instance of a Parser that can handle the configuration,
+			Optional[Parser]: An instance of the best scoring Parser for the configuration,
 							  or None if no compatible parser was found.
 		"""
-		parsers = cls._get_parser_classes()
+		ranked = cls.detect(config_text)
+		if not ranked:
+			return None
 		
-		for parser_class in parsers:
-			parser = parser_class()
-			if parser.detect_device_type(config_text):
-				return parser
+		return cls.create(ranked[0][0])
+	
+	@classmethod
+	def detect(cls, config_text: Union[str, Buffer]) -> List[Tuple[Type[Parser], float]]:
+		"""
+		Score the configuration text against every available parser.
 		
-		return None
+		Args:
+			config_text (Union[str, Buffer]): The device configuration text, or
+				its bytes, which are scanned without being decoded.
+			
+		Returns:
+			List[Tuple[Type[Parser], float]]: ``(parser class, confidence)`` pairs for
+			every parser with a matching signature, best first. Confidences are
+			between 0 and 1 and add up to 1; ties keep the order of
+			``_get_parser_classes``.
+		"""
+		return get_signature_set(tuple(cls._get_parser_classes())).rank(config_text)
+	
+	@classmethod
+	def detect_file(cls, path: str) -> List[Tuple[Type[Parser], float]]:
+		"""
+		Score a configuration file against every available parser.
+		
+		The file is memory-mapped and its first bytes are scanned in place, so
+		detecting the vendor of a very large capture reads only its beginning.
+		
+		Args:
+			path (str): The configuration file.
+			
+		Returns:
+			List[Tuple[Type[Parser], float]]: As returned by ``detect``.
+		"""
+		with map_file(path) as buffer:
+			return cls.detect(buffer)
 	
 	@classmethod
 	def get_parser_for_device_type(cls, device_type_slug: str) -> Optional[Parser]:
@@ -53,19 +101,45 @@ class ParserFactory:
 			Optional[Parser]: An instance of a Parser for the device type,
 							  or None if no compatible parser was found.
 		"""
-		parser_map = {
-			'cisco-ios': CiscoIOSParser,
-			'cisco-asa': CiscoASAParser,
-			'cisco-nexus': CiscoNexusParser,
-			'fortigate': FortiGateParser,
-			'fortiswitch': FortiSwitchParser,
-			'juniper-junos': JuniperJunOSParser
-		}
-		
-		parser_class = parser_map.get(device_type_slug.lower())
+		parser_class = cls.DEVICE_TYPE_PARSERS.get(device_type_slug.lower())
 		if parser_class:
-			return parser_class()
+			return cls.create(parser_class)
+		
+		return None
+	
+	@classmethod
+	def create(cls, parser_class: Type[Parser]) -> Parser:
+		"""
+		Create a parser with the options configured in the Django settings.
 		
+		Args:
+			parser_class (Type[Parser]): The parser class.
+			
+		Returns:
+			Parser: The parser, with every argument in its ``OPTION_SETTINGS``
+			whose setting is defined taken from that setting.
+		"""
+		options: Dict[str, Any] = {}
+		if settings.configured:
+			for argument, setting in parser_class.OPTION_SETTINGS.items():
+				if hasattr(settings, setting):
+					options[argument] = getattr(settings, setting)
+		return parser_class(**options)
+	
+	@classmethod
+	def get_device_type_slug(cls, parser_class: Type[Parser]) -> Optional[str]:
+		"""
+		Get the device type slug a parser class handles.
+		
+		Args:
+			parser_class (Type[Parser]): The parser class.
+			
+		Returns:
+			Optional[str]: The device type slug, or None if the class is not mapped.
+		"""
+		for slug, mapped_class in cls.DEVICE_TYPE_PARSERS.items():
+			if mapped_class is parser_class:
+				return slug
 		return None
 	
 	@classmethod
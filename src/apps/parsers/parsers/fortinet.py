@@ -6,13 +6,96 @@ This module contains parser implementations for Fortinet device types:
 - FortiSwitch (Switches)
 """
 
-import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Union
 from .base import Parser
+from .fortios import VDOM_LIST_SECTION, FortiOSConfig, join_stanzas, split_stanzas
+from .incremental import ConfigDiff, Stanza
+from .results import (
+	AddressObject, FirewallPolicy, FortiGateInterface, IPsecPhase2, IPsecTunnel, LazyResult, ServiceObject, SwitchPort,
+	SwitchVlan
+)
+
+
+# Result sections that are reported per VDOM
+VDOM_SECTIONS = ("policies", "address_objects", "service_objects", "vpn", "interfaces")
+
+
+def group_vdoms(names: List[str], result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+	"""
+	Group the tables of a FortiGate result by the VDOM their entries are configured in.
+	
+	Args:
+		names (List[str]): The VDOM names, in configuration order.
+		result (Dict[str, Any]): The parse result; every section in
+			``VDOM_SECTIONS`` is read.
+		
+	Returns:
+		Dict[str, Dict[str, Any]]: The policies, address objects, service
+		objects, VPN configuration and interfaces of every VDOM.
+	"""
+	vdoms = {
+		name: {
+			"policies": [],
+			"address_objects": [],
+			"service_objects": [],
+			"vpn": {"ipsec": [], "ssl": {"enabled": False, "portals": []}},
+			"interfaces": []
+		}
+		for name in names
+	}
+	for section in ("policies", "address_objects", "service_objects", "interfaces"):
+		for entry in result[section]:
+			vdom = vdoms.get(entry["vdom"])
+			if vdom is not None:
+				vdom[section].append(entry)
+	for tunnel in result["vpn"]["ipsec"]:
+		vdom = vdoms.get(tunnel["vdom"])
+		if vdom is not None:
+			vdom["vpn"]["ipsec"].append(tunnel)
+	return vdoms
 
 
 class FortiGateParser(Parser):
-	"""Parser for FortiGate firewall devices."""
+	"""
+	Parser for FortiGate firewall devices.
+	
+	Args:
+		vdom_workers (Optional[int]): Number of worker processes used to build
+			the tables of large multi-VDOM configurations in parallel (see
+			``FortiOSConfig.from_lines``). Everything is parsed in-process when
+			this is None or 1.
+	"""
+	
+	PARSER_VERSION = "3"
+	
+	OPTION_SETTINGS = {"vdom_workers": "PARSE_VDOM_WORKERS"}
+	
+	DETECTION_SIGNATURES = (
+		(r'^#config-version=FG[A-Z0-9]*-', 5.0),
+		(r'^[ \t]*config firewall policy[ \t]*$', 3.0),
+		(r'^[ \t]*config vpn ipsec phase1-interface[ \t]*$', 2.0),
+		(r'^[ \t]*config firewall address[ \t]*$', 2.0),
+		(r'^[ \t]*config system global[ \t]*$', 1.0),
+		(r'^[ \t]*set vdom ', 1.0),
+	)
+	
+	# Stanzas are table entries and section settings, by section path
+	INCREMENTAL_SECTIONS = {
+		"hostname": ('system global',),
+		"interfaces": ('system interface',),
+		"policies": ('firewall policy',),
+		"address_objects": ('firewall address',),
+		"service_objects": ('firewall service custom',),
+		"vpn": ('vpn ipsec phase1-interface', 'vpn ipsec phase2-interface'),
+		"vdoms": (VDOM_LIST_SECTION,),
+	}
+	INCREMENTAL_DEPENDENCIES = {"vdoms": VDOM_SECTIONS}
+	INCREMENTAL_ENTRIES = frozenset({"interfaces", "policies", "address_objects", "service_objects"})
+	
+	def __init__(self, vdom_workers: Optional[int] = None):
+		self.vdom_workers = vdom_workers
+		self._config = None
+		self._config_text = None
 	
 	def parse(self, config_text: str) -> Dict[str, Any]:
 		"""
@@ -30,263 +113,197 @@ class FortiGateParser(Parser):
 		if not self.detect_device_type(config_text):
 			raise ValueError("Not a valid FortiGate configuration.")
 		
-		hostname = self.extract_hostname(config_text)
+		return self._parse_config(config_text)
+	
+	def _parse_config(self, config_text: str) -> LazyResult:
+		"""Map every section to its extractor."""
+		result = LazyResult({"device_type": "fortigate"}, {
+			"hostname": lambda: self.extract_hostname(config_text),
+			"interfaces": lambda: self.extract_interfaces(config_text),
+			"policies": lambda: self.extract_policies(config_text),
+			"address_objects": lambda: self.extract_address_objects(config_text),
+			"service_objects": lambda: self.extract_service_objects(config_text),
+			"vpn": lambda: self.extract_vpn(config_text),
+			"vdoms": lambda: self.parse_vdoms(config_text, result)
+		})
+		return result
+	
+	def parse_vdoms(self, config_text: str, result: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+		"""
+		Report the tables of a multi-VDOM configuration per VDOM.
 		
-		return {
-			"device_type": "fortigate",
-			"hostname": hostname,
-			"interfaces": self.extract_interfaces(config_text),
-			"policies": self.extract_policies(config_text),
-			"address_objects": self.extract_address_objects(config_text),
-			"service_objects": self.extract_service_objects(config_text),
-			"vpn": self.extract_vpn(config_text)
-		}
+		Every entry of the top-level tables carries the VDOM it is configured
+		in, so the VDOMs are grouped from the same single pass over the
+		configuration rather than parsed again.
+		
+		Args:
+			config_text (str): The raw FortiGate configuration text.
+			result (Optional[Dict[str, Any]]): The parse result of the
+				configuration, to avoid extracting its tables again.
+			
+		Returns:
+			Dict[str, Dict[str, Any]]: Results keyed by VDOM name, in configuration
+			order. Empty when VDOMs are not enabled.
+		"""
+		names = self.get_config(config_text).vdom_names()
+		if not names:
+			return {}
+		if result is None:
+			result = self._parse_config(config_text)
+		return group_vdoms(names, result)
+	
+	def parse_stanzas(self, stanzas: List[Stanza]) -> LazyResult:
+		"""Parse a configuration made of the given stanzas only."""
+		return self._parse_config(join_stanzas(stanzas))
+	
+	def split_blocks(self, config_text: str) -> List[Stanza]:
+		"""Split the configuration into table entries and section settings (see fortios.split_stanzas)."""
+		return split_stanzas(config_text.splitlines())
+	
+	def reparse_section(self, name: str, diff: ConfigDiff, previous: Any, result: Dict[str, Any]) -> Any:
+		"""
+		Extract a changed section of a new configuration version.
+		
+		VDOMs are grouped from the new result's tables, which are merged entry
+		by entry themselves.
+		
+		Args:
+			name (str): The result section.
+			diff (ConfigDiff): The stanzas of the previous and the new version.
+			previous (Any): The section in the previous result.
+			result (Dict[str, Any]): The new result.
+			
+		Returns:
+			Any: The section of the new configuration.
+		"""
+		if name != "vdoms":
+			return super().reparse_section(name, diff, previous, result)
+		return group_vdoms([stanza.key for stanza in diff.current((VDOM_LIST_SECTION,))], result)
 	
 	def detect_device_type(self, config_text: str) -> bool:
 		"""Check if the configuration is from a FortiGate device."""
-		fortigate_indicators = [
-			r'config\s+system\s+global',
-			r'config\s+firewall\s+policy',
-			r'config\s+vpn\s+ipsec\s+phase1-interface',
-			r'set\s+vdom\s+',
-			r'config\s+firewall\s+address'
-		]
+		return self.detection_score(config_text) > 0
+	
+	def get_config(self, config_text: Union[str, FortiOSConfig]) -> FortiOSConfig:
+		"""
+		Return the section tree for the given configuration text.
 		
-		for indicator in fortigate_indicators:
-			if re.search(indicator, config_text, re.IGNORECASE):
-				return True
+		The tree is built in a single state-machine pass and reused for as long
+		as the parser is asked about the same configuration text, so calling
+		several extractors in a row only walks the configuration once. All
+		extractors also accept an already built tree in place of the text.
 		
-		return False
+		Args:
+			config_text (Union[str, FortiOSConfig]): The raw FortiOS configuration
+				text, or a tree built with FortiOSConfig.
+			
+		Returns:
+			FortiOSConfig: The parsed configuration sections.
+		"""
+		if isinstance(config_text, FortiOSConfig):
+			return config_text
+		if self._config is None or self._config_text is not config_text:
+			self._config = FortiOSConfig.from_text(config_text, self.vdom_workers)
+			self._config_text = config_text
+		return self._config
 	
 	def extract_hostname(self, config_text: str) -> str:
 		"""Extract hostname from FortiGate configuration."""
-		hostname_match = re.search(r'set\s+hostname\s+"?([^"\r\n]+)"?', config_text)
-		if hostname_match:
-			return hostname_match.group(1).strip()
+		for _, section in self.get_config(config_text).find_sections('system global'):
+			hostname = section.get('hostname')
+			if hostname:
+				return hostname.strip()
 		return ""
 	
-	def extract_interfaces(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_interfaces(self, config_text: str) -> List[FortiGateInterface]:
 		"""Extract interface configurations from FortiGate."""
 		interfaces = []
 		
-		# Find interface configurations
-		interface_blocks = re.findall(
-			r'config\s+system\s+interface\s+.*?edit\s+"([^"]+)"(.*?)next\s+.*?end',
-			config_text,
-			re.DOTALL
-		)
-		
-		for interface_name, interface_config in interface_blocks:
-			interface = {
-				"name": interface_name.strip(),
-				"ip": "",
-				"netmask": "",
-				"vdom": "root",
-				"type": "physical",
-				"description": "",
-				"enabled": True
-			}
-			
-			# Extract IP
-			ip_match = re.search(r'set\s+ip\s+(\S+)\s+(\S+)', interface_config)
-			if ip_match:
-				interface["ip"] = ip_match.group(1)
-				interface["netmask"] = ip_match.group(2)
-			
-			# Extract VDOM
-			vdom_match = re.search(r'set\s+vdom\s+"?([^"\r\n]+)"?', interface_config)
-			if vdom_match:
-				interface["vdom"] = vdom_match.group(1)
-			
-			# Extract interface type
-			type_match = re.search(r'set\s+type\s+(\S+)', interface_config)
-			if type_match:
-				interface["type"] = type_match.group(1)
-			
-			# Extract description
-			desc_match = re.search(r'set\s+description\s+"([^"]+)"', interface_config)
-			if desc_match:
-				interface["description"] = desc_match.group(1)
+		for interface_entry in self.get_config(config_text).entries('system interface'):
+			interface = FortiGateInterface(
+				name=interface_entry.name,
+				ip="",
+				netmask="",
+				vdom=interface_entry.get('vdom', "root"),
+				type=interface_entry.get('type', "physical"),
+				description=interface_entry.get('description'),
+				enabled=interface_entry.get('status').lower() != "down"
+			)
 			
-			# Check status
-			status_match = re.search(r'set\s+status\s+(\S+)', interface_config)
-			if status_match and status_match.group(1).lower() == "down":
-				interface["enabled"] = False
+			ip = interface_entry.get_list('ip')
+			if len(ip) >= 2:
+				interface["ip"] = ip[0]
+				interface["netmask"] = ip[1]
 			
 			interfaces.append(interface)
 		
 		return interfaces
 	
-	def extract_policies(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_policies(self, config_text: str) -> List[FirewallPolicy]:
 		"""Extract firewall policies from FortiGate configuration."""
 		policies = []
 		
-		# Find policy configurations
-		policy_blocks = re.findall(
-			r'edit\s+(\d+)(.*?)next',
-			config_text,
-			re.DOTALL
-		)
-		
-		for policy_id, policy_config in policy_blocks:
-			# Skip if this doesn't look like a firewall policy
-			if not re.search(r'set\s+action\s+', policy_config):
-				continue
-				
-			policy = {
-				"id": policy_id.strip(),
-				"name": "",
-				"srcintf": [],
-				"dstintf": [],
-				"srcaddr": [],
-				"dstaddr": [],
-				"service": [],
-				"action": "deny",
-				"status": "enabled",
-				"nat": False
-			}
-			
-			# Extract policy name
-			name_match = re.search(r'set\s+name\s+"([^"]+)"', policy_config)
-			if name_match:
-				policy["name"] = name_match.group(1)
-			
-			# Extract source interfaces
-			srcintf_match = re.search(r'set\s+srcintf\s+(.+?)$', policy_config, re.MULTILINE)
-			if srcintf_match:
-				srcintf_str = srcintf_match.group(1).strip()
-				srcintf_list = re.findall(r'"([^"]+)"', srcintf_str)
-				policy["srcintf"] = srcintf_list
-			
-			# Extract destination interfaces
-			dstintf_match = re.search(r'set\s+dstintf\s+(.+?)$', policy_config, re.MULTILINE)
-			if dstintf_match:
-				dstintf_str = dstintf_match.group(1).strip()
-				dstintf_list = re.findall(r'"([^"]+)"', dstintf_str)
-				policy["dstintf"] = dstintf_list
-			
-			# Extract source addresses
-			srcaddr_match = re.search(r'set\s+srcaddr\s+(.+?)$', policy_config, re.MULTILINE)
-			if srcaddr_match:
-				srcaddr_str = srcaddr_match.group(1).strip()
-				srcaddr_list = re.findall(r'"([^"]+)"', srcaddr_str)
-				policy["srcaddr"] = srcaddr_list
-			
-			# Extract destination addresses
-			dstaddr_match = re.search(r'set\s+dstaddr\s+(.+?)$', policy_config, re.MULTILINE)
-			if dstaddr_match:
-				dstaddr_str = dstaddr_match.group(1).strip()
-				dstaddr_list = re.findall(r'"([^"]+)"', dstaddr_str)
-				policy["dstaddr"] = dstaddr_list
-			
-			# Extract services
-			service_match = re.search(r'set\s+service\s+(.+?)$', policy_config, re.MULTILINE)
-			if service_match:
-				service_str = service_match.group(1).strip()
-				service_list = re.findall(r'"([^"]+)"', service_str)
-				policy["service"] = service_list
-			
-			# Extract action
-			action_match = re.search(r'set\s+action\s+(\S+)', policy_config)
-			if action_match:
-				policy["action"] = action_match.group(1)
-			
-			# Check status
-			status_match = re.search(r'set\s+status\s+(\S+)', policy_config)
-			if status_match:
-				policy["status"] = status_match.group(1)
-			
-			# Check NAT
-			nat_match = re.search(r'set\s+nat\s+(\S+)', policy_config)
-			if nat_match and nat_match.group(1) == "enable":
-				policy["nat"] = True
-			
-			policies.append(policy)
+		for vdom, policy_entry in self.get_config(config_text).scoped_entries('firewall policy'):
+			policies.append(FirewallPolicy(
+				id=policy_entry.name,
+				vdom=vdom,
+				name=policy_entry.get('name'),
+				srcintf=policy_entry.get_list('srcintf'),
+				dstintf=policy_entry.get_list('dstintf'),
+				srcaddr=policy_entry.get_list('srcaddr'),
+				dstaddr=policy_entry.get_list('dstaddr'),
+				service=policy_entry.get_list('service'),
+				action=policy_entry.get('action', "deny"),
+				status=policy_entry.get('status', "enabled"),
+				nat=policy_entry.get('nat') == "enable"
+			))
 		
 		return policies
 	
-	def extract_address_objects(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_address_objects(self, config_text: str) -> List[AddressObject]:
 		"""Extract address objects from FortiGate configuration."""
 		address_objects = []
 		
-		# Find address configurations
-		address_blocks = re.findall(
-			r'config\s+firewall\s+address.*?edit\s+"([^"]+)"(.*?)next',
-			config_text,
-			re.DOTALL
-		)
-		
-		for addr_name, addr_config in address_blocks:
-			address = {
-				"name": addr_name.strip(),
-				"type": "ipmask",
-				"subnet": "",
-				"fqdn": "",
-				"comment": ""
-			}
-			
-			# Extract type
-			type_match = re.search(r'set\s+type\s+(\S+)', addr_config)
-			if type_match:
-				address["type"] = type_match.group(1)
+		for vdom, addr_entry in self.get_config(config_text).scoped_entries('firewall address'):
+			address = AddressObject(
+				name=addr_entry.name,
+				vdom=vdom,
+				type=addr_entry.get('type', "ipmask"),
+				subnet="",
+				fqdn="",
+				comment=addr_entry.get('comment')
+			)
 			
 			# Extract subnet if type is ipmask
 			if address["type"] == "ipmask":
-				subnet_match = re.search(r'set\s+subnet\s+(\S+)\s+(\S+)', addr_config)
-				if subnet_match:
-					address["subnet"] = f"{subnet_match.group(1)}/{subnet_match.group(2)}"
+				subnet = addr_entry.get_list('subnet')
+				if len(subnet) >= 2:
+					address["subnet"] = f"{subnet[0]}/{subnet[1]}"
 			
 			# Extract FQDN if type is fqdn
 			if address["type"] == "fqdn":
-				fqdn_match = re.search(r'set\s+fqdn\s+"([^"]+)"', addr_config)
-				if fqdn_match:
-					address["fqdn"] = fqdn_match.group(1)
-			
-			# Extract comment
-			comment_match = re.search(r'set\s+comment\s+"([^"]+)"', addr_config)
-			if comment_match:
-				address["comment"] = comment_match.group(1)
+				address["fqdn"] = addr_entry.get('fqdn')
 			
 			address_objects.append(address)
 		
 		return address_objects
 	
-	def extract_service_objects(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_service_objects(self, config_text: str) -> List[ServiceObject]:
 		"""Extract service objects from FortiGate configuration."""
 		service_objects = []
 		
-		# Find service configurations
-		service_blocks = re.findall(
-			r'config\s+firewall\s+service\s+custom.*?edit\s+"([^"]+)"(.*?)next',
-			config_text,
-			re.DOTALL
-		)
-		
-		for svc_name, svc_config in service_blocks:
-			service = {
-				"name": svc_name.strip(),
-				"protocol": "",
-				"ports": [],
-				"comment": ""
-			}
-			
-			# Extract protocol
-			protocol_match = re.search(r'set\s+protocol\s+(\S+)', svc_config)
-			if protocol_match:
-				service["protocol"] = protocol_match.group(1)
+		for vdom, svc_entry in self.get_config(config_text).scoped_entries('firewall service custom'):
+			service = ServiceObject(
+				name=svc_entry.name,
+				vdom=vdom,
+				protocol=svc_entry.get('protocol'),
+				ports=[],
+				comment=svc_entry.get('comment')
+			)
 			
 			# Extract ports for TCP/UDP
 			if service["protocol"] in ["TCP", "UDP", "SCTP"]:
-				proto_lower = service["protocol"].lower()
-				port_match = re.search(fr'set\s+{proto_lower}-portrange\s+(.+?)$', svc_config, re.MULTILINE)
-				if port_match:
-					port_ranges = port_match.group(1).strip().split(" ")
-					service["ports"] = port_ranges
-			
-			# Extract comment
-			comment_match = re.search(r'set\s+comment\s+"([^"]+)"', svc_config)
-			if comment_match:
-				service["comment"] = comment_match.group(1)
+				service["ports"] = svc_entry.get_list(f'{service["protocol"].lower()}-portrange')
 			
 			service_objects.append(service)
 		
@@ -301,94 +318,42 @@ class FortiGateParser(Parser):
 				"portals": []
 			}
 		}
+		config = self.get_config(config_text)
 		
-		# Find IPsec VPN phase1 configurations
-		phase1_blocks = re.findall(
-			r'config\s+vpn\s+ipsec\s+phase1-interface.*?edit\s+"([^"]+)"(.*?)next',
-			config_text,
-			re.DOTALL
-		)
-		
-		for vpn_name, vpn_config in phase1_blocks:
-			ipsec_vpn = {
-				"name": vpn_name.strip(),
-				"interface": "",
-				"remote_gw": "",
-				"mode": "main",
-				"proposal": [],
-				"dhgrp": [],
-				"psk": False,
-				"certificate": False,
-				"phase2": []
-			}
-			
-			# Extract interface
-			intf_match = re.search(r'set\s+interface\s+"([^"]+)"', vpn_config)
-			if intf_match:
-				ipsec_vpn["interface"] = intf_match.group(1)
-			
-			# Extract remote gateway
-			gw_match = re.search(r'set\s+remote-gw\s+(\S+)', vpn_config)
-			if gw_match:
-				ipsec_vpn["remote_gw"] = gw_match.group(1)
-			
-			# Extract mode
-			mode_match = re.search(r'set\s+mode\s+(\S+)', vpn_config)
-			if mode_match:
-				ipsec_vpn["mode"] = mode_match.group(1)
-			
-			# Extract proposals
-			proposal_match = re.search(r'set\s+proposal\s+(.+?)$', vpn_config, re.MULTILINE)
-			if proposal_match:
-				proposals = proposal_match.group(1).strip().split(" ")
-				ipsec_vpn["proposal"] = proposals
-			
-			# Extract DH groups
-			dhgrp_match = re.search(r'set\s+dhgrp\s+(.+?)$', vpn_config, re.MULTILINE)
-			if dhgrp_match:
-				dhgrps = dhgrp_match.group(1).strip().split(" ")
-				ipsec_vpn["dhgrp"] = dhgrps
-			
-			# Check authentication method
-			if re.search(r'set\s+psksecret', vpn_config):
-				ipsec_vpn["psk"] = True
-			if re.search(r'set\s+certificate', vpn_config):
-				ipsec_vpn["certificate"] = True
-			
-			# Find associated phase2 configurations
-			phase2_blocks = re.findall(
-				fr'config\s+vpn\s+ipsec\s+phase2-interface.*?edit\s+"([^"]+)".*?set\s+phase1name\s+"{vpn_name}"(.*?)next',
-				config_text,
-				re.DOTALL
+		# Group phase2 selectors by their phase1 tunnel in one pass; tunnel
+		# names are only unique within a VDOM
+		phase2_by_phase1: Dict[Tuple[Optional[str], str], List[IPsecPhase2]] = {}
+		for vdom, phase2_entry in config.scoped_entries('vpn ipsec phase2-interface'):
+			phase2 = IPsecPhase2(
+				name=phase2_entry.name,
+				proposal=phase2_entry.get_list('proposal'),
+				src_subnet=[],
+				dst_subnet=[]
 			)
 			
-			for phase2_name, phase2_config in phase2_blocks:
-				phase2 = {
-					"name": phase2_name.strip(),
-					"proposal": [],
-					"src_subnet": [],
-					"dst_subnet": []
-				}
-				
-				# Extract proposals
-				proposal_match = re.search(r'set\s+proposal\s+(.+?)$', phase2_config, re.MULTILINE)
-				if proposal_match:
-					proposals = proposal_match.group(1).strip().split(" ")
-					phase2["proposal"] = proposals
-				
-				# Extract source subnet
-				src_match = re.search(r'set\s+src-subnet\s+(\S+)\s+(\S+)', phase2_config)
-				if src_match:
-					phase2["src_subnet"].append(f"{src_match.group(1)}/{src_match.group(2)}")
-				
-				# Extract destination subnet
-				dst_match = re.search(r'set\s+dst-subnet\s+(\S+)\s+(\S+)', phase2_config)
-				if dst_match:
-					phase2["dst_subnet"].append(f"{dst_match.group(1)}/{dst_match.group(2)}")
-				
-				ipsec_vpn["phase2"].append(phase2)
+			src_subnet = phase2_entry.get_list('src-subnet')
+			if len(src_subnet) >= 2:
+				phase2["src_subnet"].append(f"{src_subnet[0]}/{src_subnet[1]}")
+			
+			dst_subnet = phase2_entry.get_list('dst-subnet')
+			if len(dst_subnet) >= 2:
+				phase2["dst_subnet"].append(f"{dst_subnet[0]}/{dst_subnet[1]}")
 			
-			vpn["ipsec"].append(ipsec_vpn)
+			phase2_by_phase1.setdefault((vdom, phase2_entry.get('phase1name')), []).append(phase2)
+		
+		for vdom, phase1_entry in config.scoped_entries('vpn ipsec phase1-interface'):
+			vpn["ipsec"].append(IPsecTunnel(
+				name=phase1_entry.name,
+				vdom=vdom,
+				interface=phase1_entry.get('interface'),
+				remote_gw=phase1_entry.get('remote-gw'),
+				mode=phase1_entry.get('mode', "main"),
+				proposal=phase1_entry.get_list('proposal'),
+				dhgrp=phase1_entry.get_list('dhgrp'),
+				psk='psksecret' in phase1_entry.settings,
+				certificate='certificate' in phase1_entry.settings,
+				phase2=phase2_by_phase1.get((vdom, phase1_entry.name), [])
+			))
 		
 		return vpn
 
@@ -396,42 +361,72 @@ class FortiGateParser(Parser):
 class FortiSwitchParser(Parser):
 	"""Parser for FortiSwitch devices."""
 	
+	PARSER_VERSION = "2"
+	
+	DETECTION_SIGNATURES = (
+		(r'^#config-version=FS[A-Z0-9]*-', 5.0),
+		(r'^[ \t]*config switch vlan[ \t]*$', 3.0),
+		(r'^[ \t]*config switch physical-port[ \t]*$', 3.0),
+		(r'(?i:FortiSwitch)[- ]?\d+', 1.0),
+		(r'^[ \t]*config system global[ \t]*$', 0.5),
+	)
+	
+	# Stanzas are table entries and section settings, by section path
+	INCREMENTAL_SECTIONS = {
+		"hostname": ('system global',),
+		"interfaces": (),
+		"vlans": ('switch vlan',),
+		"switch_ports": ('switch physical-port',),
+	}
+	INCREMENTAL_ENTRIES = frozenset({"vlans", "switch_ports"})
+	
+	def __init__(self):
+		self._config = None
+		self._config_text = None
+	
 	def parse(self, config_text: str) -> Dict[str, Any]:
 		"""Parse FortiSwitch configuration."""
 		if not self.detect_device_type(config_text):
 			raise ValueError("Not a valid FortiSwitch configuration.")
 		
-		hostname = self.extract_hostname(config_text)
-		
-		return {
-			"device_type": "fortiswitch",
-			"hostname": hostname,
-			"interfaces": self.extract_interfaces(config_text),
-			"vlans": self.extract_vlans(config_text),
-			"switch_ports": self.extract_switch_ports(config_text)
-		}
+		return self._parse_config(config_text)
+	
+	def _parse_config(self, config_text: str) -> LazyResult:
+		"""Map every section to its extractor."""
+		return LazyResult({"device_type": "fortiswitch"}, {
+			"hostname": lambda: self.extract_hostname(config_text),
+			"interfaces": lambda: self.extract_interfaces(config_text),
+			"vlans": lambda: self.extract_vlans(config_text),
+			"switch_ports": lambda: self.extract_switch_ports(config_text)
+		})
+	
+	def parse_stanzas(self, stanzas: List[Stanza]) -> LazyResult:
+		"""Parse a configuration made of the given stanzas only."""
+		return self._parse_config(join_stanzas(stanzas))
+	
+	def split_blocks(self, config_text: str) -> List[Stanza]:
+		"""Split the configuration into table entries and section settings (see fortios.split_stanzas)."""
+		return split_stanzas(config_text.splitlines())
 	
 	def detect_device_type(self, config_text: str) -> bool:
 		"""Check if the configuration is from a FortiSwitch device."""
-		fortiswitch_indicators = [
-			r'config\s+switch\s+vlan',
-			r'config\s+switch\s+physical-port',
-			r'config-version=[A-Z\d]+-FGT_',
-			r'FortiSwitch\s+\d+',
-			r'FortiOS'
-		]
-		
-		for indicator in fortiswitch_indicators:
-			if re.search(indicator, config_text, re.IGNORECASE):
-				return True
-		
-		return False
+		return self.detection_score(config_text) > 0
+	
+	def get_config(self, config_text: Union[str, FortiOSConfig]) -> FortiOSConfig:
+		"""Return the section tree for the given configuration text (see FortiGateParser.get_config)."""
+		if isinstance(config_text, FortiOSConfig):
+			return config_text
+		if self._config is None or self._config_text is not config_text:
+			self._config = FortiOSConfig.from_text(config_text)
+			self._config_text = config_text
+		return self._config
 	
 	def extract_hostname(self, config_text: str) -> str:
 		"""Extract hostname from FortiSwitch configuration."""
-		hostname_match = re.search(r'set\s+hostname\s+"?([^"\r\n]+)"?', config_text)
-		if hostname_match:
-			return hostname_match.group(1).strip()
+		for _, section in self.get_config(config_text).find_sections('system global'):
+			hostname = section.get('hostname')
+			if hostname:
+				return hostname.strip()
 		return ""
 	
 	def extract_interfaces(self, config_text: str) -> List[Dict[str, Any]]:
@@ -439,84 +434,31 @@ class FortiSwitchParser(Parser):
 		# Similar to FortiGate but with switch-specific details
 		return []
 	
-	def extract_vlans(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_vlans(self, config_text: str) -> List[SwitchVlan]:
 		"""Extract VLAN configurations from FortiSwitch."""
 		vlans = []
 		
-		# Find VLAN configurations
-		vlan_blocks = re.findall(
-			r'config\s+switch\s+vlan.*?edit\s+(\d+)(.*?)next',
-			config_text,
-			re.DOTALL
-		)
-		
-		for vlan_id, vlan_config in vlan_blocks:
-			vlan = {
-				"id": vlan_id.strip(),
-				"name": "",
-				"description": ""
-			}
-			
-			# Extract VLAN name
-			name_match = re.search(r'set\s+name\s+"([^"]+)"', vlan_config)
-			if name_match:
-				vlan["name"] = name_match.group(1)
-			
-			# Extract description
-			desc_match = re.search(r'set\s+description\s+"([^"]+)"', vlan_config)
-			if desc_match:
-				vlan["description"] = desc_match.group(1)
-			
-			vlans.append(vlan)
+		for vlan_entry in self.get_config(config_text).entries('switch vlan'):
+			vlans.append(SwitchVlan(
+				id=vlan_entry.name,
+				name=vlan_entry.get('name'),
+				description=vlan_entry.get('description')
+			))
 		
 		return vlans
 	
-	def extract_switch_ports(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_switch_ports(self, config_text: str) -> List[SwitchPort]:
 		"""Extract switch port configurations from FortiSwitch."""
 		switch_ports = []
 		
-		# Find switch port configurations
-		port_blocks = re.findall(
-			r'config\s+switch\s+physical-port.*?edit\s+"([^"]+)"(.*?)next',
-			config_text,
-			re.DOTALL
-		)
-		
-		for port_name, port_config in port_blocks:
-			port = {
-				"name": port_name.strip(),
-				"speed": "auto",
-				"status": "up",
-				"poe": False,
-				"vlan": "",
-				"description": ""
-			}
-			
-			# Extract speed
-			speed_match = re.search(r'set\s+speed\s+(\S+)', port_config)
-			if speed_match:
-				port["speed"] = speed_match.group(1)
-			
-			# Extract status
-			status_match = re.search(r'set\s+status\s+(\S+)', port_config)
-			if status_match:
-				port["status"] = status_match.group(1)
-			
-			# Check PoE status
-			poe_match = re.search(r'set\s+poe-status\s+(\S+)', port_config)
-			if poe_match and poe_match.group(1) == "enable":
-				port["poe"] = True
-			
-			# Extract VLAN
-			vlan_match = re.search(r'set\s+vlan\s+"?(\d+)"?', port_config)
-			if vlan_match:
-				port["vlan"] = vlan_match.group(1)
-			
-			# Extract description
-			desc_match = re.search(r'set\s+description\s+"([^"]+)"', port_config)
-			if desc_match:
-				port["description"] = desc_match.group(1)
-			
-			switch_ports.append(port)
+		for port_entry in self.get_config(config_text).entries('switch physical-port'):
+			switch_ports.append(SwitchPort(
+				name=port_entry.name,
+				speed=port_entry.get('speed', "auto"),
+				status=port_entry.get('status', "up"),
+				poe=port_entry.get('poe-status') == "enable",
+				vlan=port_entry.get('vlan'),
+				description=port_entry.get('description')
+			))
 		
-		return switch_ports 
\ No newline at end of file
+		return switch_ports
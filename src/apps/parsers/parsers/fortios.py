@@ -0,0 +1,570 @@
+"""
+Section tree for Fortinet FortiOS configurations.
+
+FortiOS configurations are built from ``config <path>`` / ``end`` sections
+that contain either ``set`` statements directly (e.g. ``config system global``)
+or table entries opened with ``edit <name>`` and closed with ``next``. Entries
+may contain nested ``config`` sections of their own. This module walks the
+configuration once with a small state machine that tracks the nested
+config/edit stack and files every section under its path, so extractors can
+go straight to the table they need.
+
+Backups taken with VDOMs enabled repeat ``config vdom`` / ``edit <name>``
+blocks, each carrying that VDOM's own tables. The body of every such block
+is itself a flat FortiOS configuration, so for very large configurations
+``FortiOSConfig.from_lines`` can split the bodies out while it walks the
+rest and build them in worker processes (see ``split_vdom_bodies``).
+
+For incremental parsing, ``split_stanzas`` cuts a configuration into its
+table entries and section settings without parsing their statements, and
+``join_stanzas`` turns a subset of them back into a configuration.
+"""
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .incremental import Stanza
+
+# Scope of the stanzas inside ``config global``
+GLOBAL_SCOPE = 'global'
+
+# Section of the empty stanzas that list the VDOMs; not a FortiOS section
+# path, so it cannot collide with a stanza cut from the configuration
+VDOM_LIST_SECTION = 'vdom list'
+
+
+# Quoted values (which may contain spaces) and plain words of a statement
+VALUE_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"|(\S+)')
+
+
+def split_values(text: str) -> List[str]:
+	"""
+	Split the arguments of a FortiOS statement into values.
+
+	Args:
+		text (str): The arguments, e.g. ``"port1" "port2"`` or ``10.0.0.1 255.255.255.0``.
+
+	Returns:
+		List[str]: The values with surrounding quotes removed.
+	"""
+	values = []
+	for quoted, word in VALUE_PATTERN.findall(text):
+		values.append(word if word else quoted.replace('\\"', '"'))
+	return values
+
+
+def quote_open(text: str, in_quote: bool = False) -> bool:
+	"""
+	Return whether a quoted value is still open at the end of a line.
+
+	Inside quotes a backslash escapes the next character, the same rule
+	``VALUE_PATTERN`` uses, so ``set comment "say \\"hi"`` is closed.
+
+	Args:
+		text (str): The line, or the part of it that holds values.
+		in_quote (bool): Whether the line continues a quoted value opened on
+			an earlier line.
+
+	Returns:
+		bool: True if the value continues on the next line.
+	"""
+	if '"' not in text:
+		return in_quote
+	escaped = False
+	for character in text:
+		if escaped:
+			escaped = False
+		elif in_quote and character == '\\':
+			escaped = True
+		elif character == '"':
+			in_quote = not in_quote
+	return in_quote
+
+
+def split_vdom_bodies(lines: Iterable[str], bodies: Dict[str, List[str]]) -> Iterator[str]:
+	"""
+	Yield the lines outside the ``edit <vdom>`` blocks of ``config vdom``.
+
+	The lines are consumed in a single pass. The body of every VDOM block is
+	collected in ``bodies`` instead of being yielded; the ``edit`` and
+	``next`` lines around it are yielded, so the VDOMs are still listed. A
+	VDOM that appears in several blocks (FortiOS lists every VDOM once up
+	front and again with its tables) gets the bodies of all of them, in
+	configuration order. Each body is itself a flat FortiOS configuration.
+
+	Args:
+		lines (Iterable[str]): The configuration lines, e.g. an open file.
+		bodies (Dict[str, List[str]]): Receives the body lines of every VDOM,
+			by VDOM name, in configuration order.
+
+	Yields:
+		str: The lines outside the VDOM bodies.
+	"""
+	depth = 0
+	vdom_depth: Optional[int] = None
+	body: Optional[List[str]] = None
+	in_quote = False
+
+	for raw_line in lines:
+		line = raw_line.strip()
+
+		if in_quote:
+			# Continuation of a quoted value spanning several lines
+			if body is not None:
+				body.append(raw_line)
+			else:
+				yield raw_line
+			in_quote = quote_open(line, True)
+			continue
+
+		keyword, _, arguments = line.partition(' ')
+
+		if body is not None:
+			if depth == vdom_depth and keyword in ('next', 'end'):
+				body = None
+			else:
+				body.append(raw_line)
+		if body is None:
+			yield raw_line
+
+		if keyword == 'config':
+			depth += 1
+			if depth == 1 and arguments.strip() == 'vdom':
+				vdom_depth = depth
+		elif keyword == 'end':
+			if depth == vdom_depth:
+				vdom_depth = None
+			depth = max(depth - 1, 0)
+		elif keyword == 'edit' and body is None and depth == vdom_depth:
+			values = split_values(arguments)
+			body = bodies.setdefault(values[0] if values else arguments.strip(), [])
+		elif keyword in ('set', 'append') and quote_open(arguments):
+			in_quote = True
+
+
+def build_sections(lines: Sequence[str]) -> Dict[str, 'FortiOSSection']:
+	"""
+	Build the sections of a VDOM body.
+
+	This is a module level function so that it can be sent to worker
+	processes when VDOMs are parsed in parallel.
+	"""
+	return FortiOSConfig.from_lines(lines).sections
+
+
+def split_stanzas(lines: Iterable[str]) -> List[Stanza]:
+	"""
+	Split a configuration into one stanza per table entry and per section's settings.
+
+	The lines are walked with the same config/edit/next/end stack as
+	``FortiOSConfig``, without parsing the statements. Each ``edit`` block of
+	a section becomes a stanza keyed by the entry name and scoped by the VDOM
+	it is configured in (or ``GLOBAL_SCOPE``). The statements of a section
+	outside its entries become a stanza without a key. Every VDOM also gets
+	an empty stanza in ``VDOM_LIST_SECTION``. Repeated sections and entries
+	are merged, and the stanzas are ordered the way ``FortiOSConfig.entries``
+	returns entries: top-level sections first, then ``config global``, then
+	each VDOM.
+
+	Args:
+		lines (Iterable[str]): The configuration lines.
+
+	Returns:
+		List[Stanza]: The stanzas; ``join_stanzas`` turns any subset of them
+		back into a configuration.
+	"""
+	blocks: Dict[Tuple[Optional[str], str, Optional[str]], List[str]] = {}
+	vdoms: Dict[str, None] = {}
+	# [path, entry] of every open section, outermost first
+	frames: List[List[Optional[str]]] = []
+
+	def locate() -> Tuple[Optional[List[str]], int]:
+		"""Return the block the current position belongs to and the depth at which its boundaries are."""
+		# Stanzas are cut from top-level sections and from the sections
+		# directly inside config global or a VDOM
+		scope, level = None, 0
+		if frames and frames[0][0] in (GLOBAL_SCOPE, 'vdom'):
+			path, entry = frames[0]
+			if path == GLOBAL_SCOPE and entry is None:
+				scope, level = GLOBAL_SCOPE, 1
+			elif path == 'vdom' and entry is not None:
+				scope, level = entry, 1
+			else:
+				return None, -1
+		if len(frames) <= level:
+			return None, -1
+		path, entry = frames[level]
+		return blocks.setdefault((scope, path, entry), []), level + 1
+
+	target: Optional[List[str]] = None
+	boundary_depth = -1
+	in_quote = False
+
+	for raw_line in lines:
+		raw_line = raw_line.rstrip('\r\n')
+		line = raw_line.strip()
+
+		if in_quote:
+			# Continuation of a quoted value spanning several lines
+			if target is not None:
+				target.append(raw_line)
+			in_quote = quote_open(line, True)
+			continue
+
+		if not line or line.startswith('#'):
+			continue
+
+		keyword, _, arguments = line.partition(' ')
+
+		if keyword not in ('config', 'end', 'edit', 'next'):
+			if target is not None:
+				target.append(raw_line)
+			if keyword in ('set', 'append') and frames and '"' in line:
+				_, _, value_text = arguments.strip().partition(' ')
+				if quote_open(value_text):
+					in_quote = True
+			continue
+
+		# Entry and section boundaries are rebuilt by join_stanzas
+		if target is not None and (keyword == 'config' or len(frames) != boundary_depth):
+			target.append(raw_line)
+
+		if keyword == 'config':
+			frames.append([arguments.strip(), None])
+		elif not frames:
+			continue
+		elif keyword == 'end':
+			frames.pop()
+		elif keyword == 'edit':
+			values = split_values(arguments)
+			frames[-1][1] = values[0] if values else arguments.strip()
+			if len(frames) == 1 and frames[0][0] == 'vdom':
+				vdoms.setdefault(frames[0][1])
+		else:
+			frames[-1][1] = None
+		target, boundary_depth = locate()
+
+	ranks = {None: 0, GLOBAL_SCOPE: 1}
+	for rank, name in enumerate(vdoms, 2):
+		ranks.setdefault(name, rank)
+	stanzas = [Stanza(VDOM_LIST_SECTION, name, name, '') for name in vdoms]
+	stanzas.extend(
+		Stanza(path, scope, entry, '\n'.join(block_lines))
+		for (scope, path, entry), block_lines in blocks.items()
+		if entry is not None or block_lines
+	)
+	stanzas.sort(key=lambda stanza: ranks.get(stanza.scope, len(ranks)))
+	return stanzas
+
+
+def quote_value(value: str) -> str:
+	"""Quote a value so that ``split_values`` returns it unchanged."""
+	return '"' + value.replace('"', '\\"') + '"'
+
+
+def join_stanzas(stanzas: Iterable[Stanza]) -> str:
+	"""
+	Build a configuration from stanzas returned by ``split_stanzas``.
+
+	Args:
+		stanzas (Iterable[Stanza]): The stanzas, in the order ``split_stanzas``
+			returned them.
+
+	Returns:
+		str: A configuration that parses to the same sections and entries.
+	"""
+	scopes: Dict[Optional[str], Dict[str, List[str]]] = {}
+	for stanza in stanzas:
+		sections = scopes.setdefault(stanza.scope, {})
+		if stanza.section == VDOM_LIST_SECTION:
+			continue
+		lines = sections.setdefault(stanza.section, [])
+		if stanza.key is None:
+			lines.append(stanza.text)
+		else:
+			lines.extend([f'edit {quote_value(stanza.key)}', stanza.text, 'next'])
+
+	lines: List[str] = []
+	for scope, sections in scopes.items():
+		body: List[str] = []
+		for path, section_lines in sections.items():
+			body.append(f'config {path}')
+			body.extend(section_lines)
+			body.append('end')
+		if scope is None:
+			lines.extend(body)
+		elif scope == GLOBAL_SCOPE:
+			lines.extend(['config global', *body, 'end'])
+		else:
+			lines.extend(['config vdom', f'edit {quote_value(scope)}', *body, 'next', 'end'])
+	return '\n'.join(lines)
+
+
+class FortiOSEntry:
+	"""
+	A table entry opened with ``edit <name>``.
+
+	Attributes:
+		name (str): The entry name or ID, without quotes.
+		settings (Dict[str, List[str]]): The ``set`` statements of the entry.
+		sections (Dict[str, FortiOSSection]): Nested ``config`` sections by path.
+		start (int): Zero-based line number of the ``edit`` line.
+		end (int): Zero-based line number just past the ``next`` line.
+	"""
+
+	__slots__ = ('name', 'settings', 'sections', 'start', 'end')
+
+	def __init__(self, name: str, start: int):
+		self.name = name
+		self.settings: Dict[str, List[str]] = {}
+		self.sections: Dict[str, 'FortiOSSection'] = {}
+		self.start = start
+		self.end = start + 1
+
+	def __repr__(self) -> str:
+		return f"<FortiOSEntry {self.name!r}>"
+
+	def get(self, key: str, default: str = "") -> str:
+		"""Return the first value of a ``set`` statement, or the default."""
+		values = self.settings.get(key)
+		if not values:
+			return default
+		return values[0]
+
+	def get_list(self, key: str) -> List[str]:
+		"""Return all values of a ``set`` statement."""
+		return list(self.settings.get(key, []))
+
+
+class FortiOSSection(FortiOSEntry):
+	"""
+	A ``config <path>`` section.
+
+	Sections hold their own ``set`` statements (for non-table sections such
+	as ``config system global``) as well as their table entries.
+
+	Attributes:
+		path (str): The section path, e.g. ``'firewall policy'``.
+		entries (Dict[str, FortiOSEntry]): Table entries in configuration order.
+	"""
+
+	__slots__ = ('entries',)
+
+	def __init__(self, path: str, start: int):
+		super().__init__(path, start)
+		self.entries: Dict[str, FortiOSEntry] = {}
+
+	def __repr__(self) -> str:
+		return f"<FortiOSSection {self.name!r} ({len(self.entries)} entries)>"
+
+	@property
+	def path(self) -> str:
+		return self.name
+
+	def __iter__(self) -> Iterator[FortiOSEntry]:
+		return iter(self.entries.values())
+
+
+class FortiOSConfig:
+	"""
+	A parsed FortiOS configuration.
+
+	Top-level sections are available by path. Sections repeated at the top
+	level (which FortiOS allows) are merged into a single section.
+
+	Attributes:
+		sections (Dict[str, FortiOSSection]): Top-level sections by path.
+		line_count (int): Number of lines in the parsed configuration.
+	"""
+
+	# Fewest lines of VDOM bodies worth starting worker processes for
+	PARALLEL_MIN_LINES = 200000
+
+	def __init__(self):
+		self.sections: Dict[str, FortiOSSection] = {}
+		self.line_count = 0
+
+	@classmethod
+	def from_text(cls, config_text: str, workers: Optional[int] = None) -> 'FortiOSConfig':
+		"""Build a configuration tree from the raw configuration text (see ``from_lines``)."""
+		return cls.from_lines(config_text.splitlines(), workers)
+
+	@classmethod
+	def from_lines(cls, lines: Iterable[str], workers: Optional[int] = None) -> 'FortiOSConfig':
+		"""
+		Build a configuration tree in a single pass over the lines.
+
+		With several workers, the bodies of the VDOMs are split out during the
+		pass and built in a pool of worker processes, provided they have at
+		least ``PARALLEL_MIN_LINES`` lines between them. Either way every line
+		is parsed once and the tree is the same.
+
+		Args:
+			lines (Iterable[str]): The configuration lines, e.g. an open file.
+			workers (Optional[int]): Number of worker processes for the VDOM
+				bodies; None or 1 builds the whole tree in this process.
+
+		Returns:
+			FortiOSConfig: The parsed configuration.
+		"""
+		config = cls()
+		if not workers or workers <= 1:
+			config._build(lines)
+			return config
+
+		bodies: Dict[str, List[str]] = {}
+		config._build(split_vdom_bodies(lines, bodies))
+		if len(bodies) > 1 and sum(map(len, bodies.values())) >= cls.PARALLEL_MIN_LINES:
+			with ProcessPoolExecutor(max_workers=workers) as executor:
+				chunksize = max(1, len(bodies) // (workers * 4))
+				vdom_sections = list(executor.map(build_sections, bodies.values(), chunksize=chunksize))
+		else:
+			vdom_sections = [build_sections(body) for body in bodies.values()]
+
+		# Graft the VDOM tables onto the VDOM entries the pass listed
+		vdom_entries = config.sections['vdom'].entries
+		for name, sections in zip(bodies, vdom_sections):
+			vdom_entries[name].sections = sections
+		config.line_count += sum(map(len, bodies.values()))
+		return config
+
+	def vdom_names(self) -> List[str]:
+		"""Return the names of the configured VDOMs, or an empty list without VDOMs."""
+		vdom_section = self.sections.get('vdom')
+		if vdom_section is None:
+			return []
+		return list(vdom_section.entries)
+
+	def section(self, path: str) -> Optional[FortiOSSection]:
+		"""
+		Return a top-level section.
+
+		Args:
+			path (str): The section path, e.g. ``'firewall address'``.
+
+		Returns:
+			Optional[FortiOSSection]: The section, or None if it is not configured.
+		"""
+		return self.sections.get(path)
+
+	def entries(self, path: str) -> List[FortiOSEntry]:
+		"""Return the table entries of every section with the given path."""
+		entries = []
+		for _, section in self.find_sections(path):
+			entries.extend(section.entries.values())
+		return entries
+
+	def scoped_entries(self, path: str) -> Iterator[Tuple[Optional[str], FortiOSEntry]]:
+		"""Yield the table entries of every section with the given path, with their VDOM (see ``find_sections``)."""
+		for vdom, section in self.find_sections(path):
+			for entry in section.entries.values():
+				yield vdom, entry
+
+	def find_sections(self, path: str) -> Iterator[Tuple[Optional[str], FortiOSSection]]:
+		"""
+		Yield every section with the given path, wherever it is scoped.
+
+		Without VDOMs all sections are top-level. With VDOMs enabled, shared
+		settings live under ``config global`` and per-VDOM tables under the
+		``edit <vdom>`` entries of ``config vdom``.
+
+		Args:
+			path (str): The section path, e.g. ``'firewall policy'``.
+
+		Yields:
+			Tuple[Optional[str], FortiOSSection]: The VDOM name (None for top-level
+			and global sections) and the section.
+		"""
+		section = self.sections.get(path)
+		if section is not None:
+			yield None, section
+
+		global_section = self.sections.get('global')
+		if global_section is not None and path in global_section.sections:
+			yield None, global_section.sections[path]
+
+		vdom_section = self.sections.get('vdom')
+		if vdom_section is not None:
+			for vdom in vdom_section:
+				if path in vdom.sections:
+					yield vdom.name, vdom.sections[path]
+
+	def _build(self, lines: Iterable[str]) -> None:
+		"""Run the config/edit/next/end state machine over the lines."""
+		# Each stack item is the container that receives statements: the root
+		# (None), a section, or an entry inside a section.
+		stack: List[Tuple[Optional[FortiOSSection], Optional[FortiOSEntry]]] = []
+		section: Optional[FortiOSSection] = None
+		entry: Optional[FortiOSEntry] = None
+		pending_key: Optional[str] = None
+		pending_value: List[str] = []
+		line_number = -1
+
+		for line_number, raw_line in enumerate(lines):
+			line = raw_line.strip()
+
+			if pending_key is not None:
+				# Continuation of a quoted value spanning several lines
+				pending_value.append(raw_line.rstrip('\r\n'))
+				if not quote_open(line, True):
+					target = entry if entry is not None else section
+					if target is not None:
+						target.settings[pending_key] = split_values('\n'.join(pending_value))
+					pending_key = None
+					pending_value = []
+				continue
+
+			if not line or line.startswith('#'):
+				continue
+
+			keyword, _, arguments = line.partition(' ')
+
+			if keyword == 'config':
+				stack.append((section, entry))
+				parent = entry if entry is not None else section
+				container = self.sections if parent is None else parent.sections
+				path = arguments.strip()
+				section = container.get(path)
+				if section is None:
+					section = FortiOSSection(path, line_number)
+					container[path] = section
+				entry = None
+			elif keyword == 'end':
+				if section is not None:
+					section.end = line_number + 1
+				if stack:
+					section, entry = stack.pop()
+				else:
+					section, entry = None, None
+			elif keyword == 'edit' and section is not None:
+				values = split_values(arguments)
+				name = values[0] if values else arguments.strip()
+				entry = section.entries.get(name)
+				if entry is None:
+					entry = FortiOSEntry(name, line_number)
+					section.entries[name] = entry
+			elif keyword == 'next':
+				if entry is not None:
+					entry.end = line_number + 1
+				entry = None
+			elif keyword in ('set', 'append'):
+				target = entry if entry is not None else section
+				if target is None:
+					continue
+				key, _, value_text = arguments.strip().partition(' ')
+				if quote_open(value_text):
+					pending_key = key
+					pending_value = [value_text]
+					continue
+				values = split_values(value_text)
+				if keyword == 'append':
+					target.settings.setdefault(key, []).extend(values)
+				else:
+					target.settings[key] = values
+			elif keyword == 'unset':
+				target = entry if entry is not None else section
+				if target is not None:
+					target.settings.pop(arguments.strip(), None)
+
+		self.line_count = line_number + 1
@@ -0,0 +1,228 @@
+"""
+Incremental re-parsing of a changed configuration.
+
+Nightly backups of a device usually differ from the previous version by a
+handful of lines, yet a full parse walks the whole configuration again.
+Parsers that support incremental parsing split a configuration into
+stanzas (``Parser.split_stanzas``): IOS top-level stanzas, FortiOS ``edit``
+entries and so on. Each stanza has a section, e.g. ``interface`` or
+``firewall policy``. The stanzas of the previous and the new version are
+compared, and every result section is then handled in one of three ways:
+
+- If none of the stanzas it reads changed, the previous result's section is
+  reused as is.
+- If it is listed in ``INCREMENTAL_ENTRIES``, it has one entry per stanza.
+  The entries of unchanged stanzas are reused, and only the changed stanzas
+  are joined into a small configuration and extracted.
+- Otherwise only the stanzas of its own sections are joined and extracted.
+
+The result is always equal to a full parse of the new configuration,
+provided the parser declares every stanza section an extractor reads.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .results import LazyResult
+
+# Matches the stanzas of any scope in ConfigDiff lookups
+ANY_SCOPE = object()
+
+
+class Stanza:
+	"""
+	A unit of configuration that an extractor reads as a whole.
+
+	Attributes:
+		section (str): The section the stanza belongs to, e.g. ``'interface'``
+			or ``'firewall policy'``.
+		scope (Optional[str]): The VDOM or other scope the stanza is configured
+			in, or None at the top level.
+		key (Optional[str]): The stanza's name within its section and scope, e.g.
+			the interface header or the ``edit`` name. None for settings that are
+			not an entry of their section.
+		text (str): The raw lines of the stanza; stanzas are compared by it.
+	"""
+
+	__slots__ = ('section', 'scope', 'key', 'text')
+
+	def __init__(self, section: str, scope: Optional[str], key: Optional[str], text: str):
+		self.section = section
+		self.scope = scope
+		self.key = key
+		self.text = text
+
+	def __repr__(self) -> str:
+		return f"<Stanza {self.section!r} {self.key!r} in {self.scope!r}>"
+
+
+class ConfigDiff:
+	"""
+	The stanzas of two versions of a configuration, grouped by section.
+
+	Args:
+		previous (Iterable[Stanza]): The stanzas of the previous version.
+		current (Iterable[Stanza]): The stanzas of the new version.
+	"""
+
+	def __init__(self, previous: Iterable[Stanza], current: Iterable[Stanza]):
+		self._previous = self._group(previous)
+		self._current = self._group(current)
+
+	@staticmethod
+	def _group(stanzas: Iterable[Stanza]) -> Dict[str, List[Tuple[int, Stanza]]]:
+		grouped: Dict[str, List[Tuple[int, Stanza]]] = {}
+		for position, stanza in enumerate(stanzas):
+			grouped.setdefault(stanza.section, []).append((position, stanza))
+		return grouped
+
+	@staticmethod
+	def _select(grouped: Dict[str, List[Tuple[int, Stanza]]], sections: Sequence[str], scope: Any) -> List[Stanza]:
+		selected = []
+		for section in sections:
+			for position, stanza in grouped.get(section, ()):
+				if scope is ANY_SCOPE or stanza.scope == scope:
+					selected.append((position, stanza))
+		if len(sections) > 1:
+			# Keep the configuration order across sections
+			selected.sort(key=lambda item: item[0])
+		return [stanza for _, stanza in selected]
+
+	def previous(self, sections: Sequence[str], scope: Any = ANY_SCOPE) -> List[Stanza]:
+		"""Return the previous version's stanzas of the given sections, in configuration order."""
+		return self._select(self._previous, sections, scope)
+
+	def current(self, sections: Sequence[str], scope: Any = ANY_SCOPE) -> List[Stanza]:
+		"""Return the new version's stanzas of the given sections, in configuration order."""
+		return self._select(self._current, sections, scope)
+
+	def changed(self, sections: Sequence[str], scope: Any = ANY_SCOPE) -> bool:
+		"""Return whether any stanza of the given sections was added, removed, changed or moved."""
+		previous = self.previous(sections, scope)
+		current = self.current(sections, scope)
+		return len(previous) != len(current) or any(
+			old.section != new.section or old.scope != new.scope or old.key != new.key or old.text != new.text
+			for old, new in zip(previous, current)
+		)
+
+
+def reparse(parser, config_text: str, previous_text: str, previous_result: Dict[str, Any]) -> Dict[str, Any]:
+	"""
+	Parse a configuration, reusing the result of a previous version of it.
+
+	Falls back to a full parse when the parser does not support incremental
+	parsing or the previous result does not have the sections it expects.
+
+	Args:
+		parser (Parser): The parser to run.
+		config_text (str): The new configuration text.
+		previous_text (str): The previous version of the configuration.
+		previous_result (Dict[str, Any]): The full result of parsing the
+			previous version with the same parser version.
+
+	Returns:
+		Dict[str, Any]: A lazy result equal to ``parser.parse(config_text)``.
+
+	Raises:
+		ValueError: If the configuration is not valid for the parser.
+	"""
+	sections = parser.INCREMENTAL_SECTIONS
+	if not sections or set(previous_result) != {'device_type', *sections}:
+		return parser.parse(config_text)
+	if not parser.detect_device_type(config_text):
+		# Raises the parser's own error
+		return parser.parse(config_text)
+
+	diff = ConfigDiff(parser.split_stanzas(previous_text), parser.split_stanzas(config_text))
+	changed: Set[str] = set()
+	for name, stanza_sections in sections.items():
+		dependencies = parser.INCREMENTAL_DEPENDENCIES.get(name, ())
+		if diff.changed(stanza_sections) or changed.intersection(dependencies):
+			changed.add(name)
+
+	values = {'device_type': previous_result['device_type']}
+	loaders = {}
+	for name in sections:
+		if name in changed:
+			loaders[name] = lambda name=name: parser.reparse_section(name, diff, previous_result[name], result)
+		else:
+			values[name] = previous_result[name]
+	result = LazyResult(values, loaders)
+	return result
+
+
+def reparse_section(parser, name: str, diff: ConfigDiff, previous: Any, result: Dict[str, Any]) -> Any:
+	"""
+	Extract a changed section of the new configuration.
+
+	Sections listed in ``INCREMENTAL_ENTRIES`` are merged entry by entry (see
+	``merge_entries``). Other sections are extracted from a configuration made
+	of their own stanzas, with the result sections they read taken from the
+	new result.
+
+	Args:
+		parser (Parser): The parser.
+		name (str): The result section.
+		diff (ConfigDiff): The stanzas of both versions.
+		previous (Any): The section in the previous result.
+		result (Dict[str, Any]): The new result, for the sections this one reads.
+
+	Returns:
+		Any: The section of the new configuration.
+	"""
+	if name in parser.INCREMENTAL_ENTRIES:
+		entries = merge_entries(parser, name, diff, previous)
+		if entries is not None:
+			return entries
+
+	partial = parser.parse_stanzas(diff.current(parser.INCREMENTAL_SECTIONS[name]))
+	for dependency in parser.INCREMENTAL_DEPENDENCIES.get(name, ()):
+		partial[dependency] = result[dependency]
+	return partial[name]
+
+
+def merge_entries(parser, name: str, diff: ConfigDiff, previous: List[Any]) -> Optional[List[Any]]:
+	"""
+	Rebuild a section that has one entry per stanza, extracting only the changed stanzas.
+
+	Args:
+		parser (Parser): The parser.
+		name (str): The result section, listed in ``INCREMENTAL_ENTRIES``.
+		diff (ConfigDiff): The stanzas of both versions.
+		previous (List[Any]): The section in the previous result.
+
+	Returns:
+		Optional[List[Any]]: The section's entries in the new configuration, or
+		None if the entries do not line up with the stanzas one to one, e.g.
+		because the extractor skipped a malformed stanza.
+	"""
+	sections = parser.INCREMENTAL_SECTIONS[name]
+	previous_stanzas = [stanza for stanza in diff.previous(sections) if stanza.key is not None]
+	if len(previous_stanzas) != len(previous):
+		return None
+
+	# Indices of the previous entries by stanza, last first so they pop in order
+	unchanged: Dict[tuple, List[int]] = {}
+	for index in range(len(previous_stanzas) - 1, -1, -1):
+		stanza = previous_stanzas[index]
+		unchanged.setdefault((stanza.section, stanza.scope, stanza.key, stanza.text), []).append(index)
+
+	entries: List[Any] = []
+	changed: List[Stanza] = []
+	for stanza in diff.current(sections):
+		if stanza.key is None:
+			continue
+		indices = unchanged.get((stanza.section, stanza.scope, stanza.key, stanza.text))
+		if indices:
+			entries.append(previous[indices.pop()])
+		else:
+			entries.append(None)
+			changed.append(stanza)
+
+	if not changed:
+		return entries
+
+	extracted = parser.parse_stanzas(changed)[name]
+	if len(extracted) != len(changed):
+		return None
+	extracted = iter(extracted)
+	return [next(extracted) if entry is None else entry for entry in entries]
@@ -0,0 +1,219 @@
+"""
+Block index for Cisco IOS style configurations.
+
+IOS configurations are made of top-level commands that start in column zero,
+optionally followed by indented sub-commands, with stanzas separated by ``!``
+lines. This module walks the configuration once and records every top-level
+stanza together with its line offsets, so that extractors only need to look
+at the stanzas they care about instead of rescanning the whole text.
+
+``IOSBlockIndex.from_buffer`` builds the same index from a bytes buffer such
+as a memory-mapped file: it jumps from one section header to the next with a
+bytes pattern and decodes only the stanzas it keeps.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .buffers import Buffer, count_lines, decode
+from .patterns import REGISTRY
+
+
+class ConfigBlock:
+	"""
+	A single top-level stanza of an IOS style configuration.
+
+	Attributes:
+		header (str): The top-level command that opens the stanza.
+		lines (List[str]): The indented sub-command lines, as they appear in the file.
+		start (int): Zero-based line number of the header line.
+		end (int): Zero-based line number just past the last line of the stanza.
+	"""
+
+	__slots__ = ('header', 'lines', 'start', 'end')
+
+	def __init__(self, header: str, start: int):
+		self.header = header
+		self.lines: List[str] = []
+		self.start = start
+		self.end = start + 1
+
+	def __repr__(self) -> str:
+		return f"<ConfigBlock {self.header!r} lines {self.start}-{self.end}>"
+
+	@property
+	def text(self) -> str:
+		"""Return the header and sub-command lines as they appear in the file."""
+		return '\n'.join([self.header] + self.lines)
+
+	@property
+	def body(self) -> str:
+		"""Return the sub-command lines joined into a single string."""
+		return '\n'.join(self.lines).strip()
+
+	def commands(self) -> Iterator[str]:
+		"""Yield the stripped, non-empty sub-commands of the stanza."""
+		for line in self.lines:
+			command = line.strip()
+			if command and not command.startswith('!'):
+				yield command
+
+
+class IOSBlockIndex:
+	"""
+	Single-pass index of the top-level stanzas in an IOS style configuration.
+
+	The index keeps every stanza in file order and additionally groups the
+	stanzas into named sections (interfaces, access lists, VRFs, routing
+	processes and static routes) based on the header of each stanza.
+
+	Attributes:
+		blocks (List[ConfigBlock]): All top-level stanzas in file order.
+		sections (Dict[str, List[ConfigBlock]]): Stanzas grouped by section name.
+		line_count (int): Number of lines in the indexed configuration.
+	"""
+
+	# (section name, header prefix) pairs; the first matching prefix wins.
+	SECTION_PREFIXES: Tuple[Tuple[str, str], ...] = (
+		('hostname', 'hostname '),
+		('interface', 'interface '),
+		('ip access-list', 'ip access-list '),
+		('ip vrf', 'ip vrf '),
+		('router ospf', 'router ospf '),
+		('router bgp', 'router bgp '),
+		('ip route', 'ip route '),
+	)
+
+	def __init__(self, lines: Iterable[str], sections_only: bool = False):
+		"""
+		Index the stanzas of a configuration.
+
+		Args:
+			lines (Iterable[str]): The configuration lines, e.g. an open file.
+			sections_only (bool): Keep only the stanzas of the named sections and
+				drop the others as they are read, so the memory an index of a
+				very large file holds is bounded by the configuration the
+				extractors use rather than by the file size.
+		"""
+		self.blocks: List[ConfigBlock] = []
+		self.sections: Dict[str, List[ConfigBlock]] = {
+			name: [] for name, _ in self.SECTION_PREFIXES
+		}
+		self.line_count = 0
+		self.sections_only = sections_only
+		self._build(lines)
+
+	@classmethod
+	def from_text(cls, config_text: str) -> 'IOSBlockIndex':
+		"""Build an index from the raw configuration text."""
+		return cls(config_text.splitlines())
+
+	@classmethod
+	def from_buffer(cls, buffer: Buffer) -> 'IOSBlockIndex':
+		"""
+		Build an index of the named sections from a bytes buffer.
+
+		The buffer is never decoded as a whole: section headers are found with
+		a bytes pattern, the indented lines that follow each one are matched
+		as a single span, and only those spans are decoded. Lines between the
+		sections are only counted.
+
+		Args:
+			buffer (Buffer): The configuration, e.g. an ``mmap`` of the file.
+
+		Returns:
+			IOSBlockIndex: An index equal to ``IOSBlockIndex(lines, sections_only=True)``.
+		"""
+		index = cls((), sections_only=True)
+		position = 0
+		line_number = 0
+
+		for header in SECTION_HEADER_PATTERN.finditer(buffer):
+			line_number += count_lines(buffer, position, header.start())
+			block = ConfigBlock(decode(header.group()).rstrip(), line_number)
+
+			body = STANZA_BODY_PATTERN.match(buffer, header.end())
+			lines = decode(body.group()).split('\n')
+			for offset, line in enumerate(lines[1:], 1):
+				line = line.rstrip('\r')
+				if line:
+					block.lines.append(line)
+					block.end = line_number + offset + 1
+
+			index._close(block)
+			line_number += len(lines) - 1
+			position = body.end()
+
+		size = len(buffer)
+		if size:
+			line_number += count_lines(buffer, position)
+			index.line_count = line_number + (buffer[size - 1:size] != b'\n')
+		return index
+
+	def _build(self, lines: Iterable[str]) -> None:
+		"""Walk the configuration lines once and record every stanza."""
+		current: Optional[ConfigBlock] = None
+		line_number = -1
+
+		for line_number, line in enumerate(lines):
+			line = line.rstrip('\r\n')
+			if not line:
+				continue
+
+			if not line[0].isspace():
+				# A column zero line always closes the current stanza
+				if current is not None:
+					self._close(current)
+					current = None
+
+				if not line.startswith('!') and (not self.sections_only or self._section_name(line) is not None):
+					current = ConfigBlock(line.rstrip(), line_number)
+			elif current is not None:
+				current.lines.append(line)
+				current.end = line_number + 1
+
+		if current is not None:
+			self._close(current)
+
+		self.line_count = line_number + 1
+
+	def _close(self, block: ConfigBlock) -> None:
+		"""Register a finished stanza in the block list and its section."""
+		self.blocks.append(block)
+
+		name = self._section_name(block.header)
+		if name is not None:
+			self.sections[name].append(block)
+
+	def _section_name(self, header: str) -> Optional[str]:
+		"""Return the name of the section a stanza header belongs to, or None."""
+		for name, prefix in self.SECTION_PREFIXES:
+			if header.startswith(prefix):
+				return name
+		return None
+
+	def section(self, name: str) -> List[ConfigBlock]:
+		"""
+		Return the stanzas of a named section.
+
+		Args:
+			name (str): The section name, e.g. ``'interface'`` or ``'router bgp'``.
+
+		Returns:
+			List[ConfigBlock]: The stanzas in file order, or an empty list.
+		"""
+		return self.sections.get(name, [])
+
+
+# Column zero lines that open a stanza of a named section
+SECTION_HEADER_PATTERN = REGISTRY.register(
+	'IOSBlockIndex.section_header',
+	'^(?:' + '|'.join(re.escape(prefix) for _, prefix in IOSBlockIndex.SECTION_PREFIXES) + ')[^\r\n]*',
+	re.MULTILINE,
+)
+
+# The indented and blank lines that follow a stanza header
+STANZA_BODY_PATTERN = REGISTRY.register(
+	'IOSBlockIndex.stanza_body',
+	r'(?:\r?\n(?:[ \t][^\n]*|(?=\r?\n)|\Z))*',
+)
@@ -4,14 +4,35 @@ Parser for Juniper network devices.
 This module contains the parser implementation for Juniper JunOS devices.
 """
 
-import re
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Union
 from .base import Parser
+from .detection import sample_lines
+from .incremental import Stanza
+from .junos_tree import JunosConfigTree
+from .results import (
+	FilterTerm, FirewallFilter, JunosBGPNeighbor, JunosInterface, JunosStaticRoute, JunosUnit, OSPFArea,
+	LazyResult, OSPFInterface, RoutingInstance, SecurityPolicy
+)
 
 
 class JuniperJunOSParser(Parser):
 	"""Parser for Juniper JunOS devices."""
 	
+	PARSER_VERSION = "2"
+	STREAMING = True
+	
+	DETECTION_SIGNATURES = (
+		(r'^system\s+\{\s+host-name\s', 3.0),
+		(r'^version\s+\d+\.\d+[A-Z]\d+', 3.0),
+		(r'^(?:interfaces|protocols|routing-options|policy-options|security)\s+\{', 2.0),
+		# "show configuration | display set" output
+		(r'^set\s+(?:system|interfaces|protocols|routing-options|policy-options|security|firewall|routing-instances|chassis|snmp|vlans)\s+', 2.0),
+	)
+	
+	def __init__(self):
+		self._tree = None
+		self._tree_text = None
+	
 	def parse(self, config_text: str) -> Dict[str, Any]:
 		"""
 		Parse JunOS configuration.
@@ -28,119 +49,133 @@ class JuniperJunOSParser(Parser):
 		if not self.detect_device_type(config_text):
 			raise ValueError("Not a valid JunOS configuration.")
 		
-		hostname = self.extract_hostname(config_text)
+		return self._parse_config(config_text)
+	
+	def parse_lines(self, lines: Iterable[str]) -> Dict[str, Any]:
+		"""
+		Parse a JunOS configuration from an iterable of lines.
 		
-		return {
-			"device_type": "junos",
-			"hostname": hostname,
-			"interfaces": self.extract_interfaces(config_text),
-			"routing_instances": self.extract_routing_instances(config_text),
-			"security_policies": self.extract_security_policies(config_text),
-			"routing": self.extract_routing(config_text)
-		}
+		Both brace and ``display set`` formats are accepted. The lines are
+		consumed in a single pass, so an open file can be passed directly
+		without reading it into memory first.
+		
+		Args:
+			lines (Iterable[str]): The configuration lines.
+			
+		Returns:
+			Dict[str, Any]: Structured configuration data.
+			
+		Raises:
+			ValueError: If the configuration is not valid JunOS or no
+				configuration statements were found.
+		"""
+		sample, lines = sample_lines(lines)
+		if not self.detect_device_type(sample):
+			raise ValueError("Not a valid JunOS configuration.")
+		
+		tree = JunosConfigTree.load(lines)
+		if not len(tree):
+			raise ValueError("Not a valid JunOS configuration.")
+		
+		return self._parse_config(tree)
+	
+	def _parse_config(self, config: Union[str, JunosConfigTree]) -> LazyResult:
+		"""Map every section to its extractor, run against configuration text or a prebuilt tree."""
+		return LazyResult({"device_type": "junos"}, {
+			"hostname": lambda: self.extract_hostname(config),
+			"interfaces": lambda: self.extract_interfaces(config),
+			"routing_instances": lambda: self.extract_routing_instances(config),
+			"security_policies": lambda: self.extract_security_policies(config),
+			"routing": lambda: self.extract_routing(config)
+		})
 	
 	def detect_device_type(self, config_text: str) -> bool:
 		"""Check if the configuration is from a Juniper JunOS device."""
-		junos_indicators = [
-			r'system\s+{\s+host-name\s+',
-			r'interfaces\s+{\s+',
-			r'protocols\s+{\s+',
-			r'routing-options\s+{\s+',
-			r'policy-options\s+{\s+',
-			r'security\s+{\s+',
-			r'version\s+\d+\.\d+[A-Z]\d+'
-		]
+		return self.detection_score(config_text) > 0
+	
+	def split_blocks(self, config_text: str) -> List[Stanza]:
+		"""
+		Split the configuration into its second-level hierarchies for structural diffs.
 		
-		for indicator in junos_indicators:
-			if re.search(indicator, config_text, re.MULTILINE):
-				return True
+		Each block is keyed by its name below a top-level statement, e.g.
+		``ge-0/0/0`` in ``interfaces``, and holds its statements as ``display
+		set`` paths, so brace and set format versions compare equal.
 		
-		return False
+		Args:
+			config_text (str): The raw JunOS configuration text.
+			
+		Returns:
+			List[Stanza]: The blocks in configuration order.
+		"""
+		stanzas = []
+		for section in JunosConfigTree.from_text(config_text).root:
+			if not section.children:
+				stanzas.append(Stanza(section.name, None, None, section.name))
+			for block in section:
+				statements = [' '.join(leaf.path[1:]) for leaf in block.iter_leaves()] or [block.name]
+				stanzas.append(Stanza(section.name, None, block.name, '\n'.join(statements)))
+		return stanzas
+	
+	def get_config_tree(self, config_text: Union[str, JunosConfigTree]) -> JunosConfigTree:
+		"""
+		Return the configuration tree for the given configuration text.
+		
+		The tree is built in a single pass and reused for as long as the parser
+		is asked about the same configuration text, so calling several
+		extractors in a row only tokenizes the configuration once. Brace and
+		``display set`` formats are both accepted. All extractors also accept
+		an already built tree in place of the text.
+		
+		Args:
+			config_text (Union[str, JunosConfigTree]): The raw JunOS configuration
+				text, or a tree built with JunosConfigTree.
+			
+		Returns:
+			JunosConfigTree: The parsed configuration hierarchy.
+		"""
+		if isinstance(config_text, JunosConfigTree):
+			return config_text
+		if self._tree is None or self._tree_text is not config_text:
+			self._tree = JunosConfigTree.from_text(config_text)
+			self._tree_text = config_text
+		return self._tree
 	
 	def extract_hostname(self, config_text: str) -> str:
 		"""Extract hostname from JunOS configuration."""
-		hostname_match = re.search(r'system\s+{\s+host-name\s+([^;]+);', config_text, re.DOTALL)
-		if hostname_match:
-			return hostname_match.group(1).strip()
-		return ""
+		system = self.get_config_tree(config_text).get('system')
+		if system is None:
+			return ""
+		return system.value('host-name').strip()
 	
-	def extract_interfaces(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_interfaces(self, config_text: str) -> List[JunosInterface]:
 		"""Extract interface configurations from JunOS."""
 		interfaces = []
 		
-		# Find interface configurations
-		interface_section_match = re.search(r'interfaces\s+{(.*?)}', config_text, re.DOTALL)
-		if not interface_section_match:
+		interface_section = self.get_config_tree(config_text).get('interfaces')
+		if interface_section is None:
 			return interfaces
-			
-		interface_section = interface_section_match.group(1)
-		
-		# Find each interface
-		interface_blocks = re.findall(r'(\S+)\s+{(.*?)}', interface_section, re.DOTALL)
 		
-		for interface_name, interface_config in interface_blocks:
+		for interface_node in interface_section:
 			# Skip if this doesn't look like an interface
-			if interface_name in ['apply-groups', 'traceoptions']:
+			if interface_node.name in ['apply-groups', 'traceoptions']:
 				continue
 				
-			interface = {
-				"name": interface_name.strip(),
-				"description": "",
-				"units": [],
-				"enabled": True
-			}
-			
-			# Extract description
-			desc_match = re.search(r'description\s+"([^"]+)"', interface_config)
-			if desc_match:
-				interface["description"] = desc_match.group(1)
+			interface = JunosInterface(
+				name=interface_node.name,
+				description=interface_node.value('description'),
+				units=[],
+				enabled='disable' not in interface_node
+			)
 			
-			# Check if disabled
-			if re.search(r'disable;', interface_config):
-				interface["enabled"] = False
-			
-			# Extract units
-			unit_blocks = re.findall(r'unit\s+(\d+)\s+{(.*?)}', interface_config, re.DOTALL)
-			for unit_id, unit_config in unit_blocks:
-				unit = {
-					"id": unit_id.strip(),
-					"description": "",
-					"family": {
-						"inet": {
-							"addresses": []
-						},
-						"inet6": {
-							"addresses": []
-						}
-					},
-					"vlan_id": None
-				}
-				
-				# Extract unit description
-				unit_desc_match = re.search(r'description\s+"([^"]+)"', unit_config)
-				if unit_desc_match:
-					unit["description"] = unit_desc_match.group(1)
-				
-				# Extract VLAN ID
-				vlan_id_match = re.search(r'vlan-id\s+(\d+)', unit_config)
-				if vlan_id_match:
-					unit["vlan_id"] = vlan_id_match.group(1)
-				
-				# Extract IPv4 addresses
-				family_inet_match = re.search(r'family\s+inet\s+{(.*?)}', unit_config, re.DOTALL)
-				if family_inet_match:
-					family_inet = family_inet_match.group(1)
-					address_matches = re.findall(r'address\s+([^;]+);', family_inet)
-					for addr in address_matches:
-						unit["family"]["inet"]["addresses"].append(addr.strip())
-				
-				# Extract IPv6 addresses
-				family_inet6_match = re.search(r'family\s+inet6\s+{(.*?)}', unit_config, re.DOTALL)
-				if family_inet6_match:
-					family_inet6 = family_inet6_match.group(1)
-					address_matches = re.findall(r'address\s+([^;]+);', family_inet6)
-					for addr in address_matches:
-						unit["family"]["inet6"]["addresses"].append(addr.strip())
+			for unit_id in interface_node.keys('unit'):
+				unit_node = interface_node.find('unit', unit_id)
+				unit = JunosUnit(
+					id=unit_id,
+					description=unit_node.value('description'),
+					inet_addresses=unit_node.keys('family', 'inet', 'address'),
+					inet6_addresses=unit_node.keys('family', 'inet6', 'address'),
+					vlan_id=unit_node.value('vlan-id', default=None)
+				)
 				
 				interface["units"].append(unit)
 			
@@ -148,129 +183,80 @@ class JuniperJunOSParser(Parser):
 		
 		return interfaces
 	
-	def extract_routing_instances(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_routing_instances(self, config_text: str) -> List[RoutingInstance]:
 		"""Extract routing instance configurations from JunOS."""
 		routing_instances = []
 		
-		# Find routing-instances section
-		ri_section_match = re.search(r'routing-instances\s+{(.*?)}', config_text, re.DOTALL)
-		if not ri_section_match:
+		ri_section = self.get_config_tree(config_text).get('routing-instances')
+		if ri_section is None:
 			return routing_instances
-			
-		ri_section = ri_section_match.group(1)
-		
-		# Find each routing instance
-		ri_blocks = re.findall(r'(\S+)\s+{(.*?instance-type\s+([^;]+);.*?)}', ri_section, re.DOTALL)
 		
-		for ri_name, ri_config, ri_type in ri_blocks:
-			ri = {
-				"name": ri_name.strip(),
-				"type": ri_type.strip(),
-				"description": "",
-				"interfaces": [],
-				"route_distinguisher": "",
-				"vrf_target": ""
-			}
-			
-			# Extract description
-			desc_match = re.search(r'description\s+"([^"]+)"', ri_config)
-			if desc_match:
-				ri["description"] = desc_match.group(1)
+		for ri_node in ri_section:
+			ri_type = ri_node.value('instance-type')
+			if not ri_type:
+				continue
 			
-			# Extract interfaces
-			interface_matches = re.findall(r'interface\s+([^;]+);', ri_config)
-			for intf in interface_matches:
-				ri["interfaces"].append(intf.strip())
+			ri = RoutingInstance(
+				name=ri_node.name,
+				type=ri_type,
+				description=ri_node.value('description'),
+				interfaces=ri_node.keys('interface'),
+				route_distinguisher="",
+				vrf_target=""
+			)
 			
 			# Extract VRF properties if applicable
-			if ri_type.strip() in ['vrf', 'virtual-router']:
-				# Extract route distinguisher
-				rd_match = re.search(r'route-distinguisher\s+([^;]+);', ri_config)
-				if rd_match:
-					ri["route_distinguisher"] = rd_match.group(1).strip()
+			if ri_type in ['vrf', 'virtual-router']:
+				ri["route_distinguisher"] = ri_node.value('route-distinguisher')
 				
-				# Extract VRF target
-				vrf_target_match = re.search(r'vrf-target\s+([^;]+);', ri_config)
-				if vrf_target_match:
-					ri["vrf_target"] = vrf_target_match.group(1).strip()
+				# "vrf-target target:x:y;" rather than the import/export form
+				targets = [
+					target for target in ri_node.keys('vrf-target')
+					if target not in ('import', 'export', 'auto')
+				]
+				if targets:
+					ri["vrf_target"] = targets[0]
 			
 			routing_instances.append(ri)
 		
 		return routing_instances
 	
-	def extract_security_policies(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_security_policies(self, config_text: str) -> List[SecurityPolicy]:
 		"""Extract security policies from JunOS configuration."""
 		policies = []
 		
-		# Find security policies section
-		security_match = re.search(r'security\s+{.*?policies\s+{(.*?)}', config_text, re.DOTALL)
-		if not security_match:
+		from_zones = self.get_config_tree(config_text).get('security', 'policies', 'from-zone')
+		if from_zones is None:
 			return policies
-			
-		policies_section = security_match.group(1)
 		
-		# Find from-zone/to-zone sections
-		zone_blocks = re.findall(r'from-zone\s+(\S+)\s+to-zone\s+(\S+)\s+{(.*?)}', policies_section, re.DOTALL)
-		
-		for from_zone, to_zone, zone_config in zone_blocks:
-			# Find each policy
-			policy_blocks = re.findall(r'policy\s+(\S+)\s+{(.*?)}', zone_config, re.DOTALL)
+		for from_zone_node in from_zones:
+			to_zones = from_zone_node.find('to-zone')
+			if to_zones is None:
+				continue
 			
-			for policy_name, policy_config in policy_blocks:
-				policy = {
-					"name": policy_name.strip(),
-					"from_zone": from_zone.strip(),
-					"to_zone": to_zone.strip(),
-					"match": {
-						"source_address": [],
-						"destination_address": [],
-						"application": []
-					},
-					"then": {
-						"action": ""
-					},
-					"description": ""
-				}
-				
-				# Extract match criteria
-				match_section = re.search(r'match\s+{(.*?)}', policy_config, re.DOTALL)
-				if match_section:
-					match_config = match_section.group(1)
-					
-					# Source addresses
-					src_addr_matches = re.findall(r'source-address\s+([^;]+);', match_config)
-					for src in src_addr_matches:
-						policy["match"]["source_address"].append(src.strip())
-					
-					# Destination addresses
-					dst_addr_matches = re.findall(r'destination-address\s+([^;]+);', match_config)
-					for dst in dst_addr_matches:
-						policy["match"]["destination_address"].append(dst.strip())
-					
-					# Applications
-					app_matches = re.findall(r'application\s+([^;]+);', match_config)
-					for app in app_matches:
-						policy["match"]["application"].append(app.strip())
-				
-				# Extract actions
-				then_section = re.search(r'then\s+{(.*?)}', policy_config, re.DOTALL)
-				if then_section:
-					then_config = then_section.group(1)
+			for to_zone_node in to_zones:
+				for policy_name in to_zone_node.keys('policy'):
+					policy_node = to_zone_node.find('policy', policy_name)
+					policy = SecurityPolicy(
+						name=policy_name,
+						from_zone=from_zone_node.name,
+						to_zone=to_zone_node.name,
+						source_address=policy_node.keys('match', 'source-address'),
+						destination_address=policy_node.keys('match', 'destination-address'),
+						application=policy_node.keys('match', 'application'),
+						action="",
+						description=policy_node.value('description')
+					)
 					
 					# Determine action (permit, deny, reject)
-					if re.search(r'permit;', then_config):
-						policy["then"]["action"] = "permit"
-					elif re.search(r'deny;', then_config):
-						policy["then"]["action"] = "deny"
-					elif re.search(r'reject;', then_config):
-						policy["then"]["action"] = "reject"
-				
-				# Extract description
-				desc_match = re.search(r'description\s+"([^"]+)"', policy_config)
-				if desc_match:
-					policy["description"] = desc_match.group(1)
-				
-				policies.append(policy)
+					then_node = policy_node.find('then')
+					if then_node is not None:
+						for action in ('permit', 'deny', 'reject'):
+							if action in then_node:
+								policy.action = action
+								break
+					
+					policies.append(policy)
 		
 		return policies
 	
@@ -286,165 +272,86 @@ class JuniperJunOSParser(Parser):
 				"areas": []
 			}
 		}
+		tree = self.get_config_tree(config_text)
 		
-		# Extract static routes
-		routing_options_match = re.search(r'routing-options\s+{(.*?)}', config_text, re.DOTALL)
-		if routing_options_match:
-			routing_options = routing_options_match.group(1)
-			
+		routing_options = tree.get('routing-options')
+		if routing_options is not None:
 			# AS number for BGP
-			as_match = re.search(r'autonomous-system\s+(\d+)', routing_options)
-			if as_match:
-				routing["bgp"]["as_number"] = as_match.group(1).strip()
+			routing["bgp"]["as_number"] = routing_options.value('autonomous-system')
 			
 			# Static routes
-			static_section = re.search(r'static\s+{(.*?)}', routing_options, re.DOTALL)
-			if static_section:
-				static_config = static_section.group(1)
-				route_matches = re.findall(r'route\s+([^{]+){(.*?)}', static_config, re.DOTALL)
-				
-				for prefix, route_config in route_matches:
-					route = {
-						"prefix": prefix.strip(),
-						"next_hop": "",
-						"preference": "5"  # Default
-					}
-					
-					# Extract next-hop
-					next_hop_match = re.search(r'next-hop\s+([^;]+);', route_config)
-					if next_hop_match:
-						route["next_hop"] = next_hop_match.group(1).strip()
-					
-					# Extract preference
-					pref_match = re.search(r'preference\s+(\d+)', route_config)
-					if pref_match:
-						route["preference"] = pref_match.group(1).strip()
-					
-					routing["static_routes"].append(route)
+			for prefix in routing_options.keys('static', 'route'):
+				route_node = routing_options.find('static', 'route', prefix)
+				routing["static_routes"].append(JunosStaticRoute(
+					prefix=prefix,
+					next_hop=" ".join(route_node.keys('next-hop')),
+					preference=route_node.value('preference', default="5")
+				))
 		
-		# Extract BGP configuration
-		protocols_match = re.search(r'protocols\s+{(.*?)}', config_text, re.DOTALL)
-		if protocols_match:
-			protocols = protocols_match.group(1)
-			
-			# BGP configuration
-			bgp_section = re.search(r'bgp\s+{(.*?)}', protocols, re.DOTALL)
-			if bgp_section:
-				bgp_config = bgp_section.group(1)
+		# BGP neighbors
+		groups = tree.get('protocols', 'bgp', 'group')
+		if groups is not None:
+			for group_node in groups:
+				group_peer_as = group_node.value('peer-as')
 				
-				# BGP neighbors
-				group_blocks = re.findall(r'group\s+(\S+)\s+{(.*?)}', bgp_config, re.DOTALL)
-				
-				for group_name, group_config in group_blocks:
-					# Extract neighbors
-					neighbor_matches = re.findall(r'neighbor\s+([^{;]+)(?:{(.*?)}|;)', group_config, re.DOTALL)
-					
-					for neighbor_addr, neighbor_config in neighbor_matches:
-						neighbor = {
-							"address": neighbor_addr.strip(),
-							"peer_as": "",
-							"description": "",
-							"group": group_name.strip()
-						}
-						
-						# Extract peer AS
-						if len(neighbor_config) > 0:
-							peer_as_match = re.search(r'peer-as\s+(\d+)', neighbor_config)
-							if peer_as_match:
-								neighbor["peer_as"] = peer_as_match.group(1).strip()
-							
-							# Extract description
-							desc_match = re.search(r'description\s+"([^"]+)"', neighbor_config)
-							if desc_match:
-								neighbor["description"] = desc_match.group(1)
-						
-						# Check for peer-as at group level if not found at neighbor level
-						if not neighbor["peer_as"]:
-							group_peer_as_match = re.search(r'peer-as\s+(\d+)', group_config)
-							if group_peer_as_match:
-								neighbor["peer_as"] = group_peer_as_match.group(1).strip()
-						
-						routing["bgp"]["neighbors"].append(neighbor)
-			
-			# OSPF configuration
-			ospf_section = re.search(r'ospf\s+{(.*?)}', protocols, re.DOTALL)
-			if ospf_section:
-				ospf_config = ospf_section.group(1)
+				for neighbor_node in group_node.find('neighbor') or []:
+					routing["bgp"]["neighbors"].append(JunosBGPNeighbor(
+						address=neighbor_node.name,
+						peer_as=neighbor_node.value('peer-as') or group_peer_as,
+						description=neighbor_node.value('description'),
+						group=group_node.name
+					))
+		
+		# OSPF areas
+		areas = tree.get('protocols', 'ospf', 'area')
+		if areas is not None:
+			for area_node in areas:
+				area = OSPFArea(
+					id=area_node.name,
+					interfaces=[]
+				)
 				
-				# OSPF areas
-				area_blocks = re.findall(r'area\s+([^{]+){(.*?)}', ospf_config, re.DOTALL)
+				for intf_node in area_node.find('interface') or []:
+					area["interfaces"].append(OSPFInterface(
+						name=intf_node.name,
+						passive='passive' in intf_node,
+						metric=intf_node.value('metric')
+					))
 				
-				for area_id, area_config in area_blocks:
-					area = {
-						"id": area_id.strip(),
-						"interfaces": []
-					}
-					
-					# Extract interfaces
-					interface_matches = re.findall(r'interface\s+([^{;]+)(?:{(.*?)}|;)', area_config, re.DOTALL)
-					
-					for intf_name, intf_config in interface_matches:
-						interface = {
-							"name": intf_name.strip(),
-							"passive": False,
-							"metric": ""
-						}
-						
-						# Check if passive
-						if len(intf_config) > 0 and re.search(r'passive;', intf_config):
-							interface["passive"] = True
-						
-						# Extract metric
-						if len(intf_config) > 0:
-							metric_match = re.search(r'metric\s+(\d+)', intf_config)
-							if metric_match:
-								interface["metric"] = metric_match.group(1).strip()
-						
-						area["interfaces"].append(interface)
-					
-					routing["ospf"]["areas"].append(area)
+				routing["ospf"]["areas"].append(area)
 		
 		return routing
 	
-	def extract_acls(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_acls(self, config_text: str) -> List[FirewallFilter]:
 		"""Extract Access Control Lists (firewall filters) from JunOS configuration."""
 		acls = []
 		
-		# Find firewall section
-		firewall_match = re.search(r'firewall\s+{(.*?)}', config_text, re.DOTALL)
-		if not firewall_match:
+		firewall = self.get_config_tree(config_text).get('firewall')
+		if firewall is None:
 			return acls
-			
-		firewall_section = firewall_match.group(1)
 		
-		# Find filter (ACL) blocks
-		filter_blocks = re.findall(r'filter\s+(\S+)\s+{(.*?)}', firewall_section, re.DOTALL)
+		# Filters directly under "firewall" are IPv4; others are grouped by family
+		filter_sections = [("inet", firewall.find('filter'))]
+		for family in firewall.keys('family'):
+			filter_sections.append((family, firewall.find('family', family, 'filter')))
 		
-		for filter_name, filter_config in filter_blocks:
-			acl = {
-				"name": filter_name.strip(),
-				"family": "inet",  # Default to IPv4
-				"terms": []
-			}
-			
-			# Determine family (inet/inet6)
-			if re.search(r'family\s+inet6', filter_config):
-				acl["family"] = "inet6"
-			
-			# Extract terms
-			term_blocks = re.findall(r'term\s+(\S+)\s+{(.*?)}', filter_config, re.DOTALL)
+		for family, filters in filter_sections:
+			if filters is None:
+				continue
 			
-			for term_name, term_config in term_blocks:
-				term = {
-					"name": term_name.strip(),
-					"from": {},
-					"then": {}
-				}
+			for filter_node in filters:
+				acl = FirewallFilter(
+					name=filter_node.name,
+					family=family,
+					terms=[]
+				)
 				
-				# Extract from conditions
-				from_section = re.search(r'from\s+{(.*?)}', term_config, re.DOTALL)
-				if from_section:
-					from_config = from_section.group(1)
+				for term_node in filter_node.find('term') or []:
+					term = FilterTerm(
+						name=term_node.name,
+						from_={},
+						then={}
+					)
 					
 					# Common match criteria
 					match_criteria = [
@@ -456,35 +363,30 @@ class JuniperJunOSParser(Parser):
 					]
 					
 					for junos_name, dict_name in match_criteria:
-						matches = re.findall(fr'{junos_name}\s+([^;]+);', from_config)
-						if matches:
-							term["from"][dict_name] = [m.strip() for m in matches]
-				
-				# Extract then actions
-				then_section = re.search(r'then\s+{(.*?)}', term_config, re.DOTALL)
-				if then_section:
-					then_config = then_section.group(1)
+						values = term_node.keys('from', junos_name)
+						if values:
+							term["from"][dict_name] = values
 					
-					# Determine action
-					if re.search(r'accept;', then_config):
-						term["then"]["action"] = "accept"
-					elif re.search(r'discard;', then_config):
-						term["then"]["action"] = "discard"
-					elif re.search(r'reject;', then_config):
-						term["then"]["action"] = "reject"
+					then_node = term_node.find('then')
+					if then_node is not None:
+						# Determine action
+						for action in ('accept', 'discard', 'reject'):
+							if action in then_node:
+								term["then"]["action"] = action
+								break
+						
+						# Check for counter
+						counter = then_node.value('count')
+						if counter:
+							term["then"]["counter"] = counter
 					
-					# Check for counter
-					counter_match = re.search(r'count\s+([^;]+);', then_config)
-					if counter_match:
-						term["then"]["counter"] = counter_match.group(1).strip()
+					acl["terms"].append(term)
 				
-				acl["terms"].append(term)
-			
-			acls.append(acl)
+				acls.append(acl)
 		
 		return acls
 	
-	def extract_vrfs(self, config_text: str) -> List[Dict[str, Any]]:
+	def extract_vrfs(self, config_text: str) -> List[RoutingInstance]:
 		"""
 		Extract VRF information (implemented as routing-instances in JunOS).
 		This is an alias for extract_routing_instances with filtering for VRF type.
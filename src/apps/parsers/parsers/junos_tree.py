@@ -0,0 +1,422 @@
+"""
+Hierarchical configuration tree for Juniper JunOS configurations.
+
+JunOS configurations are nested ``name { ... }`` blocks terminated by
+``statement;`` leaves. This module tokenizes the configuration in a single
+streaming pass and builds a tree in which every word of a statement is one
+level of the hierarchy, e.g. ``unit 0 { family inet { address 10.0.0.1/24; } }``
+becomes the path ``unit / 0 / family / inet / address / 10.0.0.1/24``.
+Every node is also registered in a flat path index so that any hierarchy
+path can be looked up with a single dictionary access.
+
+Configurations exported with ``show configuration | display set`` map onto
+the same tree: every ``set`` line is one complete path and is inserted on its
+own, so set-format files can be ingested line by line from a file iterator.
+
+Deactivated statements, ``inactive:`` in brace format and ``deactivate`` in
+set format, stay in the tree with their node's ``inactive`` flag set. The
+lookup methods (``get``, ``find``, ``keys``, ``value``, iteration and ``in``)
+only see the active configuration and skip them with their subtree, as the
+device does.
+"""
+
+import itertools
+import re
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Quoted strings, block comments, punctuation, "#" comments and plain words.
+# A quote that is not closed on its line runs to the end of the line, so a
+# stray quote cannot make every later quote on the line rescan to its end.
+TOKEN_PATTERN = re.compile(
+	r'"((?:[^"\\]|\\.?)*)(?:"|$)'
+	r'|(/\*)'
+	r'|([{};\[\]])'
+	r'|(#.*)'
+	r'|([^\s{};\[\]"]+)'
+)
+
+# Statement prefixes that annotate a statement rather than being part of it
+STATEMENT_ANNOTATIONS = frozenset(['inactive:', 'protect:', 'replace:'])
+
+WORD = 'word'
+
+# First word of a "display set" line that carries a configuration statement
+SET_COMMAND = 'set'
+
+# "display set" commands that do not add statements to the configuration
+IGNORED_SET_COMMANDS = frozenset(['deactivate', 'delete', 'activate', 'protect', 'unprotect'])
+
+# Annotation and "display set" commands that deactivate and reactivate a statement
+INACTIVE_ANNOTATION = 'inactive:'
+DEACTIVATE_COMMAND = 'deactivate'
+ACTIVATE_COMMAND = 'activate'
+
+# Statements sampled to tell brace format from set format
+SNIFF_STATEMENTS = 20
+
+
+def is_set_format_line(line: str) -> bool:
+	"""Return True if the line is a "display set" command such as ``set system host-name r1``."""
+	words = line.split(None, 1)
+	return bool(words) and (words[0] == SET_COMMAND or words[0] in IGNORED_SET_COMMANDS)
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+	"""
+	Tokenize brace-format JunOS configuration lines.
+
+	Args:
+		lines (Iterable[str]): The configuration lines; any iterable works,
+			including an open file, so the text never has to be held in memory.
+
+	Yields:
+		Tuple[str, str]: ``(kind, value)`` pairs where kind is ``'word'`` for
+		words and quoted strings (quotes removed) or the punctuation character
+		itself for ``{``, ``}``, ``;``, ``[`` and ``]``.
+	"""
+	in_comment = False
+
+	for line in lines:
+		position = 0
+		if in_comment:
+			comment_end = line.find('*/')
+			if comment_end == -1:
+				continue
+			in_comment = False
+			position = comment_end + 2
+
+		while True:
+			match = TOKEN_PATTERN.search(line, position)
+			if match is None:
+				break
+			position = match.end()
+
+			quoted, comment_start, punctuation, _, word = match.groups()
+			if word is not None:
+				yield WORD, word
+			elif punctuation is not None:
+				yield punctuation, punctuation
+			elif quoted is not None:
+				yield WORD, quoted
+			elif comment_start is not None:
+				comment_end = line.find('*/', position)
+				if comment_end == -1:
+					in_comment = True
+					break
+				position = comment_end + 2
+			else:
+				# "#" comment runs to the end of the line
+				break
+
+
+class JunosNode:
+	"""
+	A single level of the JunOS configuration hierarchy.
+
+	Attributes:
+		name (str): The word this node represents.
+		path (Tuple[str, ...]): The full path of the node from the root.
+		children (Dict[str, JunosNode]): Child nodes in configuration order,
+			including inactive ones.
+		inactive (bool): Whether the statement ending at this node is
+			deactivated; its subtree is skipped by the lookup methods.
+	"""
+
+	__slots__ = ('name', 'path', 'children', 'inactive')
+
+	def __init__(self, name: str, path: Tuple[str, ...]):
+		self.name = name
+		self.path = path
+		self.children: Dict[str, 'JunosNode'] = {}
+		self.inactive = False
+
+	def __repr__(self) -> str:
+		return f"<JunosNode {' '.join(self.path) or '(root)'}{' (inactive)' if self.inactive else ''}>"
+
+	def __contains__(self, name: str) -> bool:
+		child = self.children.get(name)
+		return child is not None and not child.inactive
+
+	def __iter__(self) -> Iterator['JunosNode']:
+		return (child for child in self.children.values() if not child.inactive)
+
+	def iter_leaves(self) -> Iterator['JunosNode']:
+		"""Yield the active nodes below this one that have no children, in configuration order."""
+		stack = [iter(self)]
+		while stack:
+			node = next(stack[-1], None)
+			if node is None:
+				stack.pop()
+			elif node.children:
+				stack.append(iter(node))
+			else:
+				yield node
+
+	def find(self, *names: str) -> Optional['JunosNode']:
+		"""
+		Return the descendant at the given relative path.
+
+		Args:
+			*names (str): The words of the relative path.
+
+		Returns:
+			Optional[JunosNode]: The descendant node, or None if it does not exist.
+		"""
+		node = self
+		for name in names:
+			node = node.children.get(name)
+			if node is None or node.inactive:
+				return None
+		return node
+
+	def keys(self, *names: str) -> List[str]:
+		"""Return the active child names of the descendant at the given relative path."""
+		node = self.find(*names)
+		if node is None:
+			return []
+		return [child.name for child in node]
+
+	def value(self, *names: str, default: str = "") -> str:
+		"""
+		Return the value of a leaf statement such as ``description "text";``.
+
+		Args:
+			*names (str): The relative path of the statement keyword.
+			default (str): Returned when the statement is not configured.
+
+		Returns:
+			str: The first word following the statement keyword.
+		"""
+		node = self.find(*names)
+		if node is None:
+			return default
+		child = next(iter(node), None)
+		return default if child is None else child.name
+
+
+class JunosConfigTree:
+	"""
+	A parsed JunOS configuration with path lookups by dictionary access.
+
+	Attributes:
+		root (JunosNode): The root of the configuration hierarchy.
+	"""
+
+	def __init__(self):
+		self.root = JunosNode('', ())
+		self._paths: Dict[Tuple[str, ...], JunosNode] = {(): self.root}
+
+	def __len__(self) -> int:
+		return len(self._paths) - 1
+
+	@classmethod
+	def from_text(cls, config_text: str) -> 'JunosConfigTree':
+		"""Build a tree from brace or set format configuration text."""
+		return cls.load(config_text.splitlines())
+
+	@classmethod
+	def load(cls, lines: Iterable[str]) -> 'JunosConfigTree':
+		"""
+		Build a tree from brace or set format lines, detecting the format.
+
+		The format is decided by the first ``SNIFF_STATEMENTS`` lines that are
+		neither blank nor comments: set format if most of them are "display
+		set" commands. Only those lines are buffered, so the lines are still
+		consumed in a single streaming pass.
+
+		Args:
+			lines (Iterable[str]): The configuration lines, e.g. an open file.
+
+		Returns:
+			JunosConfigTree: The parsed configuration tree.
+		"""
+		lines = iter(lines)
+		leading = []
+		set_lines = statements = 0
+		for line in lines:
+			leading.append(line)
+			stripped = line.strip()
+			if stripped and not stripped.startswith(('#', '/*')):
+				statements += 1
+				if is_set_format_line(stripped):
+					set_lines += 1
+				if statements == SNIFF_STATEMENTS:
+					break
+
+		lines = itertools.chain(leading, lines)
+		if set_lines * 2 > statements:
+			return cls.from_set_lines(lines)
+		return cls.from_lines(lines)
+
+	@classmethod
+	def from_set_lines(cls, lines: Iterable[str]) -> 'JunosConfigTree':
+		"""
+		Build a tree from ``show configuration | display set`` output.
+
+		Each line is handled independently, so memory use does not depend on
+		the size of the input beyond the tree itself.
+
+		Args:
+			lines (Iterable[str]): The set-format lines, e.g. an open file.
+
+		Returns:
+			JunosConfigTree: The parsed configuration tree.
+		"""
+		tree = cls()
+		for line in lines:
+			tree.insert_set_line(line)
+		return tree
+
+	@classmethod
+	def from_lines(cls, lines: Iterable[str]) -> 'JunosConfigTree':
+		"""
+		Build a tree from brace-format configuration lines in a single pass.
+
+		Args:
+			lines (Iterable[str]): The configuration lines, e.g. an open file.
+
+		Returns:
+			JunosConfigTree: The parsed configuration tree.
+		"""
+		tree = cls()
+		tree._build(tokenize(lines))
+		return tree
+
+	def get(self, *path: str) -> Optional[JunosNode]:
+		"""
+		Return the node at the given absolute hierarchy path.
+
+		Args:
+			*path (str): The words of the path, e.g. ``('interfaces', 'ge-0/0/0')``.
+
+		Returns:
+			Optional[JunosNode]: The node, or None if the path is not configured
+			or is deactivated, itself or below a deactivated statement.
+		"""
+		node = self._paths.get(path)
+		if node is None:
+			return None
+		for length in range(1, len(path) + 1):
+			if self._paths[path[:length]].inactive:
+				return None
+		return node
+
+	def insert(self, parent: JunosNode, words: Sequence[str]) -> JunosNode:
+		"""
+		Insert a statement below a node, creating intermediate levels as needed.
+
+		Args:
+			parent (JunosNode): The node the statement belongs to.
+			words (Sequence[str]): The words of the statement.
+
+		Returns:
+			JunosNode: The node of the last word of the statement.
+		"""
+		node = parent
+		for word in words:
+			child = node.children.get(word)
+			if child is None:
+				word = sys.intern(word)
+				child = JunosNode(word, node.path + (word,))
+				node.children[word] = child
+				self._paths[child.path] = child
+			node = child
+		return node
+
+	def insert_set_line(self, line: str) -> Optional[JunosNode]:
+		"""
+		Insert a single "display set" line into the tree.
+
+		Args:
+			line (str): A line such as ``set interfaces ge-0/0/0 unit 0 family inet address 10.0.0.1/24``.
+
+		Returns:
+			Optional[JunosNode]: The node of the last word of the statement, or None
+			if the line does not add a statement (comments, ``deactivate``, ...).
+			``deactivate`` and ``activate`` lines set the ``inactive`` flag of a
+			statement inserted before them.
+		"""
+		words: List[str] = []
+		list_items: List[str] = []
+		in_list = False
+
+		for kind, value in tokenize((line,)):
+			if kind == WORD:
+				if in_list:
+					list_items.append(value)
+				else:
+					words.append(value)
+			elif kind == '[':
+				in_list = True
+			elif kind == ']':
+				in_list = False
+
+		if len(words) >= 2 and words[0] in (DEACTIVATE_COMMAND, ACTIVATE_COMMAND):
+			node = self._paths.get(tuple(words[1:]))
+			if node is not None:
+				node.inactive = words[0] == DEACTIVATE_COMMAND
+			return None
+		if len(words) < 2 or words[0] != SET_COMMAND:
+			return None
+
+		words = words[1:]
+		if list_items:
+			node = None
+			for item in list_items:
+				node = self.insert(self.root, words + [item])
+			return node
+		return self.insert(self.root, words)
+
+	def _build(self, tokens: Iterable[Tuple[str, str]]) -> None:
+		"""Consume the token stream and build the hierarchy."""
+		stack: List[JunosNode] = []
+		current = self.root
+		words: List[str] = []
+		list_items: List[str] = []
+		in_list = False
+		inactive = False
+
+		for kind, value in tokens:
+			if kind == WORD:
+				if in_list:
+					list_items.append(value)
+				elif words or value not in STATEMENT_ANNOTATIONS:
+					words.append(value)
+				elif value == INACTIVE_ANNOTATION:
+					inactive = True
+			elif kind == ';':
+				if list_items:
+					# "statement [ a b c ];" is three statements
+					for item in list_items:
+						self.insert(current, words + [item]).inactive |= inactive
+				elif words:
+					self.insert(current, words).inactive |= inactive
+				words = []
+				list_items = []
+				in_list = False
+				inactive = False
+			elif kind == '{':
+				stack.append(current)
+				current = self.insert(current, words)
+				current.inactive |= inactive
+				words = []
+				list_items = []
+				in_list = False
+				inactive = False
+			elif kind == '}':
+				if words:
+					self.insert(current, words).inactive |= inactive
+					words = []
+				list_items = []
+				in_list = False
+				inactive = False
+				current = stack.pop() if stack else self.root
+			elif kind == '[':
+				in_list = True
+			elif kind == ']':
+				in_list = False
+
+		if words:
+			self.insert(current, words).inactive |= inactive
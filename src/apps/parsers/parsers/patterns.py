@@ -0,0 +1,247 @@
+"""
+Registry of precompiled regular expressions used by the parsers.
+
+Parser classes declare their regular expressions up front in a ``PATTERNS``
+class attribute. The patterns are registered when the class is created and
+compiled on first use, so extractors never pass raw pattern strings to the
+``re`` module (and its bounded cache) inside their loops. The registry
+records how long every pattern took to compile and, while timing is
+enabled, how often it was used and how long the matching took.
+
+Every pattern can also be matched against bytes-like subjects (``bytes``,
+``bytearray`` or an ``mmap`` of a file): a bytes version of the pattern is
+compiled on first use, so large files can be scanned without decoding them
+and only the matched spans need to be turned into text.
+
+Example:
+	>>> from apps.parsers.parsers.patterns import REGISTRY
+	>>> with REGISTRY.timed():
+	...     parser.parse(config_text)
+	>>> REGISTRY.stats()[0]
+	{'name': 'CiscoASAParser.nat_rule', 'calls': 1, 'match_time': 0.0004, ...}
+"""
+
+import mmap
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple, Union
+
+# A pattern declaration: the pattern string, or (pattern string, flags)
+PatternSpec = Union[str, Tuple[str, int]]
+
+# Text, or a bytes-like object such as an mmap, to match a pattern against
+Subject = Union[str, bytes, bytearray, mmap.mmap]
+
+
+class CompiledPattern:
+	"""
+	A registered regular expression.
+
+	The matching methods mirror those of ``re.Pattern``.
+
+	Attributes:
+		name (str): The registry name, ``<owner>.<pattern name>``.
+		pattern (str): The pattern string.
+		flags (int): The ``re`` flags.
+		compile_time (float): Seconds spent compiling, 0 until first use.
+		calls (int): Number of timed calls.
+		match_time (float): Seconds spent in timed calls.
+	"""
+
+	__slots__ = ('name', 'pattern', 'flags', 'compile_time', 'calls', 'match_time', '_regex', '_bytes_regex', '_registry')
+
+	def __init__(self, name: str, pattern: str, flags: int, registry: 'PatternRegistry'):
+		self.name = name
+		self.pattern = pattern
+		self.flags = flags
+		self.compile_time = 0.0
+		self.calls = 0
+		self.match_time = 0.0
+		self._regex: Optional[Pattern] = None
+		self._bytes_regex: Optional[Pattern] = None
+		self._registry = registry
+
+	def __repr__(self) -> str:
+		return f"<CompiledPattern {self.name} {self.pattern!r}>"
+
+	@property
+	def regex(self) -> Pattern:
+		"""Return the compiled ``re.Pattern``, compiling it on first use."""
+		if self._regex is None:
+			started = time.perf_counter()
+			self._regex = re.compile(self.pattern, self.flags)
+			self.compile_time = time.perf_counter() - started
+		return self._regex
+
+	@property
+	def bytes_regex(self) -> Pattern:
+		"""Return the pattern compiled for bytes subjects, compiling it on first use."""
+		if self._bytes_regex is None:
+			started = time.perf_counter()
+			self._bytes_regex = re.compile(self.pattern.encode('utf-8'), self.flags)
+			self.compile_time += time.perf_counter() - started
+		return self._bytes_regex
+
+	def _call(self, method: str, string: Subject, *args) -> Any:
+		if isinstance(string, str):
+			regex = self._regex if self._regex is not None else self.regex
+		else:
+			regex = self._bytes_regex if self._bytes_regex is not None else self.bytes_regex
+		if method == 'sub':
+			# Pattern.sub takes the replacement first
+			args = (args[0], string) + args[1:]
+		else:
+			args = (string,) + args
+		if not self._registry.timing:
+			return getattr(regex, method)(*args)
+
+		started = time.perf_counter()
+		try:
+			result = getattr(regex, method)(*args)
+			if method == 'finditer':
+				# Matching happens while the iterator is consumed
+				result = list(result)
+			return result
+		finally:
+			self.calls += 1
+			self.match_time += time.perf_counter() - started
+
+	def search(self, string: Subject, *args) -> Optional[re.Match]:
+		return self._call('search', string, *args)
+
+	def match(self, string: Subject, *args) -> Optional[re.Match]:
+		return self._call('match', string, *args)
+
+	def fullmatch(self, string: Subject, *args) -> Optional[re.Match]:
+		return self._call('fullmatch', string, *args)
+
+	def findall(self, string: Subject, *args) -> List[Any]:
+		return self._call('findall', string, *args)
+
+	def finditer(self, string: Subject, *args) -> Iterator[re.Match]:
+		return iter(self._call('finditer', string, *args))
+
+	def sub(self, repl: Any, string: Subject, count: int = 0) -> Union[str, bytes]:
+		return self._call('sub', string, repl, count)
+
+
+class PatternRegistry:
+	"""
+	All registered patterns, keyed by name.
+
+	Attributes:
+		timing (bool): Whether calls are counted and timed. Off by default so
+			that matching costs nothing beyond the call itself.
+	"""
+
+	def __init__(self):
+		self._patterns: Dict[str, CompiledPattern] = {}
+		self.timing = False
+
+	def __len__(self) -> int:
+		return len(self._patterns)
+
+	def __contains__(self, name: str) -> bool:
+		return name in self._patterns
+
+	def __iter__(self) -> Iterator[CompiledPattern]:
+		return iter(list(self._patterns.values()))
+
+	def register(self, name: str, pattern: str, flags: int = 0) -> CompiledPattern:
+		"""
+		Register a pattern; registering the same pattern again returns the existing entry.
+
+		Args:
+			name (str): The registry name, e.g. ``'CiscoASAParser.hostname'``.
+			pattern (str): The pattern string.
+			flags (int): The ``re`` flags.
+
+		Returns:
+			CompiledPattern: The registered pattern; it is compiled on first use.
+
+		Raises:
+			ValueError: If a different pattern is already registered under the name.
+		"""
+		existing = self._patterns.get(name)
+		if existing is not None:
+			if existing.pattern != pattern or existing.flags != flags:
+				raise ValueError(f"Pattern '{name}' is already registered with a different expression.")
+			return existing
+
+		compiled = CompiledPattern(name, pattern, flags, self)
+		self._patterns[name] = compiled
+		return compiled
+
+	def register_all(self, owner: str, specs: Dict[str, PatternSpec]) -> Dict[str, CompiledPattern]:
+		"""
+		Register a set of pattern declarations under a common owner.
+
+		Args:
+			owner (str): The owner prefix, usually the parser class name.
+			specs (Dict[str, PatternSpec]): Pattern strings or ``(pattern, flags)`` pairs by name.
+
+		Returns:
+			Dict[str, CompiledPattern]: The registered patterns by their short name.
+		"""
+		patterns = {}
+		for name, spec in specs.items():
+			pattern, flags = (spec, 0) if isinstance(spec, str) else spec
+			patterns[name] = self.register(f"{owner}.{name}", pattern, flags)
+		return patterns
+
+	def get(self, name: str) -> Optional[CompiledPattern]:
+		"""Return a registered pattern by name, or None."""
+		return self._patterns.get(name)
+
+	def compile_all(self) -> float:
+		"""
+		Compile every registered pattern now instead of on first use.
+
+		Returns:
+			float: Total seconds spent compiling patterns so far.
+		"""
+		for compiled in self._patterns.values():
+			compiled.regex
+		return sum(compiled.compile_time for compiled in self._patterns.values())
+
+	@contextmanager
+	def timed(self) -> Iterator['PatternRegistry']:
+		"""Enable call counting and timing for the duration of the block."""
+		previous = self.timing
+		self.timing = True
+		try:
+			yield self
+		finally:
+			self.timing = previous
+
+	def reset_stats(self) -> None:
+		"""Reset the call counters and match timings of every pattern."""
+		for compiled in self._patterns.values():
+			compiled.calls = 0
+			compiled.match_time = 0.0
+
+	def stats(self) -> List[Dict[str, Any]]:
+		"""
+		Return compile and match statistics for every pattern.
+
+		Returns:
+			List[Dict[str, Any]]: One entry per pattern with ``name``, ``pattern``,
+			``compile_time``, ``calls`` and ``match_time``, most expensive first.
+		"""
+		stats = [
+			{
+				"name": compiled.name,
+				"pattern": compiled.pattern,
+				"compile_time": compiled.compile_time,
+				"calls": compiled.calls,
+				"match_time": compiled.match_time,
+			}
+			for compiled in self._patterns.values()
+		]
+		stats.sort(key=lambda entry: -(entry["match_time"] + entry["compile_time"]))
+		return stats
+
+
+# The registry shared by all parser classes
+REGISTRY = PatternRegistry()
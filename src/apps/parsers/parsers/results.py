@@ -0,0 +1,471 @@
+"""
+Compact result records for parser output.
+
+Parsers used to return one dict per interface, ACL, policy, route and so on.
+A dict costs several hundred bytes before its values, which dominates the
+memory of a parse with tens of thousands of entries. The records here keep
+their fields in ``__slots__`` instead, and intern the values of fields that
+repeat across entries (actions, zones, interface types, protocol names), so
+each distinct value is stored once.
+
+Records behave like read-only-keyed dicts: ``record['name']``, ``get``,
+``keys``, ``items``, ``in`` and ``len`` work, assigning to a stored key
+works, and a record compares equal to a dict with the same items. They are
+converted to plain dicts only where results leave the parser, when they are
+stored as JSON (``to_primitive``).
+
+The result of a parse as a whole is a ``LazyResult``: a dict whose sections
+are extracted when they are first read and then kept.
+"""
+
+import sys
+from collections.abc import ItemsView, KeysView, ValuesView
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Mapping, Tuple
+
+_MISSING = object()
+
+
+class Record:
+	"""
+	Base class of the parser result records.
+
+	Subclasses list their fields in ``__slots__``. Fields whose values repeat
+	across entries are listed in ``INTERNED``; their string values, and the
+	strings in their list values, are interned when the record is created. ``FIELDS`` are the keys of the
+	record, the slots by default; a subclass can add computed keys by listing
+	them there and defining a property of the same name. Computed keys are
+	read-only: assigning one raises ``TypeError``, and a computed mapping is
+	returned as a ``MappingProxyType``, so a change to it raises instead of
+	being lost on the next read. Only keys in ``FIELDS`` can be read or set.
+	``ATTRIBUTES`` maps keys that are not valid attribute names, such as
+	``from``, to their slot.
+	"""
+
+	__slots__ = ()
+	FIELDS: Tuple[str, ...] = ()
+	INTERNED: FrozenSet[str] = frozenset()
+	ATTRIBUTES: Dict[str, str] = {}
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		if 'FIELDS' not in cls.__dict__:
+			slot_keys = {attribute: key for key, attribute in cls.ATTRIBUTES.items()}
+			cls.FIELDS = tuple(slot_keys.get(name, name) for name in cls.__slots__)
+
+	def __init__(self, **values):
+		for key, attribute in self.ATTRIBUTES.items():
+			if key in values:
+				values[attribute] = values.pop(key)
+		for name in self.__slots__:
+			value = values.pop(name, _MISSING)
+			if value is _MISSING:
+				raise TypeError(f"{type(self).__name__} is missing the {name!r} field")
+			if name in self.INTERNED:
+				value = intern_value(value)
+			setattr(self, name, value)
+		if values:
+			raise TypeError(f"{type(self).__name__} has no field {next(iter(values))!r}")
+
+	def __getitem__(self, key: str) -> Any:
+		if key not in self.FIELDS:
+			raise KeyError(key)
+		return getattr(self, self.ATTRIBUTES.get(key, key))
+
+	def __setitem__(self, key: str, value: Any) -> None:
+		if key not in self.FIELDS:
+			raise KeyError(key)
+		attribute = self.ATTRIBUTES.get(key, key)
+		if attribute not in self.__slots__:
+			raise TypeError(f"{type(self).__name__} computes {key!r} from other fields; set those instead")
+		if attribute in self.INTERNED:
+			value = intern_value(value)
+		setattr(self, attribute, value)
+
+	def __contains__(self, key: object) -> bool:
+		return key in self.FIELDS
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self.FIELDS)
+
+	def __len__(self) -> int:
+		return len(self.FIELDS)
+
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, (Record, dict)):
+			return dict(self.items()) == dict(other.items())
+		return NotImplemented
+
+	__hash__ = None
+
+	def __repr__(self) -> str:
+		return f"{type(self).__name__}({', '.join(f'{key}={value!r}' for key, value in self.items())})"
+
+	def get(self, key: str, default: Any = None) -> Any:
+		"""Return the value of a key, or the default if the record has no such key."""
+		return self[key] if key in self.FIELDS else default
+
+	def keys(self) -> Tuple[str, ...]:
+		"""Return the record's keys."""
+		return self.FIELDS
+
+	def values(self) -> List[Any]:
+		"""Return the record's values in key order."""
+		return [self[key] for key in self.FIELDS]
+
+	def items(self) -> List[Tuple[str, Any]]:
+		"""Return the record's ``(key, value)`` pairs in key order."""
+		return [(key, self[key]) for key in self.FIELDS]
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""Return the record as a plain dict, converting nested records too."""
+		return {key: to_primitive(value) for key, value in self.items()}
+
+
+class LazyResult(dict):
+	"""
+	A parse result whose sections are extracted on first access.
+	
+	Parsers check the device type up front and return one of these instead
+	of running every extractor. Reading a section (``result['acls']``,
+	``get``, ``in``, iteration over ``items()``) runs its loader once and
+	stores the value, so a caller that only needs the hostname and the
+	interfaces never pays for ACLs, routing or VPNs. Everything else a dict
+	offers keeps working; operations that need every value, such as
+	comparison, ``repr``, ``copy`` and pickling, resolve the whole result
+	first. A pickled result is always fully resolved, so results cross
+	process boundaries as plain data.
+	
+	Until a section is resolved its loader keeps the configuration (text,
+	stanza index or tree) alive; call ``resolve`` to extract everything and
+	release it.
+	
+	Args:
+		values (Dict[str, Any]): Sections that are already known, e.g. the
+			device type.
+		loaders (Dict[str, Callable[[], Any]]): Zero-argument callables that
+			extract the remaining sections, keyed by section name. A loader may
+			read other sections of the result.
+	"""
+	
+	def __init__(self, values: Dict[str, Any] = None, loaders: Dict[str, Callable[[], Any]] = None):
+		super().__init__(values or {})
+		self._loaders = dict(loaders or {})
+		self._keys = list(dict.keys(self)) + [key for key in self._loaders if not dict.__contains__(self, key)]
+	
+	def __missing__(self, key: str) -> Any:
+		loader = self._loaders.pop(key, None)
+		if loader is None:
+			raise KeyError(key)
+		value = loader()
+		dict.__setitem__(self, key, value)
+		return value
+	
+	def __setitem__(self, key: str, value: Any) -> None:
+		if key not in self._keys:
+			self._keys.append(key)
+		self._loaders.pop(key, None)
+		dict.__setitem__(self, key, value)
+	
+	def __delitem__(self, key: str) -> None:
+		if key not in self._keys:
+			raise KeyError(key)
+		self._keys.remove(key)
+		if self._loaders.pop(key, None) is None:
+			dict.__delitem__(self, key)
+	
+	def __contains__(self, key: object) -> bool:
+		return key in self._keys
+	
+	def __iter__(self) -> Iterator[str]:
+		return iter(list(self._keys))
+	
+	def __len__(self) -> int:
+		return len(self._keys)
+	
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, dict):
+			return dict(self.resolve()) == dict(other.items())
+		return NotImplemented
+	
+	def __ne__(self, other: object) -> bool:
+		equal = self.__eq__(other)
+		return equal if equal is NotImplemented else not equal
+	
+	__hash__ = None
+	
+	def __repr__(self) -> str:
+		return f"{type(self).__name__}({dict.__repr__(self.resolve())})"
+	
+	def __reduce__(self):
+		return (type(self), (dict(self.resolve()),))
+	
+	def is_loaded(self, key: str) -> bool:
+		"""Return whether a section has been extracted (or was known up front)."""
+		return key in self._keys and key not in self._loaders
+	
+	def resolve(self) -> 'LazyResult':
+		"""
+		Extract every section that has not been read yet.
+		
+		Returns:
+			LazyResult: The result itself, with its sections stored in their
+			original order and the loaders released.
+		"""
+		values = [(key, self[key]) for key in self._keys]
+		dict.clear(self)
+		dict.update(self, values)
+		return self
+	
+	def get(self, key: str, default: Any = None) -> Any:
+		"""Return a section, extracting it if needed, or the default if there is no such section."""
+		return self[key] if key in self._keys else default
+	
+	def keys(self) -> KeysView:
+		"""Return the section names without extracting anything."""
+		return KeysView(self)
+	
+	def values(self) -> ValuesView:
+		"""Return the sections; each is extracted as the view reaches it."""
+		return ValuesView(self)
+	
+	def items(self) -> ItemsView:
+		"""Return ``(name, section)`` pairs; each section is extracted as the view reaches it."""
+		return ItemsView(self)
+	
+	def copy(self) -> Dict[str, Any]:
+		"""Return a plain dict of the fully resolved result."""
+		return dict(self.resolve())
+	
+	def setdefault(self, key: str, default: Any = None) -> Any:
+		if key not in self._keys:
+			self[key] = default
+		return self[key]
+	
+	def pop(self, key: str, *default: Any) -> Any:
+		if key not in self._keys:
+			if default:
+				return default[0]
+			raise KeyError(key)
+		value = self[key]
+		del self[key]
+		return value
+	
+	def popitem(self) -> Tuple[str, Any]:
+		if not self._keys:
+			raise KeyError('popitem(): dictionary is empty')
+		key = self._keys[-1]
+		return key, self.pop(key)
+	
+	def update(self, *args: Any, **kwargs: Any) -> None:
+		for key, value in dict(*args, **kwargs).items():
+			self[key] = value
+	
+	def clear(self) -> None:
+		dict.clear(self)
+		self._loaders.clear()
+		self._keys.clear()
+
+
+def intern_value(value: Any) -> Any:
+	"""Intern a string, or the strings in a list in place; other values are returned unchanged."""
+	if type(value) is str:
+		return sys.intern(value)
+	if type(value) is list:
+		for index, item in enumerate(value):
+			if type(item) is str:
+				value[index] = sys.intern(item)
+	return value
+
+
+def to_primitive(value: Any) -> Any:
+	"""
+	Convert parser output to plain dicts and lists for serialization.
+
+	Args:
+		value (Any): Parser output: a record, or a dict, list or tuple that may
+			contain records, or any other value, which is returned unchanged.
+
+	Returns:
+		Any: The value with every record replaced by a dict.
+	"""
+	if isinstance(value, Record):
+		return value.to_dict()
+	if isinstance(value, (dict, MappingProxyType)):
+		return {key: to_primitive(item) for key, item in value.items()}
+	if isinstance(value, (list, tuple)):
+		return [to_primitive(item) for item in value]
+	return value
+
+
+# Cisco IOS
+
+class IOSInterface(Record):
+	__slots__ = ('name', 'description', 'ip_address', 'subnet_mask', 'enabled', 'vrf', 'config')
+	INTERNED = frozenset({'subnet_mask', 'vrf'})
+
+
+class IOSAccessList(Record):
+	__slots__ = ('name', 'type', 'rules')
+	INTERNED = frozenset({'type'})
+
+
+class RouteTarget(Record):
+	__slots__ = ('type', 'value')
+	INTERNED = frozenset({'type'})
+
+
+class IOSVrf(Record):
+	__slots__ = ('name', 'rd', 'route_targets', 'interfaces')
+	INTERNED = frozenset({'interfaces'})
+
+
+class IOSStaticRoute(Record):
+	__slots__ = ('network', 'mask', 'next_hop')
+	INTERNED = frozenset({'mask', 'next_hop'})
+
+
+class OSPFNetwork(Record):
+	__slots__ = ('network', 'wildcard', 'area')
+	INTERNED = frozenset({'wildcard', 'area'})
+
+
+class IOSBGPNeighbor(Record):
+	__slots__ = ('ip', 'remote_as')
+	INTERNED = frozenset({'remote_as'})
+
+
+# Cisco ASA and Nexus
+
+class NetworkObject(Record):
+	__slots__ = ('name', 'type', 'value', 'description')
+	INTERNED = frozenset({'type'})
+
+
+class NATRule(Record):
+	__slots__ = ('source_interface', 'destination_interface', 'type', 'config')
+	INTERNED = frozenset({'source_interface', 'destination_interface', 'type'})
+
+
+class NexusVlan(Record):
+	__slots__ = ('id', 'name', 'state')
+	INTERNED = frozenset({'state'})
+
+
+class VPCPortChannel(Record):
+	__slots__ = ('port_channel_id', 'vpc_id')
+
+
+# Fortinet
+
+class FortiGateInterface(Record):
+	__slots__ = ('name', 'ip', 'netmask', 'vdom', 'type', 'description', 'enabled')
+	INTERNED = frozenset({'netmask', 'vdom', 'type'})
+
+
+class FirewallPolicy(Record):
+	"""A FortiGate policy; ``vdom`` is the VDOM it is configured in, None without VDOMs."""
+	__slots__ = ('id', 'vdom', 'name', 'srcintf', 'dstintf', 'srcaddr', 'dstaddr', 'service', 'action', 'status', 'nat')
+	INTERNED = frozenset({'vdom', 'srcintf', 'dstintf', 'srcaddr', 'dstaddr', 'service', 'action', 'status'})
+
+
+class AddressObject(Record):
+	__slots__ = ('name', 'vdom', 'type', 'subnet', 'fqdn', 'comment')
+	INTERNED = frozenset({'vdom', 'type'})
+
+
+class ServiceObject(Record):
+	__slots__ = ('name', 'vdom', 'protocol', 'ports', 'comment')
+	INTERNED = frozenset({'vdom', 'protocol'})
+
+
+class IPsecPhase2(Record):
+	__slots__ = ('name', 'proposal', 'src_subnet', 'dst_subnet')
+	INTERNED = frozenset({'proposal'})
+
+
+class IPsecTunnel(Record):
+	__slots__ = ('name', 'vdom', 'interface', 'remote_gw', 'mode', 'proposal', 'dhgrp', 'psk', 'certificate', 'phase2')
+	INTERNED = frozenset({'vdom', 'interface', 'mode', 'proposal', 'dhgrp'})
+
+
+class SwitchVlan(Record):
+	__slots__ = ('id', 'name', 'description')
+
+
+class SwitchPort(Record):
+	__slots__ = ('name', 'speed', 'status', 'poe', 'vlan', 'description')
+	INTERNED = frozenset({'speed', 'status', 'vlan'})
+
+
+# Juniper JunOS
+
+class JunosInterface(Record):
+	__slots__ = ('name', 'description', 'units', 'enabled')
+
+
+class JunosUnit(Record):
+	"""A logical unit; ``family`` is built on access from the unit's address lists."""
+	__slots__ = ('id', 'description', 'inet_addresses', 'inet6_addresses', 'vlan_id')
+	FIELDS = ('id', 'description', 'family', 'vlan_id')
+
+	@property
+	def family(self) -> Mapping[str, Mapping[str, List[str]]]:
+		return MappingProxyType({
+			"inet": MappingProxyType({"addresses": self.inet_addresses}),
+			"inet6": MappingProxyType({"addresses": self.inet6_addresses})
+		})
+
+
+class RoutingInstance(Record):
+	__slots__ = ('name', 'type', 'description', 'interfaces', 'route_distinguisher', 'vrf_target')
+	INTERNED = frozenset({'type', 'interfaces'})
+
+
+class SecurityPolicy(Record):
+	"""A security policy; ``match`` and ``then`` are built on access from flat fields."""
+	__slots__ = ('name', 'from_zone', 'to_zone', 'source_address', 'destination_address', 'application', 'action', 'description')
+	FIELDS = ('name', 'from_zone', 'to_zone', 'match', 'then', 'description')
+	INTERNED = frozenset({'from_zone', 'to_zone', 'source_address', 'destination_address', 'application', 'action'})
+
+	@property
+	def match(self) -> Mapping[str, List[str]]:
+		return MappingProxyType({
+			"source_address": self.source_address,
+			"destination_address": self.destination_address,
+			"application": self.application
+		})
+
+	@property
+	def then(self) -> Mapping[str, str]:
+		return MappingProxyType({"action": self.action})
+
+
+class JunosStaticRoute(Record):
+	__slots__ = ('prefix', 'next_hop', 'preference')
+	INTERNED = frozenset({'next_hop', 'preference'})
+
+
+class JunosBGPNeighbor(Record):
+	__slots__ = ('address', 'peer_as', 'description', 'group')
+	INTERNED = frozenset({'peer_as', 'group'})
+
+
+class OSPFArea(Record):
+	__slots__ = ('id', 'interfaces')
+
+
+class OSPFInterface(Record):
+	__slots__ = ('name', 'passive', 'metric')
+	INTERNED = frozenset({'metric'})
+
+
+class FirewallFilter(Record):
+	__slots__ = ('name', 'family', 'terms')
+	INTERNED = frozenset({'family'})
+
+
+class FilterTerm(Record):
+	"""A firewall filter term; ``from`` and ``then`` hold only the criteria and actions that are set."""
+	__slots__ = ('name', 'from_', 'then')
+	ATTRIBUTES = {'from': 'from_'}
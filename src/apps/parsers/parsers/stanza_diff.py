@@ -0,0 +1,240 @@
+"""
+Structural diff of two versions of a configuration.
+
+A plain text diff of a large configuration is slow and noisy: a change in
+one interface shows up as a hunk of whatever lines happen to surround it.
+The structural diff compares the configurations block by block instead,
+using the blocks a parser splits a configuration into (``Parser.split_blocks``):
+IOS top-level stanzas, FortiOS table entries, JunOS second-level
+hierarchies and so on. Every block is hashed once. The comparison is
+hierarchical: blocks are grouped by section and scope, a group whose blocks
+all hash the same is skipped as a whole, and within a changed group only
+blocks whose hashes differ are compared line by line. Comparing and
+reporting therefore cost time proportional to the change; only splitting
+and hashing touch every line.
+"""
+
+import difflib
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .incremental import Stanza
+
+# Kinds of change
+ADDED = 'added'
+REMOVED = 'removed'
+MODIFIED = 'modified'
+MOVED = 'moved'
+CHANGE_KINDS = (ADDED, REMOVED, MODIFIED, MOVED)
+
+# Lines of context around the changed lines of a modified block
+DIFF_CONTEXT = 3
+
+# Column zero lines that change on every backup without a configuration change
+VOLATILE_PREFIXES = ('Building configuration', 'Current configuration', 'ntp clock-period')
+
+
+def block_digest(text: str) -> bytes:
+	"""Return the digest of a block's text; blocks with the same digest are unchanged."""
+	return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class BlockChange:
+	"""
+	A block that differs between two versions of a configuration.
+
+	Attributes:
+		kind (str): ``added``, ``removed``, ``modified`` or ``moved`` (unchanged,
+			but in a different position among the blocks of its section).
+		section (str): The section of the block, e.g. ``'interface'``.
+		scope (Optional[str]): The VDOM or other scope of the block, if any.
+		key (Optional[str]): The block's name within its section and scope.
+		lines (List[str]): The lines of an added or removed block, or a unified
+			diff of a modified block without its file headers; empty for moved
+			blocks.
+	"""
+
+	__slots__ = ('kind', 'section', 'scope', 'key', 'lines')
+
+	def __init__(self, kind: str, stanza: Stanza, lines: List[str]):
+		self.kind = kind
+		self.section = stanza.section
+		self.scope = stanza.scope
+		self.key = stanza.key
+		self.lines = lines
+
+	def __repr__(self) -> str:
+		return f"<BlockChange {self.kind} {self.section!r} {self.key!r} in {self.scope!r}>"
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""Return the change as JSON serializable data."""
+		return {
+			'kind': self.kind,
+			'section': self.section,
+			'scope': self.scope,
+			'key': self.key,
+			'lines': self.lines,
+		}
+
+
+def split_column_blocks(config_text: str, sections: Sequence[Tuple[str, str]] = ()) -> List[Stanza]:
+	"""
+	Split an IOS style configuration into its top-level blocks.
+
+	Every line that starts in column zero opens a block holding the indented
+	lines below it. ``!`` separators, blank lines, trailing whitespace and
+	volatile lines such as ``Current configuration : 1234 bytes`` are ignored.
+
+	Args:
+		config_text (str): The raw configuration text.
+		sections (Sequence[Tuple[str, str]]): ``(section name, header prefix)``
+			pairs; the first matching prefix names a block's section. Blocks
+			matching none are in the section named by the header's first word.
+
+	Returns:
+		List[Stanza]: The blocks in configuration order, keyed by their header.
+	"""
+	stanzas: List[Stanza] = []
+	header: Optional[str] = None
+	lines: List[str] = []
+
+	def close() -> None:
+		for name, prefix in sections:
+			if header.startswith(prefix):
+				break
+		else:
+			name = header.split(None, 1)[0]
+		stanzas.append(Stanza(name, None, header, '\n'.join([header] + lines)))
+
+	for line in config_text.splitlines():
+		line = line.rstrip()
+		if not line:
+			continue
+		if not line[0].isspace():
+			if header is not None:
+				close()
+			header, lines = None, []
+			if not line.startswith(('!',) + VOLATILE_PREFIXES):
+				header = line
+		elif header is not None:
+			lines.append(line)
+
+	if header is not None:
+		close()
+	return stanzas
+
+
+def diff_blocks(previous: Iterable[Stanza], current: Iterable[Stanza]) -> List[BlockChange]:
+	"""
+	Compare the blocks of two versions of a configuration.
+
+	Blocks are matched by section, scope and key; blocks with the same key in
+	a section are matched in order.
+
+	Args:
+		previous (Iterable[Stanza]): The blocks of the previous version.
+		current (Iterable[Stanza]): The blocks of the new version.
+
+	Returns:
+		List[BlockChange]: The changes, grouped by section in the new version's
+		order, followed by the sections that were removed entirely. Within a
+		section, changes are in the new version's order, removed blocks last.
+	"""
+	previous_groups = _group(previous)
+	current_groups = _group(current)
+
+	changes: List[BlockChange] = []
+	groups = list(current_groups) + [group for group in previous_groups if group not in current_groups]
+	for group in groups:
+		old = previous_groups.get(group, [])
+		new = current_groups.get(group, [])
+		if [(stanza.key, digest) for stanza, digest in old] == [(stanza.key, digest) for stanza, digest in new]:
+			continue
+		changes.extend(_diff_group(old, new))
+	return changes
+
+
+def summarize(changes: Iterable[BlockChange]) -> List[Dict[str, Any]]:
+	"""
+	Count the changes per section.
+
+	Args:
+		changes (Iterable[BlockChange]): Changes returned by ``diff_blocks``.
+
+	Returns:
+		List[Dict[str, Any]]: One entry per changed section and scope, with the
+		number of blocks of every kind of change, in the order of the changes.
+	"""
+	sections: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+	for change in changes:
+		counts = sections.get((change.scope, change.section))
+		if counts is None:
+			counts = {'section': change.section, 'scope': change.scope, **dict.fromkeys(CHANGE_KINDS, 0)}
+			sections[(change.scope, change.section)] = counts
+		counts[change.kind] += 1
+	return list(sections.values())
+
+
+def _group(stanzas: Iterable[Stanza]) -> Dict[Tuple[Optional[str], str], List[Tuple[Stanza, bytes]]]:
+	"""Hash every block and group the blocks by scope and section, in order."""
+	groups: Dict[Tuple[Optional[str], str], List[Tuple[Stanza, bytes]]] = {}
+	for stanza in stanzas:
+		groups.setdefault((stanza.scope, stanza.section), []).append((stanza, block_digest(stanza.text)))
+	return groups
+
+
+def _diff_group(old: List[Tuple[Stanza, bytes]], new: List[Tuple[Stanza, bytes]]) -> List[BlockChange]:
+	"""Compare the blocks of one section and scope."""
+	old_items = [(stanza.key, digest) for stanza, digest in old]
+	new_items = [(stanza.key, digest) for stanza, digest in new]
+
+	# Only the part between the common prefix and suffix is aligned
+	start = 0
+	limit = min(len(old_items), len(new_items))
+	while start < limit and old_items[start] == new_items[start]:
+		start += 1
+	end = 0
+	while end < limit - start and old_items[-1 - end] == new_items[-1 - end]:
+		end += 1
+
+	matcher = difflib.SequenceMatcher(
+		None, old_items[start:len(old_items) - end], new_items[start:len(new_items) - end], autojunk=False
+	)
+	unmatched_old: List[int] = []
+	unmatched_new: List[int] = []
+	for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+		if tag != 'equal':
+			unmatched_old.extend(range(start + old_start, start + old_end))
+			unmatched_new.extend(range(start + new_start, start + new_end))
+
+	# Blocks that are only in one side's aligned order are paired up by key:
+	# unchanged ones have moved, others were modified
+	old_by_key: Dict[Optional[str], List[int]] = {}
+	for position in reversed(unmatched_old):
+		old_by_key.setdefault(old[position][0].key, []).append(position)
+
+	changes: List[BlockChange] = []
+	for position in unmatched_new:
+		stanza, digest = new[position]
+		candidates = old_by_key.get(stanza.key)
+		if not candidates:
+			changes.append(BlockChange(ADDED, stanza, _lines(stanza.text)))
+			continue
+		previous_stanza, previous_digest = old[candidates.pop()]
+		if previous_digest == digest:
+			changes.append(BlockChange(MOVED, stanza, []))
+		else:
+			diff = difflib.unified_diff(
+				_lines(previous_stanza.text), _lines(stanza.text), lineterm='', n=DIFF_CONTEXT
+			)
+			changes.append(BlockChange(MODIFIED, stanza, list(diff)[2:]))
+
+	for position in sorted(position for positions in old_by_key.values() for position in positions):
+		stanza = old[position][0]
+		changes.append(BlockChange(REMOVED, stanza, _lines(stanza.text)))
+	return changes
+
+
+def _lines(text: str) -> List[str]:
+	"""Split a block's text into lines; blocks without text have none."""
+	return text.split('\n') if text else []
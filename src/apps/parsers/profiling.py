@@ -0,0 +1,124 @@
+"""
+Parse profiles: per-extractor statistics of device file parses.
+
+When ``PARSE_PROFILING`` is enabled, ``DeviceFile.parse_file`` profiles the
+parser (see ``Parser.enable_profiling``) and stores the result in
+``DeviceFile.parse_profile``:
+
+	{
+		"parser": "CiscoIOSParser",
+		"bytes": 182934,          # size of the configuration file
+		"seconds": 0.031,         # wall time of the whole parse
+		"complete": true,         # false if the parse budget ran out
+		"incremental": false,     # true if only the changes since the previous version were parsed
+		"extractors": {
+			"extract_interfaces": {"calls": 1, "seconds": 0.012, "items": 500},
+			...
+		}
+	}
+
+Every stored profile is also passed to the exporters listed in
+``PARSE_PROFILE_EXPORTERS``: dotted paths of callables taking the device file
+and its profile, e.g. ``apps.parsers.profiling.log_profile`` or a function
+that forwards the numbers to a metrics pipeline. The admin aggregates the
+stored profiles per device type (see ``aggregate_profiles``).
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def is_profiling_enabled() -> bool:
+	"""Return whether device file parses are profiled."""
+	return getattr(settings, 'PARSE_PROFILING', False)
+
+
+def export_profile(device_file, profile: Dict[str, Any]) -> None:
+	"""
+	Pass a parse profile to every configured exporter.
+
+	An exporter that fails is logged and skipped, so metrics never make a
+	parse fail.
+
+	Args:
+		device_file (DeviceFile): The device file that was parsed.
+		profile (Dict[str, Any]): Its parse profile.
+	"""
+	for path in getattr(settings, 'PARSE_PROFILE_EXPORTERS', []):
+		try:
+			import_string(path)(device_file, profile)
+		except Exception:
+			logger.exception("Parse profile exporter %s failed for device file %s", path, device_file.pk)
+
+
+def log_profile(device_file, profile: Dict[str, Any]) -> None:
+	"""
+	Export a parse profile as log records, one per extractor.
+
+	Records are written at INFO level to this module's logger in a
+	``key=value`` format that log-based metrics pipelines can parse.
+
+	Args:
+		device_file (DeviceFile): The device file that was parsed.
+		profile (Dict[str, Any]): Its parse profile.
+	"""
+	for name, stats in profile['extractors'].items():
+		logger.info(
+			"parse_profile device_file=%s parser=%s extractor=%s calls=%d seconds=%.6f items=%d",
+			device_file.pk, profile['parser'], name, stats['calls'], stats['seconds'], stats['items']
+		)
+
+
+def aggregate_profiles(profiles: Iterable[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+	"""
+	Aggregate parse profiles per device type.
+
+	Args:
+		profiles (Iterable[Tuple[str, Dict[str, Any]]]): ``(device type name,
+			parse profile)`` pairs.
+
+	Returns:
+		List[Dict[str, Any]]: One entry per device type, slowest first, with the
+		number of ``files``, their total ``bytes`` and parse ``seconds``, the
+		throughput in ``megabytes_per_second`` and the ``extractors`` slowest
+		first. Each extractor has its ``files``, ``calls``, total, mean and
+		maximum ``seconds``, ``items`` and its ``share`` of the
+		parse time.
+	"""
+	device_types = defaultdict(lambda: {'files': 0, 'bytes': 0, 'seconds': 0.0, 'extractors': {}})
+	for device_type, profile in profiles:
+		totals = device_types[device_type]
+		totals['files'] += 1
+		totals['bytes'] += profile.get('bytes') or 0
+		totals['seconds'] += profile.get('seconds') or 0.0
+		for name, stats in profile.get('extractors', {}).items():
+			extractor = totals['extractors'].setdefault(name, {
+				'name': name, 'files': 0, 'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'items': 0
+			})
+			extractor['files'] += 1
+			extractor['calls'] += stats['calls']
+			extractor['seconds'] += stats['seconds']
+			extractor['max_seconds'] = max(extractor['max_seconds'], stats['seconds'])
+			extractor['items'] += stats['items']
+
+	aggregated = []
+	for device_type, totals in device_types.items():
+		extractors = sorted(totals['extractors'].values(), key=lambda extractor: -extractor['seconds'])
+		for extractor in extractors:
+			extractor['mean_seconds'] = extractor['seconds'] / extractor['files']
+			extractor['share'] = extractor['seconds'] / totals['seconds'] if totals['seconds'] else None
+		aggregated.append({
+			'device_type': device_type,
+			'files': totals['files'],
+			'bytes': totals['bytes'],
+			'seconds': totals['seconds'],
+			'megabytes_per_second': totals['bytes'] / totals['seconds'] / 1e6 if totals['seconds'] else None,
+			'extractors': extractors,
+		})
+	return sorted(aggregated, key=lambda entry: -entry['seconds'])
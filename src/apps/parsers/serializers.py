@@ -0,0 +1,29 @@
+from rest_framework import serializers
+from .models import DeviceFile, ParseJob
+
+class ParseJobSerializer(serializers.ModelSerializer):
+	"""Serializer for the ParseJob model"""
+	device_file_name = serializers.CharField(source='device_file.name', read_only=True)
+	parsed = serializers.BooleanField(source='device_file.parsed', read_only=True)
+	parse_errors = serializers.CharField(source='device_file.parse_errors', read_only=True)
+	
+	class Meta:
+		model = ParseJob
+		fields = [
+			'id', 'device_file', 'device_file_name', 'status', 'attempts', 'max_attempts',
+			'run_after', 'worker', 'started_at', 'finished_at', 'duration', 'last_error',
+			'parsed', 'parse_errors', 'created_at', 'updated_at'
+		]
+		read_only_fields = fields
+
+class DeviceFileSerializer(serializers.ModelSerializer):
+	"""Serializer for the DeviceFile model"""
+	device_type_slug = serializers.CharField(source='device_type.slug', read_only=True)
+	
+	class Meta:
+		model = DeviceFile
+		fields = [
+			'id', 'project', 'device_type', 'device_type_slug', 'name', 'original_filename',
+			'parsed', 'parse_errors', 'content_hash', 'created_at', 'updated_at'
+		]
+		read_only_fields = fields
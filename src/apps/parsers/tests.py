@@ -1,9 +1,44 @@
-from django.test import TestCase
+import io
+import os
+import tarfile
+import tempfile
+import zipfile
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
 from django.core.files.uploadedfile import SimpleUploadedFile
-from .models import DeviceType, DeviceFile
+from .archives import ArchiveError, import_archive
+from .blobs import blob_path
+from .cache import compute_content_hash, evict, get_cached_result, store_result
+from .jobs import claim_job, run_job
+from .models import ConfigBlob, DeviceType, DeviceFile, ParseJob, ParseResultCache
+from .profiling import aggregate_profiles
+from apps.inventory.models import Device
+from .parsers.budget import ParseBudgetExceeded
+from .parsers.cisco import CiscoIOSParser, CiscoASAParser
+from .parsers.results import to_primitive
 from apps.projects.models import Project
 from apps.clients.models import Client
 
+class MediaRootTestCase(TestCase):
+	"""Test case that stores uploaded files and blobs in a temporary media root"""
+	
+	def setUp(self):
+		"""Point MEDIA_ROOT at a temporary directory removed after the test"""
+		media_root = tempfile.TemporaryDirectory()
+		self.addCleanup(media_root.cleanup)
+		settings_override = override_settings(MEDIA_ROOT=media_root.name)
+		settings_override.enable()
+		self.addCleanup(settings_override.disable)
+
+
 class DeviceTypeModelTest(TestCase):
 	"""Test cases for the DeviceType model"""
 	
@@ -26,11 +61,12 @@ class DeviceTypeModelTest(TestCase):
 		"""Test the string representation of a device type"""
 		self.assertEqual(str(self.device_type), self.device_type_data['name'])
 
-class DeviceFileModelTest(TestCase):
+class DeviceFileModelTest(MediaRootTestCase):
 	"""Test cases for the DeviceFile model"""
 	
 	def setUp(self):
 		"""Set up test data"""
+		super().setUp()
 		self.client = Client.objects.create(
 			name='Test Company',
 			contact_name='John Doe',
@@ -71,3 +107,581 @@ class DeviceFileModelTest(TestCase):
 		"""Test the string representation of a device file"""
 		expected = f"{self.device_file_data['name']} ({self.device_type.name})"
 		self.assertEqual(str(self.device_file), expected)
+
+@override_settings(PARSE_CACHE_MAX_BYTES=10 * 1024 * 1024)
+class ParseResultCacheTest(MediaRootTestCase):
+	"""Test cases for the content-hash parse result cache"""
+	
+	def setUp(self):
+		"""Set up test data"""
+		super().setUp()
+		self.parser = CiscoIOSParser()
+		self.content_hash = compute_content_hash(b"hostname test-router\n")
+		self.result = {"hostname": "test-router", "interfaces": []}
+	
+	def test_store_and_get(self):
+		"""Test that stored output is served and counted as a hit"""
+		self.assertIsNone(get_cached_result(self.content_hash, self.parser))
+		
+		store_result(self.content_hash, self.parser, self.result)
+		self.assertEqual(get_cached_result(self.content_hash, self.parser), self.result)
+		self.assertEqual(ParseResultCache.objects.get().hits, 1)
+	
+	def test_parser_version_and_class_are_part_of_the_key(self):
+		"""Test that other parsers and bumped versions miss the cache"""
+		store_result(self.content_hash, self.parser, self.result)
+		
+		self.assertIsNone(get_cached_result(self.content_hash, CiscoASAParser()))
+		
+		self.parser.PARSER_VERSION = "2"
+		self.assertIsNone(get_cached_result(self.content_hash, self.parser))
+	
+	def test_least_recently_used_entries_are_evicted(self):
+		"""Test that eviction trims the cache below its size limit, oldest first"""
+		for number in range(5):
+			store_result(compute_content_hash(str(number).encode()), self.parser, self.result)
+		size = ParseResultCache.objects.first().size
+		
+		# Use the oldest entry so that it survives eviction
+		get_cached_result(compute_content_hash(b"0"), self.parser)
+		
+		self.assertEqual(evict(size * 3), 3)
+		remaining = set(ParseResultCache.objects.values_list('content_hash', flat=True))
+		self.assertEqual(remaining, {compute_content_hash(b"0"), compute_content_hash(b"4")})
+	
+	@override_settings(PARSE_CACHE_MAX_BYTES=0)
+	def test_disabled_cache(self):
+		"""Test that a limit of 0 disables the cache"""
+		store_result(self.content_hash, self.parser, self.result)
+		self.assertFalse(ParseResultCache.objects.exists())
+
+@override_settings(PARSE_TIME_LIMIT=None, PARSE_CACHE_MAX_BYTES=0, PARSE_JOB_RETRY_DELAY=0)
+class ParseJobTest(MediaRootTestCase):
+	"""Test cases for the background parse job queue"""
+	
+	def setUp(self):
+		"""Set up test data"""
+		super().setUp()
+		client = Client.objects.create(name='Test Company')
+		self.project = Project.objects.create(name='Test Project', client=client)
+		self.device_type = DeviceType.objects.create(name='Cisco IOS', slug='cisco-ios')
+	
+	def create_device_file(self, content, device_type=None):
+		"""Create a device file with the given content"""
+		return DeviceFile.objects.create(
+			name='Test Router',
+			project=self.project,
+			device_type=device_type or self.device_type,
+			file=SimpleUploadedFile("router_config.txt", content)
+		)
+	
+	def test_claim_and_run(self):
+		"""Test that a claimed job is parsed and its timing recorded"""
+		job = ParseJob.enqueue(self.create_device_file(b"version 15.2\nhostname R1\n!\n"))
+		
+		claimed = claim_job('worker-1')
+		self.assertEqual(claimed.pk, job.pk)
+		self.assertEqual(claimed.status, ParseJob.STATUS_RUNNING)
+		self.assertIsNone(claim_job('worker-2'))
+		
+		run_job(claimed)
+		job.refresh_from_db()
+		self.assertEqual(job.status, ParseJob.STATUS_SUCCEEDED)
+		self.assertEqual(job.attempts, 1)
+		self.assertEqual(job.worker, 'worker-1')
+		self.assertIsNotNone(job.duration)
+		self.assertTrue(job.device_file.parsed)
+	
+	def test_rejected_configuration_is_not_retried(self):
+		"""Test that a parse error fails the job on the first attempt"""
+		device_type = DeviceType.objects.create(name='Unknown', slug='unknown')
+		job = ParseJob.enqueue(self.create_device_file(b"hostname R1\n", device_type))
+		
+		run_job(claim_job('worker-1'))
+		job.refresh_from_db()
+		self.assertEqual(job.status, ParseJob.STATUS_FAILED)
+		self.assertIn('No parser available', job.last_error)
+	
+	def test_unexpected_errors_are_retried(self):
+		"""Test that unexpected errors reschedule the job until its attempts are used up"""
+		device_file = self.create_device_file(b"hostname R1\n")
+		device_file.file.storage.delete(device_file.file.name)
+		job = ParseJob.enqueue(device_file, max_attempts=2)
+		
+		run_job(claim_job('worker-1'))
+		job.refresh_from_db()
+		self.assertEqual(job.status, ParseJob.STATUS_PENDING)
+		self.assertTrue(job.last_error)
+		
+		run_job(claim_job('worker-1'))
+		job.refresh_from_db()
+		self.assertEqual(job.status, ParseJob.STATUS_FAILED)
+		self.assertEqual(job.attempts, 2)
+	
+	def test_worker_requeues_jobs_abandoned_while_polling(self):
+		"""Test that a running worker picks up a job whose worker died after it started"""
+		job = ParseJob.enqueue(self.create_device_file(b"version 15.2\nhostname R1\n!\n"))
+		claim_job('dead-worker')
+		
+		def worker_dies(seconds):
+			ParseJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(hours=1))
+		
+		out = StringIO()
+		with patch('apps.parsers.management.commands.parse_worker.time.sleep', side_effect=worker_dies) as sleep:
+			call_command('parse_worker', max_jobs=1, requeue_interval=0, worker_id='live-worker', stdout=out)
+		sleep.assert_called_once()
+		job.refresh_from_db()
+		self.assertEqual(job.status, ParseJob.STATUS_SUCCEEDED)
+		self.assertEqual(job.worker, 'live-worker')
+		self.assertEqual(job.attempts, 2)
+		self.assertIn('Requeued 1 abandoned job(s)', out.getvalue())
+
+@override_settings(PARSE_TIME_LIMIT=None, PARSE_CACHE_MAX_BYTES=10 * 1024 * 1024)
+class BulkParseCommandTest(MediaRootTestCase):
+	"""Test cases for the bulk_parse management command"""
+	
+	def setUp(self):
+		"""Write a directory of configuration backups"""
+		super().setUp()
+		client = Client.objects.create(name='Test Company')
+		self.project = Project.objects.create(name='Test Project', client=client)
+		self.directory = tempfile.TemporaryDirectory()
+		configs = {
+			'r1.cfg': "version 15.2\nhostname R1\n!\ninterface GigabitEthernet0/0\n ip address 10.0.0.1 255.255.255.0\n!\n",
+			'fw1.cfg': "ASA Version 9.8\nhostname FW1\n",
+			'notes.cfg': "nothing to see here\n",
+		}
+		for name, content in configs.items():
+			with open(os.path.join(self.directory.name, name), 'w') as config_file:
+				config_file.write(content)
+	
+	def tearDown(self):
+		self.directory.cleanup()
+	
+	def test_bulk_parse(self):
+		"""Test that detected files are parsed into the inventory, and undetected ones skipped"""
+		out = StringIO()
+		call_command('bulk_parse', self.project.pk, self.directory.name, workers=1, stdout=out, stderr=StringIO())
+		
+		device_files = {device_file.name: device_file for device_file in self.project.device_files.all()}
+		self.assertEqual(set(device_files), {'r1', 'fw1'})
+		self.assertEqual(device_files['r1'].device_type.slug, 'cisco-ios')
+		self.assertEqual(device_files['fw1'].device_type.slug, 'cisco-asa')
+		self.assertTrue(all(device_file.parsed for device_file in device_files.values()))
+		self.assertEqual(ParseResultCache.objects.count(), 2)
+		self.assertTrue(self.project.devices.filter(name='R1', interfaces__name='GigabitEthernet0/0').exists())
+		self.assertTrue(self.project.devices.filter(name='FW1').exists())
+		self.assertIn('files/sec', out.getvalue())
+		self.assertIn('CiscoASAParser', out.getvalue())
+
+class ArchiveImportTest(MediaRootTestCase):
+	"""Test cases for importing archives of device files"""
+	
+	def setUp(self):
+		"""Set up test data"""
+		super().setUp()
+		client = Client.objects.create(name='Test Company')
+		self.project = Project.objects.create(name='Test Project', client=client)
+		self.members = {
+			'site-a/r1.cfg': b"version 15.2\nhostname R1\n!\n",
+			'site-a/fw1.conf': b"ASA Version 9.8\nhostname FW1\n",
+			'site-a/readme.md': b"# Backups\n",
+			'site-b/unknown.txt': b"nothing to see here\n",
+			'site-b/big.cfg': b"hostname BIG\n" + b"!" * 2048,
+		}
+	
+	def import_members(self, fileobj, name):
+		"""Import an archive with a 1KB member limit"""
+		return import_archive(self.project, fileobj, name, ['txt', 'conf', 'cfg'], 1024, batch_size=1)
+	
+	def assert_imported(self, summary):
+		"""Check the device files and parse jobs created from the test members"""
+		self.assertEqual(summary['created'], 2)
+		self.assertEqual(dict(summary['skipped']), {
+			'site-a/readme.md': 'unsupported file type',
+			'site-b/unknown.txt': 'device type not detected',
+			'site-b/big.cfg': 'larger than 1.0\xa0KB',
+		})
+		device_files = {device_file.name: device_file for device_file in self.project.device_files.all()}
+		self.assertEqual(device_files['site-a/r1'].device_type.slug, 'cisco-ios')
+		self.assertEqual(device_files['site-a/fw1'].device_type.slug, 'cisco-asa')
+		self.assertEqual(ParseJob.objects.filter(status=ParseJob.STATUS_PENDING).count(), 2)
+		self.assertEqual(device_files['site-a/r1'].read_content(), self.members['site-a/r1.cfg'])
+	
+	def test_zip_archive(self):
+		"""Test importing a zip archive"""
+		buffer = io.BytesIO()
+		with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+			for name, content in self.members.items():
+				archive.writestr(name, content)
+		buffer.seek(0)
+		self.assert_imported(self.import_members(buffer, 'backups.zip'))
+	
+	def test_tar_gz_archive(self):
+		"""Test importing a streamed tar.gz archive"""
+		buffer = io.BytesIO()
+		with tarfile.open(fileobj=buffer, mode='w:gz') as archive:
+			for name, content in self.members.items():
+				info = tarfile.TarInfo(f"./{name}")
+				info.size = len(content)
+				archive.addfile(info, io.BytesIO(content))
+		buffer.seek(0)
+		self.assert_imported(self.import_members(buffer, 'backups.tar.gz'))
+	
+	def test_corrupt_archive(self):
+		"""Test that a corrupt archive is rejected"""
+		with self.assertRaises(ArchiveError):
+			self.import_members(io.BytesIO(b"not an archive"), 'backups.tgz')
+
+class ConfigBlobTest(MediaRootTestCase):
+	"""Test cases for the content-addressed device file store"""
+	
+	def setUp(self):
+		"""Set up test data"""
+		super().setUp()
+		client = Client.objects.create(name='Test Company')
+		self.projects = [Project.objects.create(name=f'Project {number}', client=client) for number in range(2)]
+		self.device_type = DeviceType.objects.create(name='Cisco IOS', slug='cisco-ios')
+		self.content = b"version 15.2\nhostname R1\n" * 100
+	
+	def upload(self, project, content):
+		"""Create a device file from an uploaded file"""
+		return DeviceFile.objects.create(
+			name='R1',
+			project=project,
+			device_type=self.device_type,
+			file=SimpleUploadedFile('r1.cfg', content)
+		)
+	
+	def test_identical_uploads_share_one_blob(self):
+		"""Test that identical content is stored once, compressed and reference-counted"""
+		first = self.upload(self.projects[0], self.content)
+		second = self.upload(self.projects[1], self.content)
+		
+		blob = ConfigBlob.objects.get()
+		self.assertEqual(blob.ref_count, 2)
+		self.assertEqual(first.file.name, second.file.name)
+		self.assertEqual(first.content_hash, compute_content_hash(self.content))
+		self.assertLess(blob.stored_size, len(self.content))
+		self.assertEqual(first.filename(), 'r1.cfg')
+		self.assertEqual(second.read_content(), self.content)
+	
+	def test_blob_is_deleted_with_its_last_reference(self):
+		"""Test that deleting and replacing files releases their blobs"""
+		first = self.upload(self.projects[0], self.content)
+		self.upload(self.projects[1], self.content)
+		storage = first.file.storage
+		path = first.file.name
+		
+		first.file = SimpleUploadedFile('r1.cfg', b"hostname R2\n")
+		first.save()
+		self.assertEqual(ConfigBlob.objects.get(content_hash=compute_content_hash(self.content)).ref_count, 1)
+		
+		with self.captureOnCommitCallbacks(execute=True):
+			self.projects[1].delete()
+		self.assertFalse(ConfigBlob.objects.filter(content_hash=compute_content_hash(self.content)).exists())
+		self.assertFalse(storage.exists(path))
+
+
+	def test_reference_is_taken_with_the_row(self):
+		"""Test that a device file only references its blob once the row is saved"""
+		device_file = DeviceFile(name='R1', project=self.projects[0], device_type=self.device_type)
+		device_file.set_content('r1.cfg', self.content)
+		self.assertFalse(ConfigBlob.objects.exists())
+		
+		with self.assertRaises(IntegrityError), transaction.atomic():
+			device_file.acquire_blob()
+			DeviceFile.objects.bulk_create([device_file, DeviceFile(name='R2', project=self.projects[0])])
+		self.assertFalse(ConfigBlob.objects.exists())
+	
+	def test_existing_blob_is_reused_after_a_compression_change(self):
+		"""Test that content is not stored again with the newly configured compression"""
+		first = self.upload(self.projects[0], self.content)
+		with patch('apps.parsers.blobs.get_compression', return_value='zstd'):
+			second = self.upload(self.projects[1], self.content)
+		
+		self.assertEqual(second.blob, first.blob)
+		self.assertEqual(second.file.name, first.file.name)
+		self.assertEqual(ConfigBlob.objects.get().ref_count, 2)
+		self.assertFalse(first.file.storage.exists(blob_path(first.content_hash, 'zstd')))
+	
+	@override_settings(PARSE_TIME_LIMIT=None, PARSE_CACHE_MAX_BYTES=0)
+	def test_parse_streams_the_blob(self):
+		"""Test that a streaming parser reads the decompressed blob line by line"""
+		device_file = self.upload(self.projects[0], b"version 15.2\r\nhostname R1\r\n!\r\ninterface GigabitEthernet0/0\r\n shutdown\r\n")
+		
+		with device_file.line_source()() as lines:
+			self.assertEqual(next(iter(lines)), "version 15.2\n")
+		self.assertTrue(device_file.parse_file())
+		self.assertTrue(self.projects[0].devices.filter(name='R1', interfaces__name='GigabitEthernet0/0').exists())
+
+
+class CompressMediaCommandTest(MediaRootTestCase):
+	"""Test cases for the compress_media management command"""
+	
+	def setUp(self):
+		"""Set up test data"""
+		super().setUp()
+		client = Client.objects.create(name='Test Company')
+		self.project = Project.objects.create(name='Test Project', client=client)
+		self.device_type = DeviceType.objects.create(name='Cisco IOS', slug='cisco-ios')
+		self.content = b"version 15.2\nhostname R1\n" * 100
+	
+	def test_compress_media(self):
+		"""Test that legacy device files move to the blob store"""
+		# Files stored before compression was introduced
+		storage = DeviceFile._meta.get_field('file').storage
+		legacy_name = storage.save('device_files/1/legacy.cfg', io.BytesIO(self.content))
+		DeviceFile.objects.bulk_create([
+			DeviceFile(name='R1', project=self.project, device_type=self.device_type, file=legacy_name)
+		])
+		
+		out = StringIO()
+		with self.captureOnCommitCallbacks(execute=True):
+			call_command('compress_media', '--workers', '1', stdout=out)
+		self.assertIn('Compressed 1 file(s)', out.getvalue())
+		
+		device_file = DeviceFile.objects.get()
+		self.assertIsNotNone(device_file.blob)
+		self.assertEqual(device_file.filename(), 'legacy.cfg')
+		self.assertEqual(device_file.read_content(), self.content)
+		self.assertFalse(storage.exists(legacy_name))
+		
+		# A second run finds nothing left to do
+		out = StringIO()
+		call_command('compress_media', '--workers', '1', stdout=out)
+		self.assertIn('No files to compress', out.getvalue())
+
+
+EXPORTED_PROFILES = []
+
+
+def record_profile(device_file, profile):
+	"""Parse profile exporter used by the tests"""
+	EXPORTED_PROFILES.append((device_file.pk, profile))
+
+
+@override_settings(
+	PARSE_PROFILING=True,
+	PARSE_PROFILE_EXPORTERS=['apps.parsers.tests.record_profile'],
+	PARSE_CACHE_MAX_BYTES=0
+)
+class ParseProfileTest(MediaRootTestCase):
+	"""Test cases for per-extractor parse profiles"""
+	
+	def setUp(self):
+		"""Set up test data"""
+		super().setUp()
+		client = Client.objects.create(name='Test Company')
+		self.project = Project.objects.create(name='Test Project', client=client)
+		self.device_type = DeviceType.objects.create(name='Cisco IOS', slug='cisco-ios')
+		self.content = (
+			"version 15.2\nhostname R1\n!\n"
+			+ "".join(f"interface GigabitEthernet0/{number}\n ip address 10.0.{number}.1 255.255.255.0\n!\n" for number in range(5))
+		).encode()
+		EXPORTED_PROFILES.clear()
+	
+	def parse(self):
+		"""Upload and parse the test configuration"""
+		device_file = DeviceFile.objects.create(
+			name='R1',
+			project=self.project,
+			device_type=self.device_type,
+			file=SimpleUploadedFile('r1.cfg', self.content)
+		)
+		self.assertTrue(device_file.parse_file())
+		device_file.refresh_from_db()
+		return device_file
+	
+	def test_profile_is_stored_and_exported(self):
+		"""Test that every extractor's statistics are stored with the device file and exported"""
+		for time_limit in (None, 30):
+			with self.subTest(time_limit=time_limit), override_settings(PARSE_TIME_LIMIT=time_limit):
+				EXPORTED_PROFILES.clear()
+				device_file = self.parse()
+				profile = device_file.parse_profile
+				
+				self.assertEqual(profile['parser'], 'CiscoIOSParser')
+				self.assertEqual(profile['bytes'], len(self.content))
+				self.assertTrue(profile['complete'])
+				self.assertEqual(profile['extractors']['extract_interfaces']['calls'], 1)
+				self.assertEqual(profile['extractors']['extract_interfaces']['items'], 5)
+				self.assertGreater(profile['extractors']['extract_hostname']['seconds'], 0)
+				self.assertEqual(EXPORTED_PROFILES, [(device_file.pk, profile)])
+	
+	@override_settings(PARSE_TIME_LIMIT=30)
+	def test_overrun_parse_is_not_imported(self):
+		"""Test that a parse that ran out of budget is recorded but not saved to the inventory"""
+		exceeded = ParseBudgetExceeded("Time limit of 30s exceeded", 'extract_acls', {'hostname': 'R1'})
+		device_file = DeviceFile.objects.create(
+			name='R1',
+			project=self.project,
+			device_type=self.device_type,
+			file=SimpleUploadedFile('r1.cfg', self.content)
+		)
+		with patch('apps.parsers.parsers.budget.ParseBudget.parse_lines', side_effect=exceeded):
+			self.assertFalse(device_file.parse_file())
+
+		device_file.refresh_from_db()
+		self.assertEqual(device_file.parse_errors, "Parse budget exceeded in extract_acls: Time limit of 30s exceeded")
+		self.assertFalse(device_file.parse_profile['complete'])
+		self.assertFalse(Device.objects.exists())
+		self.assertFalse(ParseResultCache.objects.exists())
+
+	@override_settings(PARSE_PROFILING=False, PARSE_TIME_LIMIT=None)
+	def test_profiling_is_opt_in(self):
+		"""Test that no profile is recorded unless profiling is enabled"""
+		self.assertIsNone(self.parse().parse_profile)
+		self.assertEqual(EXPORTED_PROFILES, [])
+	
+	@override_settings(PARSE_TIME_LIMIT=None)
+	def test_admin_aggregates_profiles_per_device_type(self):
+		"""Test that the admin view shows the stored profiles aggregated per device type"""
+		self.parse()
+		self.parse()
+		aggregated = aggregate_profiles(DeviceFile.objects.values_list('device_type__name', 'parse_profile'))
+		self.assertEqual([entry['device_type'] for entry in aggregated], ['Cisco IOS'])
+		self.assertEqual(aggregated[0]['files'], 2)
+		self.assertEqual(aggregated[0]['bytes'], 2 * len(self.content))
+		interfaces = next(extractor for extractor in aggregated[0]['extractors'] if extractor['name'] == 'extract_interfaces')
+		self.assertEqual((interfaces['files'], interfaces['calls'], interfaces['items']), (2, 2, 10))
+		
+		user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+		self.client.force_login(user)
+		response = self.client.get(reverse('admin:parsers_devicefile_profiling'))
+		self.assertEqual(response.status_code, 200)
+		self.assertContains(response, 'extract_interfaces')
+		self.assertContains(response, 'Cisco IOS')
+
+
+@override_settings(
+	PARSE_INCREMENTAL=True,
+	PARSE_PROFILING=True,
+	PARSE_PROFILE_EXPORTERS=[],
+	PARSE_CACHE_MAX_BYTES=10 * 1024 * 1024
+)
+class IncrementalParseTest(MediaRootTestCase):
+	"""Test cases for re-parsing only what changed since a device's previous upload"""
+	
+	def setUp(self):
+		"""Set up test data"""
+		super().setUp()
+		client = Client.objects.create(name='Test Company')
+		self.project = Project.objects.create(name='Test Project', client=client)
+		self.device_type = DeviceType.objects.create(name='Cisco IOS', slug='cisco-ios')
+		self.content = (
+			"version 15.2\nhostname R1\n!\n"
+			+ "".join(f"interface GigabitEthernet0/{number}\n ip address 10.0.{number}.1 255.255.255.0\n!\n" for number in range(5))
+			+ "ip access-list extended EDGE\n permit ip any any\n!\n"
+		)
+	
+	def upload(self, content, name='R1'):
+		"""Upload and parse a configuration of the device"""
+		device_file = DeviceFile.objects.create(
+			name=name,
+			project=self.project,
+			device_type=self.device_type,
+			file=SimpleUploadedFile('r1.cfg', content.encode())
+		)
+		self.assertTrue(device_file.parse_file())
+		device_file.refresh_from_db()
+		return device_file
+	
+	def test_changed_stanzas_are_parsed_again(self):
+		"""Test that a new version of a device only runs the extractors of what changed"""
+		for time_limit in (None, 30):
+			with self.subTest(time_limit=time_limit), override_settings(PARSE_TIME_LIMIT=time_limit):
+				name = f'R1-{time_limit}'
+				previous_content = self.content + f"! {name}\n"
+				previous = self.upload(previous_content, name=name)
+				self.assertFalse(previous.parse_profile['incremental'])
+				
+				content = previous_content.replace("10.0.3.1", "10.0.30.1")
+				device_file = self.upload(content, name=name)
+				profile = device_file.parse_profile
+				
+				self.assertEqual(device_file.previous_version(), previous)
+				self.assertTrue(profile['incremental'])
+				self.assertEqual(set(profile['extractors']), {'extract_interfaces', 'extract_vrfs'})
+				self.assertEqual(profile['extractors']['extract_interfaces']['items'], 1)
+				self.assertEqual(
+					get_cached_result(device_file.content_hash, CiscoIOSParser()),
+					to_primitive(CiscoIOSParser().parse(content))
+				)
+	
+	@override_settings(PARSE_TIME_LIMIT=None)
+	def test_other_devices_are_parsed_in_full(self):
+		"""Test that uploads of another device, or with incremental parsing disabled, are not incremental"""
+		self.upload(self.content)
+		self.assertFalse(self.upload(self.content.replace("R1", "R2"), name='R2').parse_profile['incremental'])
+		with override_settings(PARSE_INCREMENTAL=False):
+			self.assertFalse(self.upload(self.content.replace("R1", "R3")).parse_profile['incremental'])
+
+
+class DeviceFileDiffTest(MediaRootTestCase):
+	"""Test cases for structural diffs between versions of a device"""
+	
+	def setUp(self):
+		"""Set up test data"""
+		super().setUp()
+		client = Client.objects.create(name='Test Company')
+		self.project = Project.objects.create(name='Test Project', client=client)
+		self.device_type = DeviceType.objects.create(name='Cisco IOS', slug='cisco-ios')
+		self.content = (
+			"hostname R1\n!\n"
+			"interface GigabitEthernet0/0\n description Uplink\n!\n"
+			"interface GigabitEthernet0/1\n shutdown\n!\n"
+		)
+		self.previous = self.upload(self.content)
+		self.current = self.upload(self.content.replace("Uplink", "Core uplink"))
+		user = get_user_model().objects.create_user('viewer', 'viewer@example.com', 'password')
+		self.client.force_login(user)
+	
+	def upload(self, content, name='R1'):
+		"""Upload a configuration of the device"""
+		return DeviceFile.objects.create(
+			name=name,
+			project=self.project,
+			device_type=self.device_type,
+			file=SimpleUploadedFile('r1.cfg', content.encode())
+		)
+	
+	def test_api_diff_against_previous_version(self):
+		"""Test that the API reports the modified stanza since the previous upload of the device"""
+		response = self.client.get(reverse('api_parsers:devicefile-diff', args=[self.current.pk]))
+		self.assertEqual(response.status_code, 200)
+		
+		diff = response.json()
+		self.assertEqual(diff['previous'], self.previous.pk)
+		self.assertFalse(diff['identical'])
+		self.assertEqual(diff['summary'], {'added': 0, 'removed': 0, 'modified': 1, 'moved': 0})
+		self.assertEqual(diff['changes'][0]['key'], 'interface GigabitEthernet0/0')
+		self.assertIn('+ description Core uplink', diff['changes'][0]['lines'])
+		
+		other = self.upload(self.content, name='R2')
+		response = self.client.get(
+			reverse('api_parsers:devicefile-diff', args=[self.current.pk]), {'previous': other.pk}
+		)
+		self.assertEqual(response.json()['summary']['modified'], 1)
+		with self.assertLogs('django.request', 'WARNING'):
+			response = self.client.get(reverse('api_parsers:devicefile-diff', args=[other.pk]))
+		self.assertEqual(response.status_code, 404)
+		
+		response = self.client.get(reverse('api_parsers:devicefile-diff', args=[other.pk]), {'previous': self.previous.pk})
+		self.assertTrue(response.json()['identical'])
+		
+		response = self.client.get(reverse('api_parsers:devicefile-list'), {'name': 'R1'})
+		self.assertCountEqual([device_file['id'] for device_file in response.json()['results']], [self.current.pk, self.previous.pk])
+	
+	def test_detail_view_loads_changes_on_demand(self):
+		"""Test that the device file page loads the changes since the previous version from the API"""
+		with patch('apps.parsers.views.diff_device_files') as diff_device_files:
+			response = self.client.get(reverse('parsers:devicefile-detail', args=[self.current.pk]))
+		self.assertEqual(response.status_code, 200)
+		diff_device_files.assert_not_called()
+		self.assertEqual(response.context['previous_version'], self.previous)
+		self.assertContains(response, reverse('api_parsers:devicefile-diff', args=[self.current.pk]))
+		
+		response = self.client.get(reverse('parsers:devicefile-detail', args=[self.previous.pk]))
+		self.assertIsNone(response.context['previous_version'])
+		self.assertNotContains(response, reverse('api_parsers:devicefile-diff', args=[self.previous.pk]))
@@ -0,0 +1,114 @@
+"""
+Tests for the parser benchmark suite.
+
+The synthetic configurations must be recognised and fully parsed by the
+parser they are generated for, otherwise the benchmarks would time a
+parser rejecting its input; the baseline comparison must only flag real
+regressions.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from apps.parsers.benchmarks.generators import GENERATORS
+from apps.parsers.benchmarks.runner import compare, get_extractors, load_baseline, run_case, save_baseline
+from apps.parsers.parsers.cisco import CiscoIOSParser
+from apps.parsers.parsers.factory import ParserFactory
+
+SCALE = {'interfaces': 12, 'acl_lines': 120, 'vrfs': 4, 'policies': 20, 'vlans': 10}
+
+
+class TestGenerators(unittest.TestCase):
+	"""Test the synthetic configuration generators."""
+
+	def test_generated_configs_are_detected(self):
+		"""Test that each generated configuration is detected as its own device type."""
+		for device_type, generate in GENERATORS.items():
+			with self.subTest(device_type=device_type):
+				parser = ParserFactory.get_parser(generate(**SCALE))
+				self.assertIs(type(parser), ParserFactory.DEVICE_TYPE_PARSERS[device_type])
+
+	def test_generated_configs_parse_at_scale(self):
+		"""Test that the parsers find the generated sections in the requested numbers."""
+		expected = {
+			'cisco-ios': {'interfaces': 12, 'acls': 3, 'vrfs': 4},
+			'cisco-asa': {'network_objects': 20, 'nat_rules': 10},
+			'cisco-nexus': {'vlans': 10},
+			'fortigate': {'interfaces': 12, 'address_objects': 120, 'policies': 20, 'service_objects': 2},
+			'fortiswitch': {'vlans': 10, 'switch_ports': 12},
+			'juniper-junos': {'interfaces': 12, 'routing_instances': 4, 'security_policies': 20},
+		}
+		for device_type, counts in expected.items():
+			with self.subTest(device_type=device_type):
+				result = ParserFactory.DEVICE_TYPE_PARSERS[device_type]().parse(GENERATORS[device_type](**SCALE))
+				self.assertEqual({key: len(result[key]) for key in counts}, counts)
+
+	def test_generators_are_deterministic(self):
+		"""Test that generating twice gives identical configurations."""
+		for device_type, generate in GENERATORS.items():
+			with self.subTest(device_type=device_type):
+				self.assertEqual(generate(**SCALE), generate(**SCALE))
+
+
+class TestRunner(unittest.TestCase):
+	"""Test the benchmark runner and baseline comparison."""
+
+	def result(self, parse_seconds=0.1, extractor_seconds=0.05, parse_rss_bytes=10 * 1024 * 1024):
+		return {
+			'scale': SCALE,
+			'parse_seconds': parse_seconds,
+			'parse_rss_bytes': parse_rss_bytes,
+			'extractors': {'extract_interfaces': extractor_seconds},
+		}
+
+	def test_run_case_times_parse_and_extractors(self):
+		"""Test that a case records throughput and a timing for every extractor."""
+		result = run_case('cisco-ios', SCALE, repeat=1)
+		self.assertEqual(result['parser'], 'CiscoIOSParser')
+		self.assertEqual(result['lines'], GENERATORS['cisco-ios'](**SCALE).count('\n'))
+		self.assertGreater(result['parse_seconds'], 0)
+		self.assertEqual(set(result['extractors']), set(get_extractors(CiscoIOSParser())))
+		self.assertIn('extract_vrfs', result['extractors'])
+
+	def test_compare_flags_regressions_beyond_tolerance(self):
+		"""Test that only measurements slower or larger than the tolerance allows are reported."""
+		baseline = {'cisco-ios/small': self.result()}
+		self.assertEqual(compare({'cisco-ios/small': self.result(parse_seconds=0.12)}, baseline, 0.25), [])
+
+		regressions = compare({'cisco-ios/small': self.result(
+			parse_seconds=0.2, extractor_seconds=0.1, parse_rss_bytes=20 * 1024 * 1024
+		)}, baseline, 0.25)
+		self.assertEqual(len(regressions), 3)
+		self.assertIn('parse()', regressions[0])
+		self.assertIn('extract_interfaces()', regressions[1])
+		self.assertIn('peak RSS', regressions[2])
+
+	def test_compare_skips_noise_and_unknown_cases(self):
+		"""Test that tiny timings, new cases and changed scales are not compared."""
+		baseline = {'cisco-ios/small': self.result(parse_seconds=0.0001)}
+		self.assertEqual(compare({'cisco-ios/small': self.result(parse_seconds=0.0005)}, baseline), [])
+		self.assertEqual(compare({'fortigate/small': self.result(parse_seconds=10)}, baseline), [])
+
+		rescaled = dict(self.result(parse_seconds=10), scale=dict(SCALE, interfaces=1000))
+		self.assertEqual(compare({'cisco-ios/small': rescaled}, baseline), [])
+
+	def test_save_baseline_merges_cases(self):
+		"""Test that saving a baseline keeps the cases that were not run again."""
+		with tempfile.TemporaryDirectory() as directory:
+			path = os.path.join(directory, 'baseline.json')
+			self.assertEqual(load_baseline(path), {})
+
+			save_baseline(path, {'cisco-ios/small': self.result(), 'fortigate/small': self.result()})
+			save_baseline(path, {'cisco-ios/small': self.result(parse_seconds=0.5)})
+
+			stored = load_baseline(path)
+			self.assertEqual(set(stored), {'cisco-ios/small', 'fortigate/small'})
+			self.assertEqual(stored['cisco-ios/small']['parse_seconds'], 0.5)
+			with open(path) as baseline_file:
+				self.assertIn('python', json.load(baseline_file))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,264 @@
+"""
+Fuzz and scaling corpus for the parser regular expressions and parse budget.
+
+Every pattern in the shared pattern registry (plus the module level
+tokenizer patterns) is run against generated inputs that are known to
+trigger catastrophic backtracking in careless patterns: long unterminated
+lines, repeated headers without terminators, unclosed brackets and quotes.
+Each input is matched at two sizes and the match time must grow roughly
+linearly. The parsers themselves are run against truncated and shuffled
+variants of small vendor samples to make sure malformed uploads either
+parse or are rejected with a ValueError.
+"""
+
+import random
+import re
+import time
+import unittest
+
+from apps.parsers.parsers.budget import ParseBudget, ParseBudgetExceeded
+from apps.parsers.parsers.cisco import CiscoASAParser
+from apps.parsers.parsers.detection import get_signature_set
+from apps.parsers.parsers.factory import ParserFactory
+from apps.parsers.parsers.fortios import VALUE_PATTERN
+from apps.parsers.parsers.junos_tree import TOKEN_PATTERN
+from apps.parsers.parsers.patterns import REGISTRY
+
+# Input sizes (repetitions) compared by the scaling checks
+SMALL_SIZE = 2000
+LARGE_SIZE = 8000
+
+# A linear pattern takes about LARGE_SIZE / SMALL_SIZE times longer on the large
+# input; a quadratic one about the square of that
+MAX_GROWTH = 8.0
+
+# Timings below this many seconds are too noisy to compare
+MIN_MEASURABLE = 0.002
+
+SAMPLES = {
+	"cisco_ios": (
+		"version 15.2\n"
+		"hostname R1\n"
+		"!\n"
+		"interface GigabitEthernet0/0\n"
+		" description Uplink\n"
+		" ip address 10.0.0.1 255.255.255.0\n"
+		"!\n"
+		"ip access-list extended OUTSIDE\n"
+		" permit tcp any any eq 443\n"
+		"!\n"
+		"router bgp 65000\n"
+		" neighbor 10.0.0.2 remote-as 65001\n"
+		"!\n"
+		"ip route 0.0.0.0 0.0.0.0 10.0.0.254\n"
+	),
+	"cisco_asa": (
+		"ASA Version 9.8\n"
+		"hostname FW1\n"
+		"object network WEB\n"
+		" host 10.0.0.10\n"
+		" description web server\n"
+		"!\n"
+		"nat (inside,outside) dynamic interface\n"
+		"access-list OUTSIDE extended permit tcp any any eq 443\n"
+	),
+	"cisco_nexus": (
+		"!Command: show running-config\n"
+		"hostname N1\n"
+		"feature vpc\n"
+		"vlan 10\n"
+		"  name users\n"
+		"vpc domain 5\n"
+		"  peer-keepalive destination 10.1.1.2\n"
+		"!\n"
+		"interface port-channel10\n"
+		"  vpc 10\n"
+	),
+	"fortigate": (
+		"#config-version=FGT60F-7.2.5-FW-build1517:opmode=0:vdom=0\n"
+		"config system global\n"
+		"    set hostname \"FGT1\"\n"
+		"end\n"
+		"config firewall policy\n"
+		"    edit 1\n"
+		"        set srcintf \"port1\"\n"
+		"        set dstaddr \"all\"\n"
+		"        set action accept\n"
+		"    next\n"
+		"end\n"
+	),
+	"fortiswitch": (
+		"#config-version=FS1D24-6.4.11-FW-build0519\n"
+		"config switch vlan\n"
+		"    edit 10\n"
+		"        set description \"users\"\n"
+		"    next\n"
+		"end\n"
+	),
+	"junos": (
+		"version 20.4R3.8;\n"
+		"system {\n"
+		"    host-name SRX1;\n"
+		"}\n"
+		"interfaces {\n"
+		"    ge-0/0/0 {\n"
+		"        description \"Uplink\";\n"
+		"        unit 0 {\n"
+		"            family inet {\n"
+		"                address 10.0.0.1/24;\n"
+		"            }\n"
+		"        }\n"
+		"    }\n"
+		"}\n"
+	),
+}
+
+
+def all_patterns():
+	"""Return ``(name, re.Pattern)`` pairs for every pattern the parsers use."""
+	# Register the detection signatures of every parser
+	get_signature_set(tuple(ParserFactory._get_parser_classes()))
+	patterns = [(compiled.name, compiled.regex) for compiled in REGISTRY]
+	patterns.append(("fortios.VALUE_PATTERN", VALUE_PATTERN))
+	patterns.append(("junos_tree.TOKEN_PATTERN", TOKEN_PATTERN))
+	return patterns
+
+
+def adversarial_inputs(pattern: str, size: int):
+	"""
+	Yield inputs built around the literal keywords of a pattern.
+
+	Args:
+		pattern (str): The pattern string.
+		size (int): Number of repetitions of the variable part of each input.
+
+	Yields:
+		str: Inputs that make careless patterns backtrack.
+	"""
+	keywords = sorted(set(re.findall(r'[A-Za-z][A-Za-z-]{2,}', pattern))) or ["x"]
+	for keyword in keywords:
+		yield f"{keyword} " + "a " * size
+		yield f"{keyword} (" + "a," * size
+		yield f"{keyword} {{" + " a" * size
+		yield f"{keyword} " + "\n " * size
+		yield f"{keyword} a\n" * size
+		yield f"{keyword}\n" + "a\n" * size
+	yield '"' + 'a\\"' * size
+	yield "/*" + " a" * size
+	yield " " * size
+
+
+def best_time(regex, text: str, repeat: int = 3) -> float:
+	"""Return the fastest of several findall runs, in seconds."""
+	best = None
+	for _ in range(repeat):
+		started = time.perf_counter()
+		regex.findall(text)
+		elapsed = time.perf_counter() - started
+		best = elapsed if best is None else min(best, elapsed)
+	return best
+
+
+def mutations(sample: str, seed: int):
+	"""Yield truncated, shuffled and repeated variants of a configuration sample."""
+	rng = random.Random(seed)
+	lines = sample.splitlines(keepends=True)
+	for _ in range(10):
+		yield sample[:rng.randrange(1, len(sample))]
+	for _ in range(5):
+		shuffled = list(lines)
+		rng.shuffle(shuffled)
+		yield "".join(shuffled)
+	yield lines[0] + "".join(lines[1:]) * 200
+	yield lines[0] + "".join(line.rstrip("\n") for line in lines[1:]) * 50
+
+
+class TestPatternScaling(unittest.TestCase):
+	"""Checks that no parser pattern backtracks super-linearly."""
+
+	def test_patterns_scale_linearly(self):
+		"""Test every pattern against the adversarial corpus at two sizes."""
+		for name, regex in all_patterns():
+			small_inputs = adversarial_inputs(regex.pattern, SMALL_SIZE)
+			large_inputs = adversarial_inputs(regex.pattern, LARGE_SIZE)
+			for small, large in zip(small_inputs, large_inputs):
+				large_time = best_time(regex, large)
+				if large_time < MIN_MEASURABLE:
+					continue
+				growth = large_time / max(best_time(regex, small), 1e-9)
+				with self.subTest(pattern=name, input=large[:40]):
+					self.assertLess(growth, MAX_GROWTH)
+
+
+class TestMalformedInputs(unittest.TestCase):
+	"""Fuzz the parsers with malformed variants of vendor samples."""
+
+	def test_mutated_samples_parse_or_raise_value_error(self):
+		"""Test that truncated and shuffled configurations never crash a parser."""
+		for seed, (vendor, sample) in enumerate(SAMPLES.items()):
+			for config_text in mutations(sample, seed):
+				parser = ParserFactory.get_parser(config_text)
+				if parser is None:
+					continue
+				with self.subTest(vendor=vendor, config=config_text[:40]):
+					try:
+						self.assertIsInstance(parser.parse(config_text), dict)
+					except ValueError:
+						pass
+
+
+class SlowNatParser(CiscoASAParser):
+	"""ASA parser whose NAT extractor never finishes in time."""
+
+	def extract_nat_rules(self, config_text):
+		time.sleep(10)
+		return []
+
+
+class BacktrackingNatParser(CiscoASAParser):
+	"""ASA parser whose NAT extractor backtracks catastrophically."""
+
+	def extract_nat_rules(self, config_text):
+		re.match(r"(a+)+$", "a" * 64 + "b")
+		return []
+
+
+class TestParseBudget(unittest.TestCase):
+	"""Tests for the per-parse time budget."""
+
+	def test_result_is_returned_within_budget(self):
+		"""Test that a parse within the budget returns the full result."""
+		parsed_data = ParseBudget(time_limit=30).parse(CiscoASAParser(), SAMPLES["cisco_asa"])
+		self.assertEqual(parsed_data["hostname"], "FW1")
+		self.assertEqual(len(parsed_data["nat_rules"]), 1)
+
+	def test_overrunning_extractor_is_reported_with_partial_results(self):
+		"""Test that the overrunning extractor is named and completed ones are kept."""
+		started = time.monotonic()
+		with self.assertRaises(ParseBudgetExceeded) as context:
+			ParseBudget(time_limit=1).parse(SlowNatParser(), SAMPLES["cisco_asa"])
+
+		self.assertLess(time.monotonic() - started, 5)
+		self.assertEqual(context.exception.extractor, "extract_nat_rules")
+		self.assertEqual(context.exception.partial_results["hostname"], "FW1")
+		self.assertEqual(context.exception.partial_results["network_objects"][0]["name"], "WEB")
+		self.assertNotIn("nat_rules", context.exception.partial_results)
+
+	def test_backtracking_pattern_is_stopped_with_partial_results(self):
+		"""Test that a pattern stuck in the regex engine is interrupted and completed results are kept."""
+		started = time.monotonic()
+		with self.assertRaises(ParseBudgetExceeded) as context:
+			ParseBudget(time_limit=1).parse(BacktrackingNatParser(), SAMPLES["cisco_asa"])
+
+		self.assertLess(time.monotonic() - started, 5)
+		self.assertEqual(context.exception.extractor, "extract_nat_rules")
+		self.assertEqual(context.exception.partial_results["hostname"], "FW1")
+
+	def test_parser_errors_are_raised(self):
+		"""Test that a rejected configuration still raises ValueError."""
+		with self.assertRaises(ValueError):
+			ParseBudget(time_limit=30).parse(CiscoASAParser(), "not a configuration")
+
+
+if __name__ == '__main__':
+	unittest.main()
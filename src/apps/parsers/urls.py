@@ -8,6 +8,8 @@ urlpatterns = [
 	path('device-files/', views.DeviceFileListView.as_view(), name='devicefile-list'),
 	path('device-files/<int:pk>/', views.DeviceFileDetailView.as_view(), name='devicefile-detail'),
 	path('device-files/create/', views.DeviceFileCreateView.as_view(), name='devicefile-create'),
+	path('device-files/upload-archive/', views.DeviceFileArchiveUploadView.as_view(), name='devicefile-archive-upload'),
+	path('device-files/<int:pk>/download/', views.DeviceFileDownloadView.as_view(), name='devicefile-download'),
 	path('device-files/<int:pk>/edit/', views.DeviceFileUpdateView.as_view(), name='devicefile-update'),
 	path('device-files/<int:pk>/delete/', views.DeviceFileDeleteView.as_view(), name='devicefile-delete'),
 ] 
\ No newline at end of file
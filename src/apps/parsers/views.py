@@ -1,19 +1,82 @@
 from django.shortcuts import render
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView, FormView
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.urls import reverse_lazy
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 from django.shortcuts import get_object_or_404
 from django.db.models import Count
+from django.http import HttpResponse
+from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
 import json
 
 from apps.projects.models import Project
-from .models import DeviceFile, DeviceType
-from .forms import DeviceFileForm
+from .models import DeviceFile, DeviceType, ParseJob
+from .archives import ArchiveError, import_archive
+from .diffs import diff_device_files
+from .forms import CONFIG_FILE_EXTENSIONS, MAX_CONFIG_FILE_SIZE, DeviceFileArchiveForm, DeviceFileForm
+from .serializers import DeviceFileSerializer, ParseJobSerializer
 
 # Create your views here.
 
+class ParseJobViewSet(viewsets.ReadOnlyModelViewSet):
+	"""
+	API endpoint for polling the progress of parse jobs.
+	
+	list:
+		Return a list of parse jobs, newest first.
+	
+	retrieve:
+		Return a parse job with its status, attempts and timing.
+	"""
+	queryset = ParseJob.objects.select_related('device_file').order_by('-created_at')
+	serializer_class = ParseJobSerializer
+	permission_classes = [permissions.IsAuthenticated]
+	filterset_fields = ['status', 'device_file']
+	ordering_fields = ['created_at', 'started_at', 'finished_at', 'duration']
+
+class DeviceFileViewSet(viewsets.ReadOnlyModelViewSet):
+	"""
+	API endpoint for device files and the changes between their versions.
+	
+	list:
+		Return a list of device files, newest first.
+	
+	retrieve:
+		Return a device file with its parse status.
+	
+	diff:
+		Return the blocks that were added, removed, modified or moved since
+		the previous version of the device, or since the device file given in
+		the ``previous`` query parameter.
+	"""
+	queryset = DeviceFile.objects.select_related('device_type').order_by('-created_at')
+	serializer_class = DeviceFileSerializer
+	permission_classes = [permissions.IsAuthenticated]
+	filterset_fields = ['project', 'device_type', 'name', 'parsed']
+	search_fields = ['name', 'original_filename']
+	ordering_fields = ['name', 'created_at', 'updated_at']
+	
+	@action(detail=True)
+	def diff(self, request, pk=None):
+		"""Return the structural diff against the previous version."""
+		device_file = self.get_object()
+		previous_pk = request.query_params.get('previous')
+		if previous_pk:
+			try:
+				previous_pk = int(previous_pk)
+			except ValueError:
+				raise ValidationError({'previous': _('A device file id is required.')})
+			previous = get_object_or_404(self.get_queryset(), pk=previous_pk)
+		else:
+			previous = device_file.previous_version(parsed_only=False)
+			if previous is None:
+				raise NotFound(_('The device file has no previous version.'))
+		return Response(diff_device_files(previous, device_file))
+
 class ParserIndexView(LoginRequiredMixin, TemplateView):
 	"""View for the device management landing page."""
 	template_name = 'parsers/index.html'
@@ -83,6 +146,18 @@ class DeviceFileDetailView(LoginRequiredMixin, DetailView):
 	model = DeviceFile
 	template_name = 'parsers/devicefile_detail.html'
 	context_object_name = 'device_file'
+	
+	def get_context_data(self, **kwargs):
+		"""
+		Add the most recent parse job of the file and its previous version.
+		
+		The changes since the previous version are not computed here; the
+		page loads them from the ``diff`` endpoint of ``DeviceFileViewSet``.
+		"""
+		context = super().get_context_data(**kwargs)
+		context['parse_job'] = self.object.parse_jobs.order_by('-created_at').first()
+		context['previous_version'] = self.object.previous_version(parsed_only=False)
+		return context
 
 class DeviceFileCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
 	"""View for creating a new device file."""
@@ -100,15 +175,11 @@ class DeviceFileCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateVi
 		return initial
 	
 	def form_valid(self, form):
-		"""Set additional fields and trigger parsing."""
+		"""Save the file and queue it for parsing by a parse worker."""
 		response = super().form_valid(form)
 		
-		# Trigger file parsing
-		try:
-			self.object.parse_file()
-			messages.success(self.request, _('Device file uploaded and parsed successfully.'))
-		except Exception as e:
-			messages.error(self.request, _('File uploaded but parsing failed: %(error)s') % {'error': str(e)})
+		ParseJob.enqueue(self.object)
+		messages.success(self.request, _('Device file uploaded; parsing has been queued.'))
 		
 		return response
 	
@@ -153,7 +224,7 @@ from django.utils.translation import gettext_lazy as _
 from django.shortcuts import get_object_or_404
 
 from apps.projects.models import Project
-from .models import DeviceFile, DeviceType
+from .models import DeviceFile, DeviceType, ParseJob
 from .forms import DeviceFileForm
 
 # Create your views here.
@@ -203,6 +274,18 @@ class DeviceFileDetailView(LoginRequiredMixin, DetailView):
 	model = DeviceFile
 	template_name = 'parsers/devicefile_detail.html'
 	context_object_name = 'device_file'
+	
+	def get_context_data(self, **kwargs):
+		"""
+		Add the most recent parse job of the file and its previous version.
+		
+		The changes since the previous version are not computed here; the
+		page loads them from the ``diff`` endpoint of ``DeviceFileViewSet``.
+		"""
+		context = super().get_context_data(**kwargs)
+		context['parse_job'] = self.object.parse_jobs.order_by('-created_at').first()
+		context['previous_version'] = self.object.previous_version(parsed_only=False)
+		return context
 
 class DeviceFileCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
 	"""View for creating a new device file."""
@@ -220,15 +303,11 @@ class DeviceFileCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateVi
 		return initial
 	
 	def form_valid(self, form):
-		"""Set additional fields and trigger parsing."""
+		"""Save the file and queue it for parsing by a parse worker."""
 		response = super().form_valid(form)
 		
-		# Trigger file parsing
-		try:
-			self.object.parse_file()
-			messages.success(self.request, _('Device file uploaded and parsed successfully.'))
-		except Exception as e:
-			messages.error(self.request, _('File uploaded but parsing failed: %(error)s') % {'error': str(e)})
+		ParseJob.enqueue(self.object)
+		messages.success(self.request, _('Device file uploaded; parsing has been queued.'))
 		
 		return response
 	
@@ -263,3 +342,59 @@ class DeviceFileDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteVi
 		project_id = self.object.project.pk
 		messages.success(self.request, _('Device file deleted successfully.'))
 		return reverse_lazy('projects:project-detail', kwargs={'pk': project_id})
+
+class DeviceFileArchiveUploadView(LoginRequiredMixin, PermissionRequiredMixin, FormView):
+	"""View for uploading an archive of device files."""
+	form_class = DeviceFileArchiveForm
+	template_name = 'parsers/devicefile_archive_form.html'
+	permission_required = 'parsers.add_devicefile'
+	
+	def get_initial(self):
+		"""Set initial project if provided in GET parameters."""
+		initial = super().get_initial()
+		project_id = self.request.GET.get('project')
+		if project_id:
+			initial['project'] = get_object_or_404(Project, pk=project_id)
+		return initial
+	
+	def form_valid(self, form):
+		"""Create a device file for every configuration in the archive and queue them for parsing."""
+		self.project = form.cleaned_data['project']
+		archive = form.cleaned_data['archive']
+		try:
+			summary = import_archive(
+				self.project,
+				archive,
+				archive.name,
+				extensions=CONFIG_FILE_EXTENSIONS,
+				max_member_size=MAX_CONFIG_FILE_SIZE,
+				device_type=form.cleaned_data['device_type'],
+				notes=form.cleaned_data['notes']
+			)
+		except ArchiveError as e:
+			form.add_error('archive', str(e))
+			return self.form_invalid(form)
+		
+		messages.success(self.request, _('%(count)d device files uploaded; parsing has been queued.') % {'count': summary['created']})
+		if summary['skipped']:
+			skipped = ', '.join(f"{name} ({reason})" for name, reason in summary['skipped'][:10])
+			if len(summary['skipped']) > 10:
+				skipped += ', ...'
+			messages.warning(self.request, _('%(count)d files were skipped: %(files)s') % {
+				'count': len(summary['skipped']), 'files': skipped
+			})
+		return super().form_valid(form)
+	
+	def get_success_url(self):
+		"""Return to the project detail page after the upload."""
+		return reverse_lazy('projects:project-detail', kwargs={'pk': self.project.pk})
+
+class DeviceFileDownloadView(LoginRequiredMixin, DetailView):
+	"""View for downloading the content of a device file."""
+	model = DeviceFile
+	
+	def render_to_response(self, context, **response_kwargs):
+		"""Return the decompressed file content as an attachment."""
+		response = HttpResponse(self.object.read_content(), content_type='text/plain; charset=utf-8')
+		response['Content-Disposition'] = f'attachment; filename="{self.object.filename()}"'
+		return response
@@ -0,0 +1,87 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from apps.reports.models import Report
+from varai.storage import compress_existing
+
+
+def compress_task(path):
+	"""
+	Compress one report file in place; run in a worker process.
+
+	Args:
+		path (str): Absolute path of the report file.
+
+	Returns:
+		tuple: The path, the original and compressed sizes (None if the file
+		was already compressed) and an error message, which is empty on success.
+	"""
+	try:
+		return path, compress_existing(path), ""
+	except (OSError, ValueError) as e:
+		return path, None, str(e)
+
+
+class Command(BaseCommand):
+	"""
+	Compress report files that were stored before compression was introduced.
+
+	Each file is gzipped in place and replaced atomically, across a process
+	pool. The command can be interrupted and run again: files that are
+	already compressed are skipped.
+	"""
+	help = 'Compress uncompressed report files in parallel'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Compression processes (default: number of CPUs)')
+
+	def handle(self, *args, **options):
+		storage = Report._meta.get_field('file').storage
+		paths = [
+			storage.path(name)
+			for name in Report.objects.exclude(file='').exclude(file__isnull=True).values_list('file', flat=True)
+		]
+		if not paths:
+			self.stdout.write("No files to compress")
+			return
+
+		workers = max(1, min(options['workers'], len(paths)))
+		counts = {'compressed': 0, 'skipped': 0, 'failed': 0}
+		original_bytes = 0
+		stored_bytes = 0
+
+		self.stdout.write(f"Compressing {len(paths)} file(s) with {workers} worker(s)")
+		started = time.perf_counter()
+
+		if workers == 1:
+			outcomes = map(compress_task, paths)
+		else:
+			executor = ProcessPoolExecutor(max_workers=workers)
+			outcomes = executor.map(compress_task, paths)
+
+		try:
+			for path, sizes, error in outcomes:
+				if error:
+					counts['failed'] += 1
+					self.stderr.write(f"Failed to compress {path}: {error}")
+				elif sizes is None:
+					counts['skipped'] += 1
+				else:
+					counts['compressed'] += 1
+					original_bytes += sizes[0]
+					stored_bytes += sizes[1]
+		finally:
+			if workers > 1:
+				executor.shutdown(cancel_futures=True)
+
+		elapsed = time.perf_counter() - started
+		self.stdout.write(self.style.SUCCESS(
+			f"Compressed {counts['compressed']} file(s) in {elapsed:.1f}s, "
+			f"{counts['skipped']} skipped, {counts['failed']} failed: "
+			f"{filesizeformat(original_bytes)} stored in {filesizeformat(stored_bytes)} "
+			f"({filesizeformat(original_bytes - stored_bytes)} saved)"
+		))
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.11 on 2026-10-17 01:33
+
+import apps.reports.models
+from django.db import migrations, models
+import varai.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='report',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=varai.storage.get_compressed_storage, upload_to=apps.reports.models.report_file_path, verbose_name='Report File'),
+        ),
+    ]
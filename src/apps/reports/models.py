@@ -2,6 +2,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import User
 from apps.projects.models import Project
+from varai.storage import get_compressed_storage
 import uuid
 import os
 
@@ -54,7 +55,8 @@ class Report(models.Model):
 		report_type (ReportType): The type of this report.
 		name (str): A name for this report.
 		parameters (json): The parameters used to generate this report.
-		file (FileField): The generated report file.
+		file (FileField): The generated report file, stored gzip compressed and
+			decompressed transparently when it is read.
 		created_by (User): The user who created this report.
 		created_at (datetime): The datetime when the report was created.
 		updated_at (datetime): The datetime when the report was last updated.
@@ -82,7 +84,13 @@ class Report(models.Model):
 	name = models.CharField(_("Report Name"), max_length=255)
 	description = models.TextField(_("Description"), blank=True)
 	parameters = models.JSONField(_("Parameters"), default=dict)
-	file = models.FileField(_("Report File"), upload_to=report_file_path, blank=True, null=True)
+	file = models.FileField(
+		_("Report File"),
+		upload_to=report_file_path,
+		storage=get_compressed_storage,
+		blank=True,
+		null=True
+	)
 	status = models.CharField(
 		_("Status"),
 		max_length=20,
@@ -1,4 +1,13 @@
-from django.test import TestCase
+import gzip
+import os
+import struct
+import tempfile
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
 from django.contrib.auth.models import User
 from .models import ReportType, Report
 from apps.projects.models import Project
@@ -80,3 +89,101 @@ class ReportModelTest(TestCase):
 		"""Test the string representation of a report"""
 		expected = f"{self.report_data['name']} ({self.project.name})"
 		self.assertEqual(str(self.report), expected)
+
+
+class ReportFileStorageTest(TestCase):
+	"""Test cases for compressed report file storage"""
+	
+	def setUp(self):
+		"""Set up test data in a temporary media root"""
+		media_root = tempfile.TemporaryDirectory()
+		self.addCleanup(media_root.cleanup)
+		settings_override = override_settings(MEDIA_ROOT=media_root.name)
+		settings_override.enable()
+		self.addCleanup(settings_override.disable)
+		
+		self.user = User.objects.create_user(username='testuser', password='testpassword')
+		project = Project.objects.create(name='Test Project', client=Client.objects.create(name='Test Company'))
+		self.report = Report.objects.create(
+			name='Inventory',
+			project=project,
+			report_type=ReportType.objects.create(name='Network Inventory', slug='network-inventory')
+		)
+		self.content = b"device,interfaces\nR1,48\n" * 500
+		self.report.file.save('inventory.csv', ContentFile(self.content))
+	
+	def test_file_is_stored_compressed(self):
+		"""Test that report files are compressed on disk and read back unchanged"""
+		self.assertLess(os.path.getsize(self.report.file.path), len(self.content))
+		self.assertEqual(self.report.file.size, len(self.content))
+		with self.report.file.open('rb') as report_file:
+			self.assertEqual(report_file.read(), self.content)
+	
+	def test_size_is_read_from_the_header(self):
+		"""Test that the size comes from the header, and from the trailer for older gzip files"""
+		storage = self.report.file.storage
+		with open(self.report.file.path, 'rb') as raw:
+			stored = raw.read()
+		self.assertEqual(gzip.decompress(stored), self.content)
+		
+		# Make the trailer disagree, as it does for files of 4 GiB and more
+		with open(self.report.file.path, 'wb') as raw:
+			raw.write(stored[:-4] + struct.pack('<I', 1))
+		self.assertEqual(storage.size(self.report.file.name), len(self.content))
+		
+		with open(storage.path('legacy.csv.gz'), 'wb') as raw:
+			raw.write(gzip.compress(self.content))
+		self.assertEqual(storage.size('legacy.csv.gz'), len(self.content))
+	
+	def test_download(self):
+		"""Test that the download view streams the decompressed file"""
+		self.client.force_login(self.user)
+		response = self.client.get(reverse('reports:report-download', args=[self.report.pk]))
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(b''.join(response.streaming_content), self.content)
+		self.assertIn('attachment', response['Content-Disposition'])
+
+
+class CompressReportsCommandTest(TestCase):
+	"""Test cases for the compress_reports management command"""
+	
+	def setUp(self):
+		"""Set up test data in a temporary media root"""
+		media_root = tempfile.TemporaryDirectory()
+		self.addCleanup(media_root.cleanup)
+		settings_override = override_settings(MEDIA_ROOT=media_root.name)
+		settings_override.enable()
+		self.addCleanup(settings_override.disable)
+		
+		self.project = Project.objects.create(name='Test Project', client=Client.objects.create(name='Test Company'))
+	
+	def test_compress_reports(self):
+		"""Test that report files stored before compression are compressed in place"""
+		content = b"device,interfaces\n" * 200
+		report_storage = Report._meta.get_field('file').storage
+		report_path = report_storage.path('reports/1/report.csv')
+		os.makedirs(os.path.dirname(report_path))
+		with open(report_path, 'wb') as report_file:
+			report_file.write(content)
+		report = Report.objects.create(
+			project=self.project,
+			report_type=ReportType.objects.create(name='Inventory', slug='inventory'),
+			name='Inventory',
+			file='reports/1/report.csv'
+		)
+		
+		out = StringIO()
+		call_command('compress_reports', '--workers', '1', stdout=out)
+		self.assertIn('Compressed 1 file(s)', out.getvalue())
+		
+		report.refresh_from_db()
+		self.assertLess(os.path.getsize(report_path), len(content))
+		self.assertEqual(report.file.size, len(content))
+		with report.file.open('rb') as report_file:
+			self.assertEqual(report_file.read(), content)
+		
+		# A second run finds nothing left to do
+		out = StringIO()
+		call_command('compress_reports', '--workers', '1', stdout=out)
+		self.assertIn('Compressed 0 file(s)', out.getvalue())
+		self.assertIn('1 skipped', out.getvalue())
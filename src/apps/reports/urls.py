@@ -7,4 +7,5 @@ urlpatterns = [
 	path('', views.ReportIndexView.as_view(), name='index'),
 	path('create/', views.ReportCreateView.as_view(), name='report-create'),
 	path('<int:pk>/', views.ReportDetailView.as_view(), name='report-detail'),
+	path('<uuid:pk>/download/', views.ReportDownloadView.as_view(), name='report-download'),
 ] 
\ No newline at end of file
@@ -1,3 +1,4 @@
+from django.http import FileResponse, Http404
 from django.shortcuts import render
 from django.views.generic import TemplateView, CreateView, DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -47,3 +48,13 @@ class ReportDetailView(LoginRequiredMixin, DetailView):
     model = Report
     template_name = 'reports/report_detail.html'
     context_object_name = 'report'
+
+class ReportDownloadView(LoginRequiredMixin, DetailView):
+    """Download the file of a report."""
+    model = Report
+
+    def render_to_response(self, context, **response_kwargs):
+        """Stream the decompressed report file as an attachment."""
+        if not self.object.file:
+            raise Http404("This report has no file.")
+        return FileResponse(self.object.file.open('rb'), as_attachment=True, filename=self.object.filename())
@@ -156,6 +156,39 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Parser settings
+# Wall clock seconds and memory (MB) a single configuration parse may use;
+# a time limit of 0 parses in the request process without limits. A limit
+# forks the calling process for every parse (see apps/parsers/parsers/budget.py)
+PARSE_TIME_LIMIT = float(os.getenv('PARSE_TIME_LIMIT', 60))
+PARSE_MEMORY_LIMIT = int(os.getenv('PARSE_MEMORY_LIMIT_MB', 1024)) * 1024 * 1024
+# Total size of cached parser output before the least recently used entries
+# are evicted; 0 disables the parse result cache
+PARSE_CACHE_MAX_BYTES = int(os.getenv('PARSE_CACHE_MAX_MB', 512)) * 1024 * 1024
+# Parse job queue: attempts per job, base retry delay in seconds (doubled for
+# every further attempt) and seconds after which a running job is requeued
+PARSE_JOB_MAX_ATTEMPTS = int(os.getenv('PARSE_JOB_MAX_ATTEMPTS', 3))
+PARSE_JOB_RETRY_DELAY = float(os.getenv('PARSE_JOB_RETRY_DELAY', 30))
+PARSE_JOB_STALE_AFTER = float(os.getenv('PARSE_JOB_STALE_AFTER', 600))
+# Largest accepted archive upload (MB) and most configuration files imported from one archive
+ARCHIVE_UPLOAD_MAX_BYTES = int(os.getenv('ARCHIVE_UPLOAD_MAX_MB', 500)) * 1024 * 1024
+ARCHIVE_MAX_MEMBERS = int(os.getenv('ARCHIVE_MAX_MEMBERS', 10000))
+# Compression of stored device files: zstd (needs the optional zstandard
+# package, falls back to gzip without it) or gzip
+DEVICE_FILE_COMPRESSION = os.getenv('DEVICE_FILE_COMPRESSION', 'zstd')
+# gzip level of files in the compressed media storage (report files)
+MEDIA_COMPRESSION_LEVEL = int(os.getenv('MEDIA_COMPRESSION_LEVEL', 6))
+# Record per-extractor timings of every device file parse, and the dotted
+# paths of callables the recorded profiles are exported to (comma separated)
+PARSE_PROFILING = os.getenv('PARSE_PROFILING', 'False').lower() == 'true'
+PARSE_PROFILE_EXPORTERS = [path for path in os.getenv('PARSE_PROFILE_EXPORTERS', '').split(',') if path]
+# Worker processes that build the VDOM tables of very large multi-VDOM
+# FortiGate configurations in parallel; 1 parses in the parsing process
+PARSE_VDOM_WORKERS = int(os.getenv('PARSE_VDOM_WORKERS', 1))
+# Re-parse only the stanzas that changed since a device's previous upload,
+# when that upload's result is still in the parse result cache
+PARSE_INCREMENTAL = os.getenv('PARSE_INCREMENTAL', 'True').lower() == 'true'
+
 # REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -214,6 +247,7 @@ LOGGING = {
             'level': 'DEBUG',
             'class': 'logging.FileHandler',
             'filename': os.path.join(ROOT_DIR, 'debug.log'),
+            'delay': True,
             'formatter': 'verbose',
         },
     },
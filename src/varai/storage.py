@@ -0,0 +1,174 @@
+"""
+File storage that compresses files at rest.
+
+``CompressedFileSystemStorage`` gzips every file it writes and decompresses
+files as a stream when they are opened, so code that reads a ``FileField``
+through ``open()``/``read()``/``chunks()`` gets the original bytes back
+without knowing about the compression. File names are left unchanged, which
+lets existing uncompressed files be compressed in place: files that do not
+start with the gzip magic number are read as they are.
+
+The gzip trailer only holds the uncompressed size modulo 2**32, so files are
+written with the full size in an extra header field (RFC 1952, section
+2.3.1.1), which ``size()`` reads without decompressing the file.
+
+Files in this storage must not be served directly from ``MEDIA_URL``; serve
+them through a view that reads them, such as the report download view.
+"""
+
+import gzip
+import io
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+from typing import BinaryIO, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Header of the files written here: magic, method, flags, mtime, extra flags,
+# OS, extra field length, then one extra subfield holding the uncompressed size
+SIZED_HEADER = struct.Struct('<2sBBIBBH2sHQ')
+SIZE_SUBFIELD = b'VS'
+
+# Compressed data larger than this is spooled to disk while a file is saved
+SPOOL_SIZE = 4 * 1024 * 1024
+
+# Read size when compressing existing files
+CHUNK_SIZE = 1024 * 1024
+
+
+def get_compression_level() -> int:
+	"""Return the gzip compression level for new files."""
+	return getattr(settings, 'MEDIA_COMPRESSION_LEVEL', 6)
+
+
+def is_compressed(path: str) -> bool:
+	"""Return whether the file at a path is gzip compressed."""
+	with open(path, 'rb') as raw:
+		return raw.read(2) == GZIP_MAGIC
+
+
+def _sized_header(size: int) -> bytes:
+	"""Return a gzip header recording the uncompressed size; a fixed mtime keeps the stored bytes a function of the content."""
+	return SIZED_HEADER.pack(GZIP_MAGIC, zlib.DEFLATED, gzip.FEXTRA, 0, 0, 255, 12, SIZE_SUBFIELD, 8, size)
+
+
+def write_compressed(chunks: Iterable[bytes], out: BinaryIO) -> int:
+	"""
+	Write data to a file as a gzip member that records its uncompressed size.
+
+	The header is written with a placeholder size and rewritten once the
+	data is compressed, so the file must be seekable.
+
+	Args:
+		chunks (Iterable[bytes]): The data to compress.
+		out (BinaryIO): The file to write to, at its current position.
+
+	Returns:
+		int: The uncompressed size in bytes.
+	"""
+	start = out.tell()
+	out.write(_sized_header(0))
+	compressor = zlib.compressobj(get_compression_level(), zlib.DEFLATED, -zlib.MAX_WBITS)
+	crc = size = 0
+	for chunk in chunks:
+		crc = zlib.crc32(chunk, crc)
+		size += len(chunk)
+		out.write(compressor.compress(chunk))
+	out.write(compressor.flush())
+	out.write(struct.pack('<II', crc, size & 0xffffffff))
+
+	end = out.tell()
+	out.seek(start)
+	out.write(_sized_header(size))
+	out.seek(end)
+	return size
+
+
+def compress_existing(path: str) -> Optional[Tuple[int, int]]:
+	"""
+	Compress an uncompressed file in place.
+
+	The file is compressed to a temporary file next to it, which then
+	replaces it, so readers never see a partly written file.
+
+	Args:
+		path (str): Absolute path of the file.
+
+	Returns:
+		Optional[Tuple[int, int]]: The original and compressed sizes in bytes,
+		or None if the file was already compressed.
+	"""
+	with open(path, 'rb') as raw:
+		if raw.read(2) == GZIP_MAGIC:
+			return None
+		raw.seek(0)
+
+		fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.compress-')
+		try:
+			with os.fdopen(fd, 'wb') as out:
+				original_size = write_compressed(iter(lambda: raw.read(CHUNK_SIZE), b''), out)
+			shutil.copymode(path, temp_path)
+			os.replace(temp_path, path)
+		except BaseException:
+			os.unlink(temp_path)
+			raise
+
+	return original_size, os.path.getsize(path)
+
+
+class CompressedFileSystemStorage(FileSystemStorage):
+	"""
+	A ``FileSystemStorage`` that gzips files on write and decompresses them on read.
+
+	``size()`` returns the uncompressed size, from the header of files
+	written by ``write_compressed``. Files can only be opened for reading;
+	they are written through ``save()``.
+	"""
+
+	def _save(self, name, content):
+		with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as spooled:
+			write_compressed(content.chunks(), spooled)
+			spooled.seek(0)
+			return super()._save(name, File(spooled, name))
+
+	def _open(self, name, mode='rb'):
+		if any(flag in mode for flag in 'wax+'):
+			raise ValueError("Compressed files can only be opened for reading.")
+
+		path = self.path(name)
+		stream = gzip.GzipFile(path, 'rb') if is_compressed(path) else open(path, 'rb')
+		if 'b' not in mode:
+			stream = io.TextIOWrapper(stream)
+		opened = File(stream, name)
+		opened.size = self.size(name)
+		return opened
+
+	def size(self, name):
+		path = self.path(name)
+		with open(path, 'rb') as raw:
+			header = raw.read(SIZED_HEADER.size)
+			if header[:2] != GZIP_MAGIC:
+				return os.path.getsize(path)
+			if len(header) == SIZED_HEADER.size:
+				_, _, flags, _, _, _, extra_length, subfield, subfield_length, size = SIZED_HEADER.unpack(header)
+				if flags & gzip.FEXTRA and (extra_length, subfield, subfield_length) == (12, SIZE_SUBFIELD, 8):
+					return size
+			# Written without the size field: the trailer holds the size modulo
+			# 2**32, which is exact for files under 4 GiB
+			raw.seek(-4, os.SEEK_END)
+			return struct.unpack('<I', raw.read(4))[0]
+
+
+compressed_storage = CompressedFileSystemStorage()
+
+
+def get_compressed_storage() -> CompressedFileSystemStorage:
+	"""Return the compressed media storage; used as a ``FileField`` storage callable."""
+	return compressed_storage